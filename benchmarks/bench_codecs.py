@@ -0,0 +1,114 @@
+# =============================================
+# 📁 benchmarks/bench_codecs.py
+# =============================================
+# Decode cost of a ~10 MB audit-log / scan-results response with each codec
+# in sdk/codecs.py (only the ones installed are measured).
+#
+#   PYTHONPATH=. python benchmarks/bench_codecs.py [--mb 10] [--repeat 5]
+#
+# "decode" is bytes -> builtins; "+models" additionally builds SDK models from
+# the scan-results payload with from_dict(), and "typed" decodes bytes straight
+# into models (msgspec codecs only) — what the pages pay end to end.
+import argparse
+import datetime
+import json
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from sdk.codecs import MSGPACK_MEDIA_TYPE, StdlibJsonCodec, TypedItemsDecoder, available_codecs
+from sdk.models import SDKTaskStatus
+
+EVENT_TYPES = ["NewCommitEvent", "DagExecutionStatusEvent", "DeploymentStatusEvent", "SecurityScanResultEvent"]
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]
+
+
+def _ts(rng: random.Random) -> str:
+    moment = datetime.datetime(2026, 1, 1) + datetime.timedelta(seconds=rng.randint(0, 86400 * 180))
+    return moment.isoformat() + "Z"
+
+
+def make_audit_logs(target_bytes: int, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    entries: List[Dict[str, Any]] = []
+    size = 0
+    while size < target_bytes:
+        entry = {
+            "audit_id": f"audit_{rng.getrandbits(64):016x}",
+            "timestamp": _ts(rng),
+            "source_event_type": rng.choice(EVENT_TYPES),
+            "project_id": rng.choice(["project_alpha", "project_beta", "project_gamma"]),
+            "user_or_actor": rng.choice(["ci-bot", "plan-agent", "alice", "bob"]),
+            "action_description": "Pipeline state changed " + " ".join(rng.choice(EVENT_TYPES) for _ in range(4)),
+            "details": {"dag_id": f"dag_{rng.randint(0, 99999):05d}", "attempt": rng.randint(1, 3)},
+        }
+        entries.append(entry)
+        size += len(json.dumps(entry))
+    return {"audit_logs": entries}
+
+
+def make_scan_results(target_bytes: int, seed: int = 11) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    findings: List[Dict[str, Any]] = []
+    size = 0
+    while size < target_bytes:
+        findings.append({
+            "task_id": f"finding_{len(findings):07d}",
+            "status": rng.choice(["SUCCESS", "FAILED", "SKIPPED"]),
+            "message": f"{rng.choice(SEVERITIES)}: CVE-2026-{rng.randint(1000, 99999)} in package-{rng.randint(1, 400)}",
+            "result_summary": None,
+            "started_at": _ts(rng),
+            "completed_at": _ts(rng),
+        })
+        size += len(json.dumps(findings[-1]))
+    return {"findings": findings}
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _ms(seconds: Any) -> str:
+    return f"{seconds * 1000:.1f}" if seconds else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    target = int(args.mb * 1024 * 1024)
+
+    stdlib = StdlibJsonCodec()
+    payloads = {"audit-logs": make_audit_logs(target), "scan-results": make_scan_results(target)}
+    codecs = available_codecs()
+    print(f"codecs: {', '.join(c.name for c in codecs)}")
+    typed = TypedItemsDecoder(SDKTaskStatus, "findings")
+    print(f"{'payload':<14} {'codec':<22} {'size MB':>8} {'decode ms':>10} {'+models ms':>11} {'typed ms':>9} {'vs json':>8}")
+    for payload_name, payload in payloads.items():
+        baseline = None
+        for codec in sorted(codecs, key=lambda c: c.name != stdlib.name):  # stdlib first: it is the baseline
+            body = codec.encode(payload)
+            decode_s = _time(lambda: codec.decode(body), args.repeat)
+            models_s = typed_s = None
+            if payload_name == "scan-results":
+                models_s = _time(lambda: [SDKTaskStatus.from_dict(f) for f in codec.decode(body)["findings"]],
+                                 max(1, args.repeat // 2))
+                if typed.available and codec.name.startswith("msgspec"):
+                    typed_s = _time(lambda: typed.decode(body, codec), max(1, args.repeat // 2))
+            if codec.name == stdlib.name:
+                baseline = decode_s
+            ratio = f"{baseline / decode_s:.1f}x" if baseline else "-"
+            wire = " (bin)" if codec.media_type == MSGPACK_MEDIA_TYPE else ""
+            print(f"{payload_name:<14} {codec.name + wire:<22} {len(body) / 1e6:>8.1f} {decode_s * 1000:>10.1f} "
+                  f"{_ms(models_s):>11} {_ms(typed_s):>9} {ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,16 @@
 # 📁 pages/2_Projects.py
 # ==============================
 import streamlit as st
-import asyncio
 import logging
 import pandas as pd
 import datetime
 from typing import List, Dict, Any, Optional
 import uuid # For generating request IDs if SDK doesn't
 
+from ui.cache import page_cache
+from ui.runtime import notify, run_sync
+from ui.tracing import end_page, trace_page
+
 # --- SDK Client Access & Logger ---
 # This should be at the top of every page file in the pages/ directory
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
@@ -20,11 +23,12 @@ logger = logging.getLogger(__name__) # Page-specific logger
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Projects - ForgeIQ", layout="wide")
+trace_page("Projects")
 st.title("🏗️ Projects Dashboard")
 st.markdown("View all projects managed by ForgeIQ and initiate actions.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=120) # Cache for 2 minutes
+@page_cache.cached("projects", ttl=120) # Cache for 2 minutes
 async def fetch_all_projects_data() -> List[Dict[str, Any]]:
     logger.info("Projects Page: Fetching list of all projects...")
     try:
@@ -40,7 +44,7 @@ async def fetch_all_projects_data() -> List[Dict[str, Any]]:
         return projects_list
     except Exception as e:
         logger.error(f"Projects Page: Error fetching projects list: {e}", exc_info=True)
-        st.error(f"Could not load projects: {str(e)[:100]}")
+        notify.error(f"Could not load projects: {str(e)[:100]}")
         return []
 
 async def trigger_pipeline_for_project_sdk(project_id: str, prompt: str, commit_sha: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -56,7 +60,7 @@ async def trigger_pipeline_for_project_sdk(project_id: str, prompt: str, commit_
         return response
     except Exception as e:
         logger.error(f"Projects Page: Error triggering pipeline for {project_id}: {e}", exc_info=True)
-        st.error(f"Failed to trigger pipeline: {str(e)[:100]}")
+        notify.error(f"Failed to trigger pipeline: {str(e)[:100]}")
         return None
 
 # --- Page Layout and Display ---
@@ -65,14 +69,14 @@ async def trigger_pipeline_for_project_sdk(project_id: str, prompt: str, commit_
 col_actions1, col_actions2 = st.columns([1,4])
 with col_actions1:
     if st.button("🔄 Refresh Projects List", use_container_width=True):
-        st.cache_data.clear() # Clears all @st.cache_data on this page
+        page_cache.invalidate("projects") # Only this page's data; other pages' caches are untouched
         st.rerun()
 # with col_actions2: # Placeholder for future actions like "Create New Project"
     # if st.button("➕ Create New Project", disabled=True, use_container_width=True): # Conceptual
         # st.info("Project creation via UI is a future feature.")
 
 
-projects_list_data = asyncio.run(fetch_all_projects_data())
+projects_list_data = run_sync(fetch_all_projects_data())
 
 if not projects_list_data:
     st.info("No projects found or available. You might need to configure projects in the ForgeIQ system.")
@@ -128,7 +132,7 @@ for project in projects_list_data:
                         st.warning("Please provide a pipeline description/prompt.")
                     else:
                         with st.spinner(f"Requesting pipeline for {project_name}..."):
-                            response = asyncio.run(trigger_pipeline_for_project_sdk(
+                            response = run_sync(trigger_pipeline_for_project_sdk(
                                 project_id, pipeline_prompt, commit_sha or commit_sha_default
                             ))
                         if response and response.get("request_id"):
@@ -142,3 +146,5 @@ for project in projects_list_data:
         st.markdown("<br>", unsafe_allow_html=True) 
 
 # --- End of Project List ---
+
+end_page()
@@ -2,56 +2,79 @@
 # 📁 pages/3_Pipelines_and_Builds.py
 # ============================================
 import streamlit as st
-import asyncio
 import logging
 import pandas as pd
-import datetime
 from typing import List, Dict, Any, Optional
-import uuid # For example data or unique keys
+
+from sdk.dag import DEFAULT_COLLAPSE_THRESHOLD, build_dag_view
+from sdk.models import SDKDagExecutionStatus, SDKTaskStatus
+from sdk.pagination import CursorPage
+from sdk.timeline import build_timeline
+
+from ui.cache import page_cache
+from ui.dag_view import dag_chart
+from ui.facets import filter_options
+from ui.lazy import is_open, lazy_expander
+from ui.live_state import live_state, start_realtime
+from ui.paged_table import paged_table
+from ui.runtime import get_task_timings, notify, run_sync
+from ui.timeline_view import timeline_chart
+from ui.tracing import end_page, trace_page
 
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
     st.error("SDK client not initialized. Please go to the main Dashboard page first.")
     st.stop()
 client = st.session_state.forgeiq_sdk_client
+start_realtime(client) # No-op unless FORGEIQ_PUSHER_KEY is set
 logger = logging.getLogger(__name__)
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Pipelines & Builds - ForgeIQ", layout="wide")
+trace_page("Pipelines & Builds")
 st.title("🚀 Pipelines & Builds Tracker")
 st.markdown("Monitor ongoing and completed pipeline (DAG) executions and their constituent tasks.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=15) # Cache for 15 seconds for potentially live data
-async def fetch_pipeline_executions_data(
+@page_cache.cached("pipelines", ttl=lambda: live_state.reconcile_ttl(15)) # 15s polling; long reconciliation TTL while push events are flowing
+async def sync_pipeline_executions_store() -> Dict[str, Any]:
+    # One delta sync (only DAGs/tasks changed since the last watermark) feeds every filter combination.
+    try:
+        result = await client.sync_pipeline_executions()
+        logger.info(f"Pipelines Page: Synced executions: {result.as_dict()}")
+        return result.as_dict()
+    except Exception as e:
+        logger.error(f"Pipelines Page: Error syncing pipeline executions: {e}", exc_info=True)
+        notify.error(f"Could not load pipeline executions: {str(e)[:100]}")
+        return {}
+
+async def fetch_pipeline_executions_page(
     project_id_filter: Optional[str] = None,
     status_filter: Optional[str] = None,
-    limit: int = 25
-) -> List[Dict[str, Any]]: # List of SDKDagExecutionStatusModel-like dicts
+    sort: str = "-started_at",
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> Optional[CursorPage[SDKDagExecutionStatus]]:
     logger.info(
-        f"Pipelines Page: Fetching pipeline executions. Filters - Project: {project_id_filter}, Status: {status_filter}"
+        f"Pipelines Page: Fetching pipeline executions. Filters - Project: {project_id_filter}, Status: {status_filter}, "
+        f"Sort: {sort}, Cursor: {cursor}"
     )
+    # Backend endpoint: GET /api/forgeiq/pipelines/executions/changes?since=<watermark>
+    #   Returns: {"executions": [...changed...], "tombstones": [...deleted dag_ids...], "watermark": ...}
+    # Filtering, sorting and paging happen on the client's local keyed store (client.executions).
+    await sync_pipeline_executions_store()
     try:
-        # CONCEPTUAL SDK/API Call: client.pipelines.list_executions(project_id=..., status=..., limit=...)
-        # Backend endpoint: GET /api/forgeiq/pipelines/executions
-        #   Query params: project_id, status, limit
-        #   Returns: {"pipelines": [SDKDagExecutionStatusModel_like_summary_1, ...]}
-
-        params = {"limit": limit}
-        if project_id_filter and project_id_filter != "All": params["project_id"] = project_id_filter
-        if status_filter and status_filter != "All": params["status"] = status_filter
-
-        response = await client._request("GET", "/api/forgeiq/pipelines/executions", params=params) # NEW BACKEND ENDPOINT
-        pipelines_list = response.get("pipelines", [])
-        logger.info(f"Pipelines Page: Fetched {len(pipelines_list)} pipeline executions.")
-        return pipelines_list
-    except Exception as e:
-        logger.error(f"Pipelines Page: Error fetching pipeline executions: {e}", exc_info=True)
-        st.error(f"Could not load pipeline executions: {str(e)[:100]}")
-        return []
+        return client.executions.page(
+            project_id=project_id_filter if project_id_filter and project_id_filter != "All" else None,
+            status=status_filter if status_filter and status_filter != "All" else None,
+            sort=sort, cursor=cursor, limit=page_size,
+        )
+    except ValueError as e:
+        notify.error(f"Could not list pipeline executions: {e}")
+        return None
 
-@st.cache_data(ttl=10) # Shorter TTL for details as they might update more frequently
-async def fetch_dag_full_details(dag_id: str, project_id: Optional[str]) -> Optional[Dict[str, Any]]: # SDKDagExecutionStatusModel
+@page_cache.cached("dag_details", ttl=lambda: live_state.reconcile_ttl(10), scope_arg="dag_id") # Shorter TTL for details as they might update more frequently
+async def fetch_dag_full_details(dag_id: str, project_id: Optional[str]) -> Optional[SDKDagExecutionStatus]:
     logger.info(f"Pipelines Page: Fetching full details for DAG '{dag_id}' in project '{project_id}'")
     try:
         # This uses the existing SDK method which calls the backend
@@ -63,7 +86,7 @@ async def fetch_dag_full_details(dag_id: str, project_id: Optional[str]) -> Opti
         return details
     except Exception as e:
         logger.error(f"Pipelines Page: Error fetching DAG details for {dag_id}: {e}", exc_info=True)
-        st.error(f"Could not load DAG details for {dag_id}: {str(e)[:100]}")
+        notify.error(f"Could not load DAG details for {dag_id}: {str(e)[:100]}")
         return None
 
 async def trigger_pipeline_rerun_sdk(project_id: str, dag_id: str) -> Optional[Dict[str, Any]]:
@@ -76,14 +99,13 @@ async def trigger_pipeline_rerun_sdk(project_id: str, dag_id: str) -> Optional[D
         return response # e.g., {"message": "Rerun initiated", "new_dag_id": "..."}
     except Exception as e:
         logger.error(f"Pipelines Page: Error triggering rerun for DAG {dag_id}: {e}", exc_info=True)
-        st.error(f"Failed to trigger rerun for DAG {dag_id}: {str(e)[:100]}")
+        notify.error(f"Failed to trigger rerun for DAG {dag_id}: {str(e)[:100]}")
         return None
 
 # --- Page Layout & Filters ---
 st.sidebar.subheader("Pipeline Filters")
-# TODO: Populate project_list_options from an API call
-# For now, using session state if set by Projects page or mock
-project_options_pipelines = ["All"] + st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta", "project_gamma"])
+project_options_pipelines = filter_options(client, "pipelines/executions", "project_id",
+                                           fallback=st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta", "project_gamma"]))
 status_options_pipelines = ["All", "RUNNING", "COMPLETED_SUCCESS", "FAILED", "QUEUED", "STARTED", "COMPLETED_PARTIAL"]
 
 if 'pipeline_project_filter' not in st.session_state: st.session_state.pipeline_project_filter = "All"
@@ -93,119 +115,175 @@ st.session_state.pipeline_project_filter = st.sidebar.selectbox("Filter by Proje
 st.session_state.pipeline_status_filter = st.sidebar.selectbox("Filter by Status:", options=status_options_pipelines, key="sb_pipe_stat")
 
 if st.sidebar.button("Apply Filters & Refresh Pipelines", use_container_width=True):
-    st.cache_data.clear()
+    page_cache.invalidate("pipelines")
     st.rerun()
 
+# --- Pipeline Executions Store ---
+run_sync(sync_pipeline_executions_store()) # Delta sync into client.executions; the table and the analytics read that store
+
+# --- Timing Analytics ---
+timing_section = lazy_expander("⏱️ Task Timing Analytics", key="timing_expander")
+with timing_section:
+    if is_open(timing_section): # Ingest and summaries only run while the expander is open
+        task_timings = get_task_timings(client)
+        task_timings.ingest(client.executions.list()) # Only executions that finished since the last ingest are analysed
+        st.caption(f"{task_timings.executions:,} finished executions analysed.")
+        timing_summary = task_timings.summary()
+        if timing_summary.empty:
+            st.caption("No finished executions with task start/completion times yet.")
+        else:
+            st.markdown("##### Duration by task type")
+            st.caption("Queue wait: time between a task's dependency finishing and the task starting. "
+                       "Critical share: fraction of all critical-path time spent in this task type.")
+            summary_df = timing_summary.assign(on_critical_path=timing_summary["on_critical_path"] * 100,
+                                               critical_share=timing_summary["critical_share"] * 100).round(1)
+            summary_df = summary_df.reset_index().rename(columns={
+                "task_type": "Task Type", "runs": "Runs", "p50_s": "p50 (s)", "p95_s": "p95 (s)", "p99_s": "p99 (s)",
+                "queue_p50_s": "Queue p50 (s)", "queue_p95_s": "Queue p95 (s)", "on_critical_path": "On Critical Path (%)",
+                "critical_share": "Critical Share (%)", "total_s": "Total (s)",
+            })
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+            timing_regressions = task_timings.regressions()
+            regressed = timing_regressions[timing_regressions["regressed"]] if not timing_regressions.empty else timing_regressions
+            st.markdown("##### Regressions")
+            st.caption(f"Median of the last {task_timings.recent_runs} runs vs the {task_timings.baseline_runs} runs before them; "
+                       f"flagged at +{task_timings.regression_threshold:.0%} or more.")
+            if regressed.empty:
+                st.success("No task type is slower than its rolling baseline.")
+            else:
+                for task_type, row in regressed.iterrows():
+                    st.warning(f"**{task_type}**: median {row['recent_p50_s']:.1f}s over the last {int(row['recent_runs'])} runs "
+                               f"vs {row['baseline_p50_s']:.1f}s baseline (**{row['ratio']:.2f}×**)")
+
+
 # --- Display Pipelines ---
-pipeline_executions = asyncio.run(fetch_pipeline_executions_data(
-    project_id_filter=st.session_state.pipeline_project_filter if st.session_state.pipeline_project_filter != "All" else None,
-    status_filter=st.session_state.pipeline_status_filter if st.session_state.pipeline_status_filter != "All" else None
-))
-
-st.subheader(f"Displaying {len(pipeline_executions)} Pipeline Executions")
-
-if not pipeline_executions:
-    st.info("No pipeline executions match the current filters or failed to load.")
-else:
-    for exec_summary in pipeline_executions:
-        dag_id = exec_summary.get("dag_id", "N/A")
-        project_id = exec_summary.get("project_id", "N/A")
-        status = exec_summary.get("status", "UNKNOWN")
-        started_at_str = exec_summary.get("started_at", "")
-
-        started_display = "N/A"
-        if started_at_str:
-            try: started_display = datetime.datetime.fromisoformat(started_at_str.replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M')
-            except ValueError: started_display = started_at_str
-
-        status_icon = "❓"
-        if status == "COMPLETED_SUCCESS": status_icon = "✅"
-        elif status == "FAILED": status_icon = "❌"
-        elif status == "RUNNING" or status == "STARTED": status_icon = "⏳"
-        elif status == "QUEUED": status_icon = " M0,0H24V24H0z' fill='none'/> <path d='M12 2a10 10 0 1010 10A10 10 0 0012 2zm0 18a8 8 0 118-8 8 8 0 01-8 8zm1-13h-2v6h2zm0 8h-2v2h2z'> </path> </g> </svg>" # Clock icon (SVG for queue) - this needs HTML
-            status_icon = "🕒" # Simpler emoji
-
-        expander_title = f"{status_icon} DAG: **{dag_id}** (Project: {project_id}) - Status: **{status}** - Started: {started_display}"
-
-        with st.expander(expander_title):
-            st.caption(f"Full DAG ID: {dag_id}")
-            st.write(f"**Description:** {exec_summary.get('dag', {}).get('description', exec_summary.get('message', 'N/A'))}") # Assuming 'dag' might be in summary
-
-            if exec_summary.get("completed_at"):
-                st.write(f"**Completed:** {datetime.datetime.fromisoformat(exec_summary['completed_at'].replace('Z','+00:00')).strftime('%Y-%m-%d %H:%M')}")
-
-            cols_actions = st.columns(3)
-            with cols_actions[0]:
-                if st.button("View Details & Tasks", key=f"details_dag_{dag_id}", use_container_width=True):
-                    st.session_state.selected_dag_id_for_details = dag_id
-                    st.session_state.selected_project_id_for_details = project_id # For fetch_dag_full_details
-                    # We might need to clear other selections if any
-            with cols_actions[1]:
-                if status not in ["COMPLETED_SUCCESS", "RUNNING", "QUEUED"]: # Allow rerun for failed/partial
-                    if st.button("🔁 Re-run Pipeline", key=f"rerun_dag_{dag_id}", use_container_width=True, type="secondary"):
-                        with st.spinner(f"Requesting rerun for DAG {dag_id}..."):
-                            rerun_resp = asyncio.run(trigger_pipeline_rerun_sdk(project_id, dag_id))
-                        if rerun_resp and rerun_resp.get("new_dag_id"):
-                            st.success(f"Pipeline rerun initiated! New DAG ID: {rerun_resp['new_dag_id']}")
-                            st.cache_data.clear(); st.rerun()
-                        else:
-                            st.error(f"Failed to initiate rerun for DAG {dag_id}.")
-            # with cols_actions[2]:
-            #     if status == "RUNNING":
-            #         if st.button("❌ Cancel Pipeline", key=f"cancel_dag_{dag_id}", use_container_width=True, type="destructive"):
-            #             # Backend API: POST /api/forgeiq/pipelines/executions/{dag_id}/cancel
-            #             st.warning("Cancel functionality not yet implemented.")
-
-
-            # Display full details if this DAG is selected
-            if st.session_state.get("selected_dag_id_for_details") == dag_id:
-                with st.spinner(f"Loading full details for DAG {dag_id}..."):
-                    dag_full_details = asyncio.run(fetch_dag_full_details(st.session_state.selected_project_id_for_details, dag_id))
-
-                if dag_full_details:
-                    st.markdown("##### Task Execution Statuses:")
-                    tasks_for_df = []
-                    for task_status in dag_full_details.get("task_statuses", []):
-                        tasks_for_df.append({
-                            "Task ID": task_status.get("task_id"),
-                            "Status": task_status.get("status"),
-                            "Message/Summary": (task_status.get("message") or task_status.get("result_summary",""))[:150], # Truncate
-                            "Started": datetime.datetime.fromisoformat(task_status['started_at'].replace("Z","+00:00")).strftime('%H:%M:%S') if task_status.get('started_at') else '-',
-                            "Completed": datetime.datetime.fromisoformat(task_status['completed_at'].replace("Z","+00:00")).strftime('%H:%M:%S') if task_status.get('completed_at') else '-',
-                        })
-                    if tasks_for_df:
-                        st.dataframe(pd.DataFrame(tasks_for_df), height=min(300, len(tasks_for_df)*40 + 40), use_container_width=True, hide_index=True)
-                    else:
-                        st.caption("No task status details found for this DAG execution.")
-
-                    # DAG Visualization
-                    dag_definition_nodes = dag_full_details.get("dag", {}).get("nodes", []) # PlanAgent should store original DAG def with status
-                    if not dag_definition_nodes and dag_full_details.get("nodes"): # If nodes are top-level in status event
-                         dag_definition_nodes = dag_full_details.get("nodes")
-
-                    if dag_definition_nodes:
-                        st.markdown("##### Pipeline Structure (DAG):")
-                        dot_string = "digraph {\n  rankdir=LR;\n  node [shape=box, style=rounded];\n"
-                        for node in dag_definition_nodes:
-                            node_id = node.get("id", "unknown_node")
-                            task_type = node.get("task_type", "unknown_type")
-                            node_label = f"{node_id}\\n({task_type})"
-                            # Optionally color nodes by status if available here (would need merging task_statuses with dag_nodes)
-                            dot_string += f'  "{node_id}" [label="{node_label}"];\n'
-                            for dep in node.get("dependencies", []):
-                                dot_string += f'  "{dep}" -> "{node_id}";\n'
-                        dot_string += "}"
-                        try:
-                            st.graphviz_chart(dot_string)
-                        except Exception as e_gv:
-                            st.warning(f"Could not render DAG visualization (Graphviz might not be installed or DOT string error): {e_gv}")
-                            st.code(dot_string, language="dot")
-                    else:
-                        st.caption("DAG structure not available for visualization.")
+STATUS_ICONS = {"COMPLETED_SUCCESS": "✅", "FAILED": "❌", "RUNNING": "⏳", "STARTED": "⏳", "QUEUED": "🕒"}
+PIPELINE_SORTS = {"Newest first": "-started_at", "Oldest first": "started_at", "Recently completed": "-completed_at",
+                  "Status": "status,-started_at", "Project": "project_id,-started_at", "DAG ID": "dag_id"}
+
+def executions_frame(executions: List[SDKDagExecutionStatus]) -> pd.DataFrame:
+    frame = SDKDagExecutionStatus.to_frame(executions, columns=["status", "dag_id", "project_id", "started_at", "completed_at", "message"])
+    status = frame["status"].fillna("UNKNOWN")
+    return pd.DataFrame({
+        "Status": status.map(STATUS_ICONS).fillna("❓") + " " + status,
+        "DAG ID": frame["dag_id"],
+        "Project": frame["project_id"].fillna("N/A"),
+        "Tasks": [len(e.task_statuses) for e in executions],
+        "Started": frame["started_at"].dt.strftime('%Y-%m-%d %H:%M').fillna("N/A"),
+        "Completed": frame["completed_at"].dt.strftime('%Y-%m-%d %H:%M').fillna("-"),
+        "Duration (min)": ((frame["completed_at"] - frame["started_at"]).dt.total_seconds() / 60).round(1),
+        "Message": frame["message"].fillna("").str[:120],
+    })
+
+pipeline_filters = (st.session_state.pipeline_project_filter, st.session_state.pipeline_status_filter)
+
+st.subheader("Pipeline Executions")
+pipelines_table = paged_table(
+    "pipelines",
+    lambda sort, cursor, page_size: fetch_pipeline_executions_page(*pipeline_filters, sort=sort, cursor=cursor, page_size=page_size),
+    executions_frame,
+    PIPELINE_SORTS,
+    filters=pipeline_filters,
+    transform=lambda items: live_state.overlay_list("dags", items),
+    noun="executions",
+)
+
+if not pipelines_table.items and not pipelines_table.failed:
+    st.info("No pipeline executions match the current filters.")
+elif pipelines_table.selected is None:
+    st.caption("Select a row for the execution's tasks, timeline and DAG structure.")
+
+exec_summary = pipelines_table.selected
+if exec_summary is not None:
+    dag_id = exec_summary.dag_id or "N/A"
+    project_id = exec_summary.project_id or "N/A"
+    status = exec_summary.status or "UNKNOWN"
+    with st.container(border=True):
+        st.markdown(f"{STATUS_ICONS.get(status, '❓')} DAG: **{dag_id}** (Project: {project_id}) - Status: **{status}**")
+        st.write(f"**Description:** {exec_summary.dag.get('description', exec_summary.message or 'N/A')}") # Assuming 'dag' might be in summary
+        if exec_summary.completed_at:
+            st.write(f"**Completed:** {exec_summary.completed_at.strftime('%Y-%m-%d %H:%M')}")
 
-                    if st.button("Hide Full Details", key=f"hide_full_details_{dag_id}"):
-                        if "selected_dag_id_for_details" in st.session_state: del st.session_state.selected_dag_id_for_details
-                        if "selected_project_id_for_details" in st.session_state: del st.session_state.selected_project_id_for_details
+        cols_actions = st.columns(3)
+        with cols_actions[0]:
+            if status not in ["COMPLETED_SUCCESS", "RUNNING", "QUEUED"]: # Allow rerun for failed/partial
+                if st.button("🔁 Re-run Pipeline", key=f"rerun_dag_{dag_id}", use_container_width=True, type="secondary"):
+                    with st.spinner(f"Requesting rerun for DAG {dag_id}..."):
+                        rerun_resp = run_sync(trigger_pipeline_rerun_sdk(project_id, dag_id))
+                    if rerun_resp and rerun_resp.get("new_dag_id"):
+                        st.success(f"Pipeline rerun initiated! New DAG ID: {rerun_resp['new_dag_id']}")
+                        page_cache.invalidate("pipelines") # Next sync picks up the new DAG as a delta
                         st.rerun()
-                else:
-                    st.warning(f"Could not load full details for DAG {dag_id}.")
+                    else:
+                        st.error(f"Failed to initiate rerun for DAG {dag_id}.")
+        # with cols_actions[1]:
+        #     if status == "RUNNING":
+        #         if st.button("❌ Cancel Pipeline", key=f"cancel_dag_{dag_id}", use_container_width=True, type="destructive"):
+        #             # Backend API: POST /api/forgeiq/pipelines/executions/{dag_id}/cancel
+        #             st.warning("Cancel functionality not yet implemented.")
+
+        with st.spinner(f"Loading full details for DAG {dag_id}..."):
+            dag_full_details = live_state.overlay("dags", run_sync(fetch_dag_full_details(dag_id=dag_id, project_id=project_id)))
+        if dag_full_details:
+            st.markdown("##### Task Execution Statuses:")
+            tasks_df = SDKTaskStatus.to_frame(dag_full_details.task_statuses) # Columnar, no per-row dicts
+            if not tasks_df.empty:
+                tasks_df["message"] = tasks_df["message"].fillna(tasks_df["result_summary"]).fillna("").str[:150] # Truncate
+                tasks_df["duration"] = (tasks_df["completed_at"] - tasks_df["started_at"]).dt.total_seconds().round(1)
+                for col in ("started_at", "completed_at"):
+                    tasks_df[col] = tasks_df[col].dt.strftime('%H:%M:%S').fillna('-')
+                tasks_df = tasks_df[["task_id", "status", "message", "started_at", "completed_at", "duration"]].rename(columns={
+                    "task_id": "Task ID", "status": "Status", "message": "Message/Summary",
+                    "started_at": "Started", "completed_at": "Completed", "duration": "Duration (s)",
+                })
+                st.dataframe(tasks_df, height=min(300, len(tasks_df)*40 + 40), use_container_width=True, hide_index=True)
+            else:
+                st.caption("No task status details found for this DAG execution.")
+
+            timeline = build_timeline(dag_full_details.task_statuses)
+            if timeline.bars:
+                st.markdown("##### Execution Timeline:")
+                st.caption(
+                    f"{timeline.tasks:,} tasks on {timeline.lanes} worker lanes"
+                    + (f" ({timeline.untimed:,} not started)" if timeline.untimed else "")
+                    + f" · wall time {timeline.wall_seconds / 60:.1f} min · peak parallelism {timeline.peak}"
+                    + f" · utilization {timeline.utilization:.0%}"
+                    + f" · {len(timeline.gaps)} gaps under {timeline.gap_target} running ({timeline.idle_seconds / 60:.1f} min)"
+                    + (f" · bars merged within {timeline.bin_seconds:.0f}s" if timeline.downsampled else "")
+                )
+                st.altair_chart(timeline_chart(timeline), use_container_width=True)
+
+            # DAG Visualization
+            dag_definition_nodes = dag_full_details.dag.get("nodes", []) # PlanAgent should store original DAG def with status
+            if not dag_definition_nodes and dag_full_details.extra.get("nodes"): # If nodes are top-level in status event
+                 dag_definition_nodes = dag_full_details.extra.get("nodes")
+
+            if dag_definition_nodes:
+                st.markdown("##### Pipeline Structure (DAG):")
+                expand_all = st.toggle(f"Show every task (collapsed by task type above {DEFAULT_COLLAPSE_THRESHOLD} nodes)",
+                                       key=f"dag_expand_{dag_id}", value=False)
+                # Layout is computed by the SDK and cached per DAG structure; status updates only recolor
+                dag_view = build_dag_view(dag_definition_nodes, dag_full_details.task_statuses,
+                                          collapse_threshold=None if expand_all else DEFAULT_COLLAPSE_THRESHOLD)
+                critical_display = (f"{dag_view.critical_seconds / 60:.1f} min" if dag_view.critical_by_duration
+                                    else f"{len(dag_view.critical_path)} tasks")
+                st.caption(
+                    f"{dag_view.total_nodes:,} tasks"
+                    + (f" in {len(dag_view.structure)} task-type groups" if dag_view.collapsed else "")
+                    + f" · {dag_view.layout.layers} stages · critical path: {critical_display}"
+                    + (" · layout cached" if dag_view.layout_cached else "")
+                    + (f" · {dag_view.structure.ignored_edges} invalid/cyclic dependencies ignored" if dag_view.structure.ignored_edges else "")
+                )
+                st.altair_chart(dag_chart(dag_view), use_container_width=True)
+                with st.expander("Critical path & slowest tasks"):
+                    st.write(" → ".join(dag_view.critical_path[:50]) + (" → …" if len(dag_view.critical_path) > 50 else ""))
+                    if dag_view.longest:
+                        st.dataframe(pd.DataFrame(dag_view.longest, columns=["Task ID", "Duration (s)"]),
+                                     use_container_width=True, hide_index=True)
+            else:
+                st.caption("DAG structure not available for visualization.")
+        else:
+            st.warning(f"Could not load full details for DAG {dag_id}.")
+
+end_page()
@@ -2,63 +2,70 @@
 # 📁 pages/4_Deployments.py
 # ===================================
 import streamlit as st
-import asyncio
 import logging
 import pandas as pd
-import datetime
 from typing import List, Dict, Any, Optional
-import uuid # For example data if needed
+
+from sdk.models import SDKDeploymentStatus
+from sdk.pagination import CursorPage
+from ui.cache import page_cache
+from ui.facets import filter_options, invalidate_facets
+from ui.live_state import live_state, start_realtime
+from ui.paged_table import paged_table
+from ui.runtime import notify
+from ui.tracing import end_page, trace_page
 
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
     st.error("SDK client not initialized. Please go to the main Dashboard page first.")
     st.stop()
 client = st.session_state.forgeiq_sdk_client
+start_realtime(client) # No-op unless FORGEIQ_PUSHER_KEY is set
 logger = logging.getLogger(__name__)
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Deployments - ForgeIQ", layout="wide")
+trace_page("Deployments")
 st.title("🚢 Deployments Overview")
 st.markdown("Track the status of your service deployments across different environments.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=30) # Cache for 30 seconds for potentially live data
-async def fetch_deployments_list(
+@page_cache.cached("deployments", ttl=lambda: live_state.reconcile_ttl(30), scope_arg="project_id_filter") # 30s polling; long reconciliation TTL while push events are flowing
+async def fetch_deployments_page(
     project_id_filter: Optional[str] = None,
     service_name_filter: Optional[str] = None,
     environment_filter: Optional[str] = None,
     status_filter: Optional[str] = None,
-    limit: int = 25
-) -> List[Dict[str, Any]]:
+    sort: str = "-started_at",
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> Optional[CursorPage[SDKDeploymentStatus]]:
     logger.info(
-        f"Deployments Page: Fetching deployments list. Filters - Project: {project_id_filter}, "
-        f"Service: {service_name_filter}, Env: {environment_filter}, Status: {status_filter}"
+        f"Deployments Page: Fetching deployments page. Filters - Project: {project_id_filter}, "
+        f"Service: {service_name_filter}, Env: {environment_filter}, Status: {status_filter}, Sort: {sort}, Cursor: {cursor}"
     )
     try:
-        # CONCEPTUAL SDK/API Call: client.deployments.list(project_id=..., service_name=..., ...)
         # Backend endpoint: GET /api/forgeiq/deployments
-        #   Query params: project_id, service_name, target_environment, status, limit
-        # It should return a list of objects compatible with SDKDeploymentStatusModel.
-
-        params = {"limit": limit}
-        if project_id_filter and project_id_filter != "All":
-            params["project_id"] = project_id_filter
-        if service_name_filter and service_name_filter != "All":
-            params["service_name"] = service_name_filter
-        if environment_filter and environment_filter != "All":
-            params["target_environment"] = environment_filter
-        if status_filter and status_filter != "All":
-            params["status"] = status_filter
-
-        # Using client._request for now; SDK would have a dedicated method client.list_deployments(**params)
-        response = await client._request("GET", "/api/forgeiq/deployments", params=params) # NEW BACKEND ENDPOINT
-        deployments_list = response.get("deployments", [])
-        logger.info(f"Deployments Page: Fetched {len(deployments_list)} deployments.")
-        return deployments_list
+        #   Query params: project_id, service_name, target_environment, status, sort, limit, cursor
+        # Filtering and sorting happen server-side; only the visible page crosses the wire.
+        def _filter(value: Optional[str]) -> Optional[str]:
+            return value if value and value != "All" else None
+
+        page = await client.page_deployments(
+            project_id=_filter(project_id_filter),
+            service_name=_filter(service_name_filter),
+            environment=_filter(environment_filter),
+            status=_filter(status_filter),
+            sort=sort,
+            cursor=cursor,
+            page_size=page_size,
+        )
+        logger.info(f"Deployments Page: Fetched {len(page.items)} deployments.")
+        return page
     except Exception as e:
-        logger.error(f"Deployments Page: Error fetching deployments list: {e}", exc_info=True)
-        st.error(f"Could not load deployments: {str(e)[:100]}")
-        return []
+        logger.error(f"Deployments Page: Error fetching deployments: {e}", exc_info=True)
+        notify.error(f"Could not load deployments: {str(e)[:100]}")
+        return None
 
 async def trigger_rollback_sdk(deployment_id_to_rollback_from: str, project_id: str, service_name: str) -> Optional[Dict[str, Any]]:
     logger.info(f"Deployments Page: Requesting rollback for service '{service_name}' from deployment related to '{deployment_id_to_rollback_from}'")
@@ -76,17 +83,17 @@ async def trigger_rollback_sdk(deployment_id_to_rollback_from: str, project_id:
         return response
     except Exception as e:
         logger.error(f"Deployments Page: Error triggering rollback for deployment context {deployment_id_to_rollback_from}: {e}", exc_info=True)
-        st.error(f"Failed to trigger rollback: {str(e)[:100]}")
+        notify.error(f"Failed to trigger rollback: {str(e)[:100]}")
         return None
 
 # --- Page Layout & Filters ---
 st.sidebar.subheader("Deployment Filters")
 
-# TODO: Populate these lists dynamically from backend API calls for existing projects, services, envs
-project_options = ["All"] + sorted(list(set(d.get("project_id", "N/A") for d in asyncio.run(fetch_deployments_list(limit=100))))) # Fetch distinct project_ids
-service_options = ["All"] + sorted(list(set(d.get("service_name", "N/A") for d in asyncio.run(fetch_deployments_list(limit=100))))) # Fetch distinct service_names
-env_options = ["All", "staging", "production", "development"] # Example environments
-status_options = ["All", "STARTED", "IN_PROGRESS", "SUCCESSFUL", "FAILED", "UNKNOWN"]
+# Distinct values across all deployments from one facets query (cached 10 min); lists are fallbacks
+project_options = filter_options(client, "deployments", "project_id")
+service_options = filter_options(client, "deployments", "service_name")
+env_options = filter_options(client, "deployments", "target_environment", fallback=["staging", "production", "development"])
+status_options = filter_options(client, "deployments", "status", fallback=["STARTED", "IN_PROGRESS", "SUCCESSFUL", "FAILED", "UNKNOWN"])
 
 # Use session state to keep filter values persistent across reruns
 if 'deploy_project_filter' not in st.session_state: st.session_state.deploy_project_filter = "All"
@@ -100,83 +107,81 @@ st.session_state.deploy_env_filter = st.sidebar.selectbox("Environment:", option
 st.session_state.deploy_status_filter = st.sidebar.selectbox("Status:", options=status_options, key="sb_deploy_stat")
 
 if st.sidebar.button("Apply Filters & Refresh Deployments", use_container_width=True):
-    # fetch_deployments_list.clear() # More specific cache clearing if needed
-    st.cache_data.clear()
+    page_cache.invalidate(page_cache.scoped("deployments", st.session_state.deploy_project_filter))
+    invalidate_facets("deployments")
     st.rerun()
 
-# Fetch and display deployments based on filters
-deployments = asyncio.run(fetch_deployments_list(
-    project_id_filter=st.session_state.deploy_project_filter,
-    service_name_filter=st.session_state.deploy_service_filter,
-    environment_filter=st.session_state.deploy_env_filter,
-    status_filter=st.session_state.deploy_status_filter
-))
-
-st.subheader(f"Displaying {len(deployments)} Deployments")
-
-if not deployments:
-    st.info("No deployments match the current filters, or failed to load.")
-else:
-    cols_header = st.columns((0.5, 1.5, 1, 1, 1, 1.5, 1.5, 1))
-    headers = ["Status", "Service", "Environment", "Commit", "Req ID", "Deployed At", "Deployment URL", "Actions"]
-    for col, header_text in zip(cols_header, headers):
-        col.markdown(f"**{header_text}**")
-
-    for dep in deployments:
-        # Use deployment_id or request_id as the key for UI elements
-        ui_key_base = dep.get("deployment_id") or dep.get("request_id") or str(uuid.uuid4())
-
-        status = dep.get("status", "UNKNOWN")
-        service = dep.get("service_name", "N/A")
-        env = dep.get("target_environment", "N/A")
-        commit = dep.get("commit_sha", "N/A")[:7] # Short SHA
-        req_id = dep.get("request_id", "N/A")[-8:] # Short Req ID
-
-        completed_at_str = dep.get("completed_at") or dep.get("timestamp") # Use timestamp as fallback
-        completed_display = "N/A"
-        if completed_at_str:
-            try:
-                completed_display = datetime.datetime.fromisoformat(completed_at_str.replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M')
-            except ValueError:
-                completed_display = completed_at_str
-
-
-        deployment_url = dep.get("deployment_url")
-        logs_url = dep.get("logs_url") # Railway deployment specific logs URL
-
-        cols_data = st.columns((0.5, 1.5, 1, 1, 1, 1.5, 1.5, 1))
-
-        with cols_data[0]: # Status
-            if status == "SUCCESSFUL": st.success("✅")
-            elif status == "FAILED": st.error("❌")
-            elif status == "IN_PROGRESS" or status == "STARTED": st.warning("⏳")
-            else: st.caption(status[:10]) # Show status string if not common
-
-        cols_data[1].markdown(f"**{service}**<br><small>Project: {dep.get('project_id', 'N/A')}</small>", unsafe_allow_html=True)
-        cols_data[2].caption(env)
-        cols_data[3].code(commit, language=None)
-        cols_data[4].caption(f"...{req_id}")
-        cols_data[5].caption(completed_display)
-
-        with cols_data[6]: # Deployment URL
-            if deployment_url:
-                st.link_button("🔗 Open App", deployment_url, use_container_width=True)
-            else:
-                st.caption("No URL")
-
-        with cols_data[7]: # Actions
-            if logs_url:
-                st.link_button("📜 View Logs", logs_url, type="secondary", use_container_width=True)
-
-            # Conceptual Rollback - needs backend API and CI_CD_Agent logic
-            # if status == "SUCCESSFUL" or status == "FAILED": # Allow rollback from terminal states
-            #     if st.button("Rollback", key=f"rollback_{ui_key_base}", type="secondary", use_container_width=True, help="Conceptual: Rollback to previous version"):
-            #         with st.spinner("Initiating rollback..."):
-            #             rb_response = asyncio.run(trigger_rollback_sdk(ui_key_base, dep.get("project_id"), service))
-            #         if rb_response and rb_response.get("status") == "accepted":
-            #             st.toast(f"Rollback initiated for {service}!", icon="🎉")
-            #             st.cache_data.clear() # Refresh data
-            #             st.rerun()
-            #         else:
-            #             st.error(f"Rollback failed: {rb_response.get('message', 'Unknown error')}")
-        st.markdown("---")
+# --- Display Deployments ---
+STATUS_ICONS = {"SUCCESSFUL": "✅", "FAILED": "❌", "IN_PROGRESS": "⏳", "STARTED": "⏳"}
+DEPLOYMENT_SORTS = {"Newest first": "-started_at", "Oldest first": "started_at",
+                    "Service": "service_name,-started_at", "Environment": "target_environment,-started_at",
+                    "Status": "status,-started_at"}
+
+def deployments_frame(deployments: List[SDKDeploymentStatus]) -> pd.DataFrame:
+    frame = SDKDeploymentStatus.to_frame(deployments, columns=[
+        "status", "service_name", "project_id", "target_environment", "commit_sha", "request_id",
+        "completed_at", "timestamp", "deployment_url", "logs_url"])
+    status = frame["status"].fillna("UNKNOWN")
+    return pd.DataFrame({
+        "Status": status.map(STATUS_ICONS).fillna("") + " " + status,
+        "Service": frame["service_name"].fillna("N/A"),
+        "Project": frame["project_id"].fillna("N/A"),
+        "Environment": frame["target_environment"].fillna("N/A"),
+        "Commit": frame["commit_sha"].str[:7].fillna("N/A"),
+        "Req ID": "..." + frame["request_id"].str[-8:].fillna("N/A"),
+        "Deployed At": frame["completed_at"].fillna(frame["timestamp"]).dt.strftime('%Y-%m-%d %H:%M').fillna("N/A"),
+        "Deployment URL": frame["deployment_url"],
+        "Logs": frame["logs_url"],
+    })
+
+deployment_filters = (st.session_state.deploy_project_filter, st.session_state.deploy_service_filter,
+                      st.session_state.deploy_env_filter, st.session_state.deploy_status_filter)
+
+st.subheader("Deployments")
+deployments_table = paged_table(
+    "deployments",
+    lambda sort, cursor, page_size: fetch_deployments_page(*deployment_filters, sort=sort, cursor=cursor, page_size=page_size),
+    deployments_frame,
+    DEPLOYMENT_SORTS,
+    filters=deployment_filters,
+    transform=lambda items: live_state.overlay_list("deployments", items),
+    column_config={
+        "Deployment URL": st.column_config.LinkColumn("Deployment URL", display_text="🔗 Open App"),
+        "Logs": st.column_config.LinkColumn("Logs", display_text="📜 View Logs"),
+    },
+    noun="deployments",
+)
+
+if not deployments_table.items and not deployments_table.failed:
+    st.info("No deployments match the current filters.")
+
+selected_deployment = deployments_table.selected
+if selected_deployment is not None:
+    with st.container(border=True):
+        st.markdown(f"**{selected_deployment.service_name or 'N/A'}** → {selected_deployment.target_environment or 'N/A'} "
+                    f"(Project: {selected_deployment.project_id or 'N/A'}) · Status: **{selected_deployment.status or 'UNKNOWN'}**")
+        st.caption(f"Deployment ID: {selected_deployment.deployment_id} · Request ID: {selected_deployment.request_id or 'N/A'} "
+                   f"· Commit: {selected_deployment.commit_sha or 'N/A'}")
+        if selected_deployment.message:
+            st.write(selected_deployment.message)
+        link_cols = st.columns(4)
+        if selected_deployment.deployment_url:
+            link_cols[0].link_button("🔗 Open App", selected_deployment.deployment_url, use_container_width=True)
+        if selected_deployment.logs_url:
+            link_cols[1].link_button("📜 View Logs", selected_deployment.logs_url, type="secondary", use_container_width=True)
+
+        # Conceptual Rollback - needs backend API and CI_CD_Agent logic
+        # if selected_deployment.status in ("SUCCESSFUL", "FAILED"): # Allow rollback from terminal states
+        #     if link_cols[2].button("Rollback", key=f"rollback_{selected_deployment.deployment_id}", type="secondary", use_container_width=True, help="Conceptual: Rollback to previous version"):
+        #         with st.spinner("Initiating rollback..."):
+        #             rb_response = run_sync(trigger_rollback_sdk(selected_deployment.deployment_id, selected_deployment.project_id, selected_deployment.service_name))
+        #         if rb_response and rb_response.get("status") == "accepted":
+        #             st.toast(f"Rollback initiated for {selected_deployment.service_name}!", icon="🎉")
+        #             page_cache.invalidate("deployments") # Refresh data
+        #             st.rerun()
+        #         else:
+        #             st.error(f"Rollback failed: {rb_response.get('message', 'Unknown error')}")
+elif deployments_table.items:
+    st.caption("Select a row for deployment details and links.")
+
+end_page()
@@ -2,27 +2,35 @@
 # 📁 pages/5_Agents_Status.py
 # =====================================
 import streamlit as st
-import asyncio
+import json
 import logging
 import pandas as pd
-import datetime
 from typing import List, Dict, Any, Optional
 
+from sdk.fleet import DEGRADED, HEALTHY, OFFLINE, STALE, UNKNOWN
+from ui.cache import page_cache
+from ui.live_state import live_state, start_realtime
+from ui.paged_table import frame_source, paged_table
+from ui.runtime import get_fleet_state, notify, run_sync
+from ui.tracing import end_page, trace_page, traced
+
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
     st.error("SDK client not initialized. Please go to the main Dashboard page first.")
     st.stop()
 client = st.session_state.forgeiq_sdk_client
+start_realtime(client) # No-op unless FORGEIQ_PUSHER_KEY is set
 logger = logging.getLogger(__name__)
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Agents Status - ForgeIQ", layout="wide")
+trace_page("Agents Status")
 st.title("🤖 Agents Status Dashboard")
 st.markdown("Monitor the status, capabilities, and health of all registered agents.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=15) # Cache for 15 seconds for semi-live status
-async def fetch_all_agents_status() -> List[Dict[str, Any]]:
+@page_cache.cached("agents", ttl=lambda: live_state.reconcile_ttl(15)) # 15s polling; heartbeats are pushed while the realtime connection is up
+async def fetch_all_agents_status() -> Optional[List[Dict[str, Any]]]:
     logger.info("Agents Status Page: Fetching all agent statuses...")
     try:
         # CONCEPTUAL SDK/API Call: client.agents.list_all() or client.get_agent_registry_status()
@@ -36,118 +44,136 @@ async def fetch_all_agents_status() -> List[Dict[str, Any]]:
         return agents_list
     except Exception as e:
         logger.error(f"Agents Status Page: Error fetching agent statuses: {e}", exc_info=True)
-        st.error(f"Could not load agent statuses: {str(e)[:100]}")
-        return []
+        notify.error(f"Could not load agent statuses: {str(e)[:100]}")
+        return None
 
-async def send_ping_to_agent(agent_id: str) -> Dict[str, Any]:
-    logger.info(f"Agents Status Page: Sending conceptual ping to agent '{agent_id}'")
+async def probe_agents(agents: List[Dict[str, Any]]):
+    # Direct GET <endpoint>/health per agent, fanned out concurrently by the SDK probe engine
     try:
-        # CONCEPTUAL SDK/API Call: client.agents.ping(agent_id=agent_id)
-        # Backend endpoint: POST /api/forgeiq/agents/{agent_id}/ping
-        # This endpoint would then perhaps publish a PingEvent for the specific agent
-        # and wait for a PongEvent, or call a direct health check if agent exposes one.
-        await asyncio.sleep(0.5) # Simulate API call
-        # Mock response
-        if random.random() > 0.2:
-            return {"agent_id": agent_id, "status": "pong_received", "message": "Agent responded to ping."}
-        else:
-            return {"agent_id": agent_id, "status": "ping_timeout", "message": "Agent did not respond to ping."}
+        return await client.probe_agents(agents)
     except Exception as e:
-        logger.error(f"Agents Status Page: Error pinging agent {agent_id}: {e}", exc_info=True)
-        st.error(f"Failed to ping agent {agent_id}: {str(e)[:100]}")
-        return {"agent_id": agent_id, "status": "ping_error", "message": str(e)}
+        logger.error(f"Agents Status Page: Error probing agents: {e}", exc_info=True)
+        notify.error(f"Agent health probes failed: {str(e)[:100]}")
+        return None
 
 
 # --- Page Layout & Display ---
 
-refresh_button_cols = st.columns([0.8, 0.2]) # Give more space to other potential top-level actions
-with refresh_button_cols[1]: # Place refresh button to the right
+refresh_button_cols = st.columns([0.6, 0.2, 0.2]) # Give more space to other potential top-level actions
+with refresh_button_cols[2]: # Place refresh button to the right
     if st.button("🔄 Refresh Agent Statuses", use_container_width=True):
-        st.cache_data.clear()
+        page_cache.invalidate("agents")
         st.rerun()
 
 st.markdown("---")
 
-agents_status_data = asyncio.run(fetch_all_agents_status())
-
-if not agents_status_data:
+# Heartbeat history lives in a process-wide ring buffer per agent; pushed heartbeats are recorded as they arrive
+fleet = get_fleet_state(client)
+live_state.subscribe("agents", fleet.record)
+registry = run_sync(fetch_all_agents_status())
+if registry is not None:
+    fleet.observe(live_state.overlay_list("agents", registry))
+    fleet.retain(agent.get("agent_id") for agent in registry)  # Deregistered agents leave the fleet view
+with traced("fleet.frame"):
+    fleet_df = fleet.frame()
+
+with refresh_button_cols[1]:
+    if st.button("📡 Probe All Agents", use_container_width=True, disabled=fleet_df.empty):
+        records = [fleet.get(agent_id) for agent_id in fleet_df["agent_id"]]
+        with st.spinner(f"Probing {len(records)} agents..."):
+            probe_result = run_sync(probe_agents(records))
+        if probe_result is not None:
+            st.session_state.agents_last_probe = (probe_result.ok, probe_result.failed, probe_result.elapsed_ms, probe_result.sum_rtt_ms)
+if st.session_state.get("agents_last_probe"):
+    ok, failed, elapsed_ms, sum_rtt_ms = st.session_state.agents_last_probe
+    st.caption(f"Last probe: {ok} responded, {failed} failed or timed out · {elapsed_ms / 1000:.1f}s "
+               f"(one at a time: ~{sum_rtt_ms / 1000:.1f}s)")
+
+STATE_ICONS = {HEALTHY: "🟢", DEGRADED: "🟠", STALE: "🟡", OFFLINE: "🔴", UNKNOWN: "⚪"}
+SORT_OPTIONS = {"Health (worst first)": "health,agent_id", "Last seen (oldest first)": "-age_s,agent_id",
+                "Jitter (highest first)": "-jitter_s,agent_id", "Uptime (lowest first)": "uptime,agent_id",
+                "Agent ID": "agent_id", "Type": "agent_type,agent_id"}
+
+def agents_frame(agent_ids: List[str]) -> pd.DataFrame:
+    # Columnar formatting of the visible page only
+    window = view.loc[agent_ids]
+    table = pd.DataFrame({
+        "ID": window["agent_id"],
+        "Type": window["agent_type"],
+        "State": window["state"].map(lambda s: f"{STATE_ICONS.get(s, '')} {s}"),
+        "Reported": window["status"],
+        "Health": window["health"],
+        "Last Seen": window["last_seen"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna("N/A"),
+        "Age (s)": window["age_s"].round(0),
+        "Interval (s)": window["interval_s"].round(1),
+        "Jitter (s)": window["jitter_s"].round(1),
+        "Uptime %": (window["uptime"] * 100).round(1),
+        "Heartbeats": window["heartbeats"],
+    })
+    # RTT percentiles from this process's probe histograms (empty until a probe has run)
+    probe_stats = [client.probes.histogram(agent_id) or {} for agent_id in agent_ids]
+    last_probes = [client.probes.last_result(agent_id) for agent_id in agent_ids]
+    table["Probe"] = ["-" if p is None else ("✅" if p.ok else f"❌ {p.error}") for p in last_probes]
+    table["RTT p50 (ms)"] = [h.get("p50_ms") for h in probe_stats]
+    table["RTT p95 (ms)"] = [h.get("p95_ms") for h in probe_stats]
+    return table
+
+if fleet_df.empty:
     st.info("No agent data found or failed to load. Ensure agents are running and registering themselves.")
 else:
-    st.subheader(f"Found {len(agents_status_data)} Registered Agent(s)")
-
-    # Prepare data for DataFrame display
-    df_data = []
-    for agent_info in agents_status_data:
-        capabilities_str = ", ".join([cap.get("name", "N/A") for cap in agent_info.get("capabilities", [])])
-        endpoints_str = ""
-        for ep in agent_info.get("endpoints", []):
-            endpoints_str += f"{ep.get('type', 'N/A')}: {ep.get('address', 'N/A')}\n"
-
-        last_seen_str = agent_info.get("last_seen_timestamp", "")
-        last_seen_display = "N/A"
-        if last_seen_str:
-            try:
-                last_seen_dt = datetime.datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                last_seen_display = last_seen_dt.strftime('%Y-%m-%d %H:%M:%S %Z')
-                # Check if agent is "stale" (e.g., no heartbeat in last 5 minutes)
-                if (datetime.datetime.now(datetime.timezone.utc) - last_seen_dt).total_seconds() > 300: # 5 minutes
-                    agent_info["status"] = agent_info.get("status","") + " (Stale)"
-            except ValueError:
-                last_seen_display = last_seen_str # Show raw if parsing fails
-
-
-        df_data.append({
-            "ID": agent_info.get("agent_id"),
-            "Type": agent_info.get("agent_type"),
-            "Status": agent_info.get("status"),
-            "Capabilities": capabilities_str if capabilities_str else "N/A",
-            "Endpoints": endpoints_str.strip() if endpoints_str else "N/A",
-            "Last Seen": last_seen_display,
-            "Metadata": json.dumps(agent_info.get("metadata"), indent=2) if agent_info.get("metadata") else "N/A"
-        })
-
-    if df_data:
-        # Configure column widths and display
-        # st.dataframe(pd.DataFrame(df_data), use_container_width=True, hide_index=True)
-        # Using st.data_editor for a more interactive table (though not editing here)
-        st.subheader("Agent Fleet Details")
-
-        # Using columns for a nicer layout than just dataframe
-        for i, agent_row in enumerate(df_data):
-            with st.container(border=True):
-                c1, c2, c3 = st.columns([1.5, 1, 2.5])
-                with c1:
-                    st.markdown(f"**ID:** `{agent_row['ID']}`")
-                    st.markdown(f"**Type:** {agent_row['Type']}")
-                with c2:
-                    status = agent_row['Status']
-                    if "active" in status.lower() and not "stale" in status.lower():
-                        st.success(f"**Status:** {status}")
-                    elif "stale" in status.lower() or "degraded" in status.lower():
-                        st.warning(f"**Status:** {status}")
-                    else:
-                        st.error(f"**Status:** {status}")
-                    st.caption(f"Last Seen: {agent_row['Last Seen']}")
-                with c3:
-                    with st.expander("Details (Capabilities, Endpoints, Metadata)"):
-                        st.caption("Capabilities:")
-                        st.code(agent_row['Capabilities'], language=None)
-                        st.caption("Endpoints:")
-                        st.code(agent_row['Endpoints'], language=None)
-                        st.caption("Metadata:")
-                        st.code(agent_row['Metadata'], language="json")
-
-                # Conceptual Action Button (not functional without backend)
-                # if st.button("Ping Agent", key=f"ping_{agent_row['ID']}", type="secondary"):
-                #     with st.spinner(f"Pinging {agent_row['ID']}..."):
-                #         ping_response = asyncio.run(send_ping_to_agent(agent_row['ID']))
-                #     if ping_response:
-                #         if ping_response.get("status") == "pong_received":
-                #             st.toast(f"{agent_row['ID']} responded!", icon="✅")
-                #         else:
-                #             st.toast(f"Ping to {agent_row['ID']} failed: {ping_response.get('message')}", icon="❌")
-            st.markdown("---") # Separator between agents
-
-# For mock data if needed
-# import random
-# import hashlib
+    state_counts = fleet_df["state"].value_counts()
+    st.subheader(f"Found {len(fleet_df)} Registered Agent(s)")
+    metric_cols = st.columns(len(STATE_ICONS))
+    for col, (state, icon) in zip(metric_cols, STATE_ICONS.items()):
+        col.metric(f"{icon} {state.title()}", int(state_counts.get(state, 0)))
+
+    filter_cols = st.columns(2)
+    with filter_cols[0]:
+        selected_states = st.multiselect("State", list(STATE_ICONS), key="agents_states")
+    with filter_cols[1]:
+        selected_types = st.multiselect("Type", sorted(fleet_df["agent_type"].dropna().unique()), key="agents_types")
+
+    view = fleet_df.set_axis(fleet_df["agent_id"].to_numpy()) # Indexed by agent_id for the paged source
+    if selected_states:
+        view = view[view["state"].isin(selected_states)]
+    if selected_types:
+        view = view[view["agent_type"].isin(selected_types)]
+
+    st.subheader("Agent Fleet Details")
+    st.caption("Stale/offline thresholds per agent type (FORGEIQ_UI_AGENT_POLICIES) · "
+               "uptime and jitter over the last heartbeats seen by this dashboard")
+    # Health is computed client-side from heartbeat history, so the fleet frame is the paged source
+    agents_table = paged_table("agents", frame_source(view), agents_frame, SORT_OPTIONS,
+                               filters=(tuple(selected_states), tuple(selected_types)), noun="agents")
+
+    selected_agent = agents_table.selected
+    if selected_agent is None and agents_table.items:
+        st.caption("Select a row for the agent's capabilities, endpoints and probe history.")
+    agent_info = fleet.get(selected_agent) if selected_agent is not None else None
+    if agent_info:
+        with st.container(border=True):
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                st.caption("Capabilities:")
+                st.code(", ".join(cap.get("name", "N/A") for cap in agent_info.get("capabilities", [])) or "N/A", language=None)
+            with c2:
+                st.caption("Endpoints:")
+                st.code("\n".join(f"{ep.get('type', 'N/A')}: {ep.get('address', 'N/A')}"
+                                  for ep in agent_info.get("endpoints", [])) or "N/A", language=None)
+            with c3:
+                st.caption("Metadata:")
+                st.code(json.dumps(agent_info.get("metadata"), indent=2) if agent_info.get("metadata") else "N/A", language="json")
+
+            if st.button("Ping Agent", key=f"ping_{selected_agent}", type="secondary"):
+                with st.spinner(f"Pinging {selected_agent}..."):
+                    ping_result = run_sync(client.ping_agent(agent_info))
+                if ping_result.ok:
+                    st.toast(f"{selected_agent} responded in {ping_result.rtt_ms:.0f} ms", icon="✅")
+                else:
+                    st.toast(f"Ping to {selected_agent} failed: {ping_result.error}", icon="❌")
+            rtt = client.probes.histogram(selected_agent)
+            if rtt:
+                st.caption(f"RTT histogram ({rtt['answered']} answered of {rtt['probes']} probes, {rtt['timeouts']} timeouts):")
+                st.bar_chart(pd.Series(rtt["buckets"], name="probes").rename_axis("≤ ms"))
+
+end_page()
@@ -2,11 +2,19 @@
 # 📁 pages/6_Security_Hub.py
 # ===================================
 import streamlit as st
-import asyncio
 import logging
 import pandas as pd
-import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
+
+from sdk.findings import FindingsPage, FindingsQuery
+from sdk.findings_index import IndexedFinding
+from sdk.models import SDKScanResult, SDKSecurityFinding
+from sdk.pagination import CursorPage
+from ui.cache import page_cache
+from ui.facets import filter_options
+from ui.paged_table import paged_table
+from ui.runtime import notify, run_sync
+from ui.tracing import end_page, trace_page
 
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
@@ -17,48 +25,117 @@ logger = logging.getLogger(__name__)
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Security Hub - ForgeIQ", layout="wide")
+trace_page("Security Hub")
 st.title("🛡️ Security Hub")
 st.markdown("Review security scan results and findings across your projects.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=60) # Cache for 1 minute
+@page_cache.cached("security_scans", ttl=60, scope_arg="project_id_filter") # Cache for 1 minute
 async def fetch_security_scan_results(
     project_id_filter: Optional[str] = None,
     scan_type_filter: Optional[str] = None,
     min_severity_filter: Optional[str] = None,
     limit: int = 50
-) -> List[Dict[str, Any]]: # List of SecurityScanResultEvent-like dicts
+) -> List[SDKScanResult]:
     logger.info(
         f"Security Hub: Fetching scan results. Filters - Project: {project_id_filter}, "
         f"Scan Type: {scan_type_filter}, Severity: {min_severity_filter}"
     )
     try:
-        # CONCEPTUAL SDK/API Call: client.security.list_scan_results(project_id=..., scan_type=..., min_severity=..., limit=...)
-        # Backend endpoint: GET /api/forgeiq/security/scan-results
+        # Backend endpoint: GET /api/forgeiq/security/scan-results?include_findings=false
         #   Query params: project_id, scan_type, min_severity, limit
-        #   Returns: {"scan_results": [SecurityScanResultEvent_like_dict_1, ...]}
-        
-        params = {"limit": limit}
-        if project_id_filter and project_id_filter != "All": params["project_id"] = project_id_filter
-        if scan_type_filter and scan_type_filter != "All": params["scan_type"] = scan_type_filter
-        if min_severity_filter and min_severity_filter != "All": params["min_severity"] = min_severity_filter
-            
-        # Using client._request for now; SDK would have client.security.list_scan_results(**params)
-        response = await client._request("GET", "/api/forgeiq/security/scan-results", params=params) # NEW BACKEND ENDPOINT
-        results_list = response.get("scan_results", [])
+        # Scans come back with findings_count/severity_counts only; findings are loaded per scan below.
+        def _filter(value: Optional[str]) -> Optional[str]:
+            return value if value and value != "All" else None
+
+        results_list = await client.list_scan_results(
+            project_id=_filter(project_id_filter),
+            scan_type=_filter(scan_type_filter),
+            min_severity=_filter(min_severity_filter),
+            limit=limit,
+        )
         logger.info(f"Security Hub: Fetched {len(results_list)} scan results.")
         return results_list
     except Exception as e:
         logger.error(f"Security Hub: Error fetching scan results: {e}", exc_info=True)
-        st.error(f"Could not load security scan results: {str(e)[:100]}")
+        notify.error(f"Could not load security scan results: {str(e)[:100]}")
         return []
 
+@page_cache.cached("security_scans", ttl=60, scope_arg="project_id_filter")
+async def fetch_scan_results_page(
+    project_id_filter: Optional[str] = None,
+    scan_type_filter: Optional[str] = None,
+    min_severity_filter: Optional[str] = None,
+    sort: str = "-timestamp",
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> Optional[CursorPage[SDKScanResult]]:
+    logger.info(f"Security Hub: Fetching scan results page. Sort: {sort}, Cursor: {cursor}")
+    try:
+        # Backend endpoint: GET /api/forgeiq/security/scan-results?include_findings=false
+        #   Query params: project_id, scan_type, min_severity, sort, limit, cursor
+        def _filter(value: Optional[str]) -> Optional[str]:
+            return value if value and value != "All" else None
+
+        return await client.page_scan_results(
+            project_id=_filter(project_id_filter),
+            scan_type=_filter(scan_type_filter),
+            min_severity=_filter(min_severity_filter),
+            sort=sort,
+            cursor=cursor,
+            page_size=page_size,
+        )
+    except Exception as e:
+        logger.error(f"Security Hub: Error fetching scan results page: {e}", exc_info=True)
+        notify.error(f"Could not load security scan results: {str(e)[:100]}")
+        return None
+
+async def index_scan_findings(scans: List[SDKScanResult]) -> int:
+    # Incremental: the client's FindingsIndex is process-wide and only fetches scans it hasn't seen.
+    try:
+        return await client.index_scan_findings(scans)
+    except Exception as e:
+        logger.error(f"Security Hub: Error indexing scan findings: {e}", exc_info=True)
+        notify.error(f"Could not index findings across scans: {str(e)[:100]}")
+        return 0
+
+def _short_sha(sha: Optional[str]) -> str:
+    return sha[:8] if sha else "N/A"
+
+def _indexed_findings_df(records: List[IndexedFinding], max_rows: int = 500) -> pd.DataFrame:
+    # Columnar like the SDK models' to_frame(): one list per column, no per-row dicts
+    shown = records[:max_rows]
+    return pd.DataFrame({
+        "Severity": [str(r.severity or "N/A") for r in shown],
+        "Rule ID": [r.rule_id or "N/A" for r in shown],
+        "File": [r.file_path or "N/A" for r in shown],
+        "Line": [r.line_number if r.line_number is not None else "-" for r in shown],
+        "Project": [r.project_id or "N/A" for r in shown],
+        "First Seen": [_short_sha(r.first_seen_commit) for r in shown],
+        "Last Seen": [_short_sha(r.last_seen_commit) for r in shown],
+        "Scans": [r.scans for r in shown],
+        "Description": [(r.description or "")[:150] for r in shown],
+    })
+
+@page_cache.cached("security_findings", ttl=300, scope_arg="scan_id") # Findings of a finished scan don't change
+async def fetch_scan_findings(scan_id: str, query: FindingsQuery) -> Optional[FindingsPage]:
+    logger.info(f"Security Hub: Fetching findings for scan {scan_id} ({query})")
+    try:
+        # Backend endpoint: GET /api/forgeiq/security/scan-results/{scan_id}/findings
+        #   Query params: min_severity, rule_id, file_path (prefix), sort, limit (top-N)
+        return await client.query_findings(scan_id, query)
+    except Exception as e:
+        logger.error(f"Security Hub: Error fetching findings for scan {scan_id}: {e}", exc_info=True)
+        notify.error(f"Could not load findings for scan {scan_id}: {str(e)[:100]}")
+        return None
+
 # --- Page Layout & Filters ---
 st.sidebar.subheader("Security Scan Filters")
 
-# TODO: Populate these lists dynamically from backend API calls
-project_options_sec = ["All"] + st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta"])
-scan_type_options = ["All", "SAST_PYTHON_BANDIT", "SCA_PYTHON_PIP_AUDIT", "CONTAINER_IMAGE_TRIVY", "IAC_TFSEC"] # Example scan types
+project_options_sec = filter_options(client, "security/scan-results", "project_id",
+                                     fallback=st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta"]))
+scan_type_options = filter_options(client, "security/scan-results", "scan_type",
+                                   fallback=["SAST_PYTHON_BANDIT", "SCA_PYTHON_PIP_AUDIT", "CONTAINER_IMAGE_TRIVY", "IAC_TFSEC"])
 severity_options = ["All", "CRITICAL", "HIGH", "MEDIUM", "LOW", "INFORMATIONAL"]
 
 if 'sec_project_filter' not in st.session_state: st.session_state.sec_project_filter = "All"
@@ -68,69 +145,139 @@ if 'sec_severity_filter' not in st.session_state: st.session_state.sec_severity_
 st.session_state.sec_project_filter = st.sidebar.selectbox("Project:", options=project_options_sec, key="sb_sec_proj")
 st.session_state.sec_scantype_filter = st.sidebar.selectbox("Scan Type:", options=scan_type_options, key="sb_sec_type")
 st.session_state.sec_severity_filter = st.sidebar.selectbox("Minimum Severity:", options=severity_options, key="sb_sec_sev")
+rule_id_filter = st.sidebar.text_input("Rule ID:", key="sb_sec_rule").strip() or None
+file_path_filter = st.sidebar.text_input("File path prefix:", key="sb_sec_path").strip() or None
+dedupe_findings = st.sidebar.toggle("Deduplicate findings across scans", key="sb_sec_dedupe")
+top_n_findings = int(st.sidebar.number_input("Top findings per scan:", min_value=1, max_value=500, value=10, step=5, key="sb_sec_topn"))
+
+findings_query = FindingsQuery(
+    min_severity=st.session_state.sec_severity_filter,
+    rule_id=rule_id_filter,
+    file_path=file_path_filter,
+    limit=top_n_findings,
+)
 
 if st.sidebar.button("Apply Filters & Refresh Scans", use_container_width=True):
-    st.cache_data.clear()
+    page_cache.invalidate(page_cache.scoped("security_scans", st.session_state.sec_project_filter))
+    page_cache.invalidate("security_findings")
     st.rerun()
 
 # --- Display Scan Results ---
-scan_results = asyncio.run(fetch_security_scan_results(
+# Deduplication indexes the latest scans matching the filters (not just the visible table page)
+scan_results = run_sync(fetch_security_scan_results(
     project_id_filter=st.session_state.sec_project_filter,
     scan_type_filter=st.session_state.sec_scantype_filter,
     min_severity_filter=st.session_state.sec_severity_filter
-))
-
-st.subheader(f"Displaying {len(scan_results)} Security Scan Events")
-
-if not scan_results:
-    st.info("No security scan results match the current filters or failed to load.")
-else:
-    for result_event in scan_results:
-        event_id = result_event.get("triggering_event_id", str(uuid.uuid4()))[-8:]
-        project_id = result_event.get("project_id", "N/A")
-        scan_type = result_event.get("scan_type", "N/A")
-        tool = result_event.get("tool_name", "N/A")
-        status = result_event.get("status", "UNKNOWN")
-        timestamp_str = result_event.get("timestamp", "")
-        findings_list = result_event.get("findings", [])
-        num_findings = len(findings_list)
-
-        ts_display = datetime.datetime.fromisoformat(timestamp_str.replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M') if timestamp_str else "N/A"
-
-        expander_title = f"Scan: **{scan_type}** on **{project_id}** (Tool: {tool}) - Status: **{status}** - Findings: **{num_findings}** - Time: {ts_display}"
-        
-        with st.expander(expander_title):
-            st.markdown(f"**Details for Scan triggered by event {event_id}**")
-            st.caption(f"Commit: {result_event.get('commit_sha', 'N/A')}, Artifact: {result_event.get('artifact_name', 'N/A')}")
-            st.code(result_event.get("summary", "No summary."), language=None)
-
-            if findings_list:
-                st.markdown("##### Findings:")
-                findings_data_for_df = []
-                for finding in findings_list:
-                    findings_data_for_df.append({
-                        "ID": finding.get("finding_id", "N/A")[-12:],
-                        "Severity": finding.get("severity", "N/A"),
-                        "Description": finding.get("description", "N/A")[:150], # Truncate
-                        "File": finding.get("file_path", "N/A"),
-                        "Line": finding.get("line_number", "-"),
-                        "Rule ID": finding.get("rule_id", "N/A"),
-                        "Tool": finding.get("tool_name", "N/A")
-                    })
-                
-                # Apply severity filter for display if a filter is set
-                if st.session_state.sec_severity_filter != "All":
-                    severity_order = {"INFORMATIONAL":0, "LOW":1, "MEDIUM":2, "HIGH":3, "CRITICAL":4}
-                    min_sev_level = severity_order.get(st.session_state.sec_severity_filter, -1)
-                    findings_data_for_df = [
-                        f for f in findings_data_for_df 
-                        if severity_order.get(f["Severity"], -1) >= min_sev_level
-                    ]
-
-                if findings_data_for_df:
-                    st.dataframe(pd.DataFrame(findings_data_for_df), use_container_width=True, hide_index=True)
-                else:
-                    st.caption("No findings match the current severity filter for this scan event.")
-            else:
-                st.caption("No findings reported for this scan event.")
-            st.markdown("---")
+)) if dedupe_findings else []
+
+if dedupe_findings and scan_results:
+    st.subheader("Unique Findings Across Scans")
+    with st.spinner("Indexing findings of new scans..."):
+        run_sync(index_scan_findings(scan_results))
+    findings_index = client.findings_index
+    project_scope = None if st.session_state.sec_project_filter == "All" else st.session_state.sec_project_filter
+    type_scope = None if st.session_state.sec_scantype_filter == "All" else st.session_state.sec_scantype_filter
+    unique_open = findings_index.findings(project_id=project_scope, scan_type=type_scope,
+                                          min_severity=st.session_state.sec_severity_filter, open_only=True)
+    index_stats = findings_index.stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Open Unique Findings", len(unique_open))
+    col2.metric("Reported Occurrences", index_stats["occurrences"])
+    col3.metric("Scans Indexed", index_stats["scans"])
+
+    streams = [s for s in findings_index.streams()
+               if (project_scope is None or s["project_id"] == project_scope)
+               and (type_scope is None or s["scan_type"] == type_scope)]
+    if streams:
+        st.markdown("##### Changes Since Previous Scan (per project and scan type)")
+        st.dataframe(pd.DataFrame(streams), use_container_width=True, hide_index=True)
+        stream_labels = {f"{s['project_id']} / {s['scan_type']}": (s["project_id"], s["scan_type"]) for s in streams}
+        selected_stream = st.selectbox("Show new/fixed findings for:", options=list(stream_labels), key="sec_stream")
+        new_col, fixed_col = st.columns(2)
+        with new_col:
+            new_findings = findings_index.new_since_last_scan(*stream_labels[selected_stream])
+            st.markdown(f"**🆕 New since last scan: {len(new_findings)}**")
+            if new_findings:
+                st.dataframe(_indexed_findings_df(new_findings), use_container_width=True, hide_index=True)
+        with fixed_col:
+            fixed_findings = findings_index.fixed_since_last_scan(*stream_labels[selected_stream])
+            st.markdown(f"**✅ Fixed since last scan: {len(fixed_findings)}**")
+            if fixed_findings:
+                st.dataframe(_indexed_findings_df(fixed_findings), use_container_width=True, hide_index=True)
+
+    if unique_open:
+        st.markdown("##### Open Findings (deduplicated)")
+        st.dataframe(_indexed_findings_df(unique_open), use_container_width=True, hide_index=True)
+        if len(unique_open) > 500:
+            st.caption(f"Showing the 500 most severe of {len(unique_open)} open findings.")
+    st.markdown("---")
+
+SCAN_SORTS = {"Newest first": "-timestamp", "Oldest first": "timestamp", "Most findings": "-findings_count,-timestamp",
+              "Project": "project_id,-timestamp", "Scan type": "scan_type,-timestamp"}
+
+def scans_frame(scans: List[SDKScanResult]) -> pd.DataFrame:
+    frame = SDKScanResult.to_frame(scans, columns=["timestamp", "project_id", "scan_type", "tool_name", "status",
+                                                   "findings_count", "commit_sha", "artifact_name", "scan_id"])
+    table = pd.DataFrame({
+        "Time": frame["timestamp"].dt.strftime('%Y-%m-%d %H:%M').fillna("N/A"),
+        "Project": frame["project_id"].fillna("N/A"),
+        "Scan Type": frame["scan_type"].fillna("N/A"),
+        "Tool": frame["tool_name"].fillna("N/A"),
+        "Status": frame["status"].fillna("UNKNOWN"),
+        "Findings": frame["findings_count"],
+    })
+    if st.session_state.sec_severity_filter != "All":
+        table[f"≥ {st.session_state.sec_severity_filter}"] = [scan.count_at_least(st.session_state.sec_severity_filter) for scan in scans]
+    table["Commit"] = frame["commit_sha"].str[:8].fillna("N/A")
+    table["Artifact"] = frame["artifact_name"].fillna("N/A")
+    table["Scan ID"] = frame["scan_id"].str[-8:]
+    return table
+
+scan_filters = (st.session_state.sec_project_filter, st.session_state.sec_scantype_filter, st.session_state.sec_severity_filter)
+
+st.subheader("Security Scan Events")
+scans_table = paged_table(
+    "security_scans",
+    lambda sort, cursor, page_size: fetch_scan_results_page(*scan_filters, sort=sort, cursor=cursor, page_size=page_size),
+    scans_frame,
+    SCAN_SORTS,
+    filters=scan_filters,
+    noun="scans",
+)
+
+if not scans_table.items and not scans_table.failed:
+    st.info("No security scan results match the current filters.")
+elif scans_table.selected is None:
+    st.caption("Select a row for the scan's details and top findings.")
+
+scan = scans_table.selected
+if scan is not None:
+    event_id = (scan.get("triggering_event_id") or scan.scan_id)[-8:]
+    matching = scan.count_at_least(st.session_state.sec_severity_filter)
+    with st.container(border=True):
+        st.markdown(f"**{scan.scan_type or 'N/A'}** on **{scan.project_id or 'N/A'}** (Tool: {scan.tool_name or 'N/A'}) - "
+                    f"Status: **{scan.status or 'UNKNOWN'}** · Scan triggered by event {event_id}")
+        st.caption(f"Commit: {scan.commit_sha or 'N/A'}, Artifact: {scan.artifact_name or 'N/A'}")
+        st.code(scan.summary or "No summary.", language=None)
+        if scan.severity_counts:
+            st.caption(" · ".join(f"{sev}: {n}" for sev, n in sorted(scan.severity_counts.items())))
+
+        if not scan.findings_count:
+            st.caption("No findings reported for this scan event.")
+        elif not matching:
+            st.caption("No findings match the current severity filter for this scan event.")
+        else:
+            page = run_sync(fetch_scan_findings(scan.scan_id, findings_query))
+            if page is not None and page.findings:
+                st.markdown(f"##### Top Findings ({len(page.findings)} of {page.total} matching):")
+                findings_df = SDKSecurityFinding.to_frame(
+                    page.findings, columns=["finding_id", "severity", "description", "file_path",
+                                            "line_number", "rule_id", "tool_name"])
+                findings_df["finding_id"] = findings_df["finding_id"].str[-12:]
+                findings_df["description"] = findings_df["description"].str[:150] # Truncate
+                findings_df.columns = ["ID", "Severity", "Description", "File", "Line", "Rule ID", "Tool"]
+                st.dataframe(findings_df, use_container_width=True, hide_index=True)
+            elif page is not None:
+                st.caption("No findings match the current filters for this scan event.")
+
+end_page()
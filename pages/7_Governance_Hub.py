@@ -2,26 +2,35 @@
 # 📁 pages/7_Governance_Hub.py
 # =====================================
 import streamlit as st
-import asyncio
 import logging
-import pandas as pd
 import datetime
+import os
 from typing import List, Dict, Any, Optional
 
+from sdk.audit_store import AuditSyncResult
+from sdk.models import SDKAuditLogEntry
+from ui.cache import page_cache
+from ui.lazy import is_open, keep_widget_state, lazy_tabs, load, load_many
+from ui.runtime import get_audit_store, notify
+from ui.tracing import end_page, trace_page
+
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
     st.error("SDK client not initialized. Please go to the main Dashboard page first.")
     st.stop()
 client = st.session_state.forgeiq_sdk_client
 logger = logging.getLogger(__name__)
+audit_store = get_audit_store(client) # Local SQLite copy of the audit trail, shared by all sessions
+AUDIT_HISTORY_DAYS = int(os.getenv("FORGEIQ_UI_AUDIT_HISTORY_DAYS", "180"))
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="Governance Hub - ForgeIQ", layout="wide")
+trace_page("Governance Hub")
 st.title("📜 Governance Hub")
 st.markdown("Monitor SLA violations, governance alerts, and access audit trails.")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=60)
+@page_cache.cached("governance_alerts", ttl=60)
 async def fetch_governance_alerts_data(
     alert_type_filter: Optional[str] = None,
     min_severity_filter: Optional[str] = None,
@@ -44,121 +53,199 @@ async def fetch_governance_alerts_data(
         return alerts_list
     except Exception as e:
         logger.error(f"Governance Hub: Error fetching alerts: {e}", exc_info=True)
-        st.error(f"Could not load governance alerts: {str(e)[:100]}")
+        notify.error(f"Could not load governance alerts: {str(e)[:100]}")
         return []
 
-@st.cache_data(ttl=300) # Cache audit logs longer, or don't cache if they are too dynamic/large for direct display
-async def fetch_audit_logs_data(
-    project_id_filter: Optional[str] = None,
-    source_event_type_filter: Optional[str] = None,
-    limit: int = 100 # Audit logs can be numerous
-) -> List[Dict[str, Any]]: # List of AuditLogEntry-like dicts
-    logger.info(f"Governance Hub: Fetching audit logs. Project: {project_id_filter}, Event Type: {source_event_type_filter}")
+@page_cache.cached("audit_sync", ttl=60) # At most one incremental sync per minute; queries read the local store
+async def sync_audit_log_store() -> Optional[AuditSyncResult]:
+    logger.info("Governance Hub: Syncing local audit log store.")
     try:
-        # CONCEPTUAL SDK/API Call: client.governance.list_audit_logs(...)
         # Backend endpoint: GET /api/forgeiq/governance/audit-logs
         #   Query params: project_id, source_event_type, limit, date_start, date_end, user_actor
-        #   Returns: {"audit_logs": [audit_log_entry_1, ...]}
-        
-        params = {"limit": limit}
-        if project_id_filter and project_id_filter != "All": params["project_id"] = project_id_filter
-        if source_event_type_filter and source_event_type_filter != "All": params["source_event_type"] = source_event_type_filter
-            
-        response = await client._request("GET", "/api/forgeiq/governance/audit-logs", params=params) # NEW BACKEND ENDPOINT
-        logs_list = response.get("audit_logs", [])
-        logger.info(f"Governance Hub: Fetched {len(logs_list)} audit logs.")
-        return logs_list
+        #   Returns: {"audit_logs": [audit_log_entry_1, ...], "next_cursor": ...}
+        # Only entries newer than the store's newest are requested; an empty store backfills AUDIT_HISTORY_DAYS.
+        return await client.sync_audit_logs(audit_store, history_days=AUDIT_HISTORY_DAYS)
     except Exception as e:
-        logger.error(f"Governance Hub: Error fetching audit logs: {e}", exc_info=True)
-        st.error(f"Could not load audit logs: {str(e)[:100]}")
-        return []
+        logger.error(f"Governance Hub: Error syncing audit logs: {e}", exc_info=True)
+        notify.error(f"Could not sync audit logs (showing local history): {str(e)[:100]}")
+        return None
+
+@page_cache.cached("alert_sync", ttl=60)
+async def sync_alert_store() -> Optional[AuditSyncResult]:
+    logger.info("Governance Hub: Syncing local governance alert store.")
+    try:
+        # Backend endpoint: GET /api/forgeiq/governance/alerts (date_start, cursor), indexed for search as it lands
+        return await client.sync_governance_alerts(audit_store, history_days=AUDIT_HISTORY_DAYS)
+    except Exception as e:
+        logger.error(f"Governance Hub: Error syncing alerts: {e}", exc_info=True)
+        notify.error(f"Could not sync alerts (searching local history): {str(e)[:100]}")
+        return None
 
 # --- Page Layout & Filters ---
-tab1, tab2 = st.tabs(["🚨 Alerts (SLA & Policy)", "🗒️ Audit Trail"])
+# Only the selected tab runs: the audit log sync and search index load when their tab is opened
+keep_widget_state("gov_alert_type", "gov_min_sev", "audit_proj", "audit_event_type", "audit_actor", "audit_dates",
+                  "audit_page_size", "gov_search_text", "gov_search_sources", "gov_search_proj", "gov_search_order",
+                  "gov_search_days")
+tab1, tab2, tab3 = lazy_tabs(["🚨 Alerts (SLA & Policy)", "🗒️ Audit Trail", "🔎 Search"], key="gov_tab")
 
 with tab1:
-    st.subheader("SLA Violations & Governance Alerts")
-    col_f1, col_f2, col_f3 = st.columns(3)
-    alert_type_options = ["All", "SLAViolationEvent", "GovernanceAlertEvent"] # From event_type fields
-    severity_options_gov = ["All", "CRITICAL", "HIGH", "MEDIUM", "LOW", "INFORMATIONAL"]
-
-    with col_f1:
-        alert_type_filter = st.selectbox("Filter by Alert Type:", options=alert_type_options, key="gov_alert_type")
-    with col_f2:
-        min_severity_filter = st.selectbox("Minimum Severity:", options=severity_options_gov, key="gov_min_sev")
-    with col_f3:
-        if st.button("Refresh Alerts", key="refresh_gov_alerts", use_container_width=True):
-            # fetch_governance_alerts_data.clear() # More specific
-            st.cache_data.clear()
-            st.rerun()
+    if is_open(tab1):
+        st.subheader("SLA Violations & Governance Alerts")
+        col_f1, col_f2, col_f3 = st.columns(3)
+        alert_type_options = ["All", "SLAViolationEvent", "GovernanceAlertEvent"] # From event_type fields
+        severity_options_gov = ["All", "CRITICAL", "HIGH", "MEDIUM", "LOW", "INFORMATIONAL"]
+
+        with col_f1:
+            alert_type_filter = st.selectbox("Filter by Alert Type:", options=alert_type_options, key="gov_alert_type")
+        with col_f2:
+            min_severity_filter = st.selectbox("Minimum Severity:", options=severity_options_gov, key="gov_min_sev")
+        with col_f3:
+            if st.button("Refresh Alerts", key="refresh_gov_alerts", use_container_width=True):
+                page_cache.invalidate("governance_alerts")
+                st.rerun()
     
-    alerts_data = asyncio.run(fetch_governance_alerts_data(
-        alert_type_filter=alert_type_filter if alert_type_filter != "All" else None,
-        min_severity_filter=min_severity_filter if min_severity_filter != "All" else None
-    ))
-
-    if not alerts_data:
-        st.info("No governance alerts match the current filters.")
-    else:
-        for alert in alerts_data:
-            alert_id = alert.get("alert_id", "N/A")[-12:]
-            alert_type = alert.get("event_type", alert.get("alert_type", "N/A")) # event_type for SLAViolation, alert_type for GovernanceAlert
-            severity = alert.get("severity", "N/A")
-            timestamp_str = alert.get("timestamp", "")
-            ts_display = datetime.datetime.fromisoformat(timestamp_str.replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M') if timestamp_str else "N/A"
-
-            color = "blue"
-            if severity == "CRITICAL": color = "red"
-            elif severity == "HIGH": color = "orange"
-            elif severity == "MEDIUM": color = "orange" # Streamlit orange is more like warning
+        alerts_data = load("alerts", lambda: fetch_governance_alerts_data(
+            alert_type_filter=alert_type_filter if alert_type_filter != "All" else None,
+            min_severity_filter=min_severity_filter if min_severity_filter != "All" else None
+        ))
+
+        if not alerts_data:
+            st.info("No governance alerts match the current filters.")
+        else:
+            for alert in alerts_data:
+                alert_id = alert.get("alert_id", "N/A")[-12:]
+                alert_type = alert.get("event_type", alert.get("alert_type", "N/A")) # event_type for SLAViolation, alert_type for GovernanceAlert
+                severity = alert.get("severity", "N/A")
+                timestamp_str = alert.get("timestamp", "")
+                ts_display = datetime.datetime.fromisoformat(timestamp_str.replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M') if timestamp_str else "N/A"
+
+                color = "blue"
+                if severity == "CRITICAL": color = "red"
+                elif severity == "HIGH": color = "orange"
+                elif severity == "MEDIUM": color = "orange" # Streamlit orange is more like warning
             
-            with st.expander(f":{color}[{severity}] **{alert_type}** (ID: ...{alert_id}) - {ts_display}"):
-                st.write(f"**Description:** {alert.get('description', alert.get('details', 'No details.'))}")
-                if alert_type == "SLAViolationEvent":
-                    st.caption(f"SLA Name: {alert.get('sla_name')}, Metric: {alert.get('metric_name')}, Observed: {alert.get('observed_value')}, Threshold: {alert.get('threshold_value')}")
-                st.write("**Context/Details:**")
-                st.json(alert.get("context_summary") or alert.get("event_details") or {"raw": alert}, expanded=False)
-            st.divider()
+                with st.expander(f":{color}[{severity}] **{alert_type}** (ID: ...{alert_id}) - {ts_display}"):
+                    st.write(f"**Description:** {alert.get('description', alert.get('details', 'No details.'))}")
+                    if alert_type == "SLAViolationEvent":
+                        st.caption(f"SLA Name: {alert.get('sla_name')}, Metric: {alert.get('metric_name')}, Observed: {alert.get('observed_value')}, Threshold: {alert.get('threshold_value')}")
+                    st.write("**Context/Details:**")
+                    st.json(alert.get("context_summary") or alert.get("event_details") or {"raw": alert}, expanded=False)
+                st.divider()
 
 with tab2:
-    st.subheader("Audit Trail")
-    col_a1, col_a2, col_a3 = st.columns(3)
-    # TODO: Populate project_options_audit dynamically
-    project_options_audit = ["All"] + st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta"]) 
-    # TODO: Populate event_type_options_audit dynamically from known event types
-    event_type_options_audit = ["All", "NewCommitEvent", "DagExecutionStatusEvent", "DeploymentStatusEvent", "SecurityScanResultEvent"]
-
-    with col_a1:
-        audit_project_filter = st.selectbox("Filter by Project:", options=project_options_audit, key="audit_proj")
-    with col_a2:
-        audit_event_type_filter = st.selectbox("Filter by Source Event Type:", options=event_type_options_audit, key="audit_event_type")
-    with col_a3:
-        if st.button("Refresh Audit Logs", key="refresh_audit_logs", use_container_width=True):
-            # fetch_audit_logs_data.clear()
-            st.cache_data.clear()
-            st.rerun()
-            
-    audit_log_entries = asyncio.run(fetch_audit_logs_data(
-        project_id_filter=audit_project_filter if audit_project_filter != "All" else None,
-        source_event_type_filter=audit_event_type_filter if audit_event_type_filter != "All" else None,
-        limit=50 # Limit initial display
-    ))
-
-    if not audit_log_entries:
-        st.info("No audit log entries match the current filters.")
-    else:
-        audit_df_data = []
-        for entry in audit_log_entries:
-            audit_df_data.append({
-                "Timestamp": datetime.datetime.fromisoformat(entry['timestamp'].replace("Z","+00:00")).strftime('%Y-%m-%d %H:%M:%S') if entry.get('timestamp') else 'N/A',
-                "Source Event Type": entry.get("source_event_type"),
-                "Project ID": entry.get("project_id", "-"),
-                "Actor": entry.get("user_or_actor", "-"),
-                "Action": entry.get("action_description", "")[:100], # Truncate
-                "Audit ID": entry.get("audit_id", "N/A")[-12:]
-            })
-        if audit_df_data:
-            st.dataframe(pd.DataFrame(audit_df_data), use_container_width=True, hide_index=True)
-            # TODO: Add pagination for audit logs
+    if is_open(tab2):
+        st.subheader("Audit Trail")
+        sync_result = load("audit logs", sync_audit_log_store)
+        store_stats = audit_store.stats()
+
+        col_a1, col_a2, col_a3, col_a4 = st.columns(4)
+        project_options_audit = ["All"] + (audit_store.distinct("project_id") or st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta"]))
+        event_type_options_audit = ["All"] + (audit_store.distinct("source_event_type") or ["NewCommitEvent", "DagExecutionStatusEvent", "DeploymentStatusEvent", "SecurityScanResultEvent"])
+        actor_options_audit = ["All"] + audit_store.distinct("actor")
+
+        with col_a1:
+            audit_project_filter = st.selectbox("Filter by Project:", options=project_options_audit, key="audit_proj")
+        with col_a2:
+            audit_event_type_filter = st.selectbox("Filter by Source Event Type:", options=event_type_options_audit, key="audit_event_type")
+        with col_a3:
+            audit_actor_filter = st.selectbox("Filter by Actor:", options=actor_options_audit, key="audit_actor")
+        with col_a4:
+            today = datetime.date.today()
+            audit_dates = st.date_input("Date range:", value=(today - datetime.timedelta(days=30), today), key="audit_dates")
+
+        col_b1, col_b2 = st.columns([1, 3])
+        with col_b1:
+            audit_page_size = st.selectbox("Rows per page:", options=[50, 100, 250, 500], key="audit_page_size")
+        with col_b2:
+            if st.button("Sync Audit Logs Now", key="refresh_audit_logs", use_container_width=True):
+                page_cache.invalidate("audit_sync")
+                st.rerun()
+
+        date_start = audit_dates[0] if audit_dates else None
+        date_end = audit_dates[1] + datetime.timedelta(days=1) if len(audit_dates) > 1 else None # Inclusive end date
+        audit_filters = dict(
+            project_id=audit_project_filter if audit_project_filter != "All" else None,
+            source_event_type=audit_event_type_filter if audit_event_type_filter != "All" else None,
+            actor=audit_actor_filter if audit_actor_filter != "All" else None,
+            date_start=date_start,
+            date_end=date_end,
+        )
+
+        # Keyset paging: a stack of cursors, reset whenever the filters change
+        filter_key = (tuple(audit_filters.items()), audit_page_size)
+        if st.session_state.get("audit_filter_key") != filter_key:
+            st.session_state.audit_filter_key = filter_key
+            st.session_state.audit_cursors = [None]
+        audit_page = audit_store.query(**audit_filters, limit=audit_page_size, cursor=st.session_state.audit_cursors[-1])
+        matching_count = audit_store.count(**audit_filters)
+
+        st.caption(
+            f"{matching_count:,}{'+' if matching_count >= 100_000 else ''} matching of {store_stats['entries']:,} entries stored locally "
+            f"(since {store_stats['oldest'][:10] if store_stats['oldest'] else 'N/A'}) · page {len(st.session_state.audit_cursors)} "
+            f"in {audit_page.elapsed_ms:.1f} ms"
+            + (f" · last sync added {sync_result.inserted:,}" if sync_result else "")
+        )
+
+        if not audit_page.entries:
+            st.info("No audit log entries match the current filters.")
         else:
-            st.info("Processed audit logs resulted in empty display.")
+            audit_df = SDKAuditLogEntry.to_frame(audit_page.entries, columns=[
+                "timestamp", "source_event_type", "project_id", "user_or_actor", "action_description", "audit_id"])
+            audit_df["timestamp"] = audit_df["timestamp"].dt.strftime('%Y-%m-%d %H:%M:%S')
+            audit_df["action_description"] = audit_df["action_description"].str[:100] # Truncate
+            audit_df["audit_id"] = audit_df["audit_id"].str[-12:]
+            audit_df.columns = ["Timestamp", "Source Event Type", "Project ID", "Actor", "Action", "Audit ID"]
+            st.dataframe(audit_df, use_container_width=True, hide_index=True)
+
+        nav_prev, nav_next = st.columns(2)
+        with nav_prev:
+            if st.button("◀ Newer", key="audit_newer", disabled=len(st.session_state.audit_cursors) <= 1, use_container_width=True):
+                st.session_state.audit_cursors.pop()
+                st.rerun()
+        with nav_next:
+            if st.button("Older ▶", key="audit_older", disabled=audit_page.next_cursor is None, use_container_width=True):
+                st.session_state.audit_cursors.append(audit_page.next_cursor)
+                st.rerun()
+
+with tab3:
+    if is_open(tab3):
+        st.subheader("Search Audit Logs & Alerts")
+        load_many("search index", sync_audit_log_store, sync_alert_store)
+        search_text = st.text_input("Search:", key="gov_search_text",
+                                    placeholder='e.g. approved deploy_0042   "change ticket"   actor:alice   roll*   -ci-bot')
+        st.caption('Words must all match. Use "quotes" for phrases, prefix*, -word to exclude, OR between alternatives, '
+                   "and actor: / project: / type: / action: / details: to search one field.")
+        col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+        with col_s1:
+            search_sources = st.multiselect("Search in:", options=["audit", "alerts"], default=["audit", "alerts"],
+                                            format_func=lambda source: {"audit": "Audit logs", "alerts": "Alerts"}[source],
+                                            key="gov_search_sources")
+        with col_s2:
+            search_project = st.selectbox("Project:", options=["All"] + audit_store.distinct("project_id"), key="gov_search_proj")
+        with col_s3:
+            search_order = st.radio("Sort by:", options=["relevance", "newest"], horizontal=True, key="gov_search_order")
+        with col_s4:
+            search_days = st.selectbox("Time range:", options=[7, 30, 90, 365, None], index=3, key="gov_search_days",
+                                       format_func=lambda days: f"Last {days} days" if days else "All stored history")
+
+        if search_text.strip():
+            search_result = audit_store.search(
+                search_text, sources=search_sources, project_id=search_project, order=search_order, limit=100,
+                date_start=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=search_days) if search_days else None,
+                highlight=("**", "**"))
+            st.caption(f"{len(search_result.hits)} results in {search_result.elapsed_ms:.1f} ms")
+            if not search_result.hits:
+                st.info("No audit log entries or alerts match this search.")
+            for hit in search_result.hits:
+                ts_display = hit.timestamp.strftime('%Y-%m-%d %H:%M')
+                if hit.source == "audit":
+                    entry = hit.record
+                    st.markdown(f"🗒️ `{ts_display}` **{entry.user_or_actor or 'N/A'}** · {entry.project_id or 'N/A'} · "
+                                f"{entry.source_event_type or 'N/A'}  \n{hit.snippet}")
+                else:
+                    alert = hit.record
+                    st.markdown(f"🚨 `{ts_display}` **{alert.get('severity', 'N/A')}** "
+                                f"{alert.get('event_type', alert.get('alert_type', 'N/A'))} · {alert.get('project_id') or 'N/A'}  \n"
+                                f"{hit.snippet}")
+
+end_page()
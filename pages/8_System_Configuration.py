@@ -2,9 +2,17 @@
 # 📁 pages/8_System_Configuration.py
 # ============================================
 import streamlit as st
-import asyncio
+import json
 import logging
-from typing import Dict, Any, List
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+from sdk.config import ConfigChange, ConfigResolver
+from ui.cache import page_cache
+from ui.lazy import is_open, lazy_expander, load
+from ui.live_state import live_state
+from ui.runtime import get_tracer, notify, run_sync
+from ui.tracing import end_page, trace_page
 
 # --- SDK Client Access & Logger ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
@@ -15,33 +23,24 @@ logger = logging.getLogger(__name__)
 # --- End SDK Client Access & Logger ---
 
 st.set_page_config(page_title="System Configuration - ForgeIQ", layout="wide")
+trace_page("System Configuration")
 st.title("⚙️ System Configuration Viewer")
 st.markdown("View key configurations of the ForgeIQ system. (Read-only)")
 
 # --- Data Fetching Functions ---
-@st.cache_data(ttl=300) # Cache config longer
-async def fetch_build_system_config_data(project_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    logger.info(f"SysConfig Page: Fetching build system config (Project: {project_id or 'Global'})")
+@page_cache.cached("build_config", ttl=300) # Cache config longer
+async def fetch_build_config_resolver() -> Optional[ConfigResolver]:
+    logger.info("SysConfig Page: Fetching build system config")
     try:
-        # Uses SDK method defined in sdk/build_system.py
-        # This calls backend endpoint: GET /api/forgeiq/projects/{project_id}/build-config
-        # or a global one: GET /api/forgeiq/config/build-system (if project_id is None)
-        if project_id and project_id != "Global (Effective)":
-            # Assuming SDK has client.build_system.get_project_configuration(project_id)
-            # This endpoint was defined in ForgeIQ-backend
-            response = await client.build_system.get_project_configuration(project_id=project_id) # type: ignore
-            return response.get("configuration") if response else None
-        else:
-            # CONCEPTUAL SDK/API: client.config.get_full_build_system_config()
-            # Backend endpoint: GET /api/forgeiq/config/build-system (returns entire BuildSystemConfig)
-            response = await client._request("GET", "/api/forgeiq/config/build-system") # NEW BACKEND ENDPOINT
-            return response # Expects the full BuildSystemConfig structure
+        # One fetch of the full BuildSystemConfig (GET /api/forgeiq/config/build-system); project
+        # overrides are merged onto the global defaults client-side and memoized per content hash.
+        return await client.load_build_config()
     except Exception as e:
         logger.error(f"SysConfig Page: Error fetching build system config: {e}", exc_info=True)
-        st.error(f"Could not load build system configuration: {str(e)[:100]}")
+        notify.error(f"Could not load build system configuration: {str(e)[:100]}")
         return None
 
-@st.cache_data(ttl=60)
+@page_cache.cached("agents:registry_summary", ttl=60) # Under "agents" so an agents refresh covers it
 async def fetch_agent_registry_summary_data() -> Dict[str, Any]:
     logger.info("SysConfig Page: Fetching agent registry summary...")
     try:
@@ -56,61 +55,148 @@ async def fetch_agent_registry_summary_data() -> Dict[str, Any]:
         return summary
     except Exception as e:
         logger.error(f"SysConfig Page: Error fetching agent registry summary: {e}", exc_info=True)
-        st.error(f"Could not load agent registry summary: {str(e)[:100]}")
+        notify.error(f"Could not load agent registry summary: {str(e)[:100]}")
         return {}
 
 # --- Page Layout & Display ---
+GLOBAL_LABEL = "Global (Defaults)"
+DIFF_ROW_LIMIT = 2000
+
+
+def changes_frame(changes: List[ConfigChange]) -> pd.DataFrame:
+    shorten = lambda value: "" if value is None else json.dumps(value, default=str)[:200]  # noqa: E731
+    return pd.DataFrame({
+        "Path": [c.path for c in changes],
+        "Change": [c.kind for c in changes],
+        "Old": [shorten(c.old) for c in changes],
+        "New": [shorten(c.new) for c in changes],
+    })
+
+
+def show_changes(changes: List[ConfigChange], empty_message: str) -> None:
+    if not changes:
+        st.caption(empty_message)
+        return
+    st.caption(f"{len(changes):,} difference(s)" + (f" (first {DIFF_ROW_LIMIT:,} shown)" if len(changes) >= DIFF_ROW_LIMIT else ""))
+    st.dataframe(changes_frame(changes), use_container_width=True, hide_index=True, height=min(38 * len(changes) + 40, 500))
+
+
 st.sidebar.subheader("Config View Options")
-# TODO: Populate project_list_options from an API call
-project_options_config = ["Global (Effective)"] + st.session_state.get("project_ids_for_filtering", ["project_alpha", "project_beta"]) 
-selected_project_for_config = st.sidebar.selectbox("View Config For Project:", options=project_options_config, key="sb_cfg_proj")
+config_resolver = run_sync(fetch_build_config_resolver())
+config_projects = config_resolver.project_ids() if config_resolver else []
+selected_project_for_config = st.sidebar.selectbox("View Config For Project:", options=[GLOBAL_LABEL] + config_projects, key="sb_cfg_proj")
+project_id_arg = None if selected_project_for_config == GLOBAL_LABEL else selected_project_for_config
 
 if st.sidebar.button("Refresh Configurations", use_container_width=True):
-    st.cache_data.clear()
+    page_cache.invalidate("build_config")
+    page_cache.invalidate("agents:registry_summary")
     st.rerun()
 
 # Build System Configuration
 st.header("Build System Configuration")
-project_id_arg = None if selected_project_for_config == "Global (Effective)" else selected_project_for_config
-build_config_data = asyncio.run(fetch_build_system_config_data(project_id=project_id_arg))
 
-if build_config_data:
+if config_resolver and config_resolver.version:
+    versions = config_resolver.versions()
+    st.caption(f"Version `{versions[0].hash[:10]}` · {versions[0].projects} project(s) · "
+               f"loaded {versions[0].loaded_at.strftime('%Y-%m-%d %H:%M:%S %Z')}")
     if project_id_arg:
         st.markdown(f"#### Effective Configuration for Project: `{project_id_arg}`")
-        st.caption("Shows project-specific overrides merged with global defaults where applicable.")
+        st.caption("Project-specific overrides merged onto the global defaults (resolved in the UI).")
+        st.json(config_resolver.effective(project_id_arg), expanded=False)
+        with st.expander("Overrides vs. Global Defaults", expanded=True):
+            show_changes(config_resolver.diff_projects(None, project_id_arg, limit=DIFF_ROW_LIMIT),
+                         "This project uses the global defaults unchanged.")
     else:
         st.markdown(f"#### Global Build System Configuration")
-    
-    # Displaying parts of the config. Assumes structure from core.build_system_config.py
-    if project_id_arg: # Displaying specific project config
-         st.json(build_config_data, expanded=False)
-    else: # Displaying global config (which contains projects dict)
+        defaults = config_resolver.defaults()
         st.subheader("Global DAG Rules")
-        st.json(build_config_data.get("global_dag_rules", {}))
+        st.json(defaults.get("dag_rules", {}), expanded=False)
         st.subheader("Global Task Weights")
-        st.json(build_config_data.get("global_task_weights", {}))
+        st.json(defaults.get("task_weights", {}), expanded=False)
         st.subheader("Global Clearance Policies")
-        st.json(build_config_data.get("global_clearance_policies", {}))
-        
-        with st.expander("View All Project-Specific Configs (within Global View)", expanded=False):
-            st.json(build_config_data.get("projects", {}))
+        st.json(defaults.get("clearance_policies", {}))
+
+        overrides_section = lazy_expander(f"Project Overrides ({len(config_projects)} projects)", key="cfg_overrides_expander")
+        with overrides_section:
+            if is_open(overrides_section):
+                st.dataframe(pd.DataFrame({
+                    "Project": config_projects,
+                    "Overridden Settings": [", ".join(sorted(config_resolver.overrides(p))) for p in config_projects],
+                }), use_container_width=True, hide_index=True)
+
+    st.subheader("Compare")
+    compare_cols = st.columns(2)
+    with compare_cols[0]:
+        compare_with = st.selectbox("Compare with project:", options=["—", GLOBAL_LABEL] + config_projects, key="sb_cfg_compare")
+    with compare_cols[1]:
+        older_versions = {f"{v.hash[:10]} ({v.loaded_at.strftime('%H:%M:%S')})": v.hash for v in versions[1:]}
+        compare_version = st.selectbox("Compare with earlier version:", options=["—"] + list(older_versions),
+                                       key="sb_cfg_version", disabled=not older_versions,
+                                       help="Versions seen by this dashboard process since it started.")
+    if compare_with != "—":
+        other = None if compare_with == GLOBAL_LABEL else compare_with
+        st.markdown(f"##### `{selected_project_for_config}` → `{compare_with}`")
+        show_changes(config_resolver.diff_projects(project_id_arg, other, limit=DIFF_ROW_LIMIT), "No differences.")
+    if compare_version != "—":
+        st.markdown(f"##### Changes since `{compare_version}`" + (f" for `{project_id_arg}`" if project_id_arg else ""))
+        show_changes(config_resolver.diff_versions(older_versions[compare_version], project_id=project_id_arg,
+                                                   limit=DIFF_ROW_LIMIT), "No changes.")
 else:
     st.warning("Could not load build system configuration.")
 
 st.markdown("---")
 
-# Agent Registry Summary
-st.header("Agent Registry Summary")
-agent_summary_data = asyncio.run(fetch_agent_registry_summary_data())
-if agent_summary_data:
-    st.metric("Total Registered Agents", agent_summary_data.get("total_registered", "N/A"))
-    st.write("Agent Types Registered:")
-    if agent_summary_data.get("types"):
-        st.json(agent_summary_data.get("types"))
-    else:
-        st.caption("No agent type data available.")
-    st.link_button("Go to Full Agent Status Page ➔", "/5_Agents_Status") # Assumes page filename
-else:
-    st.warning("Could not load agent registry summary.")
+# Agent Registry Summary (fetched only while the expander is open)
+agents_section = lazy_expander("🤖 Agent Registry Summary", key="cfg_agents_expander")
+with agents_section:
+    if is_open(agents_section):
+        agent_summary_data = load("agent registry summary", fetch_agent_registry_summary_data)
+        if agent_summary_data:
+            st.metric("Total Registered Agents", agent_summary_data.get("total_registered", "N/A"))
+            st.write("Agent Types Registered:")
+            if agent_summary_data.get("types"):
+                st.json(agent_summary_data.get("types"))
+            else:
+                st.caption("No agent type data available.")
+            st.link_button("Go to Full Agent Status Page ➔", "/5_Agents_Status") # Assumes page filename
+        else:
+            st.warning("Could not load agent registry summary.")
+
+# UI data cache (shared by all pages in this process)
+with st.expander("UI Data Cache Metrics", expanded=False):
+    cache_stats = page_cache.stats()
+    cols_cache = st.columns(4)
+    cols_cache[0].metric("Cached Entries", cache_stats["entries"])
+    cols_cache[1].metric("Hit Ratio", f"{cache_stats['totals']['hit_ratio']:.0%}")
+    cols_cache[2].metric("Coalesced Requests", cache_stats["totals"]["coalesced"])
+    cols_cache[3].metric("Evictions", cache_stats["totals"]["evictions"])
+    st.json(cache_stats["namespaces"], expanded=False)
+    realtime = live_state.stats()
+    st.caption(f"Realtime push: {realtime['state']} · {realtime['events_applied']} events applied")
+    tracing = get_tracer().stats()
+    st.caption(f"Tracing: {', '.join(tracing['exporters'])} · {tracing['spans_exported']} spans exported"
+               if tracing["enabled"] else "Tracing: off (set FORGEIQ_UI_TRACE=console, file[:path] or otlp[:url])")
+
+# SDK request resilience (retries, hedging, circuit breakers)
+if hasattr(client, "resilience_stats"):
+    with st.expander("SDK Request Resilience", expanded=False):
+        resilience = client.resilience_stats()
+        if resilience:
+            cols_res = st.columns(4)
+            cols_res[0].metric("Retries", resilience["retries"])
+            cols_res[1].metric("Hedges Sent / Won", f"{resilience['hedges_sent']} / {resilience['hedges_won']}")
+            cols_res[2].metric("Breakers Opened", resilience["breaker_opened"])
+            cols_res[3].metric("Stale Responses Served", resilience["stale_served"])
+            open_breakers = [group for group, state in resilience["breakers"].items() if state != "closed"]
+            if open_breakers:
+                st.warning(f"Circuit open for: {', '.join(open_breakers)} (serving last-known-good data)")
+            st.caption(f"Last-known-good store: {resilience['last_known_good_entries']} responses, "
+                       f"{resilience['last_known_good_bytes'] / 1e6:.1f} / "
+                       f"{resilience['last_known_good_max_bytes'] / 1e6:.0f} MB")
+            st.json({"breakers": resilience["breakers"], "p95_latency_s": resilience["p95_latency_s"]}, expanded=False)
+        else:
+            st.caption("Resilience layer disabled for this client.")
 
 # TODO: Add sections for viewing MessageRouter rules, Orchestrator known flows, etc. (read-only)
+
+end_page()
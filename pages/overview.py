@@ -2,12 +2,15 @@
 # 📁 pages/1_Overview.py (V0.2 - Comprehensive)
 # =============================================
 import streamlit as st
-import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any
 import pandas as pd
 import datetime
-import random # For generating more varied mock data
+
+from sdk.batch import BatchRequest
+from ui.cache import page_cache
+from ui.runtime import notify, run_sync
+from ui.tracing import end_page, trace_page
 
 # --- SDK Client Access ---
 if 'forgeiq_sdk_client' not in st.session_state or st.session_state.forgeiq_sdk_client is None:
@@ -21,135 +24,55 @@ logger = logging.getLogger(__name__)
 # --- End Logger ---
 
 st.set_page_config(page_title="System Overview - ForgeIQ", layout="wide")
+trace_page("System Overview")
 st.title("📊 ForgeIQ System Overview")
 st.markdown("A comprehensive snapshot of your agentic build system's activities and health.")
 
-# --- Data Fetching Functions (Async with Streamlit Caching) ---
-# These functions now fetch summary data for different sections.
-# The actual API endpoints need to be implemented in ForgeIQ-backend.
-
-@st.cache_data(ttl=30) # Cache for 30 seconds
-async def fetch_general_system_summary() -> Dict[str, Any]:
-    logger.info("Overview Page: Fetching general system summary...")
+# --- Data Fetching (single batched round trip) ---
+# All summaries are requested in ONE call to the backend's batch endpoint
+# (POST /api/forgeiq/batch) and come back individually, each with its own error.
+OVERVIEW_BATCH = [
+    BatchRequest(id="general_summary", path="/api/forgeiq/system/overall-summary"),
+    BatchRequest(id="projects_summary", path="/api/forgeiq/projects/summary", params={"limit": 3}),
+    BatchRequest(id="pipelines_summary", path="/api/forgeiq/pipelines/recent-summary", params={"limit": 3}),
+    BatchRequest(id="deployments_summary", path="/api/forgeiq/deployments/recent-summary", params={"limit": 3}),
+    # Add the agents summary here when the backend exposes it
+]
+# How to unwrap each body, and what to show if that item failed
+OVERVIEW_UNWRAP = {
+    "general_summary": (lambda body: body, {}),
+    "projects_summary": (lambda body: body.get("projects", []), []),
+    "pipelines_summary": (lambda body: body.get("pipelines", []), []),
+    "deployments_summary": (lambda body: body.get("deployments", []), []),
+}
+
+@page_cache.cached("overview", ttl=30) # Cache for 30 seconds
+async def load_all_overview_data() -> Dict[str, Any]:
+    logger.info("Overview Page: Fetching all summaries in one batch...")
+    processed_results = {key: default for key, (_, default) in OVERVIEW_UNWRAP.items()}
     try:
-        # Conceptual API endpoint: GET /api/forgeiq/system/overall-summary
-        # response = await client._request("GET", "/api/forgeiq/system/overall-summary")
-        # return response 
-        await asyncio.sleep(0.3) # Simulate API call
-        return {
-            "active_projects_count": random.randint(3, 10),
-            "total_agents_defined": 12, # From your list
-            "agents_online_count": random.randint(8, 12),
-            "critical_alerts_count": random.randint(0, 2),
-            "system_health_status": random.choice(["Operational", "Degraded", "Minor Issues"])
-        }
+        results = await client.batch(OVERVIEW_BATCH)
     except Exception as e:
-        logger.error(f"Error fetching general system summary: {e}", exc_info=True)
-        st.toast(f"Could not load general summary: {e}", icon="❌")
-        return {}
-
-@st.cache_data(ttl=45)
-async def fetch_projects_summary() -> List[Dict[str, Any]]:
-    logger.info("Overview Page: Fetching projects summary...")
-    try:
-        # Conceptual API endpoint: GET /api/forgeiq/projects/summary?limit=3
-        # response = await client._request("GET", "/api/forgeiq/projects/summary", params={"limit": 3})
-        # return response.get("projects", [])
-        await asyncio.sleep(0.4)
-        project_names = ["PhoenixCI", "NovaBuild", "QuantumDeploy"]
-        statuses = ["SUCCESSFUL", "FAILED", "IN_PROGRESS"]
-        return [
-            {
-                "name": name, 
-                "last_build_status": random.choice(statuses), 
-                "last_build_timestamp": (datetime.datetime.utcnow() - datetime.timedelta(hours=random.randint(1,24))).isoformat()+"Z",
-                "repo_url": f"https://github.com/example/{name.lower()}" # Placeholder
-            } for name in random.sample(project_names,k=len(project_names))[:3] # Show up to 3
-        ]
-    except Exception as e:
-        logger.error(f"Error fetching projects summary: {e}", exc_info=True)
-        st.toast(f"Could not load projects summary: {e}", icon="❌")
-        return []
-
-@st.cache_data(ttl=30)
-async def fetch_pipelines_summary() -> List[Dict[str, Any]]:
-    logger.info("Overview Page: Fetching pipelines summary...")
-    try:
-        # Conceptual API endpoint: GET /api/forgeiq/pipelines/recent-summary?limit=3
-        # response = await client._request("GET", "/api/forgeiq/pipelines/recent-summary", params={"limit": 3})
-        # return response.get("pipelines", [])
-        await asyncio.sleep(0.6)
-        statuses = ["COMPLETED_SUCCESS", "FAILED", "RUNNING"]
-        return [
-            {
-                "dag_id": f"dag_{uuid.uuid4().hex[:8]}", "project_id": random.choice(["PhoenixCI", "NovaBuild"]), 
-                "status": random.choice(statuses), 
-                "started_at": (datetime.datetime.utcnow() - datetime.timedelta(minutes=random.randint(5,120))).isoformat()+"Z",
-                "trigger": random.choice(["Commit abc1234", "Manual via API", "Scheduled"])
-            } for _ in range(3)
-        ]
-    except Exception as e:
-        logger.error(f"Error fetching pipelines summary: {e}", exc_info=True)
-        st.toast(f"Could not load pipelines summary: {e}", icon="❌")
-        return []
-
-@st.cache_data(ttl=30)
-async def fetch_deployments_summary() -> List[Dict[str, Any]]:
-    logger.info("Overview Page: Fetching deployments summary...")
-    try:
-        # Conceptual API endpoint: GET /api/forgeiq/deployments/recent-summary?limit=3
-        # response = await client._request("GET", "/api/forgeiq/deployments/recent-summary", params={"limit": 3})
-        # return response.get("deployments", [])
-        await asyncio.sleep(0.5)
-        statuses = ["SUCCESSFUL", "FAILED", "IN_PROGRESS"]
-        services = ["forgeiq-backend", "codenav-agent", "plan-agent"]
-        envs = ["staging", "production"]
-        return [
-            {
-                "deployment_id": f"depl_{uuid.uuid4().hex[:8]}", "service_name": random.choice(services),
-                "target_environment": random.choice(envs), "commit_sha": hashlib.sha1(os.urandom(16)).hexdigest()[:7], # Needs hashlib
-                "status": random.choice(statuses), 
-                "completed_at": (datetime.datetime.utcnow() - datetime.timedelta(minutes=random.randint(15,300))).isoformat()+"Z"
-            } for _ in range(3)
-        ]
-    except Exception as e:
-        logger.error(f"Error fetching deployments summary: {e}", exc_info=True)
-        st.toast(f"Could not load deployments summary: {e}", icon="❌")
-        return []
-
-# --- Load All Data for the Page Concurrently (Example) ---
-# Note: Streamlit's caching makes direct calls simple. If not cached or needing true concurrency:
-async def load_all_overview_data():
-    results = await asyncio.gather(
-        fetch_general_system_summary(),
-        fetch_projects_summary(),
-        fetch_pipelines_summary(),
-        fetch_deployments_summary(),
-        # Add fetch_agents_summary() here when defined
-        return_exceptions=True # So one failure doesn't stop all
-    )
-    # Handle potential errors from asyncio.gather
-    data_keys = ["general_summary", "projects_summary", "pipelines_summary", "deployments_summary"]
-    processed_results = {}
-    for i, key in enumerate(data_keys):
-        if isinstance(results[i], Exception):
-            logger.error(f"Error loading data for {key}: {results[i]}")
-            processed_results[key] = [] if "summary" not in key else {} # Default to empty
+        logger.error(f"Error fetching overview batch: {e}", exc_info=True)
+        notify.toast(f"Could not load overview data: {e}", icon="❌")
+        return processed_results
+
+    for result in results:
+        unwrap, default = OVERVIEW_UNWRAP[result.id]
+        if result.ok:
+            processed_results[result.id] = unwrap(result.data or {})
         else:
-            processed_results[key] = results[i]
+            logger.error(f"Error loading data for {result.id}: {result.error}")
+            notify.toast(f"Could not load {result.id.replace('_', ' ')}: {result.error}", icon="❌")
+            processed_results[result.id] = default # Default to empty
     return processed_results
 
-# Run the data loading (Streamlit will typically await cached async functions directly)
-# For multiple concurrent non-cached calls, asyncio.run in main thread is needed.
-# For cached functions, direct calls are usually fine.
-# For simplicity and clarity with @st.cache_data, we'll call them sequentially.
-# If performance becomes an issue, asyncio.gather can be used with careful state management.
-
-general_summary = asyncio.run(fetch_general_system_summary())
-projects_summary = asyncio.run(fetch_projects_summary())
-pipelines_summary = asyncio.run(fetch_pipelines_summary())
-deployments_summary = asyncio.run(fetch_deployments_summary())
-# agents_summary = asyncio.run(fetch_agents_summary()) # When defined
+overview_data = run_sync(load_all_overview_data())
+general_summary = overview_data["general_summary"]
+projects_summary = overview_data["projects_summary"]
+pipelines_summary = overview_data["pipelines_summary"]
+deployments_summary = overview_data["deployments_summary"]
+# agents_summary = run_sync(fetch_agents_summary()) # When defined
 
 st.markdown("---")
 
@@ -242,7 +165,7 @@ st.markdown("---")
 # --- Agents Status Summary (Placeholder) ---
 st.header("Agents Status Snapshot")
 # TODO: Implement fetch_agents_summary() and display
-# agents_summary = asyncio.run(fetch_agents_summary())
+# agents_summary = run_sync(fetch_agents_summary())
 # if agents_summary:
 #    cols_agents = st.columns(3)
 #    cols_agents[0].metric("Total Agents", agents_summary.get("total", "N/A"))
@@ -255,9 +178,7 @@ if st.button("View Agent Details", key="view_agents_overview"):
 
 st.sidebar.markdown("---")
 if st.sidebar.button("Force Refresh All Overview Data"):
-    st.cache_data.clear()
+    page_cache.invalidate("overview")
     st.rerun()
 
-# Ensure imports for modules used in mock data are present if you uncomment their usage
-# import uuid
-# import hashlib
+end_page()
@@ -0,0 +1,81 @@
+# =============================
+# 📁 sdk/__init__.py
+# =============================
+from .audit_store import AuditLogStore, AuditPage, AuditSyncResult, SearchHit, SearchResult
+from .batch import BatchRequest, BatchResult
+from .client import ForgeIQClient
+from .codecs import Codec, CodecSet, available_codecs
+from .config import ConfigChange, ConfigResolver
+from .dag import DagStructure, DagView, LayoutCache, build_dag_view
+from .exceptions import APIError, CircuitOpenError, ForgeIQSDKError, TransportError
+from .facets import Facets, FacetValue
+from .findings import FindingsPage, FindingsQuery
+from .findings_index import FindingsIndex, IndexedFinding
+from .http_cache import ResponseCache
+from .models import (DeploymentState, ExecutionStatus, SDKAuditLogEntry, SDKDagExecutionStatus, SDKDeploymentStatus,
+                     SDKScanResult, SDKSecurityFinding, SDKTaskStatus, Severity)
+from .probe import FleetProbeResult, ProbeEngine, ProbeResult
+from .resilience import BreakerPolicy, EndpointPolicy, HedgePolicy, ResilienceLayer, RetryPolicy
+from .sync import ExecutionStore, SyncResult
+from .timeline import Timeline, build_timeline
+from .tracing import ConsoleExporter, FileExporter, OTLPHttpExporter, Span, SpanExporter, Tracer
+from .transport import PoolLimits
+
+__all__ = [
+    "ForgeIQClient",
+    "PoolLimits",
+    "AuditLogStore",
+    "AuditPage",
+    "AuditSyncResult",
+    "SearchHit",
+    "SearchResult",
+    "BatchRequest",
+    "BatchResult",
+    "Codec",
+    "CodecSet",
+    "available_codecs",
+    "ConfigChange",
+    "ConfigResolver",
+    "DagStructure",
+    "DagView",
+    "LayoutCache",
+    "build_dag_view",
+    "ProbeEngine",
+    "ProbeResult",
+    "FleetProbeResult",
+    "Timeline",
+    "build_timeline",
+    "ResponseCache",
+    "Facets",
+    "FacetValue",
+    "FindingsQuery",
+    "FindingsPage",
+    "FindingsIndex",
+    "IndexedFinding",
+    "ExecutionStore",
+    "SDKDagExecutionStatus",
+    "SDKDeploymentStatus",
+    "SDKTaskStatus",
+    "SDKScanResult",
+    "SDKSecurityFinding",
+    "SDKAuditLogEntry",
+    "ExecutionStatus",
+    "DeploymentState",
+    "Severity",
+    "SyncResult",
+    "ForgeIQSDKError",
+    "APIError",
+    "TransportError",
+    "CircuitOpenError",
+    "ResilienceLayer",
+    "EndpointPolicy",
+    "RetryPolicy",
+    "HedgePolicy",
+    "BreakerPolicy",
+    "Tracer",
+    "Span",
+    "SpanExporter",
+    "ConsoleExporter",
+    "FileExporter",
+    "OTLPHttpExporter",
+]
@@ -0,0 +1,478 @@
+# =============================
+# 📁 sdk/audit_store.py
+# =============================
+# Embedded SQLite store of audit-log entries, synced incrementally from the API.
+#
+# Compliance reviews need months of history, more than the audit-logs endpoint
+# can return per request or a page can hold as a DataFrame. The store keeps
+# every entry on local disk, indexed by time alone and by project,
+# event type and actor (each combined with time). Filtered queries are
+# keyset-paged newest first, so reading a page costs the same on page 1 and
+# page 1000.
+#
+# Sync uses the existing contract of GET /api/forgeiq/governance/audit-logs
+# (project_id, source_event_type, user_actor, date_start, date_end, limit,
+# cursor): audit logs are append-only, so each sync asks for
+# date_start=<watermark>, and rows already present are ignored by audit_id.
+# The watermark (sync_state "<table>.watermark") is the newest stored
+# timestamp, saved only once a sync has read every page: the endpoint may
+# return rows in any order, so rows stored by an unfinished sync prove
+# nothing about what came before them. A running sync keeps its date_start
+# and next cursor in "<table>.run" after each stored page, and the next sync
+# resumes from there. A store without a watermark backfills `history_days`
+# of history first.
+#
+# Governance alerts are synced the same way from GET /api/forgeiq/governance/alerts
+# into a second table. Both tables have an FTS5 index, kept current by insert
+# triggers, so every synced page becomes searchable in the same transaction.
+# search() accepts plain words, "quoted phrases", prefix* terms, -exclusions,
+# OR and column:term filters. Row ids follow timestamps, so FTS5 streams
+# matches newest first within a date range. Hits are ranked by BM25 among the
+# `candidates` newest matches; ranking every match of a common word would
+# score most of the table.
+#
+# Connections are shared across threads and serialized by a lock; SQLite runs
+# in WAL mode, so a reader never waits for a sync to commit.
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import SDKAuditLogEntry, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOGS_ENDPOINT = "/api/forgeiq/governance/audit-logs"
+GOVERNANCE_ALERTS_ENDPOINT = "/api/forgeiq/governance/alerts"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id INTEGER PRIMARY KEY,
+    audit_id TEXT NOT NULL UNIQUE,
+    ts_us INTEGER NOT NULL,
+    project_id TEXT,
+    source_event_type TEXT,
+    actor TEXT,
+    action TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS audit_logs_ts ON audit_logs (ts_us);
+CREATE INDEX IF NOT EXISTS audit_logs_project_ts ON audit_logs (project_id, ts_us);
+CREATE INDEX IF NOT EXISTS audit_logs_event_ts ON audit_logs (source_event_type, ts_us);
+CREATE INDEX IF NOT EXISTS audit_logs_actor_ts ON audit_logs (actor, ts_us);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS governance_alerts (
+    id INTEGER PRIMARY KEY,
+    alert_id TEXT NOT NULL UNIQUE,
+    ts_us INTEGER NOT NULL,
+    alert_type TEXT,
+    severity TEXT,
+    project_id TEXT,
+    description TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS governance_alerts_ts ON governance_alerts (ts_us);
+CREATE VIRTUAL TABLE IF NOT EXISTS audit_fts USING fts5(
+    action, details, actor, project_id, source_event_type,
+    content='audit_logs', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS audit_logs_fts_insert AFTER INSERT ON audit_logs BEGIN
+    INSERT INTO audit_fts (rowid, action, details, actor, project_id, source_event_type)
+    VALUES (new.id, new.action, new.details, new.actor, new.project_id, new.source_event_type);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS alerts_fts USING fts5(
+    description, body, alert_type, project_id,
+    content='governance_alerts', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS governance_alerts_fts_insert AFTER INSERT ON governance_alerts BEGIN
+    INSERT INTO alerts_fts (rowid, description, body, alert_type, project_id)
+    VALUES (new.id, new.description, new.body, new.alert_type, new.project_id);
+END;
+"""
+# PRAGMA user_version of the layout above. The store is a cache of the API, so a
+# database with another version is dropped on open and resynced.
+_SCHEMA_VERSION = 2
+_TABLES = ("audit_fts", "alerts_fts", "audit_logs", "governance_alerts", "sync_state")
+
+# Row ids are ts_us * _ID_SLOTS + a per-entry suffix, so rowid order is time
+# order: FTS5 walks matches newest first and date bounds become rowid ranges.
+_ID_SLOTS = 1000
+
+# Searchable sources: FTS table, content table, column weights for bm25() (in FTS
+# column order) and the aliases accepted in `column:term` filters.
+_SEARCH_SOURCES = {
+    "audit": ("audit_fts", "audit_logs", (4.0, 1.0, 2.0, 1.0, 1.0),
+              {"action": "action", "details": "details", "actor": "actor", "user": "actor",
+               "project": "project_id", "type": "source_event_type", "event": "source_event_type"}),
+    "alerts": ("alerts_fts", "governance_alerts", (4.0, 1.0, 2.0, 1.0),
+               {"description": "description", "details": "body", "type": "alert_type", "project": "project_id"}),
+}
+_QUERY_TOKEN = re.compile(r'(-?)(?:([A-Za-z_]+):)?(?:"([^"]*)"?|(\S+))')
+
+# Filter argument -> column
+_FILTER_COLUMNS = {"project_id": "project_id", "source_event_type": "source_event_type", "actor": "actor"}
+_UTC = datetime.timezone.utc
+
+
+def _to_us(value: Any) -> Optional[int]:
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min, tzinfo=_UTC)  # Dates mean midnight UTC
+    moment = parse_timestamp(value)
+    return int(moment.timestamp() * 1_000_000) if moment is not None else None
+
+
+def _row_id(ts_us: int, key: str) -> int:
+    return ts_us * _ID_SLOTS + zlib.crc32(key.encode()) % _ID_SLOTS
+
+
+def _from_us(ts_us: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(ts_us / 1_000_000, tz=_UTC)
+
+
+def default_store_path(base_url: str) -> str:
+    """Per-backend database file under FORGEIQ_CACHE_DIR (default ~/.cache/forgeiq)."""
+    cache_dir = os.getenv("FORGEIQ_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "forgeiq")
+    return os.path.join(cache_dir, f"audit_logs_{hashlib.sha1(base_url.encode()).hexdigest()[:10]}.sqlite3")
+
+
+@dataclass
+class AuditPage:
+    entries: List[SDKAuditLogEntry] = field(default_factory=list)
+    next_cursor: Optional[str] = None   # Keyset cursor for the next (older) page
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class SearchHit:
+    source: str                     # "audit" or "alerts"
+    key: str                        # audit_id / alert_id
+    timestamp: datetime.datetime
+    snippet: str                    # Best-matching fragment, matches wrapped in the highlight markers
+    score: float                    # BM25; lower is more relevant
+    record: Any = None              # SDKAuditLogEntry, or the raw alert dict
+
+
+@dataclass
+class SearchResult:
+    query: str
+    hits: List[SearchHit] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fts_query(text: str, columns: Dict[str, str]) -> str:
+    """Translate search-box syntax into an FTS5 MATCH expression.
+
+    Every term is quoted, so punctuation in ids (deploy_0042, v1.2.3) is never
+    read as FTS5 syntax. Unknown `column:` prefixes are searched as plain text.
+    """
+    groups: List[List[str]] = []
+    excluded: List[str] = []
+    join_next = False
+    for negate, column, phrase, word in _QUERY_TOKEN.findall(text):
+        if word == "OR" and not (negate or column):
+            join_next = bool(groups)
+            continue
+        if not re.search(r"\w", phrase or word):
+            continue  # Only punctuation: nothing the tokenizer would index
+        target = columns.get(column.lower()) if column else None
+        if column and target is None:
+            phrase, word = f"{column}:{phrase or word}", ""  # e.g. a URL, searched as a phrase
+        if phrase:
+            term = _fts_phrase(phrase)
+        elif word.endswith("*"):
+            term = _fts_phrase(word.strip("*")) + "*"
+        else:
+            term = _fts_phrase(word.strip("*"))
+        if target:
+            term = f"{target} : {term}"
+        if negate:
+            excluded.append(term)
+        elif join_next:
+            groups[-1].append(term)
+        else:
+            groups.append([term])
+        join_next = False
+    if not groups:
+        return ""  # FTS5 has no unary NOT; an exclusion-only query matches nothing
+    expression = " AND ".join(f"({' OR '.join(group)})" if len(group) > 1 else group[0] for group in groups)
+    if excluded:
+        expression = f"({expression}) NOT ({' OR '.join(excluded)})"
+    return expression
+
+
+@dataclass
+class AuditSyncResult:
+    inserted: int = 0
+    received: int = 0
+    pages: int = 0
+    backfill: bool = False
+    elapsed_s: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class AuditLogStore:
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            for table in _TABLES:
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Writes ---
+    def insert_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insert raw API entries; entries already stored (same audit_id) are skipped. Returns rows added."""
+        rows = []
+        for entry in entries:
+            ts_us = _to_us(entry.get("timestamp"))
+            if not entry.get("audit_id") or ts_us is None:
+                continue
+            details = entry.get("details")
+            rows.append((_row_id(ts_us, entry["audit_id"]), entry["audit_id"], ts_us, entry.get("project_id"), entry.get("source_event_type"),
+                         entry.get("user_or_actor"), entry.get("action_description"),
+                         json.dumps(details, separators=(",", ":"), default=str) if details is not None else None))
+        return self._insert("INSERT INTO audit_logs (id, audit_id, ts_us, project_id, source_event_type, actor, action, "
+                            "details) VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (audit_id) DO NOTHING", rows)
+
+    def insert_alerts(self, alerts: Iterable[Dict[str, Any]]) -> int:
+        """Insert raw governance alerts (SLA violations and policy alerts); known alert_ids are skipped."""
+        rows = []
+        for alert in alerts:
+            ts_us = _to_us(alert.get("timestamp"))
+            if not alert.get("alert_id") or ts_us is None:
+                continue
+            rows.append((_row_id(ts_us, alert["alert_id"]), alert["alert_id"], ts_us, alert.get("event_type") or alert.get("alert_type"),
+                         alert.get("severity"), alert.get("project_id"),
+                         alert.get("description") or alert.get("details"),
+                         json.dumps(alert, separators=(",", ":"), default=str)))
+        return self._insert("INSERT INTO governance_alerts (id, alert_id, ts_us, alert_type, severity, project_id, "
+                            "description, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (alert_id) DO NOTHING", rows)
+
+    def _insert(self, sql: str, rows: List[Tuple[Any, ...]]) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                try:
+                    inserted = self._conn.executemany(sql, rows).rowcount  # Excludes the FTS trigger's writes
+                except sqlite3.IntegrityError:
+                    # Two entries of the same microsecond drew the same id suffix: probe free slots row by row
+                    self._conn.execute("ROLLBACK")
+                    self._conn.execute("BEGIN")
+                    inserted = sum(self._insert_probing(sql, row) for row in rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return inserted
+
+    def _insert_probing(self, sql: str, row: Tuple[Any, ...]) -> int:
+        base = row[0] - row[0] % _ID_SLOTS
+        for step in range(_ID_SLOTS):
+            try:
+                return self._conn.execute(sql, (base + (row[0] + step) % _ID_SLOTS, *row[1:])).rowcount
+            except sqlite3.IntegrityError:
+                continue
+        raise sqlite3.IntegrityError(f"No free row id left at timestamp {row[2]} for {row[1]}")
+
+    def optimize_search_index(self) -> None:
+        """Merge FTS segments into one b-tree per index; worth doing after a large backfill."""
+        with self._lock:
+            self._conn.execute("INSERT INTO audit_fts (audit_fts) VALUES ('optimize')")
+            self._conn.execute("INSERT INTO alerts_fts (alerts_fts) VALUES ('optimize')")
+
+    def set_state(self, key: str, value: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # --- Reads ---
+    def newest_timestamp(self, table: str = "audit_logs") -> Optional[datetime.datetime]:
+        """Newest stored timestamp of `audit_logs` or `governance_alerts`."""
+        if table not in ("audit_logs", "governance_alerts"):
+            raise ValueError(f"Unknown table {table!r}")
+        with self._lock:
+            row = self._conn.execute(f"SELECT MAX(ts_us) FROM {table}").fetchone()
+        return _from_us(row[0]) if row and row[0] is not None else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0]
+
+    def _where(self, filters: Dict[str, Any], date_start: Any, date_end: Any) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        args: List[Any] = []
+        for name, value in filters.items():
+            if value not in (None, "", "All"):
+                clauses.append(f"{_FILTER_COLUMNS[name]} = ?")
+                args.append(value)
+        if date_start is not None:
+            clauses.append("ts_us >= ?")
+            args.append(_to_us(date_start))
+        if date_end is not None:
+            clauses.append("ts_us < ?")
+            args.append(_to_us(date_end))
+        return clauses, args
+
+    def query(self,
+              project_id: Optional[str] = None,
+              source_event_type: Optional[str] = None,
+              actor: Optional[str] = None,
+              date_start: Any = None,
+              date_end: Any = None,
+              limit: int = 100,
+              cursor: Optional[str] = None) -> AuditPage:
+        """Matching entries, newest first. `date_end` is exclusive; pass `next_cursor` for the next page."""
+        start = time.perf_counter()
+        clauses, args = self._where({"project_id": project_id, "source_event_type": source_event_type,
+                                     "actor": actor}, date_start, date_end)
+        if cursor:
+            ts_us, row_id = (int(part) for part in cursor.split(":", 1))
+            clauses.append("(ts_us, id) < (?, ?)")
+            args.extend([ts_us, row_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (f"SELECT id, audit_id, ts_us, project_id, source_event_type, actor, action, details "
+               f"FROM audit_logs {where} ORDER BY ts_us DESC, id DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, (*args, limit + 1)).fetchall()
+        entries = [SDKAuditLogEntry(audit_id=audit_id, timestamp=_from_us(ts_us), project_id=project,
+                                    source_event_type=event_type, user_or_actor=actor_, action_description=action,
+                                    details=json.loads(details) if details else {})
+                   for _, audit_id, ts_us, project, event_type, actor_, action, details in rows[:limit]]
+        next_cursor = f"{rows[limit - 1][2]}:{rows[limit - 1][0]}" if len(rows) > limit else None
+        return AuditPage(entries=entries, next_cursor=next_cursor,
+                         elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    def count(self,
+              project_id: Optional[str] = None,
+              source_event_type: Optional[str] = None,
+              actor: Optional[str] = None,
+              date_start: Any = None,
+              date_end: Any = None,
+              cap: Optional[int] = 100_000) -> int:
+        """Number of matching entries, counted up to `cap` (None for an exact count)."""
+        clauses, args = self._where({"project_id": project_id, "source_event_type": source_event_type,
+                                     "actor": actor}, date_start, date_end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM audit_logs {where}{' LIMIT ?' if cap else ''})"
+        with self._lock:
+            return self._conn.execute(sql, (*args, cap) if cap else args).fetchone()[0]
+
+    def distinct(self, column: str) -> List[str]:
+        """Distinct values of `project_id`, `source_event_type` or `actor` (index scans)."""
+        name = _FILTER_COLUMNS[column]
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT {name} FROM audit_logs WHERE {name} IS NOT NULL "
+                                      f"ORDER BY {name}").fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        newest = self.newest_timestamp()
+        with self._lock:
+            oldest = self._conn.execute("SELECT MIN(ts_us) FROM audit_logs").fetchone()[0]
+            alerts = self._conn.execute("SELECT COUNT(*) FROM governance_alerts").fetchone()[0]
+        return {"entries": len(self), "alerts": alerts,
+                "oldest": _from_us(oldest).isoformat() if oldest is not None else None,
+                "newest": newest.isoformat() if newest else None, "last_sync": self.get_state("last_sync"),
+                "path": self.path}
+
+    # --- Search ---
+    def search(self,
+               text: str,
+               sources: Iterable[str] = ("audit", "alerts"),
+               project_id: Optional[str] = None,
+               date_start: Any = None,
+               date_end: Any = None,
+               order: str = "relevance",
+               limit: int = 50,
+               candidates: int = 2000,
+               highlight: Tuple[str, str] = ("[", "]")) -> SearchResult:
+        """Full-text search over audit logs and/or alerts, best match first (or newest, with order="newest")."""
+        start = time.perf_counter()
+        hits: List[SearchHit] = []
+        for source in sources:
+            hits.extend(self._search_source(source, text, project_id, date_start, date_end, order,
+                                            limit, max(candidates, limit), highlight))
+        if order == "newest":
+            hits.sort(key=lambda hit: hit.timestamp, reverse=True)
+        else:
+            hits.sort(key=lambda hit: hit.score)
+        return SearchResult(query=text, hits=hits[:limit], elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    def _search_source(self, source: str, text: str, project_id: Optional[str], date_start: Any, date_end: Any,
+                       order: str, limit: int, candidates: int, highlight: Tuple[str, str]) -> List[SearchHit]:
+        fts, content, weights, columns = _SEARCH_SOURCES[source]
+        match = _fts_query(text, columns)
+        if not match:
+            return []
+        clauses, args = [f"{fts} MATCH ?"], [match]
+        if project_id not in (None, "", "All"):
+            clauses.append("c.project_id = ?")
+            args.append(project_id)
+        if date_start is not None:
+            clauses.append(f"{fts}.rowid >= ?")
+            args.append(_to_us(date_start) * _ID_SLOTS)
+        if date_end is not None:
+            clauses.append(f"{fts}.rowid < ?")
+            args.append(_to_us(date_end) * _ID_SLOTS)
+        where = " AND ".join(clauses)
+        bm25 = f"bm25({fts}, {', '.join(map(str, weights))})"
+        with self._lock:
+            try:
+                ranked = self._conn.execute(
+                    f"SELECT {fts}.rowid, {bm25} FROM {fts} JOIN {content} c ON c.id = {fts}.rowid "
+                    f"WHERE {where} ORDER BY {fts}.rowid DESC LIMIT ?",
+                    (*args, limit if order == "newest" else candidates)).fetchall()
+                scores = dict(sorted(ranked, key=lambda row: row[1])[:limit])
+                if not scores:
+                    return []
+                # snippet() only runs for the rows being returned. bm25() is not repeated here:
+                # under a rowid lookup it recomputes its corpus statistics for every row.
+                key_columns = ("c.id, c.audit_id, c.ts_us, c.project_id, c.source_event_type, c.actor, c.action, c.details"
+                               if source == "audit" else "c.id, c.alert_id, c.ts_us, c.body")
+                rows = self._conn.execute(
+                    f"SELECT {key_columns}, snippet({fts}, -1, ?, ?, '…', 16) "
+                    f"FROM {fts} JOIN {content} c ON c.id = {fts}.rowid "
+                    f"WHERE {fts} MATCH ? AND {fts}.rowid IN ({', '.join('?' * len(scores))})",
+                    (*highlight, match, *scores)).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SDK: Search {text!r} failed ({match!r}): {e}")
+                return []
+        if source == "audit":
+            return [SearchHit(source, audit_id, _from_us(ts_us), snippet, scores[row_id],
+                              SDKAuditLogEntry(audit_id=audit_id, timestamp=_from_us(ts_us), project_id=project,
+                                               source_event_type=event_type, user_or_actor=actor,
+                                               action_description=action,
+                                               details=json.loads(details) if details else {}))
+                    for row_id, audit_id, ts_us, project, event_type, actor, action, details, snippet in rows]
+        return [SearchHit(source, alert_id, _from_us(ts_us), snippet, scores[row_id], json.loads(body))
+                for row_id, alert_id, ts_us, body, snippet in rows]
@@ -0,0 +1,61 @@
+# =============================
+# 📁 sdk/batch.py
+# =============================
+# Request/response envelopes for POST /api/forgeiq/batch.
+#
+# Wire format:
+#   request:  {"requests":  [{"id": "...", "method": "GET", "path": "/api/...", "params": {...}}, ...]}
+#   response: {"responses": [{"id": "...", "status": 200, "body": {...}}
+#                           | {"id": "...", "status": 404, "error": "..."}, ...]}
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+BATCH_ENDPOINT = "/api/forgeiq/batch"
+MAX_BATCH_SIZE = 20  # Matches the backend's per-call cap
+
+
+@dataclass
+class BatchRequest:
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[str] = None  # Defaults to the request's index in the batch
+    method: str = "GET"       # Only idempotent reads are accepted by the batch endpoint
+
+    def to_wire(self, index: int) -> Dict[str, Any]:
+        return {"id": self.id or str(index), "method": self.method.upper(), "path": self.path,
+                "params": {k: v for k, v in self.params.items() if v is not None}}
+
+
+@dataclass
+class BatchResult:
+    id: str
+    status_code: int
+    data: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 300
+
+    @classmethod
+    def from_wire(cls, item: Dict[str, Any]) -> "BatchResult":
+        status_code = int(item.get("status", 500))
+        error = item.get("error")
+        if error is None and status_code >= 400:
+            error = f"HTTP {status_code}"
+        return cls(id=str(item.get("id")), status_code=status_code, data=item.get("body"), error=error)
+
+
+def encode_batch(requests: List[BatchRequest], start: int = 0) -> Dict[str, Any]:
+    """`start` is the index of requests[0] in the whole batch (for chunks), so default ids stay unique."""
+    return {"requests": [req.to_wire(i) for i, req in enumerate(requests, start)]}
+
+
+def decode_batch(requests: List[BatchRequest], response_data: Dict[str, Any], start: int = 0) -> List[BatchResult]:
+    """Match responses back to requests by id; anything the server dropped becomes an error result."""
+    by_id = {str(item.get("id")): BatchResult.from_wire(item) for item in response_data.get("responses", [])}
+    results: List[BatchResult] = []
+    for i, req in enumerate(requests, start):
+        req_id = req.id or str(i)
+        results.append(by_id.get(req_id) or BatchResult(id=req_id, status_code=502, error="Missing from batch response"))
+    return results
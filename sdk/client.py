@@ -1,52 +1,668 @@
-# In sdk/client.py within ForgeIQClient class# In sdk/client.py
-async def list_deployments(self, 
-                           project_id: Optional[str] = None, 
-                           service_name: Optional[str] = None,
-                           environment: Optional[str] = None,
-                           status: Optional[str] = None,
-                           limit: int = 25
-                           ) -> List[SDKDeploymentStatus]: # Assuming SDKDeploymentStatus is the model
-    params = {"limit": limit}
-    if project_id: params["project_id"] = project_id
-    if service_name: params["service_name"] = service_name
-    if environment: params["target_environment"] = environment
-    if status: params["status"] = status
-
-    response_data = await self._request("GET", "/api/forgeiq/deployments", params=params)
-    # Ensure response_data["deployments"] items are cast/validated to SDKDeploymentStatus
-    return [SDKDeploymentStatus(**item) for item in response_data.get("deployments", [])]
-
-async def trigger_service_rollback(self, project_id: str, service_name: str, current_deployment_id: str) -> Dict[str, Any]:
-    payload = {
-        "project_id": project_id, 
-        "service_name": service_name, 
-        "rollback_target_type": "previous_successful", # Example
-        "current_deployment_id_for_context": current_deployment_id
-    }
-    return await self._request("POST", "/api/forgeiq/deployments/rollback", json_data=payload)async def list_projects(self) -> List[Dict[str, Any]]:
-    logger.info("SDK: Listing all projects.")
-    response_data = await self._request("GET", "/api/forgeiq/projects")
-    return response_data.get("projects", [])
-# In sdk/client.py within ForgeIQClient class
-async def list_pipeline_executions(self, 
-                                 project_id: Optional[str] = None, 
+# =============================
+# 📁 sdk/client.py
+# =============================
+import asyncio
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from .audit_store import AUDIT_LOGS_ENDPOINT, GOVERNANCE_ALERTS_ENDPOINT, AuditLogStore, AuditSyncResult
+from .batch import BATCH_ENDPOINT, MAX_BATCH_SIZE, BatchRequest, BatchResult, decode_batch, encode_batch
+from .codecs import Codec, CodecSet, TypedItemsDecoder
+from .config import CONFIG_ENDPOINT, ConfigResolver
+from .exceptions import APIError, ForgeIQSDKError, TransportError
+from .facets import (DEPLOYMENT_FACET_FIELDS, FACET_RESOURCES, PIPELINE_FACET_FIELDS, PROJECT_FACET_FIELDS,
+                     SECURITY_FACET_FIELDS, Facets)
+from .findings import SCAN_RESULTS_ENDPOINT, FindingsPage, FindingsQuery, findings_endpoint
+from .findings_index import FindingsIndex
+from .http_cache import ResponseCache
+from .models import SDKDagExecutionStatus, SDKDeploymentStatus, SDKScanResult, SDKSecurityFinding, parse_timestamp
+from .pagination import CursorPage, iterate_items
+from .probe import FleetProbeResult, ProbeEngine, ProbeResult
+from .resilience import ResilienceLayer
+from .sync import CHANGES_ENDPOINT, ExecutionDelta, ExecutionStore, SyncResult
+from .tracing import Tracer
+from .transport import PoolLimits, PooledTransport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = os.getenv("FORGEIQ_API_BASE_URL", "http://localhost:8000")
+
+
+class ForgeIQClient:
+    """Async client for the ForgeIQ backend.
+
+    One instance owns a long-lived keep-alive connection pool (see sdk/transport.py),
+    so create it once and reuse it; close it with ``await client.aclose()`` or use it
+    as an ``async with`` context manager.
+    """
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 api_key: Optional[str] = None,
+                 timeout: float = 30.0,
+                 pool_limits: Optional[PoolLimits] = None,
+                 response_cache: Union[bool, ResponseCache, None] = None,
+                 json_codec: Union[str, Codec, None] = None,
+                 binary_wire: Union[bool, str, Codec] = False,
+                 typed_decoding: bool = True,
+                 resilience: Union[bool, ResilienceLayer, None] = True,
+                 probe_engine: Optional[ProbeEngine] = None,
+                 tracer: Optional[Tracer] = None):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        # Request spans with network phase timings; disabled (no exporters) unless given one (see sdk/tracing.py)
+        self.tracer = tracer or Tracer()
+        # Fastest installed JSON decoder; binary_wire=True also negotiates MessagePack (see sdk/codecs.py)
+        self.codecs = CodecSet(json_codec=json_codec, binary=binary_wire)
+        # List endpoints decode straight into SDK models when msgspec is installed
+        self.typed_decoding = typed_decoding
+        self._typed_decoders: Dict[Any, TypedItemsDecoder] = {}
+        headers = {"Accept": self.codecs.accept_header, "User-Agent": "forgeiq-ui-sdk"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._transport = PooledTransport(self.base_url, headers=headers, timeout=timeout, limits=pool_limits,
+                                          time_dns=self.tracer.enabled)
+        self._batch_supported = True  # Flipped off if the backend has no batch endpoint
+        self._delta_sync_supported = True  # Likewise for the executions changes endpoint
+        self._facets_unsupported: set = set()  # Resources whose /facets endpoint is missing
+        self._findings_query_supported = True  # Per-scan findings endpoint; see query_findings()
+        self.executions = ExecutionStore()
+        self.findings_index = FindingsIndex()  # Default target of index_scan_findings()
+        self.build_config = ConfigResolver()  # Effective per-project configs, see load_build_config()
+        # Opt-in ETag/Last-Modified revalidating cache for GETs (see sdk/http_cache.py)
+        self.response_cache: Optional[ResponseCache] = (
+            ResponseCache() if response_cache is True else (response_cache or None)
+        )
+        # Retries for GETs, optional hedging, per-endpoint circuit breakers (see sdk/resilience.py)
+        self.resilience: Optional[ResilienceLayer] = (
+            ResilienceLayer() if resilience is True else (resilience or None)
+        )
+        # Health checks go straight to the agents' endpoints, on their own pool (see sdk/probe.py)
+        self.probes = probe_engine or ProbeEngine()
+
+    # --- Lifecycle ---
+    async def __aenter__(self) -> "ForgeIQClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        logger.info(f"SDK: Closing connection pools for {self.base_url}")
+        await self._transport.aclose()
+        await self.probes.aclose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Open/idle/reused connection counts and cumulative handshake time."""
+        return self._transport.pool_stats()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.response_cache.stats() if self.response_cache else {}
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Retry/hedge/breaker counters, breaker states and per-group p95 latency."""
+        return self.resilience.snapshot() if self.resilience else {}
+
+    # --- Core request ---
+    async def _request(self,
+                       method: str,
+                       endpoint: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       json_data: Optional[Any] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       decoder: Optional[TypedItemsDecoder] = None) -> Any:
+        with self.tracer.span(f"{method} {endpoint}", kind="client",
+                              attributes={"http.request.method": method, "url.path": endpoint,
+                                          "server.address": self.base_url}):
+            if self.resilience is None:
+                return (await self._request_once(method, endpoint, params, json_data, headers, decoder))[0]
+            key = ResponseCache.make_key(method, endpoint, params) + ((decoder.cache_tag,) if decoder else ())
+            return await self.resilience.call(
+                method, endpoint, key,
+                lambda: self._request_once(method, endpoint, params, json_data, headers, decoder))
+
+    async def _request_once(self,
+                            method: str,
+                            endpoint: str,
+                            params: Optional[Dict[str, Any]],
+                            json_data: Optional[Any],
+                            headers: Optional[Dict[str, str]],
+                            decoder: Optional[TypedItemsDecoder]) -> Tuple[Any, int]:
+        """One attempt; returns the decoded body and its raw size in bytes (sizes the resilience layer's store)."""
+        # One span per attempt (retries and hedges are siblings under the request span)
+        with self.tracer.span("http.send", kind="client") as span:
+            return await self._send_and_decode(span, method, endpoint, params, json_data, headers, decoder)
+
+    async def _send_and_decode(self, span: Any, method: str, endpoint: str, params: Optional[Dict[str, Any]],
+                               json_data: Optional[Any], headers: Optional[Dict[str, str]],
+                               decoder: Optional[TypedItemsDecoder]) -> Tuple[Any, int]:
+        cache = self.response_cache if method.upper() == "GET" else None
+        cache_key = cached = None
+        if cache is not None:
+            cache_key = cache.make_key(method, endpoint, params)
+            if decoder is not None:
+                cache_key += (decoder.cache_tag,)  # Typed and untyped decodes of one URL are different values
+            cached = cache.get(cache_key)
+            if cached is not None:
+                headers = {**(headers or {}), **cache.conditional_headers(cached)}
+
+        content = None
+        if json_data is not None:
+            content = self.codecs.json.encode(json_data)
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        try:
+            response = await self._transport.send(method, endpoint, params=params, content=content, headers=headers)
+        except httpx.HTTPError as e:
+            logger.error(f"SDK: {method} {endpoint} failed before a response was received: {e}")
+            raise TransportError(f"{method} {endpoint}: {e}") from e
+
+        if cache is not None:
+            span.set_attribute("http.cache", "miss" if cached is None else
+                               "revalidated" if response.status_code == 304 else "changed")
+        if response.status_code == 304 and cached is not None:
+            return cache.record_not_modified(cached), cached.size_bytes
+
+        if response.status_code >= 400:
+            try:
+                body: Any = self._decode(response)
+            except ValueError:
+                body = response.text
+            detail = body.get("detail", body) if isinstance(body, dict) else body
+            raise APIError(f"{method} {endpoint}: {detail}", status_code=response.status_code, response_body=body)
+
+        if response.status_code == 204 or not response.content:
+            return {}, 0
+        data = self._decode(response, decoder)
+        if cache is not None:
+            cache.store(cache_key, data, len(response.content),
+                        etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        return data, len(response.content)
+
+    def _decode(self, response: httpx.Response, decoder: Optional[TypedItemsDecoder] = None) -> Any:
+        codec = self.codecs.for_content_type(response.headers.get("Content-Type"))
+        with self.tracer.span("decode", attributes={"codec": codec.name, "typed": decoder is not None,
+                                                    "http.response.body.size": len(response.content)}):
+            try:
+                if decoder is not None:
+                    return decoder.decode(response.content, codec)
+                return codec.decode(response.content)
+            except Exception as e:  # orjson/msgspec/msgpack raise their own types; normalize
+                raise ValueError(f"Could not decode {codec.name} response body: {e}") from e
+
+    def _typed_decoder(self, model: Any, items_key: str) -> Optional[TypedItemsDecoder]:
+        """Decoder for `items_key` lists of an SDK model class, or None to decode generically."""
+        if not self.typed_decoding or not hasattr(model, "from_dict"):
+            return None
+        decoder = self._typed_decoders.get((model, items_key))
+        if decoder is None:
+            decoder = self._typed_decoders[(model, items_key)] = TypedItemsDecoder(model, items_key)
+        return decoder if decoder.available else None
+
+    # --- Batching ---
+    async def batch(self, requests: List[BatchRequest]) -> List[BatchResult]:
+        """Run several GETs in one round trip; results come back in request order.
+
+        A failing item is reported on its own BatchResult (``ok`` is False, ``error``
+        is set) instead of failing the whole call. Backends without the batch
+        endpoint are handled by issuing the GETs concurrently instead.
+        """
+        if not requests:
+            return []
+        if self._batch_supported:
+            chunks = [(start, requests[start:start + MAX_BATCH_SIZE]) for start in range(0, len(requests), MAX_BATCH_SIZE)]
+            try:
+                chunk_results = await asyncio.gather(*(self._send_batch_chunk(chunk, start) for start, chunk in chunks))
+                return [result for chunk in chunk_results for result in chunk]
+            except APIError as e:
+                if e.status_code not in (404, 405):
+                    raise
+                logger.warning(f"SDK: Batch endpoint unavailable ({e.status_code}); falling back to individual requests.")
+                self._batch_supported = False
+        return list(await asyncio.gather(*(self._send_unbatched(i, req) for i, req in enumerate(requests))))
+
+    async def _send_batch_chunk(self, chunk: List[BatchRequest], start: int) -> List[BatchResult]:
+        response_data = await self._request("POST", BATCH_ENDPOINT, json_data=encode_batch(chunk, start))
+        return decode_batch(chunk, response_data, start)
+
+    async def _send_unbatched(self, index: int, req: BatchRequest) -> BatchResult:
+        req_id = req.id or str(index)
+        try:
+            data = await self._request(req.method, req.path, params=req.to_wire(index)["params"])
+            return BatchResult(id=req_id, status_code=200, data=data)
+        except APIError as e:
+            return BatchResult(id=req_id, status_code=e.status_code or 500, error=str(e))
+        except ForgeIQSDKError as e:
+            return BatchResult(id=req_id, status_code=503, error=str(e))
+
+    # --- Cursor pagination ---
+    async def fetch_page(self,
+                         endpoint: str,
+                         items_key: str,
+                         params: Optional[Dict[str, Any]] = None,
+                         cursor: Optional[str] = None,
+                         page_size: int = 100,
+                         model: Optional[Any] = None) -> CursorPage[Any]:
+        """Fetch a single page of a cursor-paginated list endpoint.
+
+        `model` is an SDK model class (decoded by the typed path when available)
+        or any callable mapping a raw item dict to a value.
+        """
+        page_params = {k: v for k, v in (params or {}).items() if v is not None}
+        page_params["limit"] = page_size
+        if cursor:
+            page_params["cursor"] = cursor
+        decoder = self._typed_decoder(model, items_key)
+        response_data = await self._request("GET", endpoint, params=page_params, decoder=decoder)
+        raw_items = response_data.get(items_key, [])
+        if decoder is not None or model is None:
+            items = raw_items
+        else:
+            items = [model.from_dict(item) if hasattr(model, "from_dict") else model(item) for item in raw_items]
+        return CursorPage(items=items, next_cursor=response_data.get("next_cursor"), cursor=cursor,
+                          total=response_data.get("total"))
+
+    def _iter_collection(self,
+                         endpoint: str,
+                         items_key: str,
+                         params: Optional[Dict[str, Any]],
+                         model: Optional[Any],
+                         page_size: int,
+                         prefetch: int,
+                         max_buffered_items: Optional[int],
+                         max_items: Optional[int]) -> AsyncIterator[Any]:
+        if max_buffered_items is not None:
+            page_size = max(1, min(page_size, max_buffered_items))  # One page must fit the memory budget
+
+        async def _fetch(cursor: Optional[str]) -> CursorPage[Any]:
+            return await self.fetch_page(endpoint, items_key, params=params, cursor=cursor,
+                                         page_size=page_size, model=model)
+        return iterate_items(_fetch, prefetch=prefetch, page_size=page_size,
+                             max_buffered_items=max_buffered_items, max_items=max_items)
+
+    # --- Facets (filter options) ---
+    async def get_facets(self, resource: str, fields: Sequence[str], **filters: Any) -> Facets:
+        """Distinct values and counts of `fields` across the whole `resource` collection."""
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if resource not in self._facets_unsupported:
+            params = {"fields": ",".join(fields), **filters}
+            try:
+                return Facets.from_wire(await self._request("GET", f"/api/forgeiq/{resource}/facets", params=params))
+            except APIError as e:
+                if e.status_code not in (404, 405):
+                    raise
+                logger.warning(f"SDK: No facets endpoint for '{resource}' ({e.status_code}); counting client-side.")
+                self._facets_unsupported.add(resource)
+        items_key = FACET_RESOURCES.get(resource)
+        if items_key is None:
+            raise ForgeIQSDKError(f"No list endpoint known for facets of '{resource}'")
+        items = self._iter_collection(f"/api/forgeiq/{resource}", items_key, filters, None,
+                                      page_size=500, prefetch=1, max_buffered_items=None, max_items=None)
+        return Facets.aggregate([item async for item in items], fields)
+
+    async def get_deployment_facets(self, project_id: Optional[str] = None) -> Facets:
+        return await self.get_facets("deployments", DEPLOYMENT_FACET_FIELDS, project_id=project_id)
+
+    async def get_pipeline_facets(self) -> Facets:
+        return await self.get_facets("pipelines/executions", PIPELINE_FACET_FIELDS)
+
+    async def get_security_facets(self) -> Facets:
+        return await self.get_facets("security/scan-results", SECURITY_FACET_FIELDS)
+
+    async def get_project_facets(self) -> Facets:
+        return await self.get_facets("projects", PROJECT_FACET_FIELDS)
+
+    # --- Deployments ---
+    async def list_deployments(self,
+                               project_id: Optional[str] = None,
+                               service_name: Optional[str] = None,
+                               environment: Optional[str] = None,
+                               status: Optional[str] = None,
+                               limit: int = 25
+                               ) -> List[SDKDeploymentStatus]:
+        params: Dict[str, Any] = {"limit": limit}
+        if project_id: params["project_id"] = project_id
+        if service_name: params["service_name"] = service_name
+        if environment: params["target_environment"] = environment
+        if status: params["status"] = status
+
+        decoder = self._typed_decoder(SDKDeploymentStatus, "deployments")
+        response_data = await self._request("GET", "/api/forgeiq/deployments", params=params, decoder=decoder)
+        items = response_data.get("deployments", [])
+        return items if decoder is not None else [SDKDeploymentStatus.from_dict(item) for item in items]
+
+    def iter_deployments(self,
+                         project_id: Optional[str] = None,
+                         service_name: Optional[str] = None,
+                         environment: Optional[str] = None,
+                         status: Optional[str] = None,
+                         page_size: int = 100,
+                         prefetch: int = 1,
+                         max_buffered_items: Optional[int] = None,
+                         max_items: Optional[int] = None
+                         ) -> AsyncIterator[SDKDeploymentStatus]:
+        """Stream every matching deployment, following server cursors page by page."""
+        params = {"project_id": project_id, "service_name": service_name,
+                  "target_environment": environment, "status": status}
+        return self._iter_collection("/api/forgeiq/deployments", "deployments", params, SDKDeploymentStatus,
+                                     page_size, prefetch, max_buffered_items, max_items)
+
+    async def page_deployments(self,
+                               project_id: Optional[str] = None,
+                               service_name: Optional[str] = None,
+                               environment: Optional[str] = None,
+                               status: Optional[str] = None,
+                               sort: Optional[str] = None,
+                               cursor: Optional[str] = None,
+                               page_size: int = 50
+                               ) -> CursorPage[SDKDeploymentStatus]:
+        """One page of matching deployments, filtered and sorted server-side (`sort` like "-started_at")."""
+        params = {"project_id": project_id, "service_name": service_name,
+                  "target_environment": environment, "status": status, "sort": sort}
+        return await self.fetch_page("/api/forgeiq/deployments", "deployments", params=params, cursor=cursor,
+                                     page_size=page_size, model=SDKDeploymentStatus)
+
+    async def trigger_service_rollback(self, project_id: str, service_name: str, current_deployment_id: str) -> Dict[str, Any]:
+        payload = {
+            "project_id": project_id,
+            "service_name": service_name,
+            "rollback_target_type": "previous_successful", # Example
+            "current_deployment_id_for_context": current_deployment_id
+        }
+        return await self._request("POST", "/api/forgeiq/deployments/rollback", json_data=payload)
+
+    # --- Projects ---
+    async def list_projects(self) -> List[Dict[str, Any]]:
+        logger.info("SDK: Listing all projects.")
+        response_data = await self._request("GET", "/api/forgeiq/projects")
+        return response_data.get("projects", [])
+
+    def iter_projects(self,
+                      page_size: int = 100,
+                      prefetch: int = 1,
+                      max_buffered_items: Optional[int] = None,
+                      max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_collection("/api/forgeiq/projects", "projects", None, None,
+                                     page_size, prefetch, max_buffered_items, max_items)
+
+    # --- Pipelines ---
+    async def list_pipeline_executions(self,
+                                       project_id: Optional[str] = None,
+                                       status: Optional[str] = None,
+                                       limit: int = 25
+                                       ) -> List[SDKDagExecutionStatus]:
+        params: Dict[str, Any] = {"limit": limit}
+        if project_id: params["project_id"] = project_id
+        if status: params["status"] = status
+
+        decoder = self._typed_decoder(SDKDagExecutionStatus, "pipelines")
+        response_data = await self._request("GET", "/api/forgeiq/pipelines/executions", params=params, decoder=decoder)
+        items = response_data.get("pipelines", [])
+        return items if decoder is not None else [SDKDagExecutionStatus.from_dict(item) for item in items]
+
+    def iter_pipeline_executions(self,
+                                 project_id: Optional[str] = None,
                                  status: Optional[str] = None,
-                                 limit: int = 25
-                                ) -> List[SDKDagExecutionStatus]: # Returns list of status models
-    params = {"limit": limit}
-    if project_id: params["project_id"] = project_id
-    if status: params["status"] = status
-
-    response_data = await self._request("GET", "/api/forgeiq/pipelines/executions", params=params)
-    return [SDKDagExecutionStatus(**item) for item in response_data.get("pipelines", [])]
-
-async def rerun_pipeline(self, project_id: str, dag_id: str) -> Dict[str, Any]:
-    endpoint = f"/api/forgeiq/pipelines/executions/{dag_id}/rerun"
-    logger.info(f"SDK: Requesting rerun for DAG '{dag_id}' in project '{project_id}'")
-    return await self._request("POST", endpoint, json_data={"project_id": project_id})
-
-# In sdk/client.py within ForgeIQClient class
-async def list_all_agents(self) -> List[Dict[str, Any]]: # Returns list of AgentRegistrationInfo-like dicts
-    logger.info("SDK: Listing all registered agents.")
-    response_data = await self._request("GET", "/api/forgeiq/agents")
-    return response_data.get("agents", [])
+                                 page_size: int = 100,
+                                 prefetch: int = 1,
+                                 max_buffered_items: Optional[int] = None,
+                                 max_items: Optional[int] = None
+                                 ) -> AsyncIterator[SDKDagExecutionStatus]:
+        """Stream every matching DAG execution, prefetching the next page while the caller works."""
+        params = {"project_id": project_id, "status": status}
+        return self._iter_collection("/api/forgeiq/pipelines/executions", "pipelines", params, SDKDagExecutionStatus,
+                                     page_size, prefetch, max_buffered_items, max_items)
+
+    async def get_dag_execution_status(self, project_id: str, dag_id: str) -> SDKDagExecutionStatus:
+        """One DAG execution with all task statuses and, when the backend has it, the DAG definition."""
+        response_data = await self._request("GET", f"/api/forgeiq/projects/{project_id}/dags/{dag_id}/status")
+        return SDKDagExecutionStatus.from_dict(response_data)
+
+    async def sync_pipeline_executions(self,
+                                       since: Optional[str] = None,
+                                       store: Optional[ExecutionStore] = None,
+                                       page_size: int = 500) -> SyncResult:
+        """Pull executions changed since `since` (default: the store's watermark) into `store`.
+
+        Only changed DAGs, changed task statuses and tombstones for deleted DAGs
+        cross the wire, so a refresh costs O(changed) rather than O(all).
+        """
+        store = store if store is not None else self.executions
+        since = since if since is not None else store.watermark
+        if not self._delta_sync_supported:
+            return await self._full_pipeline_sync(store, page_size)
+
+        total = SyncResult(watermark=since)
+        cursor: Optional[str] = None
+        while True:
+            params: Dict[str, Any] = {"limit": page_size, "since": since, "cursor": cursor}
+            try:
+                response_data = await self._request("GET", CHANGES_ENDPOINT,
+                                                    params={k: v for k, v in params.items() if v is not None})
+            except APIError as e:
+                if e.status_code not in (404, 405) or total.pages:
+                    raise
+                logger.warning(f"SDK: Executions changes endpoint unavailable ({e.status_code}); using full listings.")
+                self._delta_sync_supported = False
+                return await self._full_pipeline_sync(store, page_size)
+            delta = ExecutionDelta.from_wire(response_data)
+            page = store.apply(delta, first_page=not total.pages)
+            total.upserted += page.upserted
+            total.deleted += page.deleted
+            total.full_resync = total.full_resync or page.full_resync
+            total.pages += 1
+            total.watermark = delta.watermark or total.watermark
+            if not delta.next_cursor:
+                break
+            cursor = delta.next_cursor
+        store.commit(total.watermark, full_resync=total.full_resync)
+        logger.info(f"SDK: Synced executions since {since}: {total.upserted} changed, {total.deleted} deleted.")
+        return total
+
+    async def _full_pipeline_sync(self, store: ExecutionStore, page_size: int) -> SyncResult:
+        executions = [e async for e in self.iter_pipeline_executions(page_size=page_size)]
+        store.replace_all(executions)
+        return SyncResult(watermark=None, upserted=len(executions), full_resync=True, pages=1)
+
+    async def rerun_pipeline(self, project_id: str, dag_id: str) -> Dict[str, Any]:
+        endpoint = f"/api/forgeiq/pipelines/executions/{dag_id}/rerun"
+        logger.info(f"SDK: Requesting rerun for DAG '{dag_id}' in project '{project_id}'")
+        return await self._request("POST", endpoint, json_data={"project_id": project_id})
+
+    # --- Security ---
+    async def list_scan_results(self,
+                                project_id: Optional[str] = None,
+                                scan_type: Optional[str] = None,
+                                min_severity: Optional[str] = None,
+                                limit: int = 50) -> List[SDKScanResult]:
+        """Scan events with finding counts only; fetch findings with query_findings()."""
+        logger.info(f"SDK: Listing scan results (project={project_id}, type={scan_type}, min_severity={min_severity}).")
+        params = {"project_id": project_id, "scan_type": scan_type, "min_severity": min_severity,
+                  "limit": limit, "include_findings": "false"}
+        # Generic decoding on purpose: a backend that ignores include_findings still embeds
+        # the findings, and SDKScanResult reduces them to counts.
+        response_data = await self._request("GET", SCAN_RESULTS_ENDPOINT,
+                                            params={k: v for k, v in params.items() if v is not None})
+        return [SDKScanResult.from_dict(item) for item in response_data.get("scan_results", [])]
+
+    async def page_scan_results(self,
+                                project_id: Optional[str] = None,
+                                scan_type: Optional[str] = None,
+                                min_severity: Optional[str] = None,
+                                sort: Optional[str] = None,
+                                cursor: Optional[str] = None,
+                                page_size: int = 50) -> CursorPage[SDKScanResult]:
+        """One page of scan events (finding counts only), filtered and sorted server-side."""
+        params = {"project_id": project_id, "scan_type": scan_type, "min_severity": min_severity,
+                  "sort": sort, "include_findings": "false"}
+        # Generic decoding, as in list_scan_results()
+        return await self.fetch_page(SCAN_RESULTS_ENDPOINT, "scan_results", params=params, cursor=cursor,
+                                     page_size=page_size, model=SDKScanResult.from_dict)
+
+    async def query_findings(self, scan_id: str, query: Optional[FindingsQuery] = None, **criteria: Any) -> FindingsPage:
+        """Filtered, sorted top-N findings of one scan (`criteria` are FindingsQuery fields)."""
+        query = query or FindingsQuery(**criteria)
+        if self._findings_query_supported:
+            try:
+                return FindingsPage.from_wire(await self._request("GET", findings_endpoint(scan_id),
+                                                                  params=query.params()))
+            except APIError as e:
+                if e.status_code not in (404, 405):
+                    raise
+                # 404 may mean an unknown scan rather than a missing endpoint; the record fetch below tells.
+                record = await self._request("GET", f"{SCAN_RESULTS_ENDPOINT}/{scan_id}")
+                logger.warning(f"SDK: No findings query endpoint ({e.status_code}); filtering findings client-side.")
+                self._findings_query_supported = False
+        else:
+            record = await self._request("GET", f"{SCAN_RESULTS_ENDPOINT}/{scan_id}")
+        return query.apply(SDKSecurityFinding.from_dict(f) for f in record.get("findings", []))
+
+    async def _all_scan_findings(self, scan_id: str, page_size: int = 1000) -> List[SDKSecurityFinding]:
+        if self._findings_query_supported:
+            try:
+                items = self._iter_collection(findings_endpoint(scan_id), "findings", {"sort": "file_path"},
+                                              SDKSecurityFinding, page_size=page_size, prefetch=1,
+                                              max_buffered_items=None, max_items=None)
+                return [finding async for finding in items]
+            except APIError as e:
+                if e.status_code not in (404, 405):
+                    raise
+        page = await self.query_findings(scan_id, limit=sys.maxsize)
+        return page.findings
+
+    async def index_scan_findings(self,
+                                  scans: List[SDKScanResult],
+                                  index: Optional[FindingsIndex] = None,
+                                  concurrency: int = 4) -> int:
+        """Feed the findings of scans not yet in `index` (default: self.findings_index). Returns scans added."""
+        index = index if index is not None else self.findings_index
+        pending = [s for s in scans if s.scan_id and not index.has_scan(s.scan_id)]
+        if not pending:
+            return 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _index(scan: SDKScanResult) -> bool:
+            async with semaphore:
+                findings = await self._all_scan_findings(scan.scan_id) if scan.findings_count else []
+            return index.ingest(scan, findings)
+
+        added = sum(await asyncio.gather(*(_index(scan) for scan in pending)))
+        logger.info(f"SDK: Indexed findings of {added} scans ({index.stats()}).")
+        return added
+
+    # --- Governance ---
+    async def sync_audit_logs(self, store: AuditLogStore, history_days: int = 90, page_size: int = 1000) -> AuditSyncResult:
+        """Append new audit-log entries to `store` (see sdk/audit_store.py for the sync contract)."""
+        result = await self._sync_into_store(store, AUDIT_LOGS_ENDPOINT, "audit_logs", "audit_logs",
+                                             store.insert_many, history_days, page_size)
+        store.set_state("last_sync", datetime.datetime.now(datetime.timezone.utc).isoformat())
+        logger.info(f"SDK: Audit log sync {result.as_dict()}")
+        return result
+
+    async def sync_governance_alerts(self, store: AuditLogStore, history_days: int = 90,
+                                     page_size: int = 500) -> AuditSyncResult:
+        """Append new SLA-violation and governance alerts to `store`, indexing them for search."""
+        result = await self._sync_into_store(store, GOVERNANCE_ALERTS_ENDPOINT, "alerts", "governance_alerts",
+                                             store.insert_alerts, history_days, page_size)
+        logger.info(f"SDK: Governance alert sync {result.as_dict()}")
+        return result
+
+    async def _sync_into_store(self, store: AuditLogStore, endpoint: str, items_key: str, table: str,
+                               insert: Any, history_days: int, page_size: int) -> AuditSyncResult:
+        started = time.monotonic()
+        watermark_key, run_key = f"{table}.watermark", f"{table}.run"
+        watermark = parse_timestamp(store.get_state(watermark_key))
+        run = json.loads(store.get_state(run_key) or "null")
+        if run is None:
+            # Nothing to resume: start a new run from the last completed sync (or the history window)
+            date_start = watermark or datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=history_days)
+            run = {"date_start": date_start.isoformat(), "cursor": None}
+            store.set_state(run_key, json.dumps(run))
+        else:
+            logger.info(f"SDK: Resuming unfinished {table} sync from {run['date_start']} at cursor {run['cursor']!r}")
+        result = AuditSyncResult(backfill=watermark is None)
+        params = {"date_start": run["date_start"]}
+
+        def _fetch(cursor: Optional[str]) -> "asyncio.Future[CursorPage[Any]]":
+            return asyncio.ensure_future(self.fetch_page(endpoint, items_key, params=params,
+                                                         cursor=cursor, page_size=page_size))
+
+        pending: Optional["asyncio.Future[CursorPage[Any]]"] = _fetch(run["cursor"])
+        try:
+            while pending is not None:
+                try:
+                    page = await pending
+                except APIError as e:
+                    if not run["cursor"] or result.pages or not 400 <= e.status_code < 500:
+                        raise
+                    logger.warning(f"SDK: Saved {table} sync cursor rejected ({e.status_code}); restarting the run")
+                    run["cursor"] = None
+                    pending = _fetch(None)
+                    continue
+                # Request the next page while this one is written (and indexed)
+                pending = _fetch(page.next_cursor) if page.next_cursor else None
+                result.pages += 1
+                result.received += len(page.items)
+                result.inserted += await asyncio.to_thread(insert, page.items)
+                if page.next_cursor:
+                    # Rows are stored: an interrupted run picks up after this page
+                    run["cursor"] = page.next_cursor
+                    store.set_state(run_key, json.dumps(run))
+        finally:
+            if pending is not None:
+                pending.cancel()
+        # Only a completed run covers [date_start, now]; the endpoints may return rows in any order, so
+        # the newest stored row is a safe starting point for the next sync only now
+        newest = store.newest_timestamp(table)
+        if newest is not None:
+            store.set_state(watermark_key, newest.isoformat())
+        store.set_state(run_key, None)
+        if result.backfill and result.inserted:
+            await asyncio.to_thread(store.optimize_search_index)
+        result.elapsed_s = round(time.monotonic() - started, 3)
+        return result
+
+    # --- Build-system configuration ---
+    async def get_build_system_config(self) -> Dict[str, Any]:
+        """The full BuildSystemConfig: global defaults plus every project's overrides."""
+        logger.info("SDK: Fetching build-system configuration.")
+        return await self._request("GET", CONFIG_ENDPOINT)
+
+    async def load_build_config(self, resolver: Optional[ConfigResolver] = None) -> ConfigResolver:
+        """Fetch the config into `resolver` (default: self.build_config), which resolves projects client-side.
+
+        Unchanged configs come back as 304s from the response cache, and the
+        resolver keeps its memoized merges for them.
+        """
+        resolver = resolver or self.build_config
+        resolver.load(await self.get_build_system_config())
+        return resolver
+
+    # --- Agents ---
+    async def list_all_agents(self) -> List[Dict[str, Any]]: # Returns list of AgentRegistrationInfo-like dicts
+        logger.info("SDK: Listing all registered agents.")
+        response_data = await self._request("GET", "/api/forgeiq/agents")
+        return response_data.get("agents", [])
+
+    def iter_agents(self,
+                    page_size: int = 100,
+                    prefetch: int = 1,
+                    max_buffered_items: Optional[int] = None,
+                    max_items: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_collection("/api/forgeiq/agents", "agents", None, None,
+                                     page_size, prefetch, max_buffered_items, max_items)
+
+    async def probe_agents(self, agents: Optional[List[Dict[str, Any]]] = None) -> FleetProbeResult:
+        """Health-check every agent (default: the whole registry) concurrently; RTTs feed self.probes' histograms."""
+        if agents is None:
+            agents = await self.list_all_agents()
+        return await self.probes.probe_fleet(agents)
+
+    async def ping_agent(self, agent: Dict[str, Any]) -> ProbeResult:
+        """Health-check one agent registry record."""
+        return await self.probes.probe(agent)
@@ -0,0 +1,255 @@
+# =============================
+# 📁 sdk/codecs.py
+# =============================
+# Pluggable body codecs for ForgeIQClient.
+#
+# Decoding dominates CPU time on the large list endpoints (audit logs, scan
+# results), so the client picks the fastest JSON decoder installed (msgspec,
+# then orjson, then the stdlib) and can negotiate MessagePack with the backend
+# via the Accept header. Responses are decoded by their Content-Type, so a
+# backend that ignores the negotiation still works. All codecs produce the same
+# builtin structures (dicts, lists, str, numbers), which the SDK models decode.
+#
+# Benchmark: PYTHONPATH=. python benchmarks/bench_codecs.py
+import dataclasses
+import datetime
+import json
+import logging
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+class Codec:
+    name = "base"
+    media_type = JSON_MEDIA_TYPE
+
+    def decode(self, content: bytes) -> Any:
+        raise NotImplementedError
+
+    def encode(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class StdlibJsonCodec(Codec):
+    name = "json"
+
+    def decode(self, content: bytes) -> Any:
+        return json.loads(content)
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+class _FunctionCodec(Codec):
+    def __init__(self, name: str, media_type: str,
+                 decode: Callable[[bytes], Any], encode: Callable[[Any], bytes]):
+        self.name = name
+        self.media_type = media_type
+        self._decode = decode
+        self._encode = encode
+
+    def decode(self, content: bytes) -> Any:
+        return self._decode(content)
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encode(obj)
+
+
+def _orjson_codec() -> Optional[Codec]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return _FunctionCodec("orjson", JSON_MEDIA_TYPE, orjson.loads,
+                          lambda obj: orjson.dumps(obj, default=str))
+
+
+def _msgspec_json_codec() -> Optional[Codec]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    decoder, encoder = msgspec.json.Decoder(), msgspec.json.Encoder(enc_hook=str)
+    return _FunctionCodec("msgspec-json", JSON_MEDIA_TYPE, decoder.decode, encoder.encode)
+
+
+def _msgpack_codec() -> Optional[Codec]:
+    try:
+        import msgspec
+        decoder, encoder = msgspec.msgpack.Decoder(), msgspec.msgpack.Encoder(enc_hook=str)
+        return _FunctionCodec("msgspec-msgpack", MSGPACK_MEDIA_TYPE, decoder.decode, encoder.encode)
+    except ImportError:
+        pass
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return _FunctionCodec("msgpack", MSGPACK_MEDIA_TYPE,
+                          lambda content: msgpack.unpackb(content, raw=False),
+                          lambda obj: msgpack.packb(obj, use_bin_type=True, default=str))
+
+
+_FACTORIES: Dict[str, Callable[[], Optional[Codec]]] = {
+    "orjson": _orjson_codec,
+    "msgspec-json": _msgspec_json_codec,
+    "json": StdlibJsonCodec,
+    "msgpack": _msgpack_codec,
+}
+JSON_PREFERENCE = ("msgspec-json", "orjson", "json")  # Measured order, see benchmarks/bench_codecs.py
+
+
+def get_codec(name: str) -> Optional[Codec]:
+    """The named codec, or None if its package isn't installed."""
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown codec '{name}'; expected one of {sorted(_FACTORIES)}")
+    return factory()
+
+
+def available_codecs() -> List[Codec]:
+    return [codec for codec in (factory() for factory in _FACTORIES.values()) if codec is not None]
+
+
+def best_json_codec() -> Codec:
+    for name in JSON_PREFERENCE:
+        codec = get_codec(name)
+        if codec is not None:
+            return codec
+    return StdlibJsonCodec()
+
+
+class CodecSet:
+    """The client's codecs: one JSON codec plus an optional binary codec to negotiate."""
+
+    def __init__(self, json_codec: Union[str, Codec, None] = None, binary: Union[bool, str, Codec] = False):
+        if isinstance(json_codec, Codec):
+            self.json = json_codec
+        elif json_codec:
+            self.json = get_codec(json_codec) or best_json_codec()
+        else:
+            self.json = best_json_codec()
+
+        self.binary: Optional[Codec] = None
+        if isinstance(binary, Codec):
+            self.binary = binary
+        elif binary:
+            self.binary = get_codec("msgpack" if binary is True else binary)
+            if self.binary is None:
+                logger.warning("SDK: MessagePack requested but neither msgspec nor msgpack is installed; using JSON.")
+
+    @property
+    def accept_header(self) -> str:
+        if self.binary is not None:
+            return f"{self.binary.media_type}, {JSON_MEDIA_TYPE};q=0.9"
+        return JSON_MEDIA_TYPE
+
+    def for_content_type(self, content_type: Optional[str]) -> Codec:
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        if media_type in _MSGPACK_ALIASES:
+            if self.binary is None:
+                self.binary = get_codec("msgpack")
+                if self.binary is None:
+                    raise ValueError(f"Response is {media_type} but no MessagePack codec is installed")
+            return self.binary
+        return self.json
+
+    def describe(self) -> Dict[str, Optional[str]]:
+        return {"json": self.json.name, "binary": self.binary.name if self.binary else None}
+
+
+# --- Typed decoding (msgspec) ---
+# List endpoints decode straight into SDK models: msgspec validates the envelope
+# and parses RFC 3339 timestamps in C, so the per-item Python work is just the
+# model constructor. Unknown item keys are not kept on this path (`extra` is
+# empty); bodies msgspec rejects fall back to builtin decoding + from_dict().
+try:
+    import msgspec as _msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    _msgspec = None
+
+
+_WIRE_STRUCTS: Dict[type, Any] = {}
+_WIRE_MODELS: Dict[Any, Tuple[type, Dict[int, type]]] = {}  # wire struct -> (model, {field index: nested model})
+
+
+def _wire_struct(model_cls: type) -> Any:
+    struct = _WIRE_STRUCTS.get(model_cls)
+    if struct is not None:
+        return struct
+    hints = typing.get_type_hints(model_cls)
+    nested: Dict[int, type] = {}
+    specs = []
+    for f in dataclasses.fields(model_cls):
+        if f.name == "extra":
+            continue
+        args = typing.get_args(hints[f.name])
+        if typing.get_origin(hints[f.name]) is list and args and hasattr(args[0], "from_dict"):
+            nested[len(specs)] = args[0]
+            specs.append((f.name, List[_wire_struct(args[0])], _msgspec.field(default_factory=list)))
+        else:
+            wire_type = Optional[datetime.datetime] if f.name in model_cls._timestamp_fields else Any
+            if f.default_factory is not dataclasses.MISSING:
+                specs.append((f.name, wire_type, _msgspec.field(default_factory=f.default_factory)))
+            else:
+                specs.append((f.name, wire_type, None if f.default is dataclasses.MISSING else f.default))
+    struct = _WIRE_STRUCTS[model_cls] = _msgspec.defstruct(f"{model_cls.__name__}Wire", specs)
+    _WIRE_MODELS[struct] = (model_cls, nested)
+    return struct
+
+
+def _from_wire(wire: Any) -> Any:
+    model_cls, nested = _WIRE_MODELS[type(wire)]
+    values = _msgspec.structs.astuple(wire)
+    if nested:
+        values = list(values)
+        for i in nested:
+            values[i] = [_from_wire(v) for v in values[i]]
+    instance = model_cls(*values)
+    instance._normalize_decoded()
+    return instance
+
+
+class TypedItemsDecoder:
+    """Decodes {"<items_key>": [...], "next_cursor": ...} bodies into a dict whose items are SDK models."""
+
+    def __init__(self, model_cls: type, items_key: str):
+        self.model_cls = model_cls
+        self.items_key = items_key
+        self.cache_tag = f"typed:{model_cls.__name__}"
+        self._decoders: Dict[str, Any] = {}
+
+    @property
+    def available(self) -> bool:
+        return _msgspec is not None
+
+    def _decoder_for(self, media_type: str) -> Any:
+        decoder = self._decoders.get(media_type)
+        if decoder is None:
+            envelope = _msgspec.defstruct(f"{self.model_cls.__name__}Page", [
+                (self.items_key, List[_wire_struct(self.model_cls)], _msgspec.field(default_factory=list)),
+                ("next_cursor", Optional[str], None),
+                ("total", Optional[int], None),
+            ])
+            module = _msgspec.msgpack if media_type == MSGPACK_MEDIA_TYPE else _msgspec.json
+            decoder = self._decoders[media_type] = module.Decoder(envelope)
+        return decoder
+
+    def decode(self, content: bytes, codec: Codec) -> Dict[str, Any]:
+        try:
+            page = self._decoder_for(codec.media_type).decode(content)
+        except _msgspec.ValidationError as e:
+            logger.debug(f"SDK: typed decode of {self.model_cls.__name__} failed ({e}); using from_dict.")
+            data = codec.decode(content)
+            items = data.get(self.items_key, []) if isinstance(data, dict) else []
+            return {**data, self.items_key: [self.model_cls.from_dict(item) for item in items]}
+        return {self.items_key: [_from_wire(w) for w in getattr(page, self.items_key)],
+                "next_cursor": page.next_cursor, "total": page.total}
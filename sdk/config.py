@@ -0,0 +1,246 @@
+# =============================
+# 📁 sdk/config.py
+# =============================
+# Client-side resolution of the build-system configuration.
+#
+# The backend's BuildSystemConfig holds global defaults (global_dag_rules,
+# global_task_weights, global_clearance_policies) and per-project overrides
+# under `projects`. ConfigResolver merges a project's overrides onto the
+# defaults itself, so one fetch of the global config serves every project:
+#
+# - Each layer is hashed once per loaded config (canonical JSON). Effective
+#   configs are memoized by (defaults hash, project hash), so projects with
+#   identical overrides share one merge, and reloading an unchanged config
+#   keeps every memoized merge.
+# - Merging copies only the dicts along overridden paths; untouched subtrees
+#   are the defaults' own objects. diff() skips identical objects and
+#   layers with equal hashes, so comparing two projects walks only what
+#   either of them overrides.
+# - The last few distinct configs are kept as versions to diff against.
+import datetime
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+CONFIG_ENDPOINT = "/api/forgeiq/config/build-system"
+
+# Effective-config section -> global defaults key
+GLOBAL_SECTIONS: Dict[str, str] = {
+    "dag_rules": "global_dag_rules",
+    "task_weights": "global_task_weights",
+    "clearance_policies": "global_clearance_policies",
+}
+
+_MISSING = object()
+
+
+def content_hash(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def deep_merge(base: Any, override: Any) -> Any:
+    """`override` onto `base`: dicts merge recursively, anything else replaces; a None value removes the key.
+
+    Subtrees the override does not touch are returned as-is (shared, not copied).
+    A dict the base lacks (or holds a non-dict at) is merged onto an empty dict,
+    so None values inside it are dropped rather than stored.
+    """
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    if not override:
+        return base
+    merged = dict(base)
+    for key, value in override.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict):
+            current = base.get(key)
+            merged[key] = deep_merge(current if isinstance(current, dict) else {}, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigChange:
+    path: str
+    kind: str            # "added", "removed" or "changed"
+    old: Any = None
+    new: Any = None
+
+
+def _join(path: str, key: Any) -> str:
+    return f"{path}[{key}]" if isinstance(key, int) else (f"{path}.{key}" if path else str(key))
+
+
+def diff(old: Any, new: Any, path: str = "", limit: Optional[int] = None) -> List[ConfigChange]:
+    """Structural differences from `old` to `new`, at the deepest differing keys (list items by index)."""
+    changes: List[ConfigChange] = []
+    _diff(old, new, path, changes, limit)
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str, changes: List[ConfigChange], limit: Optional[int]) -> None:
+    if old is new or (limit is not None and len(changes) >= limit):
+        return
+    if old is _MISSING or new is _MISSING:
+        changes.append(ConfigChange(path, "added" if old is _MISSING else "removed",
+                                    None if old is _MISSING else old, None if new is _MISSING else new))
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in sorted(old.keys() | new.keys(), key=str):
+            _diff(old.get(key, _MISSING), new.get(key, _MISSING), _join(path, key), changes, limit)
+    elif isinstance(old, list) and isinstance(new, list):
+        for i in range(max(len(old), len(new))):
+            _diff(old[i] if i < len(old) else _MISSING, new[i] if i < len(new) else _MISSING,
+                  _join(path, i), changes, limit)
+    elif old != new or type(old) is not type(new):
+        changes.append(ConfigChange(path or "$", "changed", old, new))
+
+
+@dataclass(frozen=True)
+class ConfigVersion:
+    hash: str
+    loaded_at: datetime.datetime
+    projects: int
+
+
+class ConfigResolver:
+    """Effective per-project configs from a global BuildSystemConfig. Thread-safe.
+
+    load() is cheap to call on every page run with the same (cached) config
+    object; a different object is hashed layer by layer, and merges memoized
+    for unchanged layers are kept.
+    """
+
+    def __init__(self, max_effective: int = 1024, max_versions: int = 5):
+        self.max_effective = max_effective
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._config: Dict[str, Any] = {}
+        self._defaults: Dict[str, Any] = {}
+        self._defaults_hash = ""
+        self._project_hashes: Dict[str, str] = {}
+        self._effective: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        # version hash -> (version, config, defaults hash, project hashes)
+        self._versions: "OrderedDict[str, Tuple[ConfigVersion, Dict[str, Any], str, Dict[str, str]]]" = OrderedDict()
+        self.merges = 0
+        self.hits = 0
+
+    def load(self, config: Dict[str, Any]) -> str:
+        """Make `config` (a full BuildSystemConfig) current; returns its content hash."""
+        with self._lock:
+            if config is self._config:
+                return self.version
+        defaults = {section: config.get(key) or {} for section, key in GLOBAL_SECTIONS.items()}
+        projects = config.get("projects") or {}
+        defaults_hash = content_hash(defaults)
+        project_hashes = {project_id: content_hash(overrides) for project_id, overrides in projects.items()}
+        version = content_hash([defaults_hash, sorted(project_hashes.items()),
+                                {k: v for k, v in config.items() if k not in GLOBAL_SECTIONS.values() and k != "projects"}])
+        with self._lock:
+            self._config = config
+            self._defaults, self._defaults_hash = defaults, defaults_hash
+            self._project_hashes = project_hashes
+            if version not in self._versions:
+                self._versions[version] = (ConfigVersion(version, datetime.datetime.now(datetime.timezone.utc),
+                                                         len(projects)), config, defaults_hash, project_hashes)
+                while len(self._versions) > self.max_versions:
+                    self._versions.popitem(last=False)
+            else:
+                self._versions.move_to_end(version)
+        return version
+
+    @property
+    def version(self) -> str:
+        return next(reversed(self._versions), "") if self._versions else ""
+
+    def versions(self) -> List[ConfigVersion]:
+        """Distinct configs loaded so far, newest first."""
+        with self._lock:
+            return [entry[0] for entry in reversed(self._versions.values())]
+
+    def project_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._project_hashes)
+
+    def defaults(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._defaults
+
+    def overrides(self, project_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return (self._config.get("projects") or {}).get(project_id) or {}
+
+    def effective(self, project_id: Optional[str] = None) -> Dict[str, Any]:
+        """Defaults with `project_id`'s overrides merged in (the defaults alone for None). Do not mutate."""
+        with self._lock:
+            defaults, defaults_hash = self._defaults, self._defaults_hash
+            if project_id is None:
+                return defaults
+            if project_id not in self._project_hashes:
+                raise KeyError(f"Unknown project {project_id!r}")
+            key = (defaults_hash, self._project_hashes[project_id])
+            cached = self._effective.get(key)
+            if cached is not None:
+                self._effective.move_to_end(key)
+                self.hits += 1
+                return cached
+            overrides = (self._config.get("projects") or {}).get(project_id) or {}
+        merged = self.merge(defaults, overrides)
+        with self._lock:
+            self.merges += 1
+            self._effective[key] = merged
+            while len(self._effective) > self.max_effective:
+                self._effective.popitem(last=False)
+        return merged
+
+    @staticmethod
+    def merge(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+        effective = {section: deep_merge(value, overrides.get(section) or {}) for section, value in defaults.items()}
+        effective.update({k: v for k, v in overrides.items() if k not in defaults})  # Project-only settings
+        return effective
+
+    def diff_projects(self, project_a: Optional[str], project_b: Optional[str],
+                      limit: Optional[int] = None) -> List[ConfigChange]:
+        """Differences between two projects' effective configs (None is the global defaults)."""
+        with self._lock:
+            hashes = self._project_hashes
+            if project_a is not None and project_b is not None and hashes.get(project_a) == hashes.get(project_b):
+                return []
+        return diff(self.effective(project_a), self.effective(project_b), limit=limit)
+
+    def diff_versions(self, old_version: str, new_version: Optional[str] = None,
+                      project_id: Optional[str] = None, limit: Optional[int] = None) -> List[ConfigChange]:
+        """Differences between two loaded versions: of one project's effective config, or of the whole config.
+
+        Whole-config diffs only walk the layers whose hashes differ.
+        """
+        with self._lock:
+            _, old, old_defaults, old_projects = self._versions[old_version]
+            _, new, new_defaults, new_projects = self._versions[new_version or self.version]
+        if project_id is None:
+            changes: List[ConfigChange] = []
+            for key in sorted(old.keys() | new.keys(), key=str):  # Stable row order, as in _diff
+                if key == "projects":
+                    continue
+                if key in GLOBAL_SECTIONS.values() and old_defaults == new_defaults:
+                    continue
+                _diff(old.get(key, _MISSING), new.get(key, _MISSING), key, changes, limit)
+            old_by_id, new_by_id = old.get("projects") or {}, new.get("projects") or {}
+            for pid in sorted(old_projects.keys() | new_projects.keys()):
+                if old_projects.get(pid) != new_projects.get(pid):
+                    _diff(old_by_id.get(pid, _MISSING), new_by_id.get(pid, _MISSING), _join("projects", pid), changes, limit)
+            return changes[:limit] if limit is not None else changes
+        resolve = lambda config: self.merge(  # noqa: E731
+            {section: config.get(key) or {} for section, key in GLOBAL_SECTIONS.items()},
+            (config.get("projects") or {}).get(project_id) or {})
+        return diff(resolve(old), resolve(new), limit=limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"projects": len(self._project_hashes), "memoized": len(self._effective),
+                    "merges": self.merges, "hits": self.hits, "versions": len(self._versions)}
@@ -0,0 +1,339 @@
+# =============================
+# 📁 sdk/dag.py
+# =============================
+# Graph computations for rendering pipeline DAGs of thousands of nodes.
+#
+# A DAG definition ({"id", "task_type", "dependencies"} nodes) is indexed once
+# into integer adjacency lists in topological order. Everything else works on
+# that index in O(V + E):
+#   - task statuses are joined to nodes through a task_id -> index dict;
+#   - the critical path is the longest duration-weighted path, found with one
+#     pass in topological order;
+#   - above a node threshold, nodes are collapsed into one group per task_type;
+#   - the layered layout (longest-path layers, barycenter ordering) is computed
+#     here rather than by Graphviz, and cached by a hash of the structure, so
+#     a change that only touches task statuses reuses the previous layout.
+#
+# Dependency cycles should not occur, but a malformed definition must still
+# render: nodes left over by Kahn's algorithm are appended in input order and
+# edges pointing backwards in that order are ignored for layering and paths.
+import datetime
+import hashlib
+import heapq
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .models import SDKTaskStatus
+
+DEFAULT_COLLAPSE_THRESHOLD = 300
+LAYOUT_CACHE_SIZE = 64
+_BARYCENTER_SWEEPS = 4
+
+# Display priority when a collapsed group holds tasks in several states (first match wins)
+STATUS_PRIORITY = ("FAILED", "CANCELLED", "RUNNING", "STARTED", "QUEUED", "PENDING", "SKIPPED", "SUCCESS")
+
+
+@dataclass(frozen=True)
+class DagStructure:
+    ids: Tuple[str, ...]
+    task_types: Tuple[str, ...]
+    preds: Tuple[Tuple[int, ...], ...]
+    succs: Tuple[Tuple[int, ...], ...]
+    order: Tuple[int, ...]            # Topological order (cycle leftovers last)
+    structure_hash: str
+    ignored_edges: int = 0            # Dependencies on unknown nodes, or closing a cycle
+    index: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def edges(self) -> Iterable[Tuple[int, int]]:
+        for target, sources in enumerate(self.preds):
+            for source in sources:
+                yield source, target
+
+
+def build_structure(nodes: Sequence[Dict[str, Any]]) -> DagStructure:
+    """Index a DAG definition. Duplicate node ids keep their first definition."""
+    index: Dict[str, int] = {}
+    ids: List[str] = []
+    task_types: List[str] = []
+    raw_deps: List[Sequence[str]] = []
+    for node in nodes:
+        node_id = str(node.get("id") or "")
+        if not node_id or node_id in index:
+            continue
+        index[node_id] = len(ids)
+        ids.append(node_id)
+        task_types.append(str(node.get("task_type") or "unknown"))
+        raw_deps.append(node.get("dependencies") or ())
+
+    ignored = 0
+    preds: List[List[int]] = [[] for _ in ids]
+    for target, deps in enumerate(raw_deps):
+        for dep in deps:
+            source = index.get(dep)
+            if source is None or source == target:
+                ignored += 1
+            else:
+                preds[target].append(source)
+
+    # Kahn's algorithm; ties resolve in input order so the result is deterministic
+    succs: List[List[int]] = [[] for _ in ids]
+    indegree = [len(p) for p in preds]
+    for target, sources in enumerate(preds):
+        for source in sources:
+            succs[source].append(target)
+    ready = [i for i, degree in enumerate(indegree) if degree == 0]
+    heapq.heapify(ready)
+    order: List[int] = []
+    while ready:
+        current = heapq.heappop(ready)
+        order.append(current)
+        for target in succs[current]:
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                heapq.heappush(ready, target)
+    if len(order) < len(ids):
+        placed = set(order)
+        order.extend(i for i in range(len(ids)) if i not in placed)
+        position = {node: pos for pos, node in enumerate(order)}
+        for target in range(len(ids)):
+            forward = [s for s in preds[target] if position[s] < position[target]]
+            ignored += len(preds[target]) - len(forward)
+            preds[target] = forward
+        succs = [[] for _ in ids]
+        for target, sources in enumerate(preds):
+            for source in sources:
+                succs[source].append(target)
+
+    digest = hashlib.sha1()
+    for i, node_id in enumerate(ids):
+        digest.update(f"{node_id}\x1f{task_types[i]}\x1f{','.join(ids[s] for s in sorted(preds[i]))}\x1e".encode())
+    return DagStructure(ids=tuple(ids), task_types=tuple(task_types), preds=tuple(map(tuple, preds)),
+                        succs=tuple(map(tuple, succs)), order=tuple(order), structure_hash=digest.hexdigest()[:16],
+                        ignored_edges=ignored, index=index)
+
+
+def join_statuses(structure: DagStructure, task_statuses: Iterable[SDKTaskStatus]) -> List[Optional[SDKTaskStatus]]:
+    """Task status of each node (by index), None for nodes without one."""
+    joined: List[Optional[SDKTaskStatus]] = [None] * len(structure)
+    for task in task_statuses:
+        i = structure.index.get(task.task_id)
+        if i is not None:
+            joined[i] = task
+    return joined
+
+
+def task_durations(statuses: Sequence[Optional[SDKTaskStatus]],
+                   now: Optional[datetime.datetime] = None) -> List[Optional[float]]:
+    """Seconds per node; running tasks count up to `now`, tasks that never started are None."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    durations: List[Optional[float]] = []
+    for task in statuses:
+        if task is None or task.started_at is None:
+            durations.append(None)
+        else:
+            durations.append(max(0.0, ((task.completed_at or now) - task.started_at).total_seconds()))
+    return durations
+
+
+def critical_path(structure: DagStructure, weights: Sequence[Optional[float]]) -> Tuple[List[int], float]:
+    """Longest weighted path (node indices, source first) and its total weight.
+
+    Missing weights count as 0. When no node has a weight the path is the
+    longest chain by node count.
+    """
+    if not len(structure):
+        return [], 0.0
+    if all(w is None for w in weights):
+        weights = [1.0] * len(structure)
+    best = [0.0] * len(structure)
+    via = [-1] * len(structure)
+    for node in structure.order:
+        base, parent = 0.0, -1
+        for source in structure.preds[node]:
+            if best[source] > base or parent < 0:
+                base, parent = best[source], source
+        best[node] = base + (weights[node] or 0.0)
+        via[node] = parent
+    end = max(range(len(structure)), key=best.__getitem__)
+    path = [end]
+    while via[path[-1]] >= 0:
+        path.append(via[path[-1]])
+    path.reverse()
+    return path, best[end]
+
+
+def longest_tasks(structure: DagStructure, durations: Sequence[Optional[float]], n: int = 10) -> List[Tuple[str, float]]:
+    """The `n` slowest nodes as (node id, seconds)."""
+    timed = ((d, i) for i, d in enumerate(durations) if d is not None)
+    return [(structure.ids[i], d) for d, i in heapq.nlargest(n, timed)]
+
+
+def _status_key(task: Optional[SDKTaskStatus]) -> str:
+    return str(task.status) if task is not None and task.status is not None else "UNKNOWN"
+
+
+def group_status(counts: Dict[str, int]) -> str:
+    for status in STATUS_PRIORITY:
+        if counts.get(status):
+            return status
+    return next(iter(counts), "UNKNOWN")
+
+
+def collapse_by_task_type(structure: DagStructure) -> Tuple[DagStructure, List[int]]:
+    """One node per task_type, with the deduplicated edges between types.
+
+    Returns the collapsed structure and, for each original node, the index of
+    its group. Types that depend on each other both ways form a cycle, which
+    build_structure() breaks.
+    """
+    group_of: Dict[str, int] = {}
+    members = [group_of.setdefault(task_type, len(group_of)) for task_type in structure.task_types]
+    deps: List[Set[str]] = [set() for _ in group_of]
+    names = list(group_of)
+    for source, target in structure.edges():
+        if members[source] != members[target]:
+            deps[members[target]].add(f"type:{names[members[source]]}")
+    collapsed = build_structure([{"id": f"type:{name}", "task_type": name, "dependencies": sorted(deps[i])}
+                                 for i, name in enumerate(names)])
+    return collapsed, members
+
+
+@dataclass(frozen=True)
+class Layout:
+    x: Tuple[float, ...]      # Layer (0 = sources), left to right
+    y: Tuple[float, ...]      # Position within the layer
+    layers: int
+    max_layer_size: int
+
+
+def layered_layout(structure: DagStructure) -> Layout:
+    """Longest-path layering, then barycenter sweeps to reduce edge crossings."""
+    n = len(structure)
+    layer = [0] * n
+    for node in structure.order:
+        for source in structure.preds[node]:
+            layer[node] = max(layer[node], layer[source] + 1)
+    layer_count = max(layer, default=-1) + 1
+    rows: List[List[int]] = [[] for _ in range(layer_count)]
+    for node in structure.order:
+        rows[layer[node]].append(node)
+    position = [0.0] * n
+    for row in rows:
+        for pos, node in enumerate(row):
+            position[node] = float(pos)
+
+    for sweep in range(_BARYCENTER_SWEEPS):
+        downward = sweep % 2 == 0
+        neighbours = structure.preds if downward else structure.succs
+        for row in (rows[1:] if downward else reversed(rows[:-1])):
+            def barycenter(node: int) -> float:
+                linked = neighbours[node]
+                return sum(position[m] for m in linked) / len(linked) if linked else position[node]
+            row.sort(key=barycenter)
+            for pos, node in enumerate(row):
+                position[node] = float(pos)
+
+    widest = max((len(row) for row in rows), default=0)
+    # Center each layer on the widest one
+    y = [position[node] + (widest - len(rows[layer[node]])) / 2 for node in range(n)]
+    return Layout(x=tuple(float(l) for l in layer), y=tuple(y), layers=layer_count, max_layer_size=widest)
+
+
+class LayoutCache:
+    """LRU of layouts keyed by structure hash; statuses never enter the key."""
+
+    def __init__(self, maxsize: int = LAYOUT_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Layout]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, structure: DagStructure) -> Tuple[Layout, bool]:
+        """(layout, cache_hit)"""
+        key = structure.structure_hash
+        with self._lock:
+            layout = self._entries.get(key)
+            if layout is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return layout, True
+            self.misses += 1
+        layout = layered_layout(structure)  # Outside the lock; a concurrent duplicate is harmless
+        with self._lock:
+            self._entries[key] = layout
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return layout, False
+
+
+layout_cache = LayoutCache()
+
+
+@dataclass
+class DagView:
+    """Everything a renderer needs: nodes to draw (possibly groups), their layout and state."""
+    structure: DagStructure                     # Displayed nodes (task-type groups when collapsed)
+    layout: Layout
+    statuses: List[str]                         # Per displayed node
+    status_counts: List[Dict[str, int]]         # Per displayed node; one entry unless collapsed
+    durations: List[Optional[float]]            # Per displayed node (sum over members when collapsed)
+    member_counts: List[int]
+    critical_nodes: Set[int]                    # Displayed nodes on the critical path
+    critical_edges: Set[Tuple[int, int]]
+    critical_path: List[str]                    # Task ids of the full-graph critical path
+    critical_seconds: float
+    critical_by_duration: bool
+    total_nodes: int
+    collapsed: bool
+    layout_cached: bool
+    longest: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def build_dag_view(nodes: Sequence[Dict[str, Any]],
+                   task_statuses: Iterable[SDKTaskStatus],
+                   collapse_threshold: Optional[int] = DEFAULT_COLLAPSE_THRESHOLD,
+                   now: Optional[datetime.datetime] = None,
+                   cache: Optional[LayoutCache] = None) -> DagView:
+    """Join, analyse and lay out a DAG; collapse by task_type above `collapse_threshold` nodes (None: never)."""
+    cache = cache or layout_cache
+    full = build_structure(nodes)
+    joined = join_statuses(full, task_statuses)
+    durations = task_durations(joined, now)
+    path, path_weight = critical_path(full, durations)
+    by_duration = any(d is not None for d in durations)
+    path_edges = set(zip(path, path[1:]))
+
+    if collapse_threshold is not None and len(full) > collapse_threshold:
+        shown, members = collapse_by_task_type(full)
+        counts: List[Dict[str, int]] = [{} for _ in range(len(shown))]
+        group_durations: List[Optional[float]] = [None] * len(shown)
+        member_counts = [0] * len(shown)
+        for i, group in enumerate(members):
+            key = _status_key(joined[i])
+            counts[group][key] = counts[group].get(key, 0) + 1
+            member_counts[group] += 1
+            if durations[i] is not None:
+                group_durations[group] = (group_durations[group] or 0.0) + durations[i]
+        critical_nodes = {members[i] for i in path}
+        critical_edges = {(members[a], members[b]) for a, b in path_edges if members[a] != members[b]}
+        statuses = [group_status(c) for c in counts]
+    else:
+        shown = full
+        counts = [{_status_key(task): 1} for task in joined]
+        group_durations, member_counts = durations, [1] * len(full)
+        critical_nodes, critical_edges = set(path), path_edges
+        statuses = [_status_key(task) for task in joined]
+
+    layout, cached = cache.get(shown)
+    return DagView(structure=shown, layout=layout, statuses=statuses, status_counts=counts,
+                   durations=list(group_durations), member_counts=member_counts, critical_nodes=critical_nodes,
+                   critical_edges=critical_edges, critical_path=[full.ids[i] for i in path],
+                   critical_seconds=path_weight if by_duration else 0.0, critical_by_duration=by_duration,
+                   total_nodes=len(full), collapsed=shown is not full, layout_cached=cached,
+                   longest=longest_tasks(full, durations))
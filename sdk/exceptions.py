@@ -0,0 +1,33 @@
+# =============================
+# 📁 sdk/exceptions.py
+# =============================
+from typing import Any, Optional
+
+
+class ForgeIQSDKError(Exception):
+    """Base class for every error raised by the ForgeIQ SDK."""
+
+
+class APIError(ForgeIQSDKError):
+    """The ForgeIQ backend answered with a non-2xx status code."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response_body: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response_body = response_body
+
+    def __str__(self) -> str:
+        base = super().__str__()
+        return f"[{self.status_code}] {base}" if self.status_code is not None else base
+
+
+class TransportError(ForgeIQSDKError):
+    """The request never produced an HTTP response (DNS, connect, TLS, timeout...)."""
+
+
+class CircuitOpenError(ForgeIQSDKError):
+    """The endpoint's circuit breaker is open and there is no last-known-good response to serve."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,71 @@
+# =============================
+# 📁 sdk/facets.py
+# =============================
+# Distinct values + counts ("facets") for building filter dropdowns.
+#
+# Contract: GET /api/forgeiq/<resource>/facets?fields=a,b[&<filter>=...]
+#   response: {"facets": {"a": [{"value": "x", "count": 12}, ...], ...}, "total": 120}
+# One aggregated query instead of listing the collection and taking set() over
+# a truncated page. Backends without the endpoint are handled by streaming the
+# collection and counting client-side (exact, but O(all); see ForgeIQClient.get_facets).
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# resource -> items_key of its list endpoint, for the client-side fallback
+FACET_RESOURCES: Dict[str, str] = {
+    "deployments": "deployments",
+    "pipelines/executions": "pipelines",
+    "security/scan-results": "scan_results",
+    "projects": "projects",
+}
+DEPLOYMENT_FACET_FIELDS = ("project_id", "service_name", "target_environment", "status")
+PIPELINE_FACET_FIELDS = ("project_id", "status")
+SECURITY_FACET_FIELDS = ("project_id", "scan_type")
+PROJECT_FACET_FIELDS = ("project_id",)
+
+
+@dataclass
+class FacetValue:
+    value: str
+    count: int = 0
+
+
+@dataclass
+class Facets:
+    fields: Dict[str, List[FacetValue]] = field(default_factory=dict)
+    total: Optional[int] = None
+    source: str = "server"  # "server" or "client" (aggregated from a full listing)
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> "Facets":
+        return cls(fields={name: [FacetValue(value=str(v.get("value")), count=int(v.get("count", 0)))
+                                  for v in values if v.get("value") is not None]
+                           for name, values in (data.get("facets") or {}).items()},
+                   total=data.get("total"))
+
+    @classmethod
+    def aggregate(cls, items: Iterable[Any], names: Sequence[str]) -> "Facets":
+        counters: Dict[str, Counter] = {name: Counter() for name in names}
+        total = 0
+        for item in items:
+            total += 1
+            for name in names:
+                value = item.get(name)
+                if value is not None:
+                    counters[name][str(value)] += 1
+        return cls(fields={name: [FacetValue(value, count) for value, count in counter.most_common()]
+                           for name, counter in counters.items()},
+                   total=total, source="client")
+
+    def values(self, name: str) -> List[str]:
+        """Distinct values of `name`, sorted alphabetically."""
+        return sorted(v.value for v in self.fields.get(name, []))
+
+    def options(self, name: str, include_all: bool = True, fallback: Sequence[str] = ()) -> List[str]:
+        """Dropdown options: "All" followed by the distinct values (or `fallback` if there are none)."""
+        values = self.values(name) or list(fallback)
+        return (["All"] if include_all else []) + values
+
+    def counts(self, name: str) -> Dict[str, int]:
+        return {v.value: v.count for v in self.fields.get(name, [])}
@@ -0,0 +1,91 @@
+# =============================
+# 📁 sdk/findings.py
+# =============================
+# Security findings query: filter, sort and top-N pushed down to the backend.
+#
+# Scan listings no longer embed findings (a Trivy scan of a large image carries
+# thousands); they carry counts, and findings are fetched per scan, on demand:
+#
+# GET /api/forgeiq/security/scan-results?project_id=&scan_type=&min_severity=&limit=&include_findings=false
+#   -> {"scan_results": [{"scan_id": ..., "findings_count": 1532,
+#                         "severity_counts": {"CRITICAL": 4, "HIGH": 31, ...}, ...}],
+#       "next_cursor": ...}
+# GET /api/forgeiq/security/scan-results/{scan_id}/findings
+#       ?min_severity=HIGH&rule_id=&file_path=<prefix>&sort=-severity,file_path&limit=10&cursor=
+#   -> {"findings": [...], "total": <matches before limit>, "next_cursor": ...}
+#
+# `sort` is a comma-separated list of fields, "-" for descending; severity sorts
+# by rank, not alphabetically. FindingsQuery.apply() implements the same
+# semantics client-side for backends without the findings endpoint.
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import SDKSecurityFinding, severity_rank
+
+SCAN_RESULTS_ENDPOINT = "/api/forgeiq/security/scan-results"
+SORT_FIELDS = ("severity", "file_path", "rule_id", "line_number")
+
+
+def findings_endpoint(scan_id: str) -> str:
+    return f"{SCAN_RESULTS_ENDPOINT}/{scan_id}/findings"
+
+
+@dataclass(frozen=True)
+class FindingsQuery:
+    min_severity: Optional[str] = None
+    rule_id: Optional[str] = None
+    file_path: Optional[str] = None     # Prefix match
+    sort: str = "-severity,file_path,line_number"
+    limit: int = 10                     # Top-N per scan
+    cursor: Optional[str] = None
+
+    def __post_init__(self):
+        for key in self.sort.split(","):
+            if key.lstrip("-") not in SORT_FIELDS:
+                raise ValueError(f"Unsupported findings sort field '{key}'; expected one of {SORT_FIELDS}")
+
+    def params(self) -> Dict[str, Any]:
+        params = {"min_severity": self.min_severity, "rule_id": self.rule_id, "file_path": self.file_path,
+                  "sort": self.sort, "limit": self.limit, "cursor": self.cursor}
+        return {k: v for k, v in params.items() if v not in (None, "", "All")}
+
+    def matches(self, finding: SDKSecurityFinding) -> bool:
+        if self.min_severity not in (None, "", "All") and \
+                severity_rank(finding.severity) < severity_rank(self.min_severity):
+            return False
+        if self.rule_id and finding.rule_id != self.rule_id:
+            return False
+        if self.file_path and not (finding.file_path or "").startswith(self.file_path):
+            return False
+        return True
+
+    def apply(self, findings: Iterable[SDKSecurityFinding]) -> "FindingsPage":
+        """Client-side equivalent of the findings endpoint (offset cursor)."""
+        matches = [f for f in findings if self.matches(f)]
+        # Stable sorts applied from the least significant key up
+        for key in reversed(self.sort.split(",")):
+            name = key.lstrip("-")
+            if name == "severity":
+                sort_key = lambda f: severity_rank(f.severity)
+            elif name == "line_number":
+                sort_key = lambda f: f.line_number if isinstance(f.line_number, int) else -1
+            else:
+                sort_key = lambda f, name=name: getattr(f, name) or ""
+            matches.sort(key=sort_key, reverse=key.startswith("-"))
+        start = int(self.cursor or 0)
+        end = start + self.limit
+        return FindingsPage(findings=matches[start:end], total=len(matches),
+                            next_cursor=str(end) if end < len(matches) else None, source="client")
+
+
+@dataclass
+class FindingsPage:
+    findings: List[SDKSecurityFinding] = field(default_factory=list)
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+    source: str = "server"  # "server" or "client" (filtered from the full scan record)
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> "FindingsPage":
+        findings = [SDKSecurityFinding.from_dict(f) for f in data.get("findings", [])]
+        return cls(findings=findings, total=data.get("total", len(findings)), next_cursor=data.get("next_cursor"))
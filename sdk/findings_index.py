@@ -0,0 +1,170 @@
+# =============================
+# 📁 sdk/findings_index.py
+# =============================
+# Cross-scan deduplication of security findings.
+#
+# The same finding (project, rule_id, file_path, line) is reported by every
+# scan of every commit. The index keys findings by a stable fingerprint of
+# those fields and keeps one record per fingerprint with first/last-seen
+# commit and scan count. Scans are ingested once each (by scan_id), so the
+# index grows incrementally as scan results arrive instead of being rebuilt.
+#
+# Scans of the same project and scan type form a stream. For each stream the
+# index keeps the fingerprint sets of its two most recent scans and the
+# new/fixed differences between them, computed at ingest time; the
+# "new since last scan" and "fixed since last scan" queries are dict lookups.
+import datetime
+import hashlib
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .models import SDKScanResult, SDKSecurityFinding, severity_rank
+
+StreamKey = Tuple[Optional[str], Optional[str]]  # (project_id, scan_type)
+
+_EPOCH = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+
+def fingerprint(project_id: Optional[str], finding: SDKSecurityFinding) -> str:
+    """Stable identity of a finding across scans and commits."""
+    raw = f"{project_id}|{finding.rule_id}|{finding.file_path}|{finding.line_number}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+@dataclass(slots=True, eq=False)
+class IndexedFinding:
+    fingerprint: str
+    project_id: Optional[str]
+    scan_type: Optional[str]
+    rule_id: Optional[str]
+    file_path: Optional[str]
+    line_number: Optional[int]
+    severity: Optional[Any]
+    description: Optional[str]
+    first_seen_commit: Optional[str] = None
+    first_seen_at: Optional[datetime.datetime] = None
+    last_seen_commit: Optional[str] = None
+    last_seen_at: Optional[datetime.datetime] = None
+    scans: int = 0
+
+
+@dataclass
+class _Stream:
+    latest: Optional[Tuple[datetime.datetime, str]] = None    # (timestamp, scan_id)
+    previous: Optional[Tuple[datetime.datetime, str]] = None
+    latest_set: FrozenSet[str] = frozenset()
+    previous_set: FrozenSet[str] = frozenset()
+    new: FrozenSet[str] = frozenset()                          # latest - previous
+    fixed: FrozenSet[str] = frozenset()                        # previous - latest
+
+    def place(self, stamp: Tuple[datetime.datetime, str], prints: FrozenSet[str]) -> None:
+        if self.latest is None or stamp > self.latest:
+            self.previous, self.previous_set = self.latest, self.latest_set
+            self.latest, self.latest_set = stamp, prints
+        elif self.previous is None or stamp > self.previous:
+            self.previous, self.previous_set = stamp, prints  # Arrived out of order
+        else:
+            return
+        if self.previous is None:
+            self.new, self.fixed = frozenset(), frozenset()
+        else:
+            self.new, self.fixed = self.latest_set - self.previous_set, self.previous_set - self.latest_set
+
+
+class FindingsIndex:
+    """Deduplicated findings across scans, fed one scan at a time. Thread-safe; records are copy-on-write."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, IndexedFinding] = {}
+        self._streams: Dict[StreamKey, _Stream] = {}
+        self._scans: set = set()
+        self.occurrences = 0  # Findings ingested before deduplication
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def has_scan(self, scan_id: str) -> bool:
+        return scan_id in self._scans
+
+    def ingest(self, scan: SDKScanResult, findings: Iterable[SDKSecurityFinding]) -> bool:
+        """Add one scan's findings. Returns False if the scan was already indexed."""
+        if scan.scan_id in self._scans:
+            return False
+        seen_at = scan.timestamp or _EPOCH
+        by_print = {fingerprint(scan.project_id, f): f for f in findings}
+        with self._lock:
+            if scan.scan_id in self._scans:
+                return False
+            self._scans.add(scan.scan_id)
+            self.occurrences += len(by_print)
+            for fp, finding in by_print.items():
+                current = self._records.get(fp)
+                if current is None:
+                    self._records[fp] = IndexedFinding(
+                        fingerprint=fp, project_id=scan.project_id, scan_type=scan.scan_type,
+                        rule_id=finding.rule_id, file_path=finding.file_path, line_number=finding.line_number,
+                        severity=finding.severity, description=finding.description,
+                        first_seen_commit=scan.commit_sha, first_seen_at=seen_at,
+                        last_seen_commit=scan.commit_sha, last_seen_at=seen_at, scans=1)
+                    continue
+                record = replace(current, scans=current.scans + 1)
+                if seen_at < (current.first_seen_at or _EPOCH):
+                    record.first_seen_commit, record.first_seen_at = scan.commit_sha, seen_at
+                if seen_at >= (current.last_seen_at or _EPOCH):
+                    record.last_seen_commit, record.last_seen_at = scan.commit_sha, seen_at
+                    record.severity, record.description = finding.severity, finding.description
+                self._records[fp] = record
+            stream = self._streams.setdefault((scan.project_id, scan.scan_type), _Stream())
+            stream.place((seen_at, scan.scan_id), frozenset(by_print))
+        return True
+
+    def _lookup(self, prints: Iterable[str]) -> List[IndexedFinding]:
+        records = [self._records[fp] for fp in prints if fp in self._records]
+        records.sort(key=lambda r: (-severity_rank(r.severity), r.file_path or "", r.line_number or 0))
+        return records
+
+    def new_since_last_scan(self, project_id: Optional[str], scan_type: Optional[str]) -> List[IndexedFinding]:
+        """Findings in the stream's latest scan that its previous scan did not have."""
+        with self._lock:
+            stream = self._streams.get((project_id, scan_type))
+            return self._lookup(stream.new) if stream else []
+
+    def fixed_since_last_scan(self, project_id: Optional[str], scan_type: Optional[str]) -> List[IndexedFinding]:
+        """Findings in the stream's previous scan that its latest scan no longer reports."""
+        with self._lock:
+            stream = self._streams.get((project_id, scan_type))
+            return self._lookup(stream.fixed) if stream else []
+
+    def is_open(self, record: IndexedFinding) -> bool:
+        stream = self._streams.get((record.project_id, record.scan_type))
+        return stream is not None and record.fingerprint in stream.latest_set
+
+    def findings(self,
+                 project_id: Optional[str] = None,
+                 scan_type: Optional[str] = None,
+                 min_severity: Optional[str] = None,
+                 open_only: bool = False) -> List[IndexedFinding]:
+        """Unique findings, most severe first."""
+        threshold = severity_rank(min_severity) if min_severity not in (None, "", "All") else None
+        with self._lock:
+            matches = [r for r in self._records.values()
+                       if (project_id is None or r.project_id == project_id)
+                       and (scan_type is None or r.scan_type == scan_type)
+                       and (threshold is None or severity_rank(r.severity) >= threshold)
+                       and (not open_only or self.is_open(r))]
+        matches.sort(key=lambda r: (-severity_rank(r.severity), r.file_path or "", r.line_number or 0))
+        return matches
+
+    def streams(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"project_id": project_id, "scan_type": scan_type,
+                     "latest_scan_id": s.latest[1] if s.latest else None,
+                     "previous_scan_id": s.previous[1] if s.previous else None,
+                     "open": len(s.latest_set), "new": len(s.new), "fixed": len(s.fixed)}
+                    for (project_id, scan_type), s in self._streams.items()]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"scans": len(self._scans), "unique_findings": len(self._records),
+                "occurrences": self.occurrences, "streams": len(self._streams)}
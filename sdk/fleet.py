@@ -0,0 +1,230 @@
+# =============================
+# 📁 sdk/fleet.py
+# =============================
+# Agent fleet state with heartbeat history (requires numpy and pandas, so it is
+# not imported by sdk/__init__; pages import it directly).
+#
+# Every agent owns one row of a fleet-wide ring buffer holding its last
+# `history` heartbeat timestamps (epoch seconds). Registry snapshots and pushed
+# heartbeats only append to that buffer; staleness, heartbeat interval and
+# jitter, uptime and a health score are then computed for the whole fleet at
+# once with array operations. Thresholds come from a StalenessPolicy per
+# agent_type.
+#
+#   age        now - last heartbeat
+#   jitter     standard deviation of the intervals between heartbeats
+#   uptime     share of the observed window not spent beyond `stale_after`
+#              without a heartbeat
+#   health     0-100: 50% uptime, 30% freshness (1 up to the expected
+#              interval, falling to 0 at `offline_after`), 20% regularity
+#              (1 / (1 + jitter / expected interval)); DEGRADED agents are
+#              capped at 50
+import datetime
+import threading
+import warnings
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .models import parse_timestamp
+
+HEALTHY, DEGRADED, STALE, OFFLINE, UNKNOWN = "HEALTHY", "DEGRADED", "STALE", "OFFLINE", "UNKNOWN"
+# Reported statuses that count as healthy; anything else is DEGRADED
+ACTIVE_STATUSES = frozenset({"active", "running", "online", "idle", "busy", "healthy"})
+
+_COLUMNS = ["agent_id", "agent_type", "status", "state", "health", "last_seen", "age_s", "heartbeats",
+            "interval_s", "jitter_s", "uptime", "stale_after_s"]
+
+
+@dataclass(frozen=True)
+class StalenessPolicy:
+    expected_interval: float = 30.0   # Seconds between heartbeats when healthy
+    stale_after: float = 300.0
+    offline_after: float = 900.0
+
+
+class FleetState:
+    """Heartbeat ring buffers for an agent fleet. Thread-safe.
+
+    observe() takes registry records (dicts with agent_id, agent_type, status,
+    last_seen_timestamp, ...) and is cheap to call on every page run: a
+    heartbeat is only appended when last_seen moved forward. It only merges;
+    after a full registry snapshot, retain() drops agents that have left it.
+    """
+
+    def __init__(self,
+                 history: int = 64,
+                 policies: Optional[Mapping[str, StalenessPolicy]] = None,
+                 default_policy: StalenessPolicy = StalenessPolicy()):
+        self.history = history
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._records: List[Dict[str, Any]] = []
+        self._beats = np.full((0, history), np.nan)
+        self._head = np.zeros(0, dtype=np.int64)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._last = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def policy(self, agent_type: Optional[str]) -> StalenessPolicy:
+        return self.policies.get(agent_type or "", self.default_policy)
+
+    def _row(self, agent_id: str) -> int:
+        row = self._index.get(agent_id)
+        if row is None:
+            row = self._index[agent_id] = len(self._records)
+            self._records.append({"agent_id": agent_id})
+            if row >= len(self._beats):  # Grow all arrays by doubling
+                grow = max(16, len(self._beats))
+                self._beats = np.vstack([self._beats, np.full((grow, self.history), np.nan)])
+                self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.int64)])
+                self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int64)])
+                self._last = np.concatenate([self._last, np.full(grow, -np.inf)])
+        return row
+
+    def _append(self, row: int, seconds: float) -> bool:
+        if seconds <= self._last[row]:
+            return False
+        self._beats[row, self._head[row]] = seconds
+        self._head[row] = (self._head[row] + 1) % self.history
+        self._count[row] = min(self._count[row] + 1, self.history)
+        self._last[row] = seconds
+        return True
+
+    def observe(self, agents: Iterable[Dict[str, Any]]) -> int:
+        """Merge registry records; returns the number of new heartbeats."""
+        added = 0
+        with self._lock:
+            for agent in agents:
+                agent_id = agent.get("agent_id")
+                if not agent_id:
+                    continue
+                row = self._row(agent_id)
+                self._records[row].update(agent)
+                seen = parse_timestamp(agent.get("last_seen_timestamp") or agent.get("timestamp"))
+                if seen is not None:
+                    added += self._append(row, seen.timestamp())
+        return added
+
+    def retain(self, agent_ids: Iterable[str]) -> int:
+        """Drop agents not in `agent_ids` (a full registry snapshot), with their ring-buffer rows. Returns agents dropped."""
+        keep_ids = set(agent_ids)
+        with self._lock:
+            keep = [row for row, record in enumerate(self._records) if record["agent_id"] in keep_ids]
+            dropped = len(self._records) - len(keep)
+            if not dropped:
+                return 0
+            rows = np.asarray(keep, dtype=np.int64)
+            size = len(self._beats)
+            self._records = [self._records[row] for row in keep]
+            self._index = {record["agent_id"]: row for row, record in enumerate(self._records)}
+            # Compact the kept rows to the front; the freed tail is reset for agents registered later
+            self._beats = np.vstack([self._beats[rows], np.full((size - len(keep), self.history), np.nan)])
+            self._head = np.concatenate([self._head[rows], np.zeros(size - len(keep), dtype=np.int64)])
+            self._count = np.concatenate([self._count[rows], np.zeros(size - len(keep), dtype=np.int64)])
+            self._last = np.concatenate([self._last[rows], np.full(size - len(keep), -np.inf)])
+        return dropped
+
+    def record(self, heartbeat: Dict[str, Any]) -> None:
+        """Apply one pushed heartbeat/status event (same fields as a registry record)."""
+        self.observe([heartbeat])
+
+    def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._index.get(agent_id)
+            return dict(self._records[row]) if row is not None else None
+
+    def frame(self, now: Optional[datetime.datetime] = None) -> pd.DataFrame:
+        """One row per agent with state, health and heartbeat statistics (see module header)."""
+        now_s = (now or datetime.datetime.now(datetime.timezone.utc)).timestamp()
+        with self._lock:
+            n = len(self._records)
+            beats = self._beats[:n].copy()
+            count = self._count[:n].copy()
+            last = self._last[:n].copy()
+            records = [dict(r) for r in self._records]
+        if not n:
+            return pd.DataFrame(columns=_COLUMNS)
+
+        agent_types = [r.get("agent_type") for r in records]
+        policies = [self.policy(t) for t in agent_types]
+        expected = np.fromiter((p.expected_interval for p in policies), dtype=float, count=n)
+        stale_after = np.fromiter((p.stale_after for p in policies), dtype=float, count=n)
+        offline_after = np.fromiter((p.offline_after for p in policies), dtype=float, count=n)
+        statuses = [str(r.get("status") or "") for r in records]
+        reported_ok = np.fromiter((s.lower() in ACTIVE_STATUSES for s in statuses), dtype=bool, count=n)
+
+        seen = count > 0
+        age = np.where(seen, now_s - last, np.nan)
+        ordered = np.sort(beats, axis=1)                   # Unused slots (NaN) sort last
+        intervals = np.diff(ordered, axis=1)               # NaN wherever a slot is unused
+        valid = ~np.isnan(intervals)
+        n_intervals = valid.sum(axis=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # Agents with fewer than two heartbeats
+            interval = np.nanmedian(intervals, axis=1)
+            jitter = np.nanstd(intervals, axis=1)
+
+        # Uptime: time beyond stale_after inside each gap (and since the last beat) counts as down
+        down = np.nansum(np.clip(intervals - stale_after[:, None], 0.0, None), axis=1) \
+            + np.clip(np.nan_to_num(age) - stale_after, 0.0, None)
+        window = np.where(seen, now_s - ordered[:, 0], np.nan)
+        uptime = np.where(window > 0, 1.0 - down / np.where(window > 0, window, 1.0), np.where(seen, 1.0, np.nan))
+
+        freshness = np.clip((offline_after - age) / np.maximum(offline_after - expected, 1e-9), 0.0, 1.0)
+        regularity = np.where(n_intervals > 0, 1.0 / (1.0 + np.nan_to_num(jitter) / expected), 1.0)
+        health = 100.0 * (0.5 * np.nan_to_num(uptime) + 0.3 * np.nan_to_num(freshness) + 0.2 * regularity)
+        health = np.where(reported_ok, health, np.minimum(health, 50.0))
+        health = np.where(seen, health, 0.0)
+
+        state = np.select(
+            [~seen, age > offline_after, age > stale_after, ~reported_ok],
+            [UNKNOWN, OFFLINE, STALE, DEGRADED],
+            default=HEALTHY,
+        )
+        return pd.DataFrame({
+            "agent_id": [r["agent_id"] for r in records],
+            "agent_type": agent_types,
+            "status": statuses,
+            "state": state,
+            "health": health.round(1),
+            "last_seen": pd.to_datetime(np.where(seen, last, np.nan), unit="s", utc=True),
+            "age_s": age,
+            "heartbeats": count,
+            "interval_s": interval,
+            "jitter_s": jitter,
+            "uptime": uptime,
+            "stale_after_s": stale_after,
+        }, columns=_COLUMNS)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"agents": len(self._records), "heartbeats": int(self._count[:len(self._records)].sum())}
+
+
+def parse_policies(spec: str, default: StalenessPolicy = StalenessPolicy()) -> Dict[str, StalenessPolicy]:
+    """Policies from "Type:stale[/offline[/expected]],..." (seconds), e.g. "PlanAgent:120,SecurityAgent:600/1800/120".
+
+    An omitted offline threshold is three times the stale one; an omitted
+    expected interval keeps the default's, capped at the stale threshold.
+    """
+    policies: Dict[str, StalenessPolicy] = {}
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        agent_type, _, values = entry.partition(":")
+        try:
+            numbers = [float(v) for v in values.split("/") if v]
+        except ValueError:
+            raise ValueError(f"Invalid agent staleness policy {entry!r}") from None
+        if not agent_type or not numbers:
+            raise ValueError(f"Invalid agent staleness policy {entry!r}")
+        stale = numbers[0]
+        offline = numbers[1] if len(numbers) > 1 else stale * 3
+        expected = numbers[2] if len(numbers) > 2 else min(default.expected_interval, stale)
+        policies[agent_type.strip()] = StalenessPolicy(expected_interval=expected, stale_after=stale, offline_after=offline)
+    return policies
@@ -0,0 +1,113 @@
+# =============================
+# 📁 sdk/http_cache.py
+# =============================
+# Opt-in client-side HTTP response cache for ForgeIQClient.
+#
+# Entries are keyed by method + path + params and revalidated on every use with
+# If-None-Match / If-Modified-Since. When the backend answers 304 the already
+# *decoded* body is served from memory, so neither the payload nor the JSON
+# decode is paid again. Eviction is LRU under a byte budget (size of the raw body).
+#
+# Cached bodies are shared between callers: treat returned data as read-only.
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Hashable, ...]
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    size_bytes: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+    revalidations: int = 0
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0         # 304 served from memory
+        self.misses = 0       # No entry, or the entry was stale (200 with a new body)
+        self.evictions = 0
+        self.bytes_saved = 0  # Body bytes not re-downloaded thanks to 304s
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        frozen_params = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+        return (method.upper(), endpoint, frozen_params)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, entry: CachedResponse) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_not_modified(self, entry: CachedResponse) -> Any:
+        self.hits += 1
+        self.bytes_saved += entry.size_bytes
+        entry.revalidations += 1
+        return entry.data
+
+    def store(self, key: CacheKey, data: Any, size_bytes: int,
+              etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.misses += 1
+        if not etag and not last_modified:
+            return  # Nothing to revalidate against; caching would only serve stale data
+        if size_bytes > self.max_bytes:
+            logger.debug(f"SDK cache: {key[1]} body ({size_bytes} B) exceeds the cache budget; not cached.")
+            self.invalidate(key)
+            return
+        self.invalidate(key)
+        self._entries[key] = CachedResponse(data=data, size_bytes=size_bytes, etag=etag,
+                                            last_modified=last_modified, stored_at=time.time())
+        self._bytes += size_bytes
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size_bytes
+            self.evictions += 1
+
+    def invalidate(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size_bytes
+
+    def invalidate_prefix(self, endpoint_prefix: str) -> int:
+        keys = [k for k in self._entries if str(k[1]).startswith(endpoint_prefix)]
+        for k in keys:
+            self.invalidate(k)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,353 @@
+# =============================
+# 📁 sdk/models.py
+# =============================
+# Response models returned by ForgeIQClient. These mirror the backend's
+# pydantic models (ForgeIQ-backend: api_models.py) loosely; unknown keys are kept
+# in `extra`.
+#
+# Models are __slots__ dataclasses: statuses are enum members (or interned
+# strings for values this SDK doesn't know yet), timestamps are parsed once into
+# aware datetimes at decode time, and `to_frame()` builds a pandas DataFrame
+# column by column instead of going through a list of dicts. `get()` keeps
+# dict-style call sites working while they migrate to attribute access.
+import datetime
+import logging
+import sys
+from dataclasses import dataclass, field, fields, replace
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound="_Model")
+
+
+class ExecutionStatus(str, Enum):
+    """DAG and task states. A str subclass, so `status == "RUNNING"` keeps working."""
+    QUEUED = "QUEUED"
+    PENDING = "PENDING"
+    STARTED = "STARTED"
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+    CANCELLED = "CANCELLED"
+    COMPLETED_SUCCESS = "COMPLETED_SUCCESS"
+    COMPLETED_PARTIAL = "COMPLETED_PARTIAL"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class DeploymentState(str, Enum):
+    QUEUED = "QUEUED"
+    STARTED = "STARTED"
+    IN_PROGRESS = "IN_PROGRESS"
+    SUCCESSFUL = "SUCCESSFUL"
+    FAILED = "FAILED"
+    ROLLED_BACK = "ROLLED_BACK"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Severity(str, Enum):
+    CRITICAL = "CRITICAL"
+    HIGH = "HIGH"
+    MEDIUM = "MEDIUM"
+    LOW = "LOW"
+    INFORMATIONAL = "INFORMATIONAL"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+SEVERITY_RANK: Dict[str, int] = {"INFORMATIONAL": 0, "INFO": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+
+def severity_rank(value: Any) -> int:
+    """Ordering of a severity (enum or string); unknown values rank below INFORMATIONAL."""
+    return SEVERITY_RANK.get(str(value).upper(), -1) if value is not None else -1
+
+
+Status = Union[ExecutionStatus, DeploymentState, str]
+
+
+_STATUS_LOOKUP: Dict[type, Dict[str, Enum]] = {}
+
+
+def parse_status(value: Any, enum_cls: Type[Enum]) -> Optional[Status]:
+    if value is None or isinstance(value, enum_cls):
+        return value
+    lookup = _STATUS_LOOKUP.get(enum_cls)
+    if lookup is None:
+        lookup = _STATUS_LOOKUP[enum_cls] = {member.value: member for member in enum_cls}
+    member = lookup.get(value)
+    if member is not None:
+        return member
+    return sys.intern(str(value))  # Unknown to this SDK version; still shared, not copied per row
+
+
+def parse_timestamp(value: Any) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        logger.debug(f"SDK: Unparseable timestamp {value!r}")
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+_FIELD_NAMES: Dict[type, tuple] = {}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Model:
+    """Shared decode/encode helpers; subclasses declare their fields as slots dataclasses."""
+    __slots__ = ()
+    _status_enum: Type[Enum] = ExecutionStatus
+    _timestamp_fields: Sequence[str] = ()
+    _interned_fields: Sequence[str] = ()
+    _enum_fields: Sequence[Tuple[str, Type[Enum]]] = ()  # Besides `status`
+
+    @classmethod
+    def _field_names(cls) -> tuple:
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls) if f.name != "extra")
+        return names
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        names = cls._field_names()
+        kwargs = {name: data[name] for name in names if name in data}
+        instance = cls(**kwargs)
+        instance.extra = {k: v for k, v in data.items() if k not in kwargs}
+        instance._normalize()
+        return instance
+
+    def _normalize(self) -> None:
+        if getattr(self, "status", None) is not None:
+            self.status = parse_status(self.status, self._status_enum)
+        for name, enum_cls in self._enum_fields:
+            setattr(self, name, parse_status(getattr(self, name), enum_cls))
+        for name in self._timestamp_fields:
+            setattr(self, name, parse_timestamp(getattr(self, name)))
+        for name in self._interned_fields:
+            setattr(self, name, _intern(getattr(self, name)))
+
+    def _normalize_decoded(self) -> None:
+        # Typed-decoder path (sdk/codecs.py): timestamps arrive as datetimes, nested models are built.
+        if getattr(self, "status", None) is not None:
+            self.status = parse_status(self.status, self._status_enum)
+        for name, enum_cls in self._enum_fields:
+            setattr(self, name, parse_status(getattr(self, name), enum_cls))
+        for name in self._timestamp_fields:
+            value = getattr(self, name)
+            if value is not None and value.tzinfo is None:
+                setattr(self, name, value.replace(tzinfo=datetime.timezone.utc))
+        for name in self._interned_fields:
+            setattr(self, name, _intern(getattr(self, name)))
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        """Apply a partial record (e.g. a sync delta or a pushed event) in place."""
+        names = self._field_names()
+        for key, value in changes.items():
+            if key in names:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+        self._normalize()
+
+    def copy(self: M) -> M:
+        return replace(self, extra=dict(self.extra))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read over fields and `extra` (for call sites not yet using attributes)."""
+        if key in self._field_names():
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.extra)
+        for name in self._field_names():
+            value = getattr(self, name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            elif isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, _Model) else v for v in value]
+            out[name] = value
+        return out
+
+    @classmethod
+    def to_frame(cls, items: Iterable["_Model"], columns: Optional[Sequence[str]] = None):
+        """Columnar pandas DataFrame of `items` (requires pandas). Status columns hold plain strings."""
+        import pandas as pd
+
+        names = list(columns or [n for n in cls._field_names() if n != "task_statuses"])
+        data: Dict[str, List[Any]] = {name: [] for name in names}
+        appenders = [(data[name].append, name) for name in names]
+        for item in items:
+            for append, name in appenders:
+                value = getattr(item, name, None)
+                append(value.value if isinstance(value, Enum) else value)
+        frame = pd.DataFrame(data, columns=names)
+        for name in cls._timestamp_fields:
+            if name in frame.columns:
+                frame[name] = pd.to_datetime(frame[name], utc=True)
+        return frame
+
+
+@dataclass(slots=True, eq=False)
+class SDKTaskStatus(_Model):
+    task_id: str = ""
+    status: Optional[Status] = None
+    message: Optional[str] = None
+    result_summary: Optional[str] = None
+    started_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _timestamp_fields = ("started_at", "completed_at")
+    _interned_fields = ("task_id",)
+
+
+@dataclass(slots=True, eq=False)
+class SDKDagExecutionStatus(_Model):
+    dag_id: str = ""
+    project_id: Optional[str] = None
+    status: Optional[Status] = None
+    message: Optional[str] = None
+    started_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    task_statuses: List[SDKTaskStatus] = field(default_factory=list)
+    dag: Dict[str, Any] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _timestamp_fields = ("started_at", "completed_at")
+    _interned_fields = ("project_id",)
+
+    def _normalize(self) -> None:
+        _Model._normalize(self)
+        self.task_statuses = [t if isinstance(t, SDKTaskStatus) else SDKTaskStatus.from_dict(t)
+                              for t in self.task_statuses or []]
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        """Like _Model.update, but task_statuses are merged by task_id rather than replaced."""
+        task_updates = changes.get("task_statuses")
+        _Model.update(self, {k: v for k, v in changes.items() if k != "task_statuses"})
+        if task_updates:
+            by_id = {t.task_id: t for t in self.task_statuses}
+            for update in task_updates:
+                if isinstance(update, SDKTaskStatus):
+                    update = update.to_dict()
+                task = by_id.get(update.get("task_id"))
+                if task is None:
+                    task = SDKTaskStatus.from_dict(update)
+                else:
+                    task = task.copy()  # Copy-on-write: readers may hold the previous list
+                    task.update(update)
+                by_id[task.task_id] = task
+            self.task_statuses = list(by_id.values())
+
+
+@dataclass(slots=True, eq=False)
+class SDKDeploymentStatus(_Model):
+    deployment_id: str = ""
+    request_id: Optional[str] = None
+    project_id: Optional[str] = None
+    service_name: Optional[str] = None
+    target_environment: Optional[str] = None
+    commit_sha: Optional[str] = None
+    status: Optional[Status] = None
+    message: Optional[str] = None
+    deployment_url: Optional[str] = None
+    logs_url: Optional[str] = None
+    started_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    timestamp: Optional[datetime.datetime] = None
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _status_enum = DeploymentState
+    _timestamp_fields = ("started_at", "completed_at", "timestamp")
+    _interned_fields = ("project_id", "service_name", "target_environment")
+
+
+@dataclass(slots=True, eq=False)
+class SDKSecurityFinding(_Model):
+    finding_id: str = ""
+    rule_id: Optional[str] = None
+    severity: Optional[Union[Severity, str]] = None
+    description: Optional[str] = None
+    file_path: Optional[str] = None
+    line_number: Optional[int] = None
+    tool_name: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _enum_fields = (("severity", Severity),)
+    _interned_fields = ("rule_id", "file_path", "tool_name")
+
+
+@dataclass(slots=True, eq=False)
+class SDKScanResult(_Model):
+    """One scan event without its findings; those are queried per scan (ForgeIQClient.query_findings)."""
+    scan_id: str = ""
+    project_id: Optional[str] = None
+    scan_type: Optional[str] = None
+    tool_name: Optional[str] = None
+    status: Optional[Status] = None
+    commit_sha: Optional[str] = None
+    artifact_name: Optional[str] = None
+    summary: Optional[str] = None
+    timestamp: Optional[datetime.datetime] = None
+    findings_count: int = 0
+    severity_counts: Dict[str, int] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _timestamp_fields = ("timestamp",)
+    _interned_fields = ("project_id", "scan_type", "tool_name")
+
+    def _normalize(self) -> None:
+        _Model._normalize(self)
+        if not self.scan_id:
+            self.scan_id = str(self.extra.get("triggering_event_id") or "")
+        # Older backends embed every finding; keep only the counts.
+        embedded = self.extra.pop("findings", None)
+        if embedded is not None and not self.findings_count:
+            self.findings_count = len(embedded)
+            counts: Dict[str, int] = {}
+            for finding in embedded:
+                severity = str(finding.get("severity") or "UNKNOWN").upper()
+                counts[severity] = counts.get(severity, 0) + 1
+            self.severity_counts = counts
+
+    def count_at_least(self, min_severity: Optional[str]) -> int:
+        """Findings at or above `min_severity` (all findings when it is None/"All")."""
+        if min_severity in (None, "", "All"):
+            return self.findings_count
+        threshold = severity_rank(min_severity)
+        return sum(n for sev, n in self.severity_counts.items() if severity_rank(sev) >= threshold)
+
+
+@dataclass(slots=True, eq=False)
+class SDKAuditLogEntry(_Model):
+    audit_id: str = ""
+    timestamp: Optional[datetime.datetime] = None
+    project_id: Optional[str] = None
+    source_event_type: Optional[str] = None
+    user_or_actor: Optional[str] = None
+    action_description: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    _timestamp_fields = ("timestamp",)
+    _interned_fields = ("project_id", "source_event_type", "user_or_actor")
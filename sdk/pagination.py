@@ -0,0 +1,114 @@
+# =============================
+# 📁 sdk/pagination.py
+# =============================
+# Cursor-based streaming over the backend's list endpoints.
+#
+# Contract (all ForgeIQ list endpoints):
+#   request:  ?limit=<page_size>&cursor=<opaque token from the previous page>
+#   response: {"<items_key>": [...], "next_cursor": "<token>" | null, "total": <int, optional>}
+# A missing/null next_cursor ends the stream. List endpoints that support it
+# also take ?sort=<field>[,-<field>...] (a "-" prefix sorts descending).
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    cursor: Optional[str] = None  # Cursor that produced this page (None = first page)
+    total: Optional[int] = None   # Matching items across all pages, when the endpoint reports it
+
+    @property
+    def has_more(self) -> bool:
+        return bool(self.next_cursor)
+
+
+PageFetcher = Callable[[Optional[str]], Awaitable[CursorPage[T]]]
+
+_END = object()
+
+
+async def iterate_pages(fetch_page: PageFetcher[T],
+                        start_cursor: Optional[str] = None,
+                        prefetch: int = 1,
+                        page_size: int = 100,
+                        max_buffered_items: Optional[int] = None) -> AsyncIterator[CursorPage[T]]:
+    """Yield pages in order while the next `prefetch` page(s) are fetched in the background.
+
+    Memory stays bounded: besides the page the consumer is holding, at most
+    `prefetch` pages (further capped by `max_buffered_items // page_size`) are
+    fetched or buffered ahead of it. A fetch starts only once a buffer slot is
+    free. `max_buffered_items` must fit at least one page.
+    """
+    if max_buffered_items is not None and max_buffered_items < page_size:
+        raise ValueError(f"max_buffered_items ({max_buffered_items}) cannot hold one page of {page_size} items; "
+                         f"lower page_size")
+    buffered_pages = max(1, prefetch)
+    if max_buffered_items is not None:
+        buffered_pages = max(1, min(buffered_pages, max_buffered_items // max(1, page_size)))
+    slots = asyncio.Semaphore(buffered_pages)  # Taken before each fetch, given back when the consumer takes the page
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    async def _producer() -> None:
+        cursor = start_cursor
+        try:
+            while True:
+                await slots.acquire()
+                page = await fetch_page(cursor)
+                page.cursor = cursor
+                queue.put_nowait(page)
+                if not page.next_cursor:
+                    break
+                cursor = page.next_cursor
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:  # Surface fetch errors to the consumer in order
+            queue.put_nowait(e)
+            return
+        queue.put_nowait(_END)
+
+    producer = asyncio.create_task(_producer())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            yield item
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+async def iterate_items(fetch_page: PageFetcher[T],
+                        start_cursor: Optional[str] = None,
+                        prefetch: int = 1,
+                        page_size: int = 100,
+                        max_buffered_items: Optional[int] = None,
+                        max_items: Optional[int] = None) -> AsyncIterator[T]:
+    """Flatten iterate_pages() into single items, stopping after `max_items` if given."""
+    yielded = 0
+    pages = iterate_pages(fetch_page, start_cursor=start_cursor, prefetch=prefetch,
+                          page_size=page_size, max_buffered_items=max_buffered_items)
+    try:
+        async for page in pages:
+            for item in page.items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+    finally:
+        await pages.aclose()
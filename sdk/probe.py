@@ -0,0 +1,217 @@
+# =============================
+# 📁 sdk/probe.py
+# =============================
+# Concurrent health probes against the agents' own HTTP endpoints.
+#
+# probe_fleet() fans one GET <endpoint><health_path> out per agent, with at
+# most `concurrency` in flight (a semaphore) and a per-probe timeout, so a
+# fleet-wide check takes about max(RTT) per wave instead of sum(RTT). Probes
+# share one keep-alive pool (sdk/transport.py), so repeated checks skip the
+# handshake. Round-trip times are kept per agent in fixed-bucket histograms.
+import asyncio
+import bisect
+import datetime
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import httpx
+
+from .transport import PoolLimits, PooledTransport
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds; one overflow bucket follows
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    agent_id: str
+    url: Optional[str]
+    ok: bool
+    status_code: Optional[int] = None
+    rtt_ms: Optional[float] = None
+    error: Optional[str] = None      # "timeout", "no HTTP endpoint", or the transport error
+    probed_at: Optional[datetime.datetime] = None
+
+    @property
+    def timed_out(self) -> bool:
+        return self.error == "timeout"
+
+
+class RttHistogram:
+    """Counts of round-trip times per bucket, plus failures. Not thread-safe on its own."""
+
+    def __init__(self, bounds_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.probes = 0
+        self.total = 0                 # Probes that got an HTTP response (and so an RTT)
+        self.sum_ms = 0.0
+        self.failures = 0              # Timeouts, transport errors and non-2xx answers
+        self.timeouts = 0
+
+    def record(self, result: ProbeResult) -> None:
+        self.probes += 1
+        self.failures += not result.ok
+        self.timeouts += result.timed_out
+        if result.rtt_ms is None:
+            return
+        bucket = bisect.bisect_left(self.bounds_ms, result.rtt_ms)
+        self.counts[bucket] += 1
+        self.total += 1
+        self.sum_ms += result.rtt_ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (the last finite bound for the overflow bucket)."""
+        if not self.total:
+            return None
+        target = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return float(self.bounds_ms[min(i, len(self.bounds_ms) - 1)])
+        return float(self.bounds_ms[-1])
+
+    @property
+    def mean_ms(self) -> Optional[float]:
+        return self.sum_ms / self.total if self.total else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"probes": self.probes, "answered": self.total, "failures": self.failures, "timeouts": self.timeouts,
+                "mean_ms": self.mean_ms, "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95),
+                "buckets": dict(zip([*map(str, self.bounds_ms), "inf"], self.counts))}
+
+
+@dataclass
+class FleetProbeResult:
+    results: List[ProbeResult] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> int:
+        return sum(r.ok for r in self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.ok
+
+    @property
+    def sum_rtt_ms(self) -> float:
+        """What probing one agent after another would have cost."""
+        return sum(r.rtt_ms for r in self.results if r.rtt_ms is not None)
+
+    @property
+    def max_rtt_ms(self) -> float:
+        return max((r.rtt_ms for r in self.results if r.rtt_ms is not None), default=0.0)
+
+    def by_agent(self) -> Dict[str, ProbeResult]:
+        return {r.agent_id: r for r in self.results}
+
+
+def health_url(agent: Dict[str, Any], health_path: str) -> Optional[str]:
+    """The probe URL for a registry record: its first http(s) endpoint plus `health_path`."""
+    for endpoint in agent.get("endpoints") or ():
+        address = str(endpoint.get("address") or "")
+        if address.startswith(("http://", "https://")):
+            return address.rstrip("/") + health_path
+    return None
+
+
+class ProbeEngine:
+    """Fans health checks out to agent endpoints. Safe to share across event loops."""
+
+    def __init__(self,
+                 concurrency: int = 64,
+                 timeout: float = 2.0,
+                 health_path: str = "/health",
+                 headers: Optional[Dict[str, str]] = None,
+                 buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.health_path = health_path
+        self.buckets_ms = tuple(buckets_ms)
+        # Agents often share a host (one per node); the semaphore is the only in-flight bound
+        self._transport = PooledTransport("", headers={"User-Agent": "forgeiq-ui-sdk", **(headers or {})},
+                                          timeout=timeout,
+                                          limits=PoolLimits(max_connections=concurrency,
+                                                            max_connections_per_host=concurrency,
+                                                            max_keepalive_connections=concurrency))
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, RttHistogram] = {}
+        self._last: Dict[str, ProbeResult] = {}
+
+    async def probe(self, agent: Dict[str, Any]) -> ProbeResult:
+        """Probe one agent (a registry record with agent_id and endpoints)."""
+        result = await self._probe(agent)
+        self._record(result)
+        return result
+
+    async def probe_fleet(self, agents: Iterable[Dict[str, Any]]) -> FleetProbeResult:
+        """Probe every agent concurrently, at most `concurrency` at a time; results keep input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(agent: Dict[str, Any]) -> ProbeResult:
+            async with semaphore:
+                return await self._probe(agent)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded(a) for a in agents if a.get("agent_id")))
+        fleet = FleetProbeResult(results=list(results), elapsed_ms=(time.perf_counter() - started) * 1000)
+        for result in fleet.results:
+            self._record(result)
+        logger.info(f"SDK: Probed {len(fleet.results)} agents in {fleet.elapsed_ms:.0f} ms "
+                    f"({fleet.ok} ok, sequential would be ~{fleet.sum_rtt_ms:.0f} ms)")
+        return fleet
+
+    async def _probe(self, agent: Dict[str, Any]) -> ProbeResult:
+        agent_id = agent["agent_id"]
+        url = health_url(agent, self.health_path)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if url is None:
+            return ProbeResult(agent_id, None, False, error="no HTTP endpoint", probed_at=now)
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._transport.send("GET", url), self.timeout)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            return ProbeResult(agent_id, url, False, error="timeout", probed_at=now)
+        except httpx.HTTPError as e:
+            return ProbeResult(agent_id, url, False, error=str(e) or type(e).__name__, probed_at=now)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # e.g. httpx.InvalidURL from a malformed registry address; fails this agent only
+            logger.debug(f"SDK: Probe of {agent_id} at {url!r} failed: {e!r}")
+            return ProbeResult(agent_id, url, False, error=f"{type(e).__name__}: {e}", probed_at=now)
+        rtt_ms = (time.perf_counter() - started) * 1000
+        return ProbeResult(agent_id, url, response.is_success, response.status_code, rtt_ms,
+                           None if response.is_success else f"HTTP {response.status_code}", now)
+
+    def _record(self, result: ProbeResult) -> None:
+        with self._lock:
+            histogram = self._histograms.get(result.agent_id)
+            if histogram is None:
+                histogram = self._histograms[result.agent_id] = RttHistogram(self.buckets_ms)
+            histogram.record(result)
+            self._last[result.agent_id] = result
+
+    def histogram(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            histogram = self._histograms.get(agent_id)
+            return histogram.as_dict() if histogram is not None else None
+
+    def last_result(self, agent_id: str) -> Optional[ProbeResult]:
+        with self._lock:
+            return self._last.get(agent_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"agents": len(self._histograms),
+                    "probes": sum(h.probes for h in self._histograms.values()),
+                    **self._transport.pool_stats()}
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,161 @@
+# =============================
+# 📁 sdk/realtime.py
+# =============================
+# Minimal Pusher-protocol (v7) subscriber for the ForgeIQ Soketi server.
+#
+# Python-side counterpart of src/realtime/pusherClient.ts: connects over
+# WebSocket, subscribes to public/private channels (private channels are
+# authorized through a caller-supplied coroutine, normally the backend's
+# /api/broadcasting/auth), answers server pings, pings on inactivity and
+# reconnects with capped exponential backoff. Every channel event is handed to
+# `on_event(channel, event_name, payload)`.
+#
+# Requires the optional `websockets` package.
+import asyncio
+import json
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None  # type: ignore[assignment]
+
+PROTOCOL_VERSION = 7
+CLIENT_NAME = "forgeiq-py"
+
+EventHandler = Callable[[str, str, Any], None]
+ChannelAuthorizer = Callable[[str, str], Awaitable[Dict[str, Any]]]  # (socket_id, channel) -> {"auth": ...}
+
+
+class PusherSubscriber:
+    def __init__(self,
+                 app_key: str,
+                 ws_host: str,
+                 channels: Iterable[str],
+                 on_event: EventHandler,
+                 ws_port: int = 443,
+                 use_tls: bool = True,
+                 authorizer: Optional[ChannelAuthorizer] = None,
+                 activity_timeout: float = 12.0,   # Same defaults as pusherClient.ts
+                 pong_timeout: float = 6.0,
+                 max_backoff: float = 30.0,
+                 on_state_change: Optional[Callable[[str], None]] = None):
+        if websockets is None:
+            raise ImportError("PusherSubscriber requires the 'websockets' package (pip install websockets).")
+        self.app_key = app_key
+        self.ws_host = ws_host
+        self.ws_port = ws_port
+        self.use_tls = use_tls
+        self.channels: List[str] = list(channels)
+        self.on_event = on_event
+        self.authorizer = authorizer
+        self.activity_timeout = activity_timeout
+        self.pong_timeout = pong_timeout
+        self.max_backoff = max_backoff
+        self.on_state_change = on_state_change
+        self.state = "initialized"
+        self.socket_id: Optional[str] = None
+        self.events_received = 0
+        self.reconnects = 0
+        self._stopped = asyncio.Event()
+
+    @property
+    def url(self) -> str:
+        scheme = "wss" if self.use_tls else "ws"
+        return (f"{scheme}://{self.ws_host}:{self.ws_port}/app/{self.app_key}"
+                f"?protocol={PROTOCOL_VERSION}&client={CLIENT_NAME}&version=1.0")
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.info(f"Realtime: state {self.state} -> {state}")
+            self.state = state
+            if self.on_state_change:
+                self.on_state_change(state)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    async def run(self) -> None:
+        """Connect and keep the subscription alive until stop() is called."""
+        backoff = 1.0
+        while not self._stopped.is_set():
+            self._set_state("connecting")
+            try:
+                async with websockets.connect(self.url, open_timeout=10, ping_interval=None) as ws:
+                    backoff = 1.0
+                    await self._session(ws)
+            except asyncio.CancelledError:
+                self._set_state("disconnected")
+                raise
+            except Exception as e:
+                logger.warning(f"Realtime: connection to {self.ws_host} lost: {e}")
+            self._set_state("unavailable")
+            if self._stopped.is_set():
+                break
+            self.reconnects += 1
+            delay = random.uniform(0, backoff)  # Full jitter so many dashboards don't reconnect in lockstep
+            backoff = min(self.max_backoff, backoff * 2)
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        self._set_state("disconnected")
+
+    async def _session(self, ws: Any) -> None:
+        awaiting_pong = False
+        while not self._stopped.is_set():
+            timeout = self.pong_timeout if awaiting_pong else self.activity_timeout
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if awaiting_pong:
+                    raise ConnectionError("pong timeout")
+                await ws.send(json.dumps({"event": "pusher:ping", "data": {}}))
+                awaiting_pong = True
+                continue
+            awaiting_pong = False
+            message = json.loads(raw)
+            event = message.get("event", "")
+            data = message.get("data")
+            if isinstance(data, str):
+                try:
+                    data = json.loads(data)
+                except ValueError:
+                    pass
+
+            if event == "pusher:connection_established":
+                self.socket_id = data.get("socket_id")
+                if data.get("activity_timeout"):
+                    self.activity_timeout = min(self.activity_timeout, float(data["activity_timeout"]))
+                self._set_state("connected")
+                for channel in self.channels:
+                    await self._subscribe(ws, channel)
+            elif event == "pusher:ping":
+                await ws.send(json.dumps({"event": "pusher:pong", "data": {}}))
+            elif event == "pusher:error":
+                logger.warning(f"Realtime: server error {data}")
+            elif event.startswith("pusher_internal:") or event.startswith("pusher:"):
+                if event == "pusher_internal:subscription_succeeded":
+                    logger.info(f"Realtime: subscribed to {message.get('channel')}")
+            else:
+                self.events_received += 1
+                try:
+                    self.on_event(message.get("channel", ""), event, data)
+                except Exception as e:
+                    logger.error(f"Realtime: handler failed for {event}: {e}", exc_info=True)
+
+    async def _subscribe(self, ws: Any, channel: str) -> None:
+        payload: Dict[str, Any] = {"channel": channel}
+        if channel.startswith(("private-", "presence-")):
+            if self.authorizer is None:
+                logger.error(f"Realtime: no authorizer configured for {channel}; skipping.")
+                return
+            auth = await self.authorizer(self.socket_id or "", channel)
+            payload["auth"] = auth.get("auth")
+            if "channel_data" in auth:
+                payload["channel_data"] = auth["channel_data"]
+        await ws.send(json.dumps({"event": "pusher:subscribe", "data": payload}))
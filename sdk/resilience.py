@@ -0,0 +1,301 @@
+# =============================
+# 📁 sdk/resilience.py
+# =============================
+# Retry, hedging and circuit-breaking for ForgeIQClient._request.
+#
+# - Retries: idempotent GETs are retried on transport errors and 429/5xx with
+#   exponential backoff and full jitter.
+# - Hedging (opt-in per endpoint): if a GET hasn't answered by the endpoint's
+#   observed p95 latency, a second identical request is raced against it and
+#   the first success wins.
+# - Circuit breaker (per endpoint group): after consecutive failures (transport
+#   errors and 5xx; a 4xx means the backend answered) the group fails fast for
+#   `recovery_timeout` seconds, then lets one probe through (half-open). While
+#   open, GETs are answered from the last-known-good response for the same URL
+#   if there is one; with the breaker closed, errors are raised as they are.
+#   Last-known-good bodies are kept LRU under a byte budget, counted in raw
+#   response bytes like the ETag cache's (sdk/http_cache.py).
+#
+# Endpoint groups are policy prefixes ("/api/forgeiq/deployments") or, for
+# paths without a policy, their first three segments.
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from .exceptions import APIError, CircuitOpenError, TransportError
+from .tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3          # Including the first try
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_on_status: Tuple[int, ...] = RETRYABLE_STATUS
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+@dataclass
+class HedgePolicy:
+    enabled: bool = False
+    percentile: float = 0.95
+    min_samples: int = 20          # Don't hedge until the latency estimate means something
+    min_delay: float = 0.05
+    max_delay: float = 5.0
+
+
+@dataclass
+class BreakerPolicy:
+    failure_threshold: int = 5     # Consecutive failures that open the breaker
+    recovery_timeout: float = 30.0
+
+
+@dataclass
+class EndpointPolicy:
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    hedge: HedgePolicy = field(default_factory=HedgePolicy)
+    breaker: BreakerPolicy = field(default_factory=BreakerPolicy)
+
+
+@dataclass
+class ResilienceStats:
+    retries: int = 0
+    hedges_sent: int = 0
+    hedges_won: int = 0            # The hedge answered first
+    breaker_opened: int = 0
+    short_circuited: int = 0       # Calls rejected/answered without touching the network
+    stale_served: int = 0          # Last-known-good responses returned instead of an error
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class LatencyTracker:
+    """Sliding window of recent successful latencies for one endpoint group."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    def __init__(self, policy: BreakerPolicy):
+        self.policy = policy
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.policy.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and self.retry_after() <= 0:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state, self.failures, self._probe_in_flight = "closed", 0, False
+
+    def release_probe(self) -> None:
+        """The probe ended without a verdict (cancelled, or failed in a way that says nothing about the backend)."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened the breaker."""
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.policy.failure_threshold:
+            was_open = self.state == "open"
+            self.state, self.opened_at = "open", time.monotonic()
+            return not was_open
+        return False
+
+
+class ResilienceLayer:
+    """Runs request attempts under the retry/hedge/breaker policy of their endpoint group."""
+
+    def __init__(self,
+                 policies: Optional[Dict[str, EndpointPolicy]] = None,
+                 default: Optional[EndpointPolicy] = None,
+                 last_known_good_entries: int = 512,
+                 last_known_good_max_bytes: int = 32 * 1024 * 1024):
+        self.policies = dict(policies or {})
+        self.default = default or EndpointPolicy()
+        self.stats = ResilienceStats()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._last_good: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()  # key -> (value, body bytes)
+        self._last_good_entries = last_known_good_entries
+        self._last_good_max_bytes = last_known_good_max_bytes
+        self._last_good_bytes = 0
+
+    def group_for(self, endpoint: str) -> Tuple[str, EndpointPolicy]:
+        matches = [prefix for prefix in self.policies if endpoint.startswith(prefix)]
+        if matches:
+            prefix = max(matches, key=len)
+            return prefix, self.policies[prefix]
+        return "/".join(endpoint.split("/")[:4]), self.default
+
+    def breaker_states(self) -> Dict[str, str]:
+        return {group: breaker.state for group, breaker in self._breakers.items()}
+
+    @staticmethod
+    def _is_outage(error: Exception) -> bool:
+        """Failures that count against the breaker: no answer, or a 5xx."""
+        if isinstance(error, TransportError):
+            return True
+        return isinstance(error, APIError) and (error.status_code or 0) >= 500
+
+    def _is_retryable(self, error: Exception, policy: RetryPolicy) -> bool:
+        if isinstance(error, TransportError):
+            return True
+        return isinstance(error, APIError) and error.status_code in policy.retry_on_status
+
+    def _remember(self, key: Hashable, value: Any, size_bytes: int) -> None:
+        previous = self._last_good.pop(key, None)
+        if previous is not None:
+            self._last_good_bytes -= previous[1]
+        if size_bytes > self._last_good_max_bytes:
+            return  # Larger than the whole budget: keeping it would evict everything else
+        self._last_good[key] = (value, size_bytes)
+        self._last_good_bytes += size_bytes
+        while len(self._last_good) > self._last_good_entries or self._last_good_bytes > self._last_good_max_bytes:
+            _, (_, evicted_bytes) = self._last_good.popitem(last=False)
+            self._last_good_bytes -= evicted_bytes
+
+    async def call(self,
+                   method: str,
+                   endpoint: str,
+                   key: Hashable,
+                   attempt: Callable[[], Awaitable[Tuple[Any, int]]]) -> Any:
+        """Run `attempt` (returns the decoded body and its raw size in bytes) under the group's policy."""
+        group, policy = self.group_for(endpoint)
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            breaker = self._breakers[group] = CircuitBreaker(policy.breaker)
+        idempotent = method.upper() == "GET"
+
+        if not breaker.allow():
+            self.stats.short_circuited += 1
+            current_span().add_event("breaker.short_circuit", {"group": group})
+            return self._serve_stale(group, key, breaker, None)
+
+        max_attempts = policy.retry.max_attempts if idempotent else 1
+        last_error: Optional[Exception] = None
+        for attempt_no in range(1, max_attempts + 1):
+            try:
+                if idempotent and policy.hedge.enabled:
+                    value, size_bytes = await self._hedged(group, policy.hedge, attempt)
+                else:
+                    value, size_bytes = await self._timed(group, attempt)
+            except (TransportError, APIError) as e:
+                last_error = e
+                if not self._is_outage(e):
+                    breaker.record_success()  # The backend answered; a 4xx is not an outage
+                elif breaker.record_failure():
+                    self.stats.breaker_opened += 1
+                    logger.warning(f"SDK: Circuit for {group} opened after {breaker.failures} failures: {e}")
+                if not self._is_retryable(e, policy.retry) or breaker.state == "open" or attempt_no == max_attempts:
+                    break
+                self.stats.retries += 1
+                delay = policy.retry.backoff(attempt_no)
+                logger.info(f"SDK: {method} {endpoint} failed ({e}); retry {attempt_no} in {delay:.2f}s")
+                current_span().add_event("retry", {"attempt": attempt_no, "delay_ms": round(delay * 1000, 1),
+                                                   "error": str(e)[:200]})
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.release_probe()
+                raise
+            breaker.record_success()
+            if idempotent:
+                self._remember(key, value, size_bytes)
+            return value
+        if idempotent and breaker.state == "open":
+            return self._serve_stale(group, key, breaker, last_error)
+        raise last_error  # type: ignore[misc]
+
+    def _serve_stale(self, group: str, key: Hashable, breaker: CircuitBreaker,
+                     error: Optional[Exception]) -> Any:
+        if key in self._last_good:
+            self.stats.stale_served += 1
+            current_span().add_event("stale_served", {"group": group, "breaker": breaker.state})
+            logger.warning(f"SDK: Serving last-known-good response for {group} ({breaker.state}).")
+            self._last_good.move_to_end(key)
+            return self._last_good[key][0]
+        if error is not None:
+            raise error
+        raise CircuitOpenError(f"Circuit for {group} is open; retry in {breaker.retry_after():.0f}s",
+                               retry_after=breaker.retry_after())
+
+    async def _timed(self, group: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        value = await attempt()
+        self._latency.setdefault(group, LatencyTracker()).record(time.monotonic() - start)
+        return value
+
+    async def _hedged(self, group: str, hedge: HedgePolicy, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        tracker = self._latency.setdefault(group, LatencyTracker())
+        threshold = tracker.percentile(hedge.percentile) if len(tracker) >= hedge.min_samples else None
+        if threshold is None:
+            return await self._timed(group, attempt)
+
+        delay = min(hedge.max_delay, max(hedge.min_delay, threshold))
+        primary = asyncio.ensure_future(self._timed(group, attempt))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.hedges_sent += 1
+        current_span().add_event("hedge", {"after_ms": round(delay * 1000, 1)})
+        hedge_task = asyncio.ensure_future(self._timed(group, attempt))
+        pending = {primary, hedge_task}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.stats.hedges_won += 1
+                            current_span().add_event("hedge_won")
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]  # Both attempts failed
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = {group: round(t.percentile(0.95) or 0.0, 4) for group, t in self._latency.items()}
+        return {**self.stats.as_dict(), "breakers": self.breaker_states(), "p95_latency_s": p95,
+                "last_known_good_entries": len(self._last_good), "last_known_good_bytes": self._last_good_bytes,
+                "last_known_good_max_bytes": self._last_good_max_bytes}
@@ -0,0 +1,155 @@
+# =============================
+# 📁 sdk/sync.py
+# =============================
+# Incremental (delta) sync of pipeline executions into a local keyed store.
+#
+# Contract: GET /api/forgeiq/pipelines/executions/changes
+#   request:  ?since=<watermark from the previous sync>&limit=&cursor=
+#   response: {"executions": [<changed DAG fields, task_statuses holds only changed tasks>],
+#              "tombstones": ["<deleted dag_id>", ...],
+#              "watermark": "<opaque>", "next_cursor": "<token>" | null,
+#              "full_resync": false}
+# `full_resync` is true when `since` is missing or older than the server's
+# tombstone retention; the store then drops everything it holds and rebuilds
+# from that response. The watermark is only advanced once every page of a sync
+# has been applied, so an interrupted sync is simply repeated.
+import datetime
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import SDKDagExecutionStatus
+from .pagination import CursorPage
+
+CHANGES_ENDPOINT = "/api/forgeiq/pipelines/executions/changes"
+
+_EPOCH = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+# Fields ExecutionStore.page() can sort by
+SORT_FIELDS = ("started_at", "completed_at", "dag_id", "project_id", "status")
+
+
+@dataclass
+class SyncResult:
+    watermark: Optional[str]
+    upserted: int = 0
+    deleted: int = 0
+    full_resync: bool = False
+    pages: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class ExecutionDelta:
+    executions: List[Dict[str, Any]] = field(default_factory=list)
+    tombstones: List[str] = field(default_factory=list)
+    watermark: Optional[str] = None
+    next_cursor: Optional[str] = None
+    full_resync: bool = False
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> "ExecutionDelta":
+        return cls(executions=data.get("executions", []),
+                   tombstones=[str(t) for t in data.get("tombstones", [])],
+                   watermark=data.get("watermark"),
+                   next_cursor=data.get("next_cursor"),
+                   full_resync=bool(data.get("full_resync")))
+
+
+class ExecutionStore:
+    """DAG executions keyed by dag_id, kept current by applying deltas.
+
+    Written from the SDK's event loop, read from page threads. Records are
+    replaced copy-on-write, so the models handed out are never mutated afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, SDKDagExecutionStatus] = {}
+        self.watermark: Optional[str] = None
+        self.syncs = 0
+        self.full_resyncs = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def apply(self, delta: ExecutionDelta, first_page: bool = True) -> SyncResult:
+        """Merge one page of changes. Does not advance the watermark (see commit())."""
+        with self._lock:
+            if delta.full_resync and first_page:
+                self._records.clear()
+            for change in delta.executions:
+                dag_id = change.get("dag_id")
+                if not dag_id:
+                    continue
+                current = self._records.get(dag_id)
+                if current is None:
+                    self._records[dag_id] = SDKDagExecutionStatus.from_dict(change)
+                else:
+                    record = current.copy()
+                    record.update(change)
+                    self._records[dag_id] = record
+            deleted = sum(self._records.pop(dag_id, None) is not None for dag_id in delta.tombstones)
+        return SyncResult(watermark=delta.watermark, upserted=len(delta.executions), deleted=deleted,
+                          full_resync=delta.full_resync, pages=1)
+
+    def commit(self, watermark: Optional[str], full_resync: bool = False) -> None:
+        with self._lock:
+            self.watermark = watermark
+            self.syncs += 1
+            self.full_resyncs += int(full_resync)
+
+    def replace_all(self, executions: Iterable[SDKDagExecutionStatus]) -> None:
+        """Full-list fallback for backends without the changes endpoint; leaves no watermark."""
+        with self._lock:
+            self._records = {e.dag_id: e for e in executions if e.dag_id}
+            self.watermark = None
+            self.syncs += 1
+            self.full_resyncs += 1
+
+    def get(self, dag_id: str) -> Optional[SDKDagExecutionStatus]:
+        with self._lock:
+            return self._records.get(dag_id)
+
+    def list(self,
+             project_id: Optional[str] = None,
+             status: Optional[str] = None,
+             limit: Optional[int] = None) -> List[SDKDagExecutionStatus]:
+        """Executions matching the filters, most recently started first."""
+        with self._lock:
+            matches = [r for r in self._records.values()
+                       if (project_id is None or r.project_id == project_id)
+                       and (status is None or r.status == status)]
+        matches.sort(key=lambda r: r.started_at or _EPOCH, reverse=True)
+        return matches[:limit] if limit is not None else matches
+
+    def page(self,
+             project_id: Optional[str] = None,
+             status: Optional[str] = None,
+             sort: str = "-started_at",
+             cursor: Optional[str] = None,
+             limit: int = 50) -> CursorPage[SDKDagExecutionStatus]:
+        """One page of matching executions, like a list endpoint: `sort` is "-field,field", cursors are offsets."""
+        with self._lock:
+            matches = [r for r in self._records.values()
+                       if (project_id is None or r.project_id == project_id)
+                       and (status is None or r.status == status)]
+        for key in reversed([k for k in sort.split(",") if k]):
+            name = key.lstrip("-")
+            if name not in SORT_FIELDS:
+                raise ValueError(f"Unsupported sort field {name!r}")
+            # Stable passes, last key first; executions missing the field sort last either way
+            present = [r for r in matches if getattr(r, name) is not None]
+            present.sort(key=lambda r: getattr(r, name), reverse=key.startswith("-"))
+            matches = present + [r for r in matches if getattr(r, name) is None]
+        start = int(cursor or 0)
+        end = start + limit
+        return CursorPage(items=matches[start:end], next_cursor=str(end) if end < len(matches) else None,
+                          cursor=cursor, total=len(matches))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"executions": len(self._records), "watermark": self.watermark,
+                "syncs": self.syncs, "full_resyncs": self.full_resyncs}
+
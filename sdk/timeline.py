@@ -0,0 +1,223 @@
+# =============================
+# 📁 sdk/timeline.py
+# =============================
+# Gantt timeline of one DAG execution, sized for thousands of tasks.
+#
+# - Tasks are packed into lanes by greedy interval partitioning (a heap of
+#   lane end times), so the chart needs as many rows as the peak parallelism
+#   rather than one row per task.
+# - Concurrency over time is a sweep line over start/end events, O(n log n).
+#   Stretches where it drops below a target parallelism are the idle-worker
+#   gaps.
+# - When there are more bars than can be drawn, adjacent lanes are folded
+#   into rows and each row's bars are merged into blocks about one time bin
+#   wide, carrying a task count, busy task-seconds and the most severe status.
+import datetime
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .dag import STATUS_PRIORITY
+from .models import SDKTaskStatus
+
+DEFAULT_MAX_BARS = 1500
+DEFAULT_MAX_ROWS = 120
+
+_RANK = {status: i for i, status in enumerate(STATUS_PRIORITY)}
+
+
+@dataclass(slots=True)
+class TimelineBar:
+    row: int
+    start: datetime.datetime
+    end: datetime.datetime
+    label: str                  # Task id, or "<n> tasks" for a merged block
+    status: str
+    tasks: int = 1
+    busy_seconds: float = 0.0   # Task-seconds inside the bar; below its span × lanes per row when merged
+    running: bool = False       # Not finished; `end` is the time of the snapshot
+
+
+@dataclass(slots=True)
+class Gap:
+    start: datetime.datetime
+    end: datetime.datetime
+    concurrency: int            # Running tasks during the gap (below the target)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end - self.start).total_seconds()
+
+
+@dataclass
+class Timeline:
+    bars: List[TimelineBar] = field(default_factory=list)
+    lanes: int = 0
+    rows: int = 0
+    lanes_per_row: int = 1
+    tasks: int = 0
+    untimed: int = 0                                            # Tasks that never started
+    start: Optional[datetime.datetime] = None
+    end: Optional[datetime.datetime] = None
+    concurrency: List[Tuple[datetime.datetime, int]] = field(default_factory=list)  # Step function
+    peak: int = 0
+    gap_target: int = 0
+    gaps: List[Gap] = field(default_factory=list)
+    busy_seconds: float = 0.0                                   # Task-seconds executed
+    downsampled: bool = False
+    bin_seconds: float = 0.0
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.end - self.start).total_seconds() if self.start and self.end else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Busy task-seconds over wall time × peak parallelism (1.0 means no idle lanes)."""
+        capacity = self.wall_seconds * self.peak
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    @property
+    def idle_seconds(self) -> float:
+        return sum(g.seconds for g in self.gaps)
+
+
+def _status(task: SDKTaskStatus) -> str:
+    return str(task.status) if task.status is not None else "UNKNOWN"
+
+
+def concurrency_curve(intervals: Iterable[Tuple[datetime.datetime, datetime.datetime]]) -> List[Tuple[datetime.datetime, int]]:
+    """Running-task count as a step function: (time, count from that time on). Ends sort before starts."""
+    events: List[Tuple[datetime.datetime, int]] = []
+    for start, end in intervals:
+        events.append((start, 1))
+        events.append((end, -1))
+    events.sort()
+    curve: List[Tuple[datetime.datetime, int]] = []
+    running = 0
+    for moment, delta in events:
+        running += delta
+        if curve and curve[-1][0] == moment:
+            curve[-1] = (moment, running)
+        else:
+            curve.append((moment, running))
+    return curve
+
+
+def find_gaps(curve: List[Tuple[datetime.datetime, int]], target: int = 1, min_seconds: float = 0.0) -> List[Gap]:
+    """Stretches inside the curve's span where fewer than `target` tasks ran; the lowest count is kept."""
+    gaps: List[Gap] = []
+    for (moment, running), (following, _) in zip(curve, curve[1:]):
+        if running >= target:
+            continue
+        if gaps and gaps[-1].end == moment:
+            gaps[-1].end = following
+            gaps[-1].concurrency = min(gaps[-1].concurrency, running)
+        else:
+            gaps.append(Gap(start=moment, end=following, concurrency=running))
+    return [g for g in gaps if g.seconds >= min_seconds]
+
+
+def pack_lanes(intervals: List[Tuple[datetime.datetime, datetime.datetime]]) -> List[int]:
+    """Lane of each interval (input sorted by start); uses the minimum number of lanes.
+
+    Intervals are half-open, so a lane freed at `start` is reused. That makes the
+    lane count equal the concurrency curve's peak, except that a zero-length
+    interval inside busy lanes still gets a lane of its own to be drawn in.
+    """
+    free: List[Tuple[datetime.datetime, int]] = []   # (end time, lane) of busy lanes
+    lanes: List[int] = []
+    count = 0
+    for start, end in intervals:
+        if free and free[0][0] <= start:
+            lane = free[0][1]
+            heapq.heapreplace(free, (end, lane))
+        else:
+            lane = count
+            count += 1
+            heapq.heappush(free, (end, lane))
+        lanes.append(lane)
+    return lanes
+
+
+def _merge_status(a: str, b: str) -> str:
+    return a if _RANK.get(a, len(_RANK)) <= _RANK.get(b, len(_RANK)) else b
+
+
+def _downsample(bars: List[TimelineBar], rows: int, bin_seconds: float) -> List[TimelineBar]:
+    """Merge each row's bars (in start order) into blocks starting at most one bin apart."""
+    open_blocks: List[Optional[TimelineBar]] = [None] * rows
+    merged: List[TimelineBar] = []
+    window = datetime.timedelta(seconds=bin_seconds)
+    for bar in bars:
+        block = open_blocks[bar.row]
+        if block is not None and bar.start - block.start < window:
+            block.end = max(block.end, bar.end)
+            block.tasks += 1
+            block.busy_seconds += bar.busy_seconds
+            block.status = _merge_status(block.status, bar.status)
+            block.running = block.running or bar.running
+            block.label = f"{block.tasks} tasks"
+            continue
+        if block is not None:
+            merged.append(block)
+        open_blocks[bar.row] = TimelineBar(bar.row, bar.start, bar.end, bar.label, bar.status,
+                                           1, bar.busy_seconds, bar.running)
+    merged.extend(block for block in open_blocks if block is not None)
+    return merged
+
+
+def build_timeline(task_statuses: Iterable[SDKTaskStatus],
+                   now: Optional[datetime.datetime] = None,
+                   max_bars: int = DEFAULT_MAX_BARS,
+                   max_rows: int = DEFAULT_MAX_ROWS,
+                   gap_target: Optional[int] = None,
+                   min_gap_seconds: float = 1.0) -> Timeline:
+    """Timeline of the started tasks.
+
+    Gaps are where fewer than `gap_target` tasks ran; by default half the
+    peak parallelism, i.e. at least half of the workers the run showed it
+    had were idle.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    timed: List[Tuple[datetime.datetime, datetime.datetime, SDKTaskStatus]] = []
+    untimed = 0
+    for task in task_statuses:
+        if task.started_at is None:
+            untimed += 1
+            continue
+        timed.append((task.started_at, max(task.completed_at or now, task.started_at), task))
+    timeline = Timeline(untimed=untimed, tasks=len(timed))
+    if not timed:
+        return timeline
+    timed.sort(key=lambda item: item[0])
+    intervals = [(start, end) for start, end, _ in timed]
+    lanes = pack_lanes(intervals)
+    timeline.lanes = max(lanes) + 1
+    timeline.start = timed[0][0]
+    timeline.end = max(end for _, end in intervals)
+    timeline.concurrency = concurrency_curve(intervals)
+    timeline.peak = max(running for _, running in timeline.concurrency)
+    timeline.gap_target = gap_target or max(1, (timeline.peak + 1) // 2)
+    timeline.gaps = find_gaps(timeline.concurrency, timeline.gap_target, min_gap_seconds)
+
+    downsample = len(timed) > max_bars
+    timeline.lanes_per_row = -(-timeline.lanes // max_rows) if downsample else 1
+    timeline.rows = -(-timeline.lanes // timeline.lanes_per_row)
+    bars = [TimelineBar(lane // timeline.lanes_per_row, start, end, task.task_id, _status(task), 1,
+                        (end - start).total_seconds(), task.completed_at is None)
+            for lane, (start, end, task) in zip(lanes, timed)]
+    timeline.busy_seconds = sum(bar.busy_seconds for bar in bars)
+    if downsample:
+        # Bins sized so each row yields about its share of the bar budget
+        timeline.bin_seconds = timeline.wall_seconds * timeline.rows / max_bars
+        bars = _downsample(bars, timeline.rows, timeline.bin_seconds)
+        timeline.downsampled = True
+    timeline.bars = bars
+    return timeline
+
+
+def concurrency_series(timeline: Timeline) -> Dict[str, list]:
+    """The concurrency step function as columns for plotting (`time`, `running`)."""
+    return {"time": [moment for moment, _ in timeline.concurrency],
+            "running": [running for _, running in timeline.concurrency]}
@@ -0,0 +1,219 @@
+# =============================
+# 📁 sdk/timing.py
+# =============================
+# Task timing analytics over finished DAG executions (requires numpy and
+# pandas, so it is not imported by sdk/__init__; pages import it directly).
+#
+# Each execution is reduced once, when it is first seen in a terminal state,
+# to one row per timed task:
+#   duration          completed_at - started_at
+#   queue_wait        started_at - ready time; ready is the completion of the
+#                     dependency it waited for (latest-finishing dependency
+#                     from the DAG definition, or without a definition the
+#                     latest task to finish before it started), else the DAG start
+#   critical_seconds  its duration if it lies on the execution's critical
+#                     path, traced back from the last task to finish
+#   task_type         from the DAG definition, else the task status, else "unknown"
+# Rows accumulate in a columnar DataFrame. Aggregates (per-task_type
+# percentiles, critical-path share, regressions against a rolling baseline)
+# are vectorized groupbys, recomputed only when new executions were ingested.
+import datetime
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import SDKDagExecutionStatus
+
+TERMINAL_STATUSES = frozenset({"COMPLETED_SUCCESS", "COMPLETED_PARTIAL", "FAILED", "CANCELLED"})
+# Tasks whose type is neither in the DAG definition nor on the task status share one group;
+# falling back to task_id would give every task its own single-sample "type".
+UNKNOWN_TASK_TYPE = "unknown"
+
+_COLUMNS = ("dag_id", "project_id", "task_id", "task_type", "status", "completed_at",
+            "duration", "queue_wait", "critical_seconds", "dag_seconds")
+
+
+def _seconds(moment: Optional[datetime.datetime]) -> float:
+    return moment.timestamp() if moment is not None else np.nan
+
+
+def execution_rows(execution: SDKDagExecutionStatus) -> Optional[Dict[str, Any]]:
+    """Columns (dict of equal-length arrays) of one execution's timed tasks, or None if none are timed."""
+    tasks = [t for t in execution.task_statuses if t.started_at is not None and t.completed_at is not None]
+    if not tasks:
+        return None
+    nodes = execution.dag.get("nodes") or execution.extra.get("nodes") or []
+    definition = {n["id"]: n for n in nodes if n.get("id")}
+    n = len(tasks)
+    start = np.fromiter((_seconds(t.started_at) for t in tasks), dtype=float, count=n)
+    end = np.maximum(np.fromiter((_seconds(t.completed_at) for t in tasks), dtype=float, count=n), start)
+    dag_start = min(_seconds(execution.started_at), start.min()) if execution.started_at else start.min()
+
+    pred = np.full(n, -1, dtype=np.int64)
+    if definition:
+        position = {t.task_id: i for i, t in enumerate(tasks)}
+        for i, task in enumerate(tasks):
+            deps = [position[d] for d in definition.get(task.task_id, {}).get("dependencies") or () if d in position]
+            if deps:
+                pred[i] = max(deps, key=end.__getitem__)
+    else:
+        by_end = np.argsort(end, kind="stable")
+        latest = np.searchsorted(end[by_end], start, side="right") - 1
+        # A zero-length task ends when it starts: step past it to the task that finished before it
+        latest[(latest >= 0) & (by_end[np.maximum(latest, 0)] == np.arange(n))] -= 1
+        found = latest >= 0
+        pred[found] = by_end[latest[found]]
+
+    ready = np.where(pred >= 0, end[np.maximum(pred, 0)], dag_start)
+    queue_wait = np.clip(start - ready, 0.0, None)
+
+    critical = np.zeros(n)
+    current, visited = int(np.argmax(end)), set()
+    while current >= 0 and current not in visited:
+        visited.add(current)
+        critical[current] = end[current] - start[current]
+        current = int(pred[current])
+
+    return {
+        "dag_id": [execution.dag_id] * n,
+        "project_id": [execution.project_id] * n,
+        "task_id": [t.task_id for t in tasks],
+        "task_type": [definition.get(t.task_id, {}).get("task_type") or t.extra.get("task_type") or UNKNOWN_TASK_TYPE
+                      for t in tasks],
+        "status": [str(t.status) if t.status is not None else None for t in tasks],
+        "completed_at": end,
+        "duration": end - start,
+        "queue_wait": queue_wait,
+        "critical_seconds": critical,
+        "dag_seconds": np.full(n, end.max() - dag_start),
+    }
+
+
+class TaskTimingAnalytics:
+    """Timing rows of finished executions, with aggregates cached per ingest version.
+
+    Thread-safe; ingest() is cheap to call on every page run, since executions
+    already seen are skipped by (dag_id, completed_at).
+    """
+
+    def __init__(self,
+                 max_rows: int = 500_000,
+                 recent_runs: int = 10,
+                 baseline_runs: int = 50,
+                 regression_threshold: float = 0.2,
+                 min_samples: int = 5):
+        self.max_rows = max_rows
+        self.recent_runs = recent_runs
+        self.baseline_runs = baseline_runs
+        self.regression_threshold = regression_threshold
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._seen: Set[Tuple[str, Optional[datetime.datetime]]] = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._frame = pd.DataFrame(columns=list(_COLUMNS))
+        self._version = 0
+        self._cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
+        self.executions = 0
+
+    def ingest(self, executions: Iterable[SDKDagExecutionStatus]) -> int:
+        """Add executions that finished since the last call. Returns the number added."""
+        added = 0
+        for execution in executions:
+            if execution.status is None or str(execution.status) not in TERMINAL_STATUSES:
+                continue
+            key = (execution.dag_id, execution.completed_at)
+            with self._lock:
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+            rows = execution_rows(execution)
+            if rows is None:
+                continue
+            with self._lock:
+                self._pending.append(rows)
+                self._version += 1
+                self.executions += 1
+            added += 1
+        return added
+
+    def frame(self) -> pd.DataFrame:
+        """All timing rows, oldest first. Pending executions are appended in one concat."""
+        return self._materialize()[0]
+
+    def _materialize(self) -> Tuple[pd.DataFrame, int]:
+        with self._lock:
+            if self._pending:
+                columns = {name: np.concatenate([np.asarray(rows[name]) for rows in self._pending]) for name in _COLUMNS}
+                self._pending.clear()
+                frame = pd.DataFrame(columns)
+                if not self._frame.empty:
+                    frame = pd.concat([self._frame, frame], ignore_index=True)
+                frame = frame.sort_values("completed_at", kind="stable", ignore_index=True)
+                if len(frame) > self.max_rows:
+                    frame = frame.iloc[-self.max_rows:].reset_index(drop=True)
+                self._frame = frame
+            return self._frame, self._version
+
+    def _cached(self, name: str, compute) -> pd.DataFrame:
+        frame, version = self._materialize()
+        with self._lock:
+            hit = self._cache.get(name)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        result = compute(frame)
+        with self._lock:
+            self._cache[name] = (version, result)
+        return result
+
+    def summary(self) -> pd.DataFrame:
+        """Per task_type: runs, duration p50/p95/p99, queue-wait p50/p95 and critical-path share."""
+        return self._cached("summary", self._summary)
+
+    def regressions(self) -> pd.DataFrame:
+        """Per task_type: median of the last `recent_runs` vs the `baseline_runs` before them."""
+        return self._cached("regressions", self._regressions)
+
+    @staticmethod
+    def _summary(frame: pd.DataFrame) -> pd.DataFrame:
+        if frame.empty:
+            return pd.DataFrame()
+        grouped = frame.groupby("task_type", sort=False)
+        durations = grouped["duration"].quantile([0.5, 0.95, 0.99]).unstack()
+        durations.columns = ["p50_s", "p95_s", "p99_s"]
+        waits = grouped["queue_wait"].quantile([0.5, 0.95]).unstack()
+        waits.columns = ["queue_p50_s", "queue_p95_s"]
+        on_path = frame["critical_seconds"] > 0
+        summary = pd.concat([
+            grouped.size().rename("runs"),
+            durations,
+            waits,
+            on_path.groupby(frame["task_type"]).mean().rename("on_critical_path"),        # Fraction of runs
+            # Share of all critical-path time spent in this task type
+            (grouped["critical_seconds"].sum() / frame["critical_seconds"].sum()).rename("critical_share"),
+            grouped["duration"].sum().rename("total_s"),
+        ], axis=1)
+        return summary.sort_values("critical_share", ascending=False)
+
+    def _regressions(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if frame.empty:
+            return pd.DataFrame()
+        # `frame` is sorted by completion, so this ranks each type's runs newest first
+        rank = frame.groupby("task_type", sort=False).cumcount(ascending=False)
+        recent = frame[rank < self.recent_runs].groupby("task_type")["duration"]
+        baseline = frame[(rank >= self.recent_runs) & (rank < self.recent_runs + self.baseline_runs)] \
+            .groupby("task_type")["duration"]
+        result = pd.concat([recent.median().rename("recent_p50_s"), recent.size().rename("recent_runs"),
+                            baseline.median().rename("baseline_p50_s"), baseline.size().rename("baseline_runs")],
+                           axis=1).dropna(subset=["baseline_p50_s"])
+        result["ratio"] = result["recent_p50_s"] / result["baseline_p50_s"].where(result["baseline_p50_s"] > 0)
+        result["regressed"] = ((result["ratio"] >= 1 + self.regression_threshold)
+                               & (result["recent_runs"] >= self.min_samples)
+                               & (result["baseline_runs"] >= self.min_samples))
+        return result.sort_values("ratio", ascending=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = sum(len(rows["task_id"]) for rows in self._pending)
+            return {"executions": self.executions, "rows": len(self._frame) + pending, "version": self._version}
@@ -0,0 +1,440 @@
+# =============================
+# 📁 sdk/tracing.py
+# =============================
+# Lightweight spans for client-side latency tracing.
+#
+# A Tracer hands out spans that nest through a contextvar, so the span active
+# when a coroutine (or a task it spawns) starts becomes its parent. Finished
+# spans are buffered per trace and exported together when the trace's local
+# root ends (a page render, or a request issued outside one); spans that end
+# after their root are exported on their own.
+#
+# Exporters speak the OTLP/JSON trace encoding, so the output can be read by an
+# OpenTelemetry collector (`otlpjsonfile` receiver for files, OTLP/HTTP for the
+# network exporter) or any OTLP backend, and works offline:
+#   console             indented span tree per trace on stderr
+#   file[:<path>]       one OTLP/JSON ExportTraceServiceRequest per line
+#   otlp[:<endpoint>]   POST <endpoint>/v1/traces (OTEL_EXPORTER_OTLP_ENDPOINT)
+# A Tracer without exporters is disabled: span() returns a shared no-op span.
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICE_NAME = "forgeiq-ui"
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318"
+
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+class Span:
+    """One timed operation. Durations come from perf_counter; start/end are wall-clock nanoseconds."""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes",
+                 "events", "status", "status_message", "_t0", "_tracer")
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, parent: Optional["Span"],
+                 attributes: Optional[Mapping[str, Any]]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Tuple[str, int, Dict[str, Any]]] = []
+        self.status = "unset"
+        self.status_message = ""
+        self._tracer = tracer
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e6
+        return (time.perf_counter_ns() - self._t0) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Mapping[str, Any]] = None) -> None:
+        self.events.append((name, time.time_ns(), dict(attributes) if attributes else {}))
+
+    def set_status(self, status: str, message: str = "") -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, error: BaseException) -> None:
+        self.add_event("exception", {"exception.type": type(error).__name__, "exception.message": str(error)[:500]})
+        self.set_status("error", str(error)[:200])
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._t0)
+        self._tracer._on_end(self)
+
+
+class _NoopSpan:
+    """Stands in for a Span when tracing is off; every operation is a no-op."""
+
+    __slots__ = ()
+
+    recording = False
+    name = ""
+    trace_id = span_id = parent_id = None
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Mapping[str, Any]] = None) -> None:
+        pass
+
+    def set_status(self, status: str, message: str = "") -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Any] = contextvars.ContextVar("forgeiq_current_span", default=NOOP_SPAN)
+
+
+def current_span() -> Any:
+    """The active span in this context (NOOP_SPAN when none is)."""
+    return _current_span.get()
+
+
+def activate(span: Any) -> contextvars.Token:
+    """Make `span` the parent of spans started in this context; returns a token for deactivate()."""
+    return _current_span.set(span)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _current_span.reset(token)
+
+
+class _SpanScope:
+    """Context manager returned by Tracer.span(): activates the span and ends it on exit."""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if isinstance(exc, Exception):
+            self.span.record_exception(exc)
+        elif exc is not None:  # Cancelled (e.g. a losing hedge) or a script-control exception; not a failure
+            self.span.add_event(type(exc).__name__)
+        self.span.end()
+        _current_span.reset(self._token)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+# --- OTLP/JSON encoding ---
+def _any_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # int64 is a string in OTLP/JSON
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _key_values(attributes: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _any_value(v)} for k, v in attributes.items() if v is not None]
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    encoded: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _key_values(span.attributes),
+        "status": {"code": _STATUS_CODES.get(span.status, 0)},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    if span.status_message:
+        encoded["status"]["message"] = span.status_message
+    if span.events:
+        encoded["events"] = [{"name": name, "timeUnixNano": str(ts), "attributes": _key_values(attrs)}
+                             for name, ts, attrs in span.events]
+    return encoded
+
+
+def to_otlp_json(spans: Sequence[Span], resource: Mapping[str, Any]) -> Dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest (JSON encoding) for `spans`."""
+    return {"resourceSpans": [{
+        "resource": {"attributes": _key_values(resource)},
+        "scopeSpans": [{"scope": {"name": "forgeiq.sdk"}, "spans": [_otlp_span(s) for s in spans]}],
+    }]}
+
+
+# --- Exporters ---
+class SpanExporter:
+    def export(self, spans: Sequence[Span], resource: Mapping[str, Any]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleExporter(SpanExporter):
+    """Indented span tree per trace with durations and attributes, for reading in a terminal."""
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span], resource: Mapping[str, Any]) -> None:
+        ids = {s.span_id for s in spans}
+        children: Dict[Optional[str], List[Span]] = {}
+        for s in spans:
+            children.setdefault(s.parent_id if s.parent_id in ids else None, []).append(s)
+        lines: List[str] = []
+
+        def walk(parent_id: Optional[str], depth: int) -> None:
+            for s in sorted(children.get(parent_id, ()), key=lambda s: s.start_ns):
+                attrs = " ".join(f"{k}={v}" for k, v in s.attributes.items() if v is not None)
+                status = " ERROR" + (f" ({s.status_message})" if s.status_message else "") if s.status == "error" else ""
+                lines.append(f"{'  ' * depth}{s.name}  {s.duration_ms:.1f} ms{status}" + (f"  {attrs}" if attrs else ""))
+                walk(s.span_id, depth + 1)
+
+        walk(None, 1)
+        with self._lock:
+            stream = self.stream or sys.stderr
+            stream.write(f"[trace {spans[0].trace_id[:12]}]\n" + "\n".join(lines) + "\n")
+            stream.flush()
+
+
+class FileExporter(SpanExporter):
+    """Appends one OTLP/JSON ExportTraceServiceRequest per line (readable by the collector's otlpjsonfile receiver)."""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+
+    def export(self, spans: Sequence[Span], resource: Mapping[str, Any]) -> None:
+        line = json.dumps(to_otlp_json(spans, resource), separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OTLPHttpExporter(SpanExporter):
+    """POSTs OTLP/JSON to a collector from a background thread; batches are dropped if it is unreachable."""
+
+    def __init__(self, endpoint: str = DEFAULT_OTLP_ENDPOINT, headers: Optional[Mapping[str, str]] = None,
+                 timeout: float = 5.0, max_queued: int = 256):
+        self.url = endpoint.rstrip("/") + ("" if endpoint.rstrip("/").endswith("/v1/traces") else "/v1/traces")
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span], resource: Mapping[str, Any]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="forgeiq-otlp-exporter", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(json.dumps(to_otlp_json(spans, resource), separators=(",", ":")).encode())
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        import httpx  # Only needed once something is exported
+
+        with httpx.Client(timeout=self.timeout, headers=self.headers) as http:
+            while True:
+                body = self._queue.get()
+                if body is None:
+                    return
+                try:
+                    response = http.post(self.url, content=body)
+                    if response.status_code >= 400:
+                        self.dropped += 1
+                        logger.debug(f"SDK tracing: collector answered {response.status_code} for {self.url}")
+                except Exception as e:
+                    self.dropped += 1
+                    logger.debug(f"SDK tracing: could not export to {self.url}: {e}")
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=self.timeout)
+
+
+def exporters_from_spec(spec: str) -> List[SpanExporter]:
+    """Exporters for a comma-separated spec such as "console,file:/tmp/forgeiq-traces.jsonl"."""
+    exporters: List[SpanExporter] = []
+    for part in (p.strip() for p in spec.split(",")):
+        name, _, arg = part.partition(":")
+        name = name.lower()
+        if not name or name in ("0", "off", "none"):
+            continue
+        if name == "console":
+            exporters.append(ConsoleExporter())
+        elif name == "file":
+            exporters.append(FileExporter(arg or default_trace_path()))
+        elif name == "otlp":
+            endpoint = arg or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or \
+                os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or DEFAULT_OTLP_ENDPOINT
+            exporters.append(OTLPHttpExporter(endpoint))
+        else:
+            logger.warning(f"SDK tracing: unknown exporter '{part}' ignored (use console, file[:path] or otlp[:url]).")
+    return exporters
+
+
+def default_trace_path() -> str:
+    """traces.jsonl under FORGEIQ_CACHE_DIR (default ~/.cache/forgeiq)."""
+    cache_dir = os.getenv("FORGEIQ_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "forgeiq")
+    return os.path.join(cache_dir, "traces.jsonl")
+
+
+# --- Tracer ---
+class Tracer:
+    """Creates spans and exports finished traces. Safe to use from any thread or event loop."""
+
+    def __init__(self, exporters: Iterable[SpanExporter] = (), service_name: str = DEFAULT_SERVICE_NAME,
+                 max_spans_per_trace: int = 4096, max_open_traces: int = 256):
+        self.exporters: List[SpanExporter] = list(exporters)
+        self.resource = {"service.name": service_name, "telemetry.sdk.name": "forgeiq-sdk",
+                         "telemetry.sdk.language": "python"}
+        self.max_spans_per_trace = max_spans_per_trace
+        self.max_open_traces = max_open_traces
+        self.spans_exported = 0
+        self.spans_dropped = 0
+        self._open: "OrderedDict[str, List[Span]]" = OrderedDict()  # Finished spans of traces whose root is running
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def span(self, name: str, kind: str = "internal", attributes: Optional[Mapping[str, Any]] = None):
+        """Context manager for a child of the current span (a new trace if there is none)."""
+        if not self.exporters:
+            return _NOOP_SCOPE
+        return _SpanScope(self.start_span(name, kind, attributes))
+
+    def start_span(self, name: str, kind: str = "internal", attributes: Optional[Mapping[str, Any]] = None,
+                   parent: Any = None) -> Any:
+        """Start a span without activating it; the caller ends it (and may activate() it)."""
+        if not self.exporters:
+            return NOOP_SPAN
+        parent = parent if parent is not None else _current_span.get()
+        span = Span(self, name, kind, parent if parent.recording else None, attributes)
+        if span.parent_id is None:
+            with self._lock:
+                self._open[span.trace_id] = []
+                if len(self._open) > self.max_open_traces:  # Roots that never ended (e.g. an abandoned session)
+                    _, orphans = self._open.popitem(last=False)
+                    self._export(orphans)
+        return span
+
+    def _on_end(self, span: Span) -> None:
+        with self._lock:
+            buffered = self._open.get(span.trace_id)
+            if buffered is not None and span.parent_id is not None:
+                if len(buffered) < self.max_spans_per_trace:
+                    buffered.append(span)
+                else:
+                    self.spans_dropped += 1
+                return
+            if buffered is not None:  # The local root: the trace is complete
+                del self._open[span.trace_id]
+                buffered.append(span)
+                batch = buffered
+            else:
+                batch = [span]        # Ended after its root was exported
+        self._export(batch)
+
+    def _export(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        self.spans_exported += len(spans)
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans, self.resource)
+            except Exception as e:
+                logger.warning(f"SDK tracing: {type(exporter).__name__} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_traces = len(self._open)
+        return {"enabled": self.enabled, "exporters": [type(e).__name__ for e in self.exporters],
+                "spans_exported": self.spans_exported, "spans_dropped": self.spans_dropped,
+                "open_traces": open_traces}
+
+    def shutdown(self) -> None:
+        """Export traces still open (their running spans are left out) and close the exporters."""
+        with self._lock:
+            pending = list(self._open.values())
+            self._open.clear()
+        for spans in pending:
+            self._export(spans)
+        for exporter in self.exporters:
+            exporter.shutdown()
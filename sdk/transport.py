@@ -0,0 +1,311 @@
+# =============================
+# 📁 sdk/transport.py
+# =============================
+# Long-lived, keep-alive connection pool used by ForgeIQClient._request.
+#
+# httpx/httpcore connections are bound to the event loop that opened them, so
+# one httpx.AsyncClient is kept *per event loop* and reused for every request
+# issued from that loop. With a single background loop (see ui/runtime.py) this
+# collapses to one pool per process; with legacy asyncio.run() callers it still
+# avoids re-handshaking within one run.
+#
+# When the client's tracer is enabled, send() tags the current span with the
+# request's phases from httpcore's trace hook: queueing on the per-host limit,
+# DNS, TCP connect, TLS, sending, waiting for the first response byte and
+# reading the body (see sdk/tracing.py).
+import asyncio
+import contextvars
+import ipaddress
+import logging
+import socket
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpcore
+import httpx
+
+from .tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class PoolLimits:
+    max_connections: int = 40            # Total sockets across all hosts
+    max_connections_per_host: int = 10   # Concurrent in-flight requests per host:port
+    max_keepalive_connections: int = 20  # Idle sockets kept warm
+    keepalive_expiry: float = 90.0       # Seconds an idle socket stays in the pool
+    http2: bool = True                   # Negotiated via ALPN; falls back to HTTP/1.1
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    handshakes: int = 0
+    handshake_seconds_total: float = 0.0
+    http2_requests: int = 0
+    per_host_waits: int = 0  # Requests that had to queue on the per-host limit
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg_ms = (self.handshake_seconds_total / self.handshakes * 1000) if self.handshakes else 0.0
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / self.requests, 3) if self.requests else 0.0,
+            "handshakes": self.handshakes,
+            "handshake_ms_total": round(self.handshake_seconds_total * 1000, 2),
+            "handshake_ms_avg": round(avg_ms, 2),
+            "http2_requests": self.http2_requests,
+            "per_host_waits": self.per_host_waits,
+        }
+
+
+@dataclass
+class _LoopPool:
+    client: httpx.AsyncClient
+    host_semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+
+
+class _ConnectionTrace:
+    """httpcore trace hook: tells new connections from reused ones and times the handshake.
+
+    With `phases` set it also times every httpcore step ("connect_tcp",
+    "receive_response_headers", ...) for the request's span.
+    """
+
+    def __init__(self, stats: PoolStats, phases: bool = False):
+        self._stats = stats
+        self._connect_started: Optional[float] = None
+        self._handshake_seconds: Optional[float] = None
+        self._http2 = False
+        self.new_connection = False
+        self.phases: Optional[Dict[str, float]] = {} if phases else None
+        self.dns_seconds: Optional[float] = None  # Set by _TimedResolveBackend
+        self.first_byte_at: Optional[float] = None
+        self._step_started: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        if self.phases is not None:
+            step, _, edge = event_name.rpartition(".")
+            step = step.partition(".")[2]  # "http11.receive_response_headers" -> "receive_response_headers"
+            if edge == "started":
+                self._step_started[step] = time.perf_counter()
+            elif edge in ("complete", "failed") and step in self._step_started:
+                now = time.perf_counter()
+                self.phases[step] = self.phases.get(step, 0.0) + now - self._step_started.pop(step)
+                if step == "receive_response_headers":
+                    self.first_byte_at = now
+        if event_name == "connection.connect_tcp.started":
+            self.new_connection = True
+            self._connect_started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            # For TLS the handshake ends at start_tls.complete, which overwrites the TCP-only value.
+            if self._connect_started is not None:
+                self._handshake_seconds = time.perf_counter() - self._connect_started
+        elif event_name.startswith("http2."):
+            self._http2 = True
+
+    def finish(self) -> None:
+        if self.new_connection:
+            self._stats.new_connections += 1
+            if self._handshake_seconds is not None:
+                self._stats.handshakes += 1
+                self._stats.handshake_seconds_total += self._handshake_seconds
+        else:
+            self._stats.reused_connections += 1
+        if self._http2:
+            self._stats.http2_requests += 1
+
+    def span_attributes(self, started: float, queued: float) -> Dict[str, Any]:
+        """Phase timings in ms: where the request's time went, for the request span."""
+        phases = self.phases or {}
+        ms = lambda seconds: round(seconds * 1000, 2)  # noqa: E731
+        attributes: Dict[str, Any] = {
+            "net.connection": "new" if self.new_connection else "reused",
+            "network.protocol.version": "2" if self._http2 else "1.1",
+            "http.queue_ms": ms(queued),
+        }
+        if "connect_tcp" in phases:
+            dns = self.dns_seconds or 0.0
+            if self.dns_seconds is not None:
+                attributes["net.dns_ms"] = ms(dns)
+            attributes["net.connect_ms"] = ms(phases["connect_tcp"] - dns)
+        if "start_tls" in phases:
+            attributes["net.tls_ms"] = ms(phases["start_tls"])
+        attributes["http.send_ms"] = ms(phases.get("send_request_headers", 0.0) + phases.get("send_request_body", 0.0))
+        if "receive_response_headers" in phases:
+            # Request sent -> response headers in: backend time plus one round trip
+            attributes["http.server_wait_ms"] = ms(phases["receive_response_headers"])
+        if self.first_byte_at is not None:
+            attributes["http.ttfb_ms"] = ms(self.first_byte_at - started)
+        if "receive_response_body" in phases:
+            attributes["http.download_ms"] = ms(phases["receive_response_body"])
+        return attributes
+
+
+# The trace of the request being sent in this task, for _TimedResolveBackend.
+_active_trace: contextvars.ContextVar[Optional[_ConnectionTrace]] = \
+    contextvars.ContextVar("forgeiq_active_connection_trace", default=None)
+
+
+class _TimedResolveBackend:
+    """httpcore network backend that resolves the host itself, so DNS time is measured apart from TCP connect.
+
+    httpcore folds name resolution into connect_tcp. This wrapper resolves
+    first (timed), then connects to the resolved addresses in order; TLS still
+    verifies against the original host name. Only installed while tracing.
+    """
+
+    def __init__(self, inner: Any):
+        self._inner = inner
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None, socket_options: Any = None) -> Any:
+        trace = _active_trace.get()
+        try:
+            ipaddress.ip_address(host)
+            addresses: List[str] = [host]
+        except ValueError:
+            started = time.perf_counter()
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            if trace is not None:
+                trace.dns_seconds = time.perf_counter() - started
+            addresses = list(dict.fromkeys(info[4][0] for info in infos)) or [host]
+        last_error: Optional[BaseException] = None
+        for address in addresses:
+            try:
+                return await self._inner.connect_tcp(address, port, timeout=timeout, local_address=local_address,
+                                                     socket_options=socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout, OSError) as e:
+                last_error = e
+        raise last_error  # type: ignore[misc]
+
+    def __getattr__(self, name: str) -> Any:  # connect_unix_socket, sleep, ...
+        return getattr(self._inner, name)
+
+
+class PooledTransport:
+    """Owns the keep-alive pools for one ForgeIQClient. Safe to share across event loops."""
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: float = 30.0, limits: Optional[PoolLimits] = None, time_dns: bool = False):
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.limits = limits or PoolLimits()
+        self.time_dns = time_dns  # Resolve hosts in _TimedResolveBackend (tracing only)
+        self.stats = PoolStats()
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]" = weakref.WeakKeyDictionary()
+        self._closed = False
+
+    def _build_client(self) -> httpx.AsyncClient:
+        use_http2 = self.limits.http2 and HTTP2_AVAILABLE
+        if self.limits.http2 and not HTTP2_AVAILABLE:
+            logger.debug("SDK transport: 'h2' not installed, using HTTP/1.1 keep-alive only.")
+        client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=self.timeout,
+            http2=use_http2,
+            limits=httpx.Limits(
+                max_connections=self.limits.max_connections,
+                max_keepalive_connections=self.limits.max_keepalive_connections,
+                keepalive_expiry=self.limits.keepalive_expiry,
+            ),
+        )
+        if self.time_dns:
+            # httpx has no public hook for the network backend; tolerate version drift as in pool_stats().
+            core_pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            if hasattr(core_pool, "_network_backend"):
+                core_pool._network_backend = _TimedResolveBackend(core_pool._network_backend)
+        return client
+
+    def _pool_for_running_loop(self) -> _LoopPool:
+        if self._closed:
+            raise RuntimeError("PooledTransport is closed; create a new ForgeIQClient.")
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = _LoopPool(client=self._build_client())
+            self._pools[loop] = pool
+            logger.debug(f"SDK transport: opened connection pool for loop {id(loop):#x} -> {self.base_url}")
+        return pool
+
+    def _host_semaphore(self, pool: _LoopPool, url: httpx.URL) -> asyncio.Semaphore:
+        host_key = f"{url.host}:{url.port or (443 if url.scheme == 'https' else 80)}"
+        sem = pool.host_semaphores.get(host_key)
+        if sem is None:
+            sem = asyncio.Semaphore(self.limits.max_connections_per_host)
+            pool.host_semaphores[host_key] = sem
+        return sem
+
+    async def send(self, method: str, endpoint: str, *, params: Optional[Dict[str, Any]] = None,
+                   json_data: Any = None, headers: Optional[Dict[str, str]] = None,
+                   content: Optional[bytes] = None) -> httpx.Response:
+        pool = self._pool_for_running_loop()
+        request = pool.client.build_request(method, endpoint, params=params, json=json_data,
+                                            headers=headers, content=content)
+        span = current_span()
+        trace = _ConnectionTrace(self.stats, phases=span.recording)
+        request.extensions["trace"] = trace
+
+        sem = self._host_semaphore(pool, request.url)
+        if sem.locked():
+            self.stats.per_host_waits += 1
+        queued_at = time.perf_counter()
+        async with sem:
+            started = time.perf_counter()
+            token = _active_trace.set(trace)
+            try:
+                response = await pool.client.send(request)
+            finally:
+                _active_trace.reset(token)
+        self.stats.requests += 1
+        trace.finish()
+        if span.recording:
+            span.set_attributes(trace.span_attributes(started, started - queued_at))
+            span.set_attribute("http.response.status_code", response.status_code)
+        return response
+
+    def pool_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        open_conns = idle_conns = 0
+        for pool in list(self._pools.values()):
+            # httpcore exposes its connection list on the pool; tolerate version drift.
+            core_pool = getattr(getattr(pool.client, "_transport", None), "_pool", None)
+            for conn in getattr(core_pool, "connections", []) or []:
+                if conn.is_closed():
+                    continue
+                open_conns += 1
+                if conn.is_idle():
+                    idle_conns += 1
+        stats.update({"open_connections": open_conns, "idle_connections": idle_conns,
+                      "event_loop_pools": len(self._pools)})
+        return stats
+
+    async def aclose(self) -> None:
+        self._closed = True
+        current = asyncio.get_running_loop()
+        pools = list(self._pools.items())
+        self._pools.clear()
+        for loop, pool in pools:
+            try:
+                if loop is current:
+                    await pool.client.aclose()
+                elif loop.is_running():
+                    fut = asyncio.run_coroutine_threadsafe(pool.client.aclose(), loop)
+                    await asyncio.wrap_future(fut)
+                # Pools bound to an already-closed loop cannot be awaited; their sockets are released on GC.
+            except Exception as e:
+                logger.warning(f"SDK transport: error closing pool for loop {id(loop):#x}: {e}")
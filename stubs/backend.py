@@ -0,0 +1,783 @@
+# =============================================
+# 📁 stubs/backend.py
+# =============================================
+# Local stand-in for the ForgeIQ backend, for exercising the SDK and pages
+# without the Railway deployment. Serves randomized mock data.
+#
+#   uvicorn stubs.backend:app --port 8000
+#   FORGEIQ_API_BASE_URL=http://localhost:8000 streamlit run app.py
+import asyncio
+import datetime
+import functools
+import hashlib
+import heapq
+import json
+import os
+import random
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+try:
+    import msgpack
+except ImportError:  # MessagePack negotiation is simply not offered
+    msgpack = None
+
+app = FastAPI(title="ForgeIQ backend stub")
+
+
+# --- Conditional GET support + MessagePack negotiation ---
+# Mirrors the backend: strong ETag over the body bytes, 304 when If-None-Match matches.
+# Clients sending "Accept: application/msgpack" get the same payload MessagePack-encoded.
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    media_type = response.media_type
+    if msgpack is not None and "application/msgpack" in request.headers.get("accept", "") \
+            and headers.get("content-type", "").startswith("application/json"):
+        body = msgpack.packb(json.loads(body), use_bin_type=True)
+        media_type = headers["content-type"] = "application/msgpack"
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers["ETag"] = etag
+    headers["Vary"] = "Accept"
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, status_code=200, headers=headers, media_type=media_type)
+
+
+# --- Fault injection (for exercising sdk/resilience.py) ---
+#   curl -XPOST localhost:8000/_stub/faults -H 'content-type: application/json' \
+#        -d '{"path_prefix": "/api/forgeiq/deployments", "latency_ms": 800, "latency_rate": 0.1, "error_rate": 0.5}'
+#   curl -XDELETE localhost:8000/_stub/faults
+class FaultRule(BaseModel):
+    path_prefix: str = "/api/forgeiq/"
+    latency_ms: int = 0
+    latency_rate: float = 1.0    # Fraction of matching requests that get the extra latency
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+_fault_rules: List[FaultRule] = []
+
+
+@app.middleware("http")
+async def fault_middleware(request: Request, call_next):
+    for rule in _fault_rules:
+        if request.url.path.startswith(rule.path_prefix):
+            if rule.latency_ms and random.random() < rule.latency_rate:
+                await asyncio.sleep(rule.latency_ms / 1000)
+            if random.random() < rule.error_rate:
+                return Response(content=json.dumps({"detail": "Injected fault"}), status_code=rule.error_status,
+                                media_type="application/json")
+            break
+    return await call_next(request)
+
+
+@app.get("/_stub/faults")
+async def list_faults() -> Dict[str, Any]:
+    return {"rules": [rule.model_dump() for rule in _fault_rules]}
+
+
+@app.post("/_stub/faults")
+async def add_fault(rule: FaultRule) -> Dict[str, Any]:
+    _fault_rules.insert(0, rule)  # Most recent rule wins for overlapping prefixes
+    return await list_faults()
+
+
+@app.delete("/_stub/faults")
+async def clear_faults() -> Dict[str, Any]:
+    _fault_rules.clear()
+    return await list_faults()
+
+
+def _iso_ago(**delta: int) -> str:
+    return (datetime.datetime.utcnow() - datetime.timedelta(**delta)).isoformat() + "Z"
+
+
+# --- Overview summaries ---
+@app.get("/api/forgeiq/system/overall-summary")
+async def overall_summary() -> Dict[str, Any]:
+    return {
+        "active_projects_count": random.randint(3, 10),
+        "total_agents_defined": 12,
+        "agents_online_count": random.randint(8, 12),
+        "critical_alerts_count": random.randint(0, 2),
+        "system_health_status": random.choice(["Operational", "Degraded", "Minor Issues"]),
+    }
+
+
+@app.get("/api/forgeiq/projects/summary")
+async def projects_summary(limit: int = 3) -> Dict[str, Any]:
+    project_names = ["PhoenixCI", "NovaBuild", "QuantumDeploy"]
+    statuses = ["SUCCESSFUL", "FAILED", "IN_PROGRESS"]
+    return {"projects": [
+        {
+            "name": name,
+            "last_build_status": random.choice(statuses),
+            "last_build_timestamp": _iso_ago(hours=random.randint(1, 24)),
+            "repo_url": f"https://github.com/example/{name.lower()}",
+        } for name in random.sample(project_names, k=len(project_names))[:limit]
+    ]}
+
+
+@app.get("/api/forgeiq/pipelines/recent-summary")
+async def pipelines_recent_summary(limit: int = 3) -> Dict[str, Any]:
+    statuses = ["COMPLETED_SUCCESS", "FAILED", "RUNNING"]
+    return {"pipelines": [
+        {
+            "dag_id": f"dag_{uuid.uuid4().hex[:8]}",
+            "project_id": random.choice(["PhoenixCI", "NovaBuild"]),
+            "status": random.choice(statuses),
+            "started_at": _iso_ago(minutes=random.randint(5, 120)),
+            "trigger": random.choice(["Commit abc1234", "Manual via API", "Scheduled"]),
+        } for _ in range(limit)
+    ]}
+
+
+@app.get("/api/forgeiq/deployments/recent-summary")
+async def deployments_recent_summary(limit: int = 3) -> Dict[str, Any]:
+    statuses = ["SUCCESSFUL", "FAILED", "IN_PROGRESS"]
+    services = ["forgeiq-backend", "codenav-agent", "plan-agent"]
+    envs = ["staging", "production"]
+    return {"deployments": [
+        {
+            "deployment_id": f"depl_{uuid.uuid4().hex[:8]}",
+            "service_name": random.choice(services),
+            "target_environment": random.choice(envs),
+            "commit_sha": hashlib.sha1(os.urandom(16)).hexdigest()[:7],
+            "status": random.choice(statuses),
+            "completed_at": _iso_ago(minutes=random.randint(15, 300)),
+        } for _ in range(limit)
+    ]}
+
+
+# --- Pipeline executions (versioned, for list + delta sync) ---
+# Every DAG and task carries the version at which it last changed; deletions
+# leave a tombstone version. Each request advances a few RUNNING DAGs so that
+# consecutive syncs see real deltas.
+_TASK_NAMES = ["lint", "unit-tests", "build-image", "security-scan", "deploy-staging"]
+_TOMBSTONE_RETENTION = 500  # Versions; older watermarks get a full resync
+
+_exec_version = 0
+_executions: Dict[str, Dict[str, Any]] = {}
+_tombstones: Dict[str, int] = {}
+_compacted_before = 0
+
+
+def _bump() -> int:
+    global _exec_version
+    _exec_version += 1
+    return _exec_version
+
+
+_TASK_SECONDS = {"lint": 30, "unit-tests": 120, "build-image": 300, "security-scan": 90, "deploy-staging": 60}
+
+
+def _new_execution(i: int) -> Dict[str, Any]:
+    version = _bump()
+    done = random.randint(0, len(_TASK_NAMES))
+    count = int(os.getenv("STUB_EXECUTIONS", "300"))
+    started = datetime.datetime.utcnow() - datetime.timedelta(minutes=30 + 2 * (count - i) + random.randint(0, 5))
+    # The newest quarter of DAGs have a slower build-image step, for the timing regression report
+    slowdown = 1.6 if i >= 0.75 * count else 1.0
+    tasks, clock = [], started
+    for n, name in enumerate(_TASK_NAMES):
+        task = {"task_id": name, "task_type": name.split("-")[0],  # Same type as in the DAG definition
+                "status": "SUCCESS" if n < done else ("RUNNING" if n == done else "PENDING"), "_version": version}
+        if n <= done:
+            clock += datetime.timedelta(seconds=random.uniform(0, 20))  # Queue wait
+            task["started_at"] = clock.isoformat() + "Z"
+            if n < done:
+                clock += datetime.timedelta(seconds=_TASK_SECONDS[name] * random.uniform(0.8, 1.25)
+                                            * (slowdown if name == "build-image" else 1.0))
+                task["completed_at"] = clock.isoformat() + "Z"
+        tasks.append(task)
+    finished = done == len(_TASK_NAMES)
+    return {"dag_id": f"dag_{i:05d}", "project_id": random.choice(["project_alpha", "project_beta", "project_gamma"]),
+            "status": "COMPLETED_SUCCESS" if finished else "RUNNING",
+            "started_at": started.isoformat() + "Z", "completed_at": clock.isoformat() + "Z" if finished else None,
+            "message": None, "task_statuses": tasks, "_version": version}
+
+
+def _advance_executions() -> None:
+    global _compacted_before
+    if not _executions and not _tombstones:
+        for i in range(int(os.getenv("STUB_EXECUTIONS", "300"))):
+            execution = _new_execution(i)
+            _executions[execution["dag_id"]] = execution
+    running = [e for e in _executions.values() if e["status"] == "RUNNING"]
+    for execution in random.sample(running, k=min(len(running), 3)):
+        version = _bump()
+        task = next(t for t in execution["task_statuses"] if t["status"] in ("RUNNING", "PENDING"))
+        task.update(status="SUCCESS", completed_at=_iso_ago(seconds=0), _version=version)
+        task.setdefault("started_at", task["completed_at"])
+        pending = [t for t in execution["task_statuses"] if t["status"] == "PENDING"]
+        if pending:
+            pending[0].update(status="RUNNING", started_at=_iso_ago(seconds=0), _version=version)
+        else:
+            execution.update(status="COMPLETED_SUCCESS", completed_at=_iso_ago(seconds=0))
+        execution["_version"] = version
+    if random.random() < 0.2 and len(_executions) > 1:
+        dag_id = random.choice(list(_executions))
+        del _executions[dag_id]
+        _tombstones[dag_id] = _bump()
+    stale = [dag_id for dag_id, v in _tombstones.items() if v < _exec_version - _TOMBSTONE_RETENTION]
+    for dag_id in stale:
+        _compacted_before = max(_compacted_before, _tombstones.pop(dag_id))
+
+
+def _public(record: Dict[str, Any], since: int = 0) -> Dict[str, Any]:
+    out = {k: v for k, v in record.items() if not k.startswith("_")}
+    out["task_statuses"] = [{k: v for k, v in t.items() if k != "_version"}
+                            for t in record["task_statuses"] if t["_version"] > since]
+    return out
+
+
+def _page(items: List[Any], limit: int, cursor: Optional[str]):
+    start = int(cursor or 0)
+    end = start + limit
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+def _sorted(records: List[Dict[str, Any]], sort: str, fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # "-field,field" spec; `fields` maps each sortable name to its key function. Missing values sort last.
+    for key in reversed([k for k in sort.split(",") if k]):
+        name = key.lstrip("-")
+        if name not in fields:
+            raise HTTPException(status_code=400, detail=f"Unsupported sort field {name}")
+        value = fields[name]
+        present = [r for r in records if value(r) is not None]
+        present.sort(key=value, reverse=key.startswith("-"))
+        records = present + [r for r in records if value(r) is None]
+    return records
+
+
+def _facets(records: Iterable[Dict[str, Any]], fields: str) -> Dict[str, Any]:
+    names = [f for f in fields.split(",") if f]
+    counters = {name: Counter() for name in names}
+    total = 0
+    for record in records:
+        total += 1
+        for name in names:
+            if record.get(name) is not None:
+                counters[name][record[name]] += 1
+    return {"facets": {name: [{"value": v, "count": c} for v, c in counter.most_common()]
+                       for name, counter in counters.items()},
+            "total": total}
+
+
+_EXECUTION_SORTS = {name: (lambda e, name=name: e.get(name))
+                    for name in ("started_at", "completed_at", "dag_id", "project_id", "status")}
+
+
+@app.get("/api/forgeiq/pipelines/executions")
+async def list_executions(project_id: Optional[str] = None, status: Optional[str] = None, sort: str = "-started_at",
+                          limit: int = 25, cursor: Optional[str] = None) -> Dict[str, Any]:
+    _advance_executions()
+    matches = _sorted([e for e in _executions.values()
+                       if (project_id is None or e["project_id"] == project_id)
+                       and (status is None or e["status"] == status)], sort, _EXECUTION_SORTS)
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"pipelines": [_public(e) for e in items], "next_cursor": next_cursor, "total": len(matches)}
+
+
+@app.get("/api/forgeiq/pipelines/executions/facets")
+async def execution_facets(fields: str = "project_id,status") -> Dict[str, Any]:
+    _advance_executions()
+    return _facets(_executions.values(), fields)
+
+
+@app.get("/api/forgeiq/pipelines/executions/changes")
+async def execution_changes(since: Optional[str] = None, limit: int = 500,
+                            cursor: Optional[str] = None) -> Dict[str, Any]:
+    # The watermark is pinned in the cursor so later pages of one sync see the same snapshot bounds.
+    if cursor:
+        cursor, _, watermark = cursor.partition("@")
+    else:
+        _advance_executions()
+        watermark = str(_exec_version)
+    since_version = int(since) if since and since.isdigit() else None
+    full_resync = since_version is None or since_version < _compacted_before
+    base = 0 if full_resync else since_version
+    changed = [_public(e, base) for e in _executions.values() if e["_version"] > base]
+    tombstones = [] if full_resync else [d for d, v in _tombstones.items() if v > base]
+    items, next_cursor = _page(changed, limit, cursor)
+    return {"executions": items, "tombstones": tombstones if not cursor else [],
+            "watermark": watermark, "next_cursor": f"{next_cursor}@{watermark}" if next_cursor else None,
+            "full_resync": full_resync}
+
+
+@app.get("/api/forgeiq/projects/{project_id}/dags/{dag_id}/status")
+async def dag_status(project_id: str, dag_id: str) -> Dict[str, Any]:
+    execution = _executions.get(dag_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail=f"DAG {dag_id} not found")
+    nodes = [{"id": name, "task_type": name.split("-")[0], "dependencies": [_TASK_NAMES[i - 1]] if i else []}
+             for i, name in enumerate(_TASK_NAMES)]
+    public = _public(execution)
+    packages = int(os.getenv("STUB_DAG_PACKAGES", "0"))  # e.g. 1000 for a monorepo DAG of 2,000+ nodes
+    if packages:
+        extra_nodes, extra_tasks = _monorepo_tasks(dag_id, packages, execution)
+        nodes[_TASK_NAMES.index("build-image")]["dependencies"] = [n["id"] for n in extra_nodes if n["task_type"] == "test"]
+        nodes.extend(extra_nodes)
+        public["task_statuses"] += extra_tasks
+    return {**public, "dag": {"description": f"CI pipeline for {execution['project_id']}", "nodes": nodes}}
+
+
+def _monorepo_tasks(dag_id: str, packages: int, execution: Dict[str, Any]):
+    """compile/test task pairs per package between unit-tests and build-image, seeded by dag_id."""
+    rng = random.Random(dag_id)
+    workers = [datetime.datetime.min] * int(os.getenv("STUB_DAG_WORKERS", "64"))  # Free-at times of the CI worker pool
+    # Two tasks per package averaging ~2 min each, spread over the pool
+    started = datetime.datetime.utcnow() - datetime.timedelta(minutes=30 + packages * 4 // len(workers))
+    finished = next(t for t in execution["task_statuses"] if t["task_id"] == "build-image")["status"] == "SUCCESS"
+    nodes: List[Dict[str, Any]] = []
+    tasks: List[Dict[str, Any]] = []
+    end_of: Dict[str, datetime.datetime] = {"unit-tests": started}
+    for i in range(packages):
+        compile_id, test_id = f"compile-pkg{i:04d}", f"test-pkg{i:04d}"
+        deps = ["unit-tests"] + [f"compile-pkg{j:04d}" for j in rng.sample(range(max(0, i - 50), i), k=min(i, rng.randint(0, 2)))]
+        nodes.append({"id": compile_id, "task_type": "compile", "dependencies": deps})
+        nodes.append({"id": test_id, "task_type": "test", "dependencies": [compile_id]})
+        for task_id, task_deps in ((compile_id, deps), (test_id, [compile_id])):
+            begin = max(max(end_of.get(d, started) for d in task_deps), workers[0])
+            end_of[task_id] = begin + datetime.timedelta(seconds=rng.randint(5, 240))
+            status = "SUCCESS" if finished or rng.random() < 0.7 else rng.choice(["RUNNING", "PENDING", "FAILED"])
+            tasks.append({"task_id": task_id, "status": status,
+                          "started_at": begin.isoformat() + "Z" if status != "PENDING" else None,
+                          "completed_at": end_of[task_id].isoformat() + "Z" if status in ("SUCCESS", "FAILED") else None})
+            heapq.heapreplace(workers, end_of[task_id])
+    return nodes, tasks
+
+
+# --- Deployments ---
+_deployments: List[Dict[str, Any]] = []
+
+
+def _seed_deployments() -> None:
+    if not _deployments:
+        for i in range(int(os.getenv("STUB_DEPLOYMENTS", "200"))):
+            started = random.randint(10, 5000)
+            _deployments.append({
+                "deployment_id": f"depl_{i:05d}", "request_id": f"req_{uuid.uuid4().hex[:12]}",
+                "project_id": random.choice(["project_alpha", "project_beta", "project_gamma"]),
+                "service_name": random.choice(["forgeiq-backend", "codenav-agent", "plan-agent"]),
+                "target_environment": random.choice(["staging", "production"]),
+                "commit_sha": hashlib.sha1(os.urandom(16)).hexdigest(),
+                "status": random.choice(["SUCCESSFUL", "SUCCESSFUL", "FAILED", "IN_PROGRESS"]),
+                "started_at": _iso_ago(minutes=started), "completed_at": _iso_ago(minutes=started - 5),
+                "deployment_url": None, "logs_url": None,
+            })
+
+
+@app.get("/api/forgeiq/deployments/facets")
+async def deployment_facets(fields: str = "project_id,service_name,target_environment,status",
+                            project_id: Optional[str] = None) -> Dict[str, Any]:
+    _seed_deployments()
+    return _facets((d for d in _deployments if project_id is None or d["project_id"] == project_id), fields)
+
+
+_DEPLOYMENT_SORTS = {name: (lambda d, name=name: d.get(name))
+                     for name in ("started_at", "completed_at", "project_id", "service_name", "target_environment", "status")}
+
+
+@app.get("/api/forgeiq/deployments")
+async def list_deployments(project_id: Optional[str] = None, service_name: Optional[str] = None,
+                           target_environment: Optional[str] = None, status: Optional[str] = None,
+                           sort: str = "-started_at", limit: int = 25, cursor: Optional[str] = None) -> Dict[str, Any]:
+    _seed_deployments()
+    filters = {"project_id": project_id, "service_name": service_name,
+               "target_environment": target_environment, "status": status}
+    matches = [d for d in _deployments if all(v is None or d[k] == v for k, v in filters.items())]
+    matches = _sorted(matches, sort, _DEPLOYMENT_SORTS)
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"deployments": items, "next_cursor": next_cursor, "total": len(matches)}
+
+
+# --- Security scan results + findings query ---
+_SCANNERS = {"CONTAINER_IMAGE_TRIVY": ("trivy", 3000), "SAST_PYTHON_BANDIT": ("bandit", 60),
+             "SCA_PYTHON_PIP_AUDIT": ("pip-audit", 40), "IAC_TFSEC": ("tfsec", 30)}
+_SEVERITY_RANK = {"INFORMATIONAL": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+_scans: List[Dict[str, Any]] = []
+
+
+def _seed_scans() -> None:
+    if _scans:
+        return
+    # Scans of one project + scan type draw from a shared pool, so most findings
+    # recur from scan to scan (as they do across commits) and a few come and go.
+    pools: Dict[tuple, List[Dict[str, Any]]] = {}
+    for i in range(int(os.getenv("STUB_SCANS", "40"))):
+        scan_type = random.choice(list(_SCANNERS))
+        tool, max_findings = _SCANNERS[scan_type]
+        project_id = random.choice(["project_alpha", "project_beta", "project_gamma"])
+        pool = pools.get((project_id, scan_type))
+        if pool is None:
+            pool = pools[(project_id, scan_type)] = [{
+                "rule_id": f"{tool.upper()}-{random.randint(100, 160)}",
+                "severity": random.choices(list(_SEVERITY_RANK), weights=[30, 30, 25, 12, 3])[0],
+                "description": f"{tool} finding {n}",
+                "file_path": random.choice(["app/", "lib/", "usr/lib/python3/"]) + f"module_{random.randint(0, 40)}.py",
+                "line_number": random.randint(1, 800),
+                "tool_name": tool,
+            } for n in range(random.randint(0, max_findings))]
+        findings = [{**f, "finding_id": f"find_{i:04d}_{n:05d}"}
+                    for n, f in enumerate(f for f in pool if random.random() < 0.9)]
+        _scans.append({
+            "scan_id": f"scan_{i:04d}", "triggering_event_id": f"evt_{uuid.uuid4().hex}",
+            "project_id": project_id,
+            "scan_type": scan_type, "tool_name": tool, "status": "COMPLETED_SUCCESS",
+            "commit_sha": hashlib.sha1(os.urandom(16)).hexdigest(), "artifact_name": f"{tool}-target-{i}",
+            "summary": f"{len(findings)} findings", "timestamp": _iso_ago(minutes=random.randint(1, 5000)),
+            "findings": findings,
+        })
+
+
+def _scan_summary(scan: Dict[str, Any]) -> Dict[str, Any]:
+    counts = Counter(f["severity"] for f in scan["findings"])
+    return {**{k: v for k, v in scan.items() if k != "findings"},
+            "findings_count": len(scan["findings"]), "severity_counts": dict(counts)}
+
+
+_SCAN_SORTS = {**{name: (lambda s, name=name: s.get(name)) for name in ("timestamp", "project_id", "scan_type", "tool_name")},
+               "findings_count": lambda s: len(s["findings"])}
+
+
+@app.get("/api/forgeiq/security/scan-results")
+async def list_scan_results(project_id: Optional[str] = None, scan_type: Optional[str] = None,
+                            min_severity: Optional[str] = None, include_findings: bool = True,
+                            sort: str = "-timestamp", limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+    _seed_scans()
+    threshold = _SEVERITY_RANK.get(min_severity or "", -1)
+    matches = [s for s in _scans
+               if (project_id is None or s["project_id"] == project_id)
+               and (scan_type is None or s["scan_type"] == scan_type)
+               and (threshold < 0 or any(_SEVERITY_RANK[f["severity"]] >= threshold for f in s["findings"]))]
+    matches = _sorted(matches, sort, _SCAN_SORTS)
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"scan_results": items if include_findings else [_scan_summary(s) for s in items],
+            "next_cursor": next_cursor, "total": len(matches)}
+
+
+@app.get("/api/forgeiq/security/scan-results/facets")
+async def scan_result_facets(fields: str = "project_id,scan_type") -> Dict[str, Any]:
+    _seed_scans()
+    return _facets(_scans, fields)
+
+
+def _scan(scan_id: str) -> Dict[str, Any]:
+    _seed_scans()
+    scan = next((s for s in _scans if s["scan_id"] == scan_id), None)
+    if scan is None:
+        raise HTTPException(status_code=404, detail=f"Scan {scan_id} not found")
+    return scan
+
+
+@app.get("/api/forgeiq/security/scan-results/{scan_id}")
+async def get_scan_result(scan_id: str) -> Dict[str, Any]:
+    return _scan(scan_id)
+
+
+@app.get("/api/forgeiq/security/scan-results/{scan_id}/findings")
+async def query_findings(scan_id: str, min_severity: Optional[str] = None, rule_id: Optional[str] = None,
+                         file_path: Optional[str] = None, sort: str = "-severity,file_path,line_number",
+                         limit: int = 10, cursor: Optional[str] = None) -> Dict[str, Any]:
+    threshold = _SEVERITY_RANK.get(min_severity or "", -1)
+    matches = [f for f in _scan(scan_id)["findings"]
+               if _SEVERITY_RANK[f["severity"]] >= threshold
+               and (rule_id is None or f["rule_id"] == rule_id)
+               and (file_path is None or f["file_path"].startswith(file_path))]
+    for key in reversed(sort.split(",")):
+        name = key.lstrip("-")
+        if name not in ("severity", "file_path", "rule_id", "line_number"):
+            raise HTTPException(status_code=400, detail=f"Unsupported sort field {name}")
+        matches.sort(key=(lambda f: _SEVERITY_RANK[f["severity"]]) if name == "severity" else (lambda f: f[name]),
+                     reverse=key.startswith("-"))
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"findings": items, "total": len(matches), "next_cursor": next_cursor}
+
+
+# --- Governance audit logs (append-only; oldest first so offset cursors stay stable while entries are added) ---
+_AUDIT_EVENT_TYPES = ["NewCommitEvent", "DagExecutionStatusEvent", "DeploymentStatusEvent", "SecurityScanResultEvent"]
+_AUDIT_ACTORS = ["ci-bot", "plan-agent", "deploy-agent", "alice", "bob", "carol"]
+_AUDIT_ACTIONS = {
+    "NewCommitEvent": ["Pushed commit {sha} to main", "Opened review for commit {sha}"],
+    "DagExecutionStatusEvent": ["Started {dag}", "Retried failed task in {dag}", "Cancelled {dag}"],
+    "DeploymentStatusEvent": ["Approved deployment {deploy} to production", "Rejected deployment {deploy}",
+                              "Rolled back deployment {deploy} in staging"],
+    "SecurityScanResultEvent": ["Waived finding in scan of {sha}", "Acknowledged critical findings for {sha}"],
+}
+_audit_logs: List[Dict[str, Any]] = []
+
+
+def _audit_entry(moment: datetime.datetime) -> Dict[str, Any]:
+    event_type = random.choice(_AUDIT_EVENT_TYPES)
+    ids = {"sha": uuid.uuid4().hex[:8], "dag": f"dag_{random.randint(0, 999):05d}",
+           "deploy": f"deploy_{random.randint(0, 999):04d}"}
+    return {
+        "audit_id": f"audit_{uuid.uuid4().hex}", "timestamp": moment.isoformat() + "Z", "_ts": moment,
+        "source_event_type": event_type,
+        "project_id": random.choice(["project_alpha", "project_beta", "project_gamma"]),
+        "user_or_actor": random.choice(_AUDIT_ACTORS),
+        "action_description": random.choice(_AUDIT_ACTIONS[event_type]).format(**ids),
+        "details": {"dag_id": ids["dag"], "deployment_id": ids["deploy"], "attempt": random.randint(1, 3)},
+    }
+
+
+def _advance_audit_logs() -> None:
+    now = datetime.datetime.utcnow()
+    if not _audit_logs:
+        count = int(os.getenv("STUB_AUDIT_LOGS", "20000"))
+        span = datetime.timedelta(days=int(os.getenv("STUB_AUDIT_DAYS", "180")))
+        _audit_logs.extend(sorted((_audit_entry(now - span * random.random()) for _ in range(count)),
+                                  key=lambda e: e["_ts"]))
+    _audit_logs.extend(_audit_entry(now) for _ in range(random.randint(0, 3)))
+
+
+def _stub_ts(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+@app.get("/api/forgeiq/governance/audit-logs")
+async def list_audit_logs(project_id: Optional[str] = None, source_event_type: Optional[str] = None,
+                          user_actor: Optional[str] = None, date_start: Optional[str] = None,
+                          date_end: Optional[str] = None, limit: int = 100,
+                          cursor: Optional[str] = None) -> Dict[str, Any]:
+    if not cursor:
+        _advance_audit_logs()
+    start, end = (_stub_ts(date_start) if date_start else None), (_stub_ts(date_end) if date_end else None)
+    matches = [e for e in _audit_logs
+               if (start is None or e["_ts"] >= start) and (end is None or e["_ts"] < end)
+               and (project_id is None or e["project_id"] == project_id)
+               and (source_event_type is None or e["source_event_type"] == source_event_type)
+               and (user_actor is None or e["user_or_actor"] == user_actor)]
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"audit_logs": [{k: v for k, v in e.items() if k != "_ts"} for e in items], "next_cursor": next_cursor}
+
+
+# --- Governance alerts (append-only like the audit log) ---
+_ALERT_SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFORMATIONAL"]
+_governance_alerts: List[Dict[str, Any]] = []
+
+
+def _alert(moment: datetime.datetime) -> Dict[str, Any]:
+    project = random.choice(["project_alpha", "project_beta", "project_gamma"])
+    common = {"alert_id": f"alert_{uuid.uuid4().hex}", "timestamp": moment.isoformat() + "Z", "_ts": moment,
+              "severity": random.choice(_ALERT_SEVERITIES), "project_id": project}
+    if random.random() < 0.5:
+        sla, metric = random.choice([("build-duration", "p95_build_seconds"), ("deploy-lead-time", "lead_time_minutes"),
+                                     ("pipeline-success", "success_rate")])
+        return {**common, "event_type": "SLAViolationEvent", "sla_name": sla, "metric_name": metric,
+                "observed_value": round(random.uniform(50, 150), 1), "threshold_value": 100,
+                "description": f"SLA {sla} violated for {project}: {metric} above threshold"}
+    deploy = f"deploy_{random.randint(0, 999):04d}"
+    return {**common, "alert_type": "GovernanceAlertEvent",
+            "description": random.choice([f"Deployment {deploy} approved without change ticket",
+                                          f"Policy check skipped for {deploy}",
+                                          f"Critical finding waived by {random.choice(_AUDIT_ACTORS)}"]),
+            "context_summary": {"deployment_id": deploy, "policy": random.choice(["change-ticket", "two-person-review"])}}
+
+
+def _advance_alerts() -> None:
+    now = datetime.datetime.utcnow()
+    if not _governance_alerts:
+        span = datetime.timedelta(days=int(os.getenv("STUB_AUDIT_DAYS", "180")))
+        _governance_alerts.extend(sorted((_alert(now - span * random.random()) for _ in range(2000)),
+                                         key=lambda a: a["_ts"]))
+    if random.random() < 0.3:
+        _governance_alerts.append(_alert(now))
+
+
+@app.get("/api/forgeiq/governance/alerts")
+async def list_governance_alerts(alert_type: Optional[str] = None, min_severity: Optional[str] = None,
+                                 date_start: Optional[str] = None, limit: int = 25,
+                                 cursor: Optional[str] = None) -> Dict[str, Any]:
+    # Without date_start this is the "latest alerts" view, newest first; with it, a sync, oldest first
+    if not cursor:
+        _advance_alerts()
+    start = _stub_ts(date_start) if date_start else None
+    threshold = _ALERT_SEVERITIES.index(min_severity) if min_severity in _ALERT_SEVERITIES else len(_ALERT_SEVERITIES)
+    matches = [a for a in _governance_alerts
+               if (start is None or a["_ts"] >= start)
+               and (alert_type is None or a.get("event_type", a.get("alert_type")) == alert_type)
+               and _ALERT_SEVERITIES.index(a["severity"]) <= threshold]
+    if start is None:
+        matches.reverse()
+    items, next_cursor = _page(matches, limit, cursor)
+    return {"alerts": [{k: v for k, v in a.items() if k != "_ts"} for a in items], "next_cursor": next_cursor}
+
+
+# --- Build-system configuration ---
+# Global defaults plus STUB_CONFIG_PROJECTS projects with overrides (a few MB of
+# JSON at the default 300). A few projects change every STUB_CONFIG_CHANGE_SECONDS,
+# so successive fetches are distinct versions.
+_TASK_TYPES = [f"{kind}-{n:02d}" for kind in ("lint", "compile", "test", "package", "scan", "deploy") for n in range(40)]
+
+
+@functools.lru_cache(maxsize=2)
+def _build_system_config(generation: int) -> Dict[str, Any]:
+    rng = random.Random(0)
+    config: Dict[str, Any] = {
+        "global_dag_rules": {"max_parallel_tasks": 32, "fail_fast": True,
+                             "retry": {"max_attempts": 2, "backoff_seconds": 10},
+                             "timeouts": {t: rng.choice([300, 600, 1200, 3600]) for t in _TASK_TYPES}},
+        "global_task_weights": {t: round(rng.uniform(0.5, 5.0), 2) for t in _TASK_TYPES},
+        "global_clearance_policies": {env: {"required_approvals": n, "require_green_security_scan": env != "dev",
+                                            "allowed_branches": ["main"] if env == "production" else ["main", "release/*"]}
+                                      for env, n in (("dev", 0), ("staging", 1), ("production", 2))},
+        "projects": {},
+    }
+    for i in range(int(os.getenv("STUB_CONFIG_PROJECTS", "300"))):
+        weights = {t: round(rng.uniform(0.5, 5.0), 2) for t in rng.sample(_TASK_TYPES, k=rng.randint(0, 120))}
+        overrides: Dict[str, Any] = {
+            "repo_url": f"https://github.com/example/project-{i:03d}",
+            "task_weights": weights,
+            "dag_rules": {"timeouts": {t: rng.choice([600, 1800]) for t in rng.sample(_TASK_TYPES, k=rng.randint(0, 60))}},
+            "owners": [f"team-{rng.randint(0, 20)}"],
+            "paths": [f"services/svc-{i:03d}/module_{n}" for n in range(rng.randint(10, 200))],
+        }
+        if rng.random() < 0.3:
+            overrides["dag_rules"]["max_parallel_tasks"] = rng.choice([8, 16, 64])
+        if rng.random() < 0.1:
+            overrides["clearance_policies"] = {"production": {"required_approvals": 3}}
+        config["projects"][f"project_{i:03d}"] = overrides
+    change = random.Random(generation)
+    for project_id in change.sample(sorted(config["projects"]), k=min(3, len(config["projects"]))):
+        config["projects"][project_id]["dag_rules"]["max_parallel_tasks"] = change.choice([4, 8, 12, 24, 48])
+    return config
+
+
+@app.get("/api/forgeiq/config/build-system")
+async def build_system_config() -> Dict[str, Any]:
+    period = float(os.getenv("STUB_CONFIG_CHANGE_SECONDS", "120"))
+    return _build_system_config(int(datetime.datetime.utcnow().timestamp() // period))
+
+
+# --- Agent registry ---
+# Each agent heartbeats on its own period with some jitter; a few have stopped
+# heartbeating, and some report a degraded status.
+_AGENT_TYPES = {"PlanAgent": 30, "CodeNavAgent": 60, "BuildSurfAgent": 20, "DeployAgent": 30, "SecurityAgent": 120}
+_agents: List[Dict[str, Any]] = []
+_agents_epoch = datetime.datetime.utcnow()
+
+
+def _seed_agents() -> None:
+    if _agents:
+        return
+    base_url = os.getenv("STUB_AGENT_BASE_URL", "http://localhost:8000")
+    for i in range(int(os.getenv("STUB_AGENTS", "300"))):
+        agent_type = random.choice(list(_AGENT_TYPES))
+        agent_id = f"{agent_type.lower()}-{i:04d}"
+        _agents.append({
+            "agent_id": agent_id, "agent_type": agent_type,
+            "capabilities": [{"name": c} for c in random.sample(["plan", "build", "test", "deploy", "scan", "index"], k=2)],
+            "endpoints": [{"type": "http", "address": f"{base_url}/_stub/agents/{agent_id}"}],
+            "metadata": {"version": f"1.{random.randint(0, 9)}.{random.randint(0, 20)}", "region": random.choice(["us-east", "eu-west"])},
+            "_period": _AGENT_TYPES[agent_type] * random.uniform(0.8, 1.2),
+            "_jitter": random.uniform(0.0, 0.3),
+            "_phase": random.uniform(0, 60),
+            "_died_after": random.uniform(60, 3600) if random.random() < 0.05 else None,
+            "_status": "degraded" if random.random() < 0.05 else "active",
+        })
+
+
+def _last_heartbeat(agent: Dict[str, Any], now: datetime.datetime) -> datetime.datetime:
+    elapsed = (now - _agents_epoch).total_seconds() + agent["_phase"]
+    if agent["_died_after"] is not None:
+        elapsed = min(elapsed, agent["_died_after"])
+    beat = int(elapsed // agent["_period"])
+    # Jitter is a deterministic function of the beat number, so repeated polls agree
+    offset = random.Random(f"{agent['agent_id']}:{beat}").uniform(0, agent["_jitter"]) * agent["_period"]
+    seconds = beat * agent["_period"] + offset
+    if seconds > elapsed:
+        seconds -= agent["_period"]
+    return _agents_epoch + datetime.timedelta(seconds=max(0.0, seconds) - agent["_phase"])
+
+
+@app.get("/api/forgeiq/agents")
+async def list_agents(limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    _seed_agents()
+    now = datetime.datetime.utcnow()
+    agents = [{**{k: v for k, v in a.items() if not k.startswith("_")},
+               "status": a["_status"], "last_seen_timestamp": _last_heartbeat(a, now).isoformat() + "Z"}
+              for a in _agents]
+    if limit is None:
+        return {"agents": agents}
+    items, next_cursor = _page(agents, limit, cursor)
+    return {"agents": items, "next_cursor": next_cursor}
+
+
+# Health endpoint of each stub agent (the address in its registry record). Latency
+# is long-tailed; dead agents never answer and degraded ones answer 503.
+@app.get("/_stub/agents/{agent_id}/health")
+async def agent_health(agent_id: str) -> Dict[str, Any]:
+    _seed_agents()
+    agent = next((a for a in _agents if a["agent_id"] == agent_id), None)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+    if agent["_died_after"] is not None:
+        await asyncio.sleep(30)
+    await asyncio.sleep(min(random.lognormvariate(-3.5, 0.8), 3.0))  # Median ~30 ms
+    if agent["_status"] != "active":
+        raise HTTPException(status_code=503, detail="degraded")
+    return {"agent_id": agent_id, "status": "ok"}
+
+
+# --- Realtime channel auth (pairs with stubs/soketi.py, which does not verify it) ---
+@app.post("/api/broadcasting/auth")
+async def broadcasting_auth(body: Dict[str, Any]) -> Dict[str, Any]:
+    signature = hashlib.sha256(f"{body.get('socket_id')}:{body.get('channel_name')}".encode()).hexdigest()
+    return {"auth": f"local:{signature}"}
+
+
+# --- Batch endpoint ---
+class BatchItem(BaseModel):
+    id: str
+    method: str = "GET"
+    path: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchBody(BaseModel):
+    requests: List[BatchItem]
+
+
+MAX_BATCH_SIZE = 20
+
+
+@app.post("/api/forgeiq/batch")
+async def batch(body: BatchBody, request: Request) -> Dict[str, Any]:
+    if len(body.requests) > MAX_BATCH_SIZE:
+        return {"responses": [{"id": item.id, "status": 413, "error": f"Batch limited to {MAX_BATCH_SIZE} items"}
+                              for item in body.requests]}
+
+    # Sub-requests are dispatched in-process through this same ASGI app, so any route
+    # the stub serves is batchable without extra wiring. Auth headers are forwarded.
+    forward_headers = {k: v for k, v in request.headers.items() if k.lower() in ("authorization", "x-api-key")}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch.local", headers=forward_headers) as sub:
+        async def _run(item: BatchItem) -> Dict[str, Any]:
+            if item.method.upper() != "GET":
+                return {"id": item.id, "status": 405, "error": "Only GET requests can be batched"}
+            if not item.path.startswith("/api/forgeiq/") or item.path.startswith("/api/forgeiq/batch"):
+                return {"id": item.id, "status": 400, "error": f"Path not batchable: {item.path}"}
+            try:
+                resp = await sub.get(item.path, params=item.params)
+            except Exception as e:
+                return {"id": item.id, "status": 500, "error": str(e)}
+            if resp.status_code >= 400:
+                return {"id": item.id, "status": resp.status_code, "error": resp.text[:500]}
+            return {"id": item.id, "status": resp.status_code, "body": resp.json()}
+
+        responses = await asyncio.gather(*(_run(item) for item in body.requests))
+    return {"responses": list(responses)}
@@ -0,0 +1,74 @@
+# =============================================
+# 📁 stubs/soketi.py
+# =============================================
+# Local Soketi/Pusher-compatible stand-in (protocol 7, no signature checks).
+#
+#   uvicorn stubs.soketi:app --port 6001
+#   FORGEIQ_PUSHER_KEY=local FORGEIQ_PUSHER_HOST=localhost FORGEIQ_PUSHER_PORT=6001 FORGEIQ_PUSHER_TLS=0 ...
+#
+# Publish an event the same way the backend does (Pusher HTTP API):
+#   curl -XPOST localhost:6001/apps/local/events -H 'content-type: application/json' \
+#        -d '{"name":"DagExecutionStatusEvent","channels":["private-forgeiq"],"data":"{\"dag_id\":\"d1\",\"status\":\"RUNNING\"}"}'
+import asyncio
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel
+
+app = FastAPI(title="Soketi stub")
+
+_subscriptions: Dict[str, Set[WebSocket]] = {}
+
+
+def _frame(event: str, data: Any, channel: Optional[str] = None) -> str:
+    message: Dict[str, Any] = {"event": event, "data": data if isinstance(data, str) else json.dumps(data)}
+    if channel:
+        message["channel"] = channel
+    return json.dumps(message)
+
+
+@app.websocket("/app/{app_key}")
+async def pusher_socket(websocket: WebSocket, app_key: str) -> None:
+    await websocket.accept()
+    socket_id = f"{uuid.uuid4().int % 10**6}.{uuid.uuid4().int % 10**6}"
+    await websocket.send_text(_frame("pusher:connection_established",
+                                     {"socket_id": socket_id, "activity_timeout": 30}))
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            event = message.get("event")
+            data = message.get("data") or {}
+            if event == "pusher:ping":
+                await websocket.send_text(_frame("pusher:pong", {}))
+            elif event == "pusher:subscribe":
+                channel = data.get("channel", "")
+                if channel.startswith(("private-", "presence-")) and not data.get("auth"):
+                    await websocket.send_text(_frame("pusher:error", {"code": 4009, "message": "auth required"}))
+                    continue
+                _subscriptions.setdefault(channel, set()).add(websocket)
+                await websocket.send_text(_frame("pusher_internal:subscription_succeeded", {}, channel))
+            elif event == "pusher:unsubscribe":
+                _subscriptions.get(data.get("channel", ""), set()).discard(websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for sockets in _subscriptions.values():
+            sockets.discard(websocket)
+
+
+class TriggerBody(BaseModel):
+    name: str
+    data: Any
+    channel: Optional[str] = None
+    channels: List[str] = []
+
+
+@app.post("/apps/{app_id}/events")
+async def trigger(app_id: str, body: TriggerBody) -> Dict[str, Any]:
+    channels = body.channels or ([body.channel] if body.channel else [])
+    sends = [ws.send_text(_frame(body.name, body.data, channel))
+             for channel in channels for ws in list(_subscriptions.get(channel, ()))]
+    await asyncio.gather(*sends, return_exceptions=True)
+    return {"delivered": len(sends)}
@@ -0,0 +1,49 @@
+# =============================
+# 📁 tests/conftest.py
+# =============================
+# Runs the backend stub (stubs/backend.py) in-process on a free port for the SDK tests.
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from stubs.backend import app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def stub_url():
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Backend stub did not start")
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def faults(stub_url):
+    """Adds fault rules to the stub (see FaultRule there); all rules are cleared after the test."""
+    def add(**rule):
+        httpx.post(f"{stub_url}/_stub/faults", json=rule).raise_for_status()
+
+    def clear():
+        httpx.delete(f"{stub_url}/_stub/faults").raise_for_status()
+
+    add.clear = clear
+    yield add
+    clear()
@@ -0,0 +1,100 @@
+# =============================
+# 📁 tests/test_audit_search.py
+# =============================
+# Search-box syntax -> FTS5 MATCH translation and search() over the audit store (sdk/audit_store.py).
+import datetime
+import sqlite3
+
+import pytest
+
+from sdk.audit_store import _SEARCH_SOURCES, AuditLogStore, _fts_query
+
+AUDIT_COLUMNS = _SEARCH_SOURCES["audit"][3]
+ALERT_COLUMNS = _SEARCH_SOURCES["alerts"][3]
+
+QUERIES = [
+    ("deploy", '"deploy"'),
+    ("rolled back", '"rolled" AND "back"'),
+    ('"rolled back"', '"rolled back"'),
+    ('say "hi', '"say" AND "hi"'),                                   # Unterminated quote
+    ("roll*", '"roll"*'),
+    ("deploy -staging", '("deploy") NOT ("staging")'),
+    ("-actor:bob deploy", '("deploy") NOT (actor : "bob")'),
+    ("-staging", ""),                                                # FTS5 has no unary NOT
+    ("alice OR bob deploy", '("alice" OR "bob") AND "deploy"'),
+    ("OR alice", '"alice"'),
+    ("alice OR", '"alice"'),
+    ("actor:alice", 'actor : "alice"'),
+    ("user:alice", 'actor : "alice"'),                               # Alias
+    ('project:"project alpha"', 'project_id : "project alpha"'),
+    ("type:Deploy*", 'source_event_type : "Deploy"*'),
+    ("https://x.io/a", '"https://x.io/a"'),                          # Unknown column: plain text
+    ("v1.2.3 deploy_0042", '"v1.2.3" AND "deploy_0042"'),
+    ('a"b', '"a""b"'),
+    ("-- ... deploy", '"deploy"'),                                   # Punctuation-only tokens are dropped
+    ("*", ""),
+]
+
+
+@pytest.mark.parametrize("text, expected", QUERIES)
+def test_fts_query(text, expected):
+    assert _fts_query(text, AUDIT_COLUMNS) == expected
+
+
+@pytest.mark.parametrize("text", [q for q, _ in QUERIES] + ["details:rollback type:SLA", "project:x OR -y"])
+def test_fts_query_is_valid_fts5(text):
+    store = AuditLogStore()
+    for source, columns in (("audit_fts", AUDIT_COLUMNS), ("alerts_fts", ALERT_COLUMNS)):
+        match = _fts_query(text, columns)
+        if match:
+            try:
+                store._conn.execute(f"SELECT rowid FROM {source} WHERE {source} MATCH ?", (match,)).fetchall()
+            except sqlite3.OperationalError as e:
+                pytest.fail(f"{text!r} -> {match!r}: {e}")
+
+
+BASE = datetime.datetime(2026, 3, 1, tzinfo=datetime.timezone.utc)
+
+
+def entry(audit_id: str, minutes: int, action: str, actor: str = "alice", project_id: str = "project_alpha"):
+    return {"audit_id": audit_id, "timestamp": (BASE + datetime.timedelta(minutes=minutes)).isoformat(),
+            "source_event_type": "DeploymentStatusEvent", "project_id": project_id, "user_or_actor": actor,
+            "action_description": action, "details": {"deployment_id": f"deploy_{audit_id}"}}
+
+
+@pytest.fixture
+def store():
+    store = AuditLogStore()
+    store.insert_many([
+        entry("a0", 0, "Rolled back deployment deploy_0001 in staging"),
+        entry("a1", 10, "Rolled back deployment deploy_0002 in production", actor="bob"),
+        entry("a2", 20, "Approved deployment deploy_0003 to production"),
+        entry("a3", 30, "Rolled back deployment deploy_0004 in staging", project_id="project_beta"),
+        entry("a4", 40, "Rolled back deployment deploy_0005 in staging"),
+    ])
+    yield store
+    store.close()
+
+
+def keys(result):
+    return [hit.key for hit in result.hits]
+
+
+def test_search_date_bounds_are_start_inclusive_end_exclusive(store):
+    # Bounds fall exactly on entries a1 (included) and a4 (excluded)
+    result = store.search("rolled", sources=("audit",), order="newest",
+                          date_start=BASE + datetime.timedelta(minutes=10),
+                          date_end=BASE + datetime.timedelta(minutes=40))
+    assert keys(result) == ["a3", "a1"]
+    assert result.hits[0].timestamp == BASE + datetime.timedelta(minutes=30)
+    assert "[Rolled]" in result.hits[0].snippet
+
+
+def test_search_filters_and_syntax(store):
+    assert keys(store.search("rolled -staging", sources=("audit",))) == ["a1"]
+    assert keys(store.search("user:bob", sources=("audit",))) == ["a1"]
+    assert sorted(keys(store.search("approved OR production", sources=("audit",)))) == ["a1", "a2"]
+    assert keys(store.search("rolled", sources=("audit",), project_id="project_beta")) == ["a3"]
+    assert keys(store.search("deploy_0004", sources=("audit",))) == ["a3"]
+    assert keys(store.search("roll*", sources=("audit",), order="newest", limit=2)) == ["a4", "a3"]
+    assert store.search("-rolled", sources=("audit",)).hits == []
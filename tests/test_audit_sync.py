@@ -0,0 +1,70 @@
+# =============================
+# 📁 tests/test_audit_sync.py
+# =============================
+# Interrupted and resumed audit-log syncs (ForgeIQClient.sync_audit_logs into sdk/audit_store.py).
+import asyncio
+
+import pytest
+
+from sdk import AuditLogStore, ForgeIQClient
+
+HISTORY_DAYS = 5
+PAGE_SIZE = 100
+
+
+class FailingStore(AuditLogStore):
+    """Stops the sync with an error once `fail_after` pages have been written."""
+
+    def __init__(self, fail_after: int):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def insert_many(self, entries):
+        if self.fail_after == 0:
+            raise RuntimeError("disk full")
+        self.fail_after -= 1
+        return super().insert_many(entries)
+
+
+def sync(stub_url, store):
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, response_cache=False) as client:
+            return await client.sync_audit_logs(store, history_days=HISTORY_DAYS, page_size=PAGE_SIZE)
+    return asyncio.run(_main())
+
+
+def audit_ids(store):
+    return {row[0] for row in store._conn.execute("SELECT audit_id FROM audit_logs")}
+
+
+def test_interrupted_backfill_keeps_no_watermark_and_resumes_at_saved_cursor(stub_url):
+    store = FailingStore(fail_after=2)
+    with pytest.raises(RuntimeError):
+        sync(stub_url, store)
+    assert len(store) == 2 * PAGE_SIZE
+    assert store.get_state("audit_logs.watermark") is None  # The stored rows do not cover the window yet
+    assert store.get_state("audit_logs.run") is not None
+
+    store.fail_after = -1
+    resumed = sync(stub_url, store)
+    assert resumed.backfill
+    assert resumed.received == resumed.inserted  # Started after the two stored pages, nothing re-downloaded
+    assert store.get_state("audit_logs.run") is None
+    assert store.get_state("audit_logs.watermark") is not None
+
+    reference = AuditLogStore()
+    sync(stub_url, reference)
+    # Rows the reference saw up to the resumed store's newest entry are all present: no gap was left behind
+    newest = store.newest_timestamp()
+    older = {row[0] for row in reference._conn.execute("SELECT audit_id FROM audit_logs WHERE ts_us <= ?",
+                                                       (int(newest.timestamp() * 1_000_000),))}
+    assert older <= audit_ids(store)
+
+
+def test_completed_sync_continues_from_watermark(stub_url):
+    store = AuditLogStore()
+    first = sync(stub_url, store)
+    assert first.backfill and first.inserted > PAGE_SIZE
+    second = sync(stub_url, store)
+    assert not second.backfill
+    assert second.received < PAGE_SIZE
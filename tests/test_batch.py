@@ -0,0 +1,55 @@
+# =============================
+# 📁 tests/test_batch.py
+# =============================
+# Batched GETs (ForgeIQClient.batch) against the stub: errors stay on their own item.
+import asyncio
+
+from sdk import BatchRequest, ForgeIQClient
+
+OK_PATH = "/api/forgeiq/system/overall-summary"
+FAULTY_PATH = "/api/forgeiq/deployments/recent-summary"
+
+
+def run_batch(stub_url, requests):
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, response_cache=False, resilience=False) as client:
+            return client, await client.batch(requests)
+    return asyncio.run(_main())
+
+
+def test_per_item_errors_do_not_fail_the_batch(stub_url, faults):
+    faults(path_prefix=FAULTY_PATH, error_rate=1.0, error_status=503)
+    client, results = run_batch(stub_url, [
+        BatchRequest(id="ok", path=OK_PATH),
+        BatchRequest(id="missing", path="/api/forgeiq/no-such-resource"),
+        BatchRequest(id="faulty", path=FAULTY_PATH, params={"limit": 3}),
+        BatchRequest(id="not_batchable", path="/_stub/faults"),
+        BatchRequest(path="/api/forgeiq/projects/summary", params={"limit": 2}),
+    ])
+    assert client._batch_supported
+    assert [r.id for r in results] == ["ok", "missing", "faulty", "not_batchable", "4"]
+    by_id = {r.id: r for r in results}
+    assert by_id["ok"].ok and "system_health_status" in by_id["ok"].data
+    assert (by_id["missing"].ok, by_id["missing"].status_code) == (False, 404)
+    assert (by_id["faulty"].ok, by_id["faulty"].status_code) == (False, 503)
+    assert (by_id["not_batchable"].ok, by_id["not_batchable"].status_code) == (False, 400)
+    assert by_id["4"].ok and len(by_id["4"].data["projects"]) == 2
+
+
+def test_batches_over_the_cap_are_chunked_in_order(stub_url):
+    requests = [BatchRequest(path="/api/forgeiq/projects/summary", params={"limit": 1 + i % 3}) for i in range(45)]
+    _, results = run_batch(stub_url, requests)
+    assert [r.id for r in results] == [str(i) for i in range(45)]
+    assert all(r.ok for r in results)
+    assert [len(r.data["projects"]) for r in results] == [1 + i % 3 for i in range(45)]
+
+
+def test_missing_batch_endpoint_falls_back_to_individual_requests(stub_url, faults):
+    faults(path_prefix="/api/forgeiq/batch", error_rate=1.0, error_status=404)
+    client, results = run_batch(stub_url, [
+        BatchRequest(id="ok", path=OK_PATH),
+        BatchRequest(id="missing", path="/api/forgeiq/no-such-resource"),
+    ])
+    assert not client._batch_supported
+    assert results[0].ok and "system_health_status" in results[0].data
+    assert (results[1].ok, results[1].status_code) == (False, 404)
@@ -0,0 +1,143 @@
+# =============================
+# 📁 tests/test_cache.py
+# =============================
+# Single-flight loads, TTLs and namespace invalidation of the page cache (ui/cache.py).
+import asyncio
+
+import pytest
+
+from ui.cache import PageCache
+
+
+class Loader:
+    """Counts calls; each call waits for `release` so callers can pile up behind it."""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.result, self.error = result, error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result if self.result is not None else self.calls
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_load():
+    async def main():
+        cache, loader = PageCache(), Loader(result="rows")
+        calls = [asyncio.ensure_future(cache.get_or_load("pipelines", "k", loader, ttl=60)) for _ in range(5)]
+        await settle()
+        loader.release.set()
+        results = await asyncio.gather(*calls)
+        return cache, loader, results
+
+    cache, loader, results = asyncio.run(main())
+    assert results == ["rows"] * 5
+    assert loader.calls == 1
+    assert cache.stats()["namespaces"]["pipelines"] == {"hits": 0, "misses": 1, "coalesced": 4, "evictions": 0,
+                                                        "invalidations": 0}
+
+
+def test_waiters_receive_the_owners_exception_and_nothing_is_stored():
+    async def main():
+        cache, failing = PageCache(), Loader(error=RuntimeError("backend down"))
+        calls = [asyncio.ensure_future(cache.get_or_load("agents", "k", failing, ttl=60)) for _ in range(3)]
+        await settle()
+        failing.release.set()
+        outcomes = await asyncio.gather(*calls, return_exceptions=True)
+        retry = Loader(result="ok")
+        retry.release.set()
+        return failing, outcomes, await cache.get_or_load("agents", "k", retry, ttl=60)
+
+    failing, outcomes, after = asyncio.run(main())
+    assert failing.calls == 1
+    assert all(isinstance(o, RuntimeError) and str(o) == "backend down" for o in outcomes)
+    assert after == "ok"  # The failure was not cached
+
+
+def test_waiters_see_the_owners_cancellation():
+    async def main():
+        cache, loader = PageCache(), Loader()
+        owner = asyncio.ensure_future(cache.get_or_load("agents", "k", loader, ttl=60))
+        await settle()
+        waiter = asyncio.ensure_future(cache.get_or_load("agents", "k", loader, ttl=60))
+        await settle()
+        owner.cancel()
+        outcomes = await asyncio.gather(owner, waiter, return_exceptions=True)
+        loader.release.set()
+        return cache, outcomes, await cache.get_or_load("agents", "k", loader, ttl=60)
+
+    cache, outcomes, after = asyncio.run(main())
+    assert all(isinstance(o, asyncio.CancelledError) for o in outcomes)
+    assert after == 2  # The next caller starts a fresh load instead of waiting forever
+    assert cache.stats()["entries"] == 1
+
+
+def test_callable_ttl_through_the_decorator():
+    cache = PageCache()
+    ttl = {"seconds": 300.0}
+    calls = []
+
+    @cache.cached("agents", ttl=lambda: ttl["seconds"])
+    async def fetch(kind: str):
+        calls.append(kind)
+        return len(calls)
+
+    assert asyncio.run(fetch("all")) == 1
+    assert asyncio.run(fetch("all")) == 1
+    assert asyncio.run(fetch("other")) == 2   # Arguments are part of the key
+    ttl["seconds"] = 0.0
+    assert asyncio.run(fetch("all")) == 3
+
+
+def scoped_fetcher(cache: PageCache):
+    loads = []
+
+    @cache.cached("deployments", ttl=300, scope_arg="project")
+    async def fetch(project: str):
+        loads.append(project)
+        return f"{project}#{len(loads)}"
+
+    return fetch, loads
+
+
+@pytest.mark.parametrize("invalidated, reloaded", [
+    ("deployments:alpha", {"All", "alpha"}),                    # The unfiltered view holds alpha's rows too
+    ("deployments:all", {"All", "alpha", "beta"}),              # Refreshing everything refreshes every scope
+    ("deployments", {"All", "alpha", "beta"}),
+])
+def test_scoped_invalidation(invalidated, reloaded):
+    cache = PageCache()
+    fetch, loads = scoped_fetcher(cache)
+    projects = ["All", "alpha", "beta"]
+    for project in projects:
+        asyncio.run(fetch(project))
+    assert PageCache.scoped("deployments", "All") == "deployments:all"
+
+    cache.invalidate(invalidated)
+    loads.clear()
+    for project in projects:
+        asyncio.run(fetch(project))
+    assert set(loads) == reloaded
+
+
+def test_load_started_before_invalidation_is_not_stored():
+    async def main():
+        cache, loader = PageCache(), Loader(result="old")
+        pending = asyncio.ensure_future(cache.get_or_load("pipelines:alpha", "k", loader, ttl=60))
+        await settle()
+        cache.invalidate("pipelines")
+        loader.release.set()
+        return cache, await pending
+
+    cache, value = asyncio.run(main())
+    assert value == "old"  # The caller still gets its result...
+    assert cache.stats()["entries"] == 0  # ...but it is not served to later callers
@@ -0,0 +1,104 @@
+# =============================
+# 📁 tests/test_config.py
+# =============================
+# Merging, memoization and diffs of the build-system configuration (sdk/config.py).
+import copy
+
+from sdk.config import ConfigResolver, deep_merge, diff
+
+CONFIG = {
+    "global_dag_rules": {"max_parallel": 8, "retry": {"attempts": 2, "backoff_s": 30}},
+    "global_task_weights": {"build": 3, "test": 2},
+    "global_clearance_policies": {"production": {"approvers": 2}},
+    "projects": {
+        "alpha": {"dag_rules": {"retry": {"attempts": 5}}, "owner": "team-a"},
+        "beta": {"dag_rules": {"retry": {"attempts": 5}}, "owner": "team-a"},     # Same overrides as alpha
+        "gamma": {"task_weights": {"test": None, "lint": 1},
+                  "clearance_policies": {"staging": {"approvers": 1, "window": None}}},
+    },
+    "schema": 1,
+}
+
+
+def test_deep_merge_overrides_removes_and_shares():
+    base = CONFIG["global_dag_rules"]
+    merged = deep_merge(base, {"retry": {"backoff_s": None}, "max_parallel": 4})
+    assert merged == {"max_parallel": 4, "retry": {"attempts": 2}}
+    assert base["retry"] == {"attempts": 2, "backoff_s": 30}          # Inputs are not mutated
+    untouched = deep_merge(base, {"max_parallel": 4})
+    assert untouched["retry"] is base["retry"]                         # Shared, not copied
+    assert deep_merge(base, {}) is base
+
+
+def test_none_inside_a_new_subtree_removes_the_key():
+    merged = deep_merge({"a": 1}, {"b": {"c": None, "d": {"e": None, "f": 2}}})
+    assert merged == {"a": 1, "b": {"d": {"f": 2}}}
+    # A dict replacing a scalar is cleaned the same way
+    assert deep_merge({"a": 1}, {"a": {"x": None, "y": 0}}) == {"a": {"y": 0}}
+
+
+def test_effective_config_and_memo_hits():
+    resolver = ConfigResolver()
+    resolver.load(CONFIG)
+    alpha = resolver.effective("alpha")
+    assert alpha["dag_rules"] == {"max_parallel": 8, "retry": {"attempts": 5, "backoff_s": 30}}
+    assert alpha["owner"] == "team-a"                                  # Project-only setting
+    assert alpha["task_weights"] is resolver.defaults()["task_weights"]
+    gamma = resolver.effective("gamma")
+    assert gamma["task_weights"] == {"build": 3, "lint": 1}
+    assert gamma["clearance_policies"]["staging"] == {"approvers": 1}
+    assert resolver.effective(None) is resolver.defaults()
+
+    # Identical overrides share one merge; an equal config reloaded as a new object keeps the memo
+    assert resolver.effective("beta") is alpha
+    resolver.load(copy.deepcopy(CONFIG))
+    assert resolver.effective("alpha") is alpha
+    assert resolver.stats()["merges"] == 2 and resolver.stats()["hits"] == 2
+    assert len(resolver.versions()) == 1
+
+
+def test_diff_projects():
+    resolver = ConfigResolver()
+    resolver.load(CONFIG)
+    assert resolver.diff_projects("alpha", "beta") == []
+    changes = resolver.diff_projects(None, "gamma")
+    assert [(c.path, c.kind, c.old, c.new) for c in changes] == [
+        ("clearance_policies.staging", "added", None, {"approvers": 1}),
+        ("task_weights.lint", "added", None, 1),
+        ("task_weights.test", "removed", 2, None),
+    ]
+    assert len(resolver.diff_projects(None, "gamma", limit=1)) == 1
+
+
+def test_diff_versions_whole_config_and_one_project():
+    resolver = ConfigResolver()
+    old_version = resolver.load(CONFIG)
+    updated = copy.deepcopy(CONFIG)
+    updated["global_task_weights"]["build"] = 4
+    updated["projects"]["alpha"]["dag_rules"]["retry"]["attempts"] = 6
+    updated["projects"]["delta"] = {"owner": "team-d"}
+    updated["schema"] = 2
+    updated["audit"] = {"enabled": True}
+    new_version = resolver.load(updated)
+    assert new_version != old_version and resolver.version == new_version
+
+    whole = resolver.diff_versions(old_version)
+    expected = [
+        ("audit", "added"),
+        ("global_task_weights.build", "changed"),
+        ("schema", "changed"),
+        ("projects.alpha.dag_rules.retry.attempts", "changed"),
+        ("projects.delta", "added"),
+    ]
+    assert [(c.path, c.kind) for c in whole] == expected
+    # Same rows, same order, on every call (keys are sorted, not taken in set order)
+    assert [(c.path, c.kind) for c in resolver.diff_versions(old_version, new_version)] == expected
+
+    alpha = resolver.diff_versions(old_version, project_id="alpha")
+    assert [(c.path, c.old, c.new) for c in alpha] == [("dag_rules.retry.attempts", 5, 6),
+                                                       ("task_weights.build", 3, 4)]
+
+
+def test_diff_lists_by_index():
+    changes = diff({"steps": ["lint", "test"]}, {"steps": ["lint", "build", "test"]})
+    assert [(c.path, c.kind) for c in changes] == [("steps[1]", "changed"), ("steps[2]", "added")]
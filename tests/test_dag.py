@@ -0,0 +1,95 @@
+# =============================
+# 📁 tests/test_dag.py
+# =============================
+# DAG indexing, critical path, task-type collapsing and the layout cache (sdk/dag.py).
+import datetime
+
+from sdk.dag import LayoutCache, build_dag_view, build_structure, collapse_by_task_type, critical_path
+from sdk.models import SDKTaskStatus
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def node(node_id, task_type=None, deps=()):
+    return {"id": node_id, "task_type": task_type or node_id.split("-")[0], "dependencies": list(deps)}
+
+
+def task(task_id, start_s, seconds=None, status="SUCCESS"):
+    """A task that ran `seconds`; without them it is still running."""
+    end = T0 + datetime.timedelta(seconds=start_s + seconds) if seconds is not None else None
+    return SDKTaskStatus.from_dict({
+        "task_id": task_id, "status": status,
+        "started_at": (T0 + datetime.timedelta(seconds=start_s)).isoformat(),
+        "completed_at": end.isoformat() if end else None})
+
+
+# a -> b -> d and a -> c -> d; c is the slow branch
+DIAMOND = [node("a"), node("b", deps=["a"]), node("c", deps=["a"]), node("d", deps=["b", "c"])]
+DIAMOND_TASKS = [task("a", 0, 10), task("b", 10, 5), task("c", 10, 20), task("d", 30, 1)]
+
+
+def test_critical_path_of_a_diamond():
+    structure = build_structure(DIAMOND)
+    assert structure.order == (0, 1, 2, 3) and structure.ignored_edges == 0
+    path, seconds = critical_path(structure, [10.0, 5.0, 20.0, 1.0])
+    assert [structure.ids[i] for i in path] == ["a", "c", "d"]
+    assert seconds == 31.0
+    # Without any durations the longest chain by node count is used
+    path, length = critical_path(structure, [None] * 4)
+    assert len(path) == 3 and length == 3.0
+
+
+def test_cycles_unknown_dependencies_self_edges_and_duplicates():
+    structure = build_structure([
+        node("x", deps=["z"]), node("y", deps=["x"]), node("z", deps=["y"]),   # x -> y -> z -> x
+        node("w", deps=["missing", "w"]),
+        node("x", deps=["w"]),                                                  # Duplicate: first one wins
+    ])
+    assert structure.ids == ("x", "y", "z", "w")
+    assert structure.order == (3, 0, 1, 2)          # Cycle leftovers appended in input order
+    assert structure.ignored_edges == 3             # Unknown node, self edge, and z -> x closing the cycle
+    assert structure.preds == ((), (0,), (1,), ())
+    path, _ = critical_path(structure, [1.0, 1.0, 1.0, 1.0])
+    assert [structure.ids[i] for i in path] == ["x", "y", "z"]
+
+
+def test_collapsed_view_maps_critical_edges_to_groups():
+    nodes = [node("lint-1"), node("build-1", deps=["lint-1"]),
+             node("test-1", deps=["build-1"]), node("test-2", deps=["build-1"]),
+             node("deploy-1", deps=["test-1", "test-2"])]
+    tasks = [task("lint-1", 0, 5), task("build-1", 5, 50), task("test-1", 55, 10), task("test-2", 55, 30),
+             task("deploy-1", 85, status="RUNNING")]
+    view = build_dag_view(nodes, tasks, collapse_threshold=3, now=T0 + datetime.timedelta(seconds=90),
+                          cache=LayoutCache())
+    assert view.collapsed and view.total_nodes == 5
+    assert view.structure.ids == ("type:lint", "type:build", "type:test", "type:deploy")
+    assert view.critical_path == ["lint-1", "build-1", "test-2", "deploy-1"]
+    assert view.critical_nodes == {0, 1, 2, 3}
+    assert view.critical_edges == {(0, 1), (1, 2), (2, 3)}
+    assert view.member_counts == [1, 1, 2, 1]
+    assert view.durations[2] == 40.0
+    assert view.critical_seconds == 90.0  # The running deploy counts up to `now`
+    assert view.statuses == ["SUCCESS", "SUCCESS", "SUCCESS", "RUNNING"]
+
+
+def test_types_depending_on_each_other_collapse_into_a_broken_cycle():
+    structure = build_structure([node("a-1", "A"), node("b-1", "B", deps=["a-1"]), node("a-2", "A", deps=["b-1"])])
+    collapsed, members = collapse_by_task_type(structure)
+    assert members == [0, 1, 0]
+    assert collapsed.ignored_edges == 1
+    assert len(list(collapsed.edges())) == 1
+
+
+def test_status_only_change_reuses_the_layout():
+    cache = LayoutCache()
+    first = build_dag_view(DIAMOND, DIAMOND_TASKS[:2], collapse_threshold=None, cache=cache)
+    second = build_dag_view(DIAMOND, DIAMOND_TASKS, collapse_threshold=None, cache=cache)
+    assert not first.layout_cached and second.layout_cached
+    assert second.layout is first.layout
+    assert first.statuses != second.statuses
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.layout.x == (0.0, 1.0, 1.0, 2.0)
+
+    # A structural change (new dependency) is laid out again
+    changed = DIAMOND[:3] + [node("d", deps=["b"])]
+    assert not build_dag_view(changed, DIAMOND_TASKS, collapse_threshold=None, cache=cache).layout_cached
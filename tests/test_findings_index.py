@@ -0,0 +1,72 @@
+# =============================
+# 📁 tests/test_findings_index.py
+# =============================
+# Cross-scan deduplication and new/fixed tracking of security findings (sdk/findings_index.py).
+import datetime
+
+from sdk.findings_index import FindingsIndex
+from sdk.models import SDKScanResult, SDKSecurityFinding
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def scan(scan_id, hours, commit, project_id="project_alpha", scan_type="SAST"):
+    return SDKScanResult.from_dict({"scan_id": scan_id, "project_id": project_id, "scan_type": scan_type,
+                                    "commit_sha": commit, "timestamp": (T0 + datetime.timedelta(hours=hours)).isoformat()})
+
+
+def finding(rule_id, line, severity="MEDIUM", path="app/main.py"):
+    return SDKSecurityFinding.from_dict({"finding_id": f"{rule_id}-{line}", "rule_id": rule_id, "severity": severity,
+                                         "file_path": path, "line_number": line, "description": rule_id})
+
+
+SQLI, XSS, SECRET = finding("sql-injection", 10, "HIGH"), finding("xss", 20), finding("hardcoded-secret", 5, "CRITICAL")
+
+
+def rules(records):
+    return [r.rule_id for r in records]
+
+
+def test_two_consecutive_scans_of_one_stream():
+    index = FindingsIndex()
+    assert index.ingest(scan("s1", 0, "c1"), [SQLI, XSS])
+    # Nothing to compare the first scan with
+    assert index.new_since_last_scan("project_alpha", "SAST") == []
+    assert index.fixed_since_last_scan("project_alpha", "SAST") == []
+
+    assert index.ingest(scan("s2", 1, "c2"), [SQLI, SECRET])        # xss fixed, secret introduced
+    assert rules(index.new_since_last_scan("project_alpha", "SAST")) == ["hardcoded-secret"]
+    assert rules(index.fixed_since_last_scan("project_alpha", "SAST")) == ["xss"]
+
+    # sql-injection is one unique finding seen by both scans
+    assert len(index) == 3 and index.stats()["occurrences"] == 4
+    sqli = next(r for r in index.findings() if r.rule_id == "sql-injection")
+    assert (sqli.scans, sqli.first_seen_commit, sqli.last_seen_commit) == (2, "c1", "c2")
+    assert rules(index.findings(open_only=True)) == ["hardcoded-secret", "sql-injection"]   # Most severe first
+    assert rules(index.findings(min_severity="HIGH")) == ["hardcoded-secret", "sql-injection"]
+    assert index.streams() == [{"project_id": "project_alpha", "scan_type": "SAST", "latest_scan_id": "s2",
+                                "previous_scan_id": "s1", "open": 2, "new": 1, "fixed": 1}]
+
+
+def test_rescan_and_out_of_order_arrival():
+    index = FindingsIndex()
+    index.ingest(scan("s2", 1, "c2"), [SQLI, SECRET])
+    assert not index.ingest(scan("s2", 1, "c2"), [SQLI, SECRET])     # Already indexed
+    index.ingest(scan("s1", 0, "c1"), [SQLI, XSS])                   # Older scan arrives late
+    assert rules(index.new_since_last_scan("project_alpha", "SAST")) == ["hardcoded-secret"]
+    assert rules(index.fixed_since_last_scan("project_alpha", "SAST")) == ["xss"]
+    sqli = next(r for r in index.findings() if r.rule_id == "sql-injection")
+    assert (sqli.first_seen_commit, sqli.last_seen_commit) == ("c1", "c2")
+    # A scan older than both tracked ones does not move the comparison
+    index.ingest(scan("s0", -1, "c0"), [XSS])
+    assert rules(index.fixed_since_last_scan("project_alpha", "SAST")) == ["xss"]
+
+
+def test_streams_and_projects_are_separate():
+    index = FindingsIndex()
+    index.ingest(scan("a1", 0, "c1"), [SQLI])
+    index.ingest(scan("b1", 0, "d1", project_id="project_beta"), [SQLI])
+    index.ingest(scan("a2", 1, "c2", scan_type="SCA"), [XSS])
+    assert len(index) == 3                                           # The fingerprint includes the project
+    assert index.new_since_last_scan("project_alpha", "SAST") == []
+    assert index.stats()["streams"] == 3
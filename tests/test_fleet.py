@@ -0,0 +1,49 @@
+# =============================
+# 📁 tests/test_fleet.py
+# =============================
+# Registry snapshots, pushed heartbeats and pruning of deregistered agents (sdk/fleet.py).
+import datetime
+
+from sdk.fleet import HEALTHY, FleetState
+
+NOW = datetime.datetime(2026, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def agent(agent_id: str, seconds_ago: float, status: str = "active", agent_type: str = "PlanAgent"):
+    seen = NOW - datetime.timedelta(seconds=seconds_ago)
+    return {"agent_id": agent_id, "agent_type": agent_type, "status": status, "last_seen_timestamp": seen.isoformat()}
+
+
+def test_deregistered_agent_disappears_from_frame():
+    fleet = FleetState(history=4)
+    fleet.observe([agent("a1", 90), agent("a2", 60), agent("a3", 30)])
+    fleet.observe([agent("a1", 30), agent("a3", 0)])
+    assert fleet.retain(["a1", "a3"]) == 1
+
+    frame = fleet.frame(now=NOW).set_index("agent_id")
+    assert list(frame.index) == ["a1", "a3"]
+    assert fleet.get("a2") is None
+    # The kept agents keep their own heartbeat history after the rows were compacted
+    assert frame.loc["a1", "heartbeats"] == 2 and frame.loc["a1", "interval_s"] == 60.0
+    assert frame.loc["a3", "heartbeats"] == 2 and frame.loc["a3", "age_s"] == 0.0
+    assert fleet.stats() == {"agents": 2, "heartbeats": 4}
+
+
+def test_agent_registered_after_pruning_starts_with_empty_history():
+    fleet = FleetState(history=4)
+    fleet.observe([agent("a1", 60), agent("a2", 30)])
+    fleet.observe([agent("a2", 0)])
+    fleet.retain(["a1"])
+    fleet.observe([agent("a4", 10)])
+    frame = fleet.frame(now=NOW).set_index("agent_id")
+    assert frame.loc["a4", "heartbeats"] == 1
+    assert frame.loc["a4", "state"] == HEALTHY
+
+
+def test_pushed_heartbeat_merges_without_pruning():
+    fleet = FleetState()
+    fleet.observe([agent("a1", 60), agent("a2", 60)])
+    fleet.record({"agent_id": "a2", "status": "busy", "timestamp": NOW.isoformat()})
+    assert len(fleet) == 2
+    assert fleet.get("a2")["status"] == "busy"
+    assert fleet.retain(["a1", "a2"]) == 0
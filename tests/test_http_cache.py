@@ -0,0 +1,60 @@
+# =============================
+# 📁 tests/test_http_cache.py
+# =============================
+# ETag revalidation and eviction of the response cache (sdk/http_cache.py) against the stub's ETag middleware.
+import asyncio
+import datetime
+
+from sdk import ForgeIQClient
+from sdk.audit_store import AUDIT_LOGS_ENDPOINT
+from sdk.http_cache import ResponseCache
+
+# Audit logs are append-only at "now", so a window in the past returns the same body every time
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def window(days_ago: int):
+    return {"date_start": (NOW - datetime.timedelta(days=days_ago)).isoformat(),
+            "date_end": (NOW - datetime.timedelta(days=days_ago - 1)).isoformat(), "limit": 20}
+
+
+def fetch_all(stub_url, cache, *days):
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, response_cache=cache, resilience=False) as client:
+            return [await client._request("GET", AUDIT_LOGS_ENDPOINT, params=window(d)) for d in days]
+    return asyncio.run(_main())
+
+
+def test_unchanged_body_is_revalidated_with_304_and_served_from_memory(stub_url):
+    cache = ResponseCache()
+    first, second = fetch_all(stub_url, cache, 10, 10)
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+    assert second is first                      # The decoded body itself, not a re-download
+    assert len(first["audit_logs"]) == 20
+    assert stats["bytes_saved"] == stats["bytes"] > 0
+    entry = next(iter(cache._entries.values()))
+    assert entry.etag and entry.revalidations == 1
+
+
+def test_lru_eviction_under_byte_and_entry_budgets(stub_url):
+    probe = ResponseCache()
+    fetch_all(stub_url, probe, 10)
+    body_bytes = probe.stats()["bytes"]
+
+    # Room for about two bodies: the third evicts the least recently used (day 10, since 11 was reused)
+    cache = ResponseCache(max_bytes=int(body_bytes * 2.5))
+    fetch_all(stub_url, cache, 10, 11, 11, 12)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1 and stats["bytes"] <= cache.max_bytes
+    fetch_all(stub_url, cache, 11, 10)
+    # 11 is still cached and revalidates (the second hit); 10 was evicted and is downloaded again
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 4
+
+    by_count = ResponseCache(max_entries=1)
+    fetch_all(stub_url, by_count, 10, 11)
+    assert by_count.stats()["entries"] == 1 and by_count.stats()["evictions"] == 1
+
+    too_small = ResponseCache(max_bytes=body_bytes // 2)
+    fetch_all(stub_url, too_small, 10, 10)
+    assert too_small.stats()["entries"] == 0 and too_small.stats()["hits"] == 0
@@ -0,0 +1,78 @@
+# =============================
+# 📁 tests/test_live_state.py
+# =============================
+# Pushed records vs polled snapshots (ui/live_state.py) and connection-dependent cache TTLs (ui/cache.py).
+import asyncio
+import datetime
+
+from ui.cache import PageCache
+from ui.live_state import LiveStateStore
+
+
+def _iso(**delta) -> str:
+    return (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(**delta)).isoformat()
+
+
+def _connected_store(**kwargs) -> LiveStateStore:
+    store = LiveStateStore(**kwargs)
+    store.set_state("connected")
+    return store
+
+
+def test_push_newer_than_poll_is_overlaid():
+    store = _connected_store()
+    store.apply("private-forgeiq", "DeploymentStatusEvent", {"deployment_id": "d1", "status": "IN_PROGRESS"})
+    polled = {"deployment_id": "d1", "status": "PENDING", "started_at": _iso(minutes=-5)}
+    assert store.overlay("deployments", polled)["status"] == "IN_PROGRESS"
+
+
+def test_poll_newer_than_push_wins_and_drops_live_record():
+    store = _connected_store()
+    store.apply("private-forgeiq", "DeploymentStatusEvent", {"deployment_id": "d1", "status": "IN_PROGRESS"})
+    polled = {"deployment_id": "d1", "status": "SUCCESSFUL", "completed_at": _iso(seconds=5)}
+    assert store.overlay("deployments", polled)["status"] == "SUCCESSFUL"
+    assert store.stats()["deployments"] == 0
+    # Older snapshots no longer get the stale push either
+    assert store.overlay("deployments", {"deployment_id": "d1", "status": "PENDING"})["status"] == "PENDING"
+
+
+def test_pushed_timestamp_compared_with_polled_one():
+    store = _connected_store()
+    store.apply("private-forgeiq", "AgentHeartbeatEvent",
+                {"agent_id": "a1", "status": "busy", "timestamp": _iso(minutes=-10)})
+    polled = {"agent_id": "a1", "status": "idle", "last_seen_timestamp": _iso(minutes=-1)}
+    assert store.overlay("agents", polled)["status"] == "idle"
+
+
+def test_leaving_connected_clears_pushed_records():
+    store = _connected_store()
+    store.apply("private-forgeiq", "DagExecutionStatusEvent", {"dag_id": "g1", "status": "RUNNING"})
+    store.set_state("disconnected")
+    assert store.stats()["dags"] == 0
+    assert store.overlay("dags", {"dag_id": "g1", "status": "COMPLETED_SUCCESS"})["status"] == "COMPLETED_SUCCESS"
+
+
+def test_store_size_is_bounded():
+    store = _connected_store(max_records=3)
+    for i in range(5):
+        store.apply("private-forgeiq", "DeploymentStatusEvent", {"deployment_id": f"d{i}", "status": "IN_PROGRESS"})
+    assert store.stats()["deployments"] == 3
+    assert store.get("deployments", "d0") is None and store.get("deployments", "d4") is not None
+
+
+def test_callable_ttl_is_evaluated_at_lookup():
+    cache = PageCache()
+    ttl = {"seconds": 300.0}
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return len(loads)
+
+    async def lookup():
+        return await cache.get_or_load("agents", "k", loader, ttl=lambda: ttl["seconds"])
+
+    assert asyncio.run(lookup()) == 1
+    assert asyncio.run(lookup()) == 1      # Long TTL while connected
+    ttl["seconds"] = 0.0                   # Connection dropped: polling TTL applies to the stored entry too
+    assert asyncio.run(lookup()) == 2
@@ -0,0 +1,62 @@
+# =============================
+# 📁 tests/test_pagination.py
+# =============================
+# Prefetch buffering bounds of iterate_pages (sdk/pagination.py).
+import asyncio
+
+import pytest
+
+from sdk.pagination import CursorPage, iterate_items, iterate_pages
+
+
+def make_fetcher(pages: int, page_size: int, log: list):
+    async def fetch(cursor):
+        index = int(cursor or 0)
+        log.append(("fetch", index))
+        await asyncio.sleep(0)
+        items = list(range(index * page_size, (index + 1) * page_size))
+        return CursorPage(items=items, next_cursor=str(index + 1) if index + 1 < pages else None)
+    return fetch
+
+
+def max_ahead(prefetch: int, max_buffered_items=None, page_size: int = 10, pages: int = 8) -> int:
+    """Most pages fetched (or being fetched) but not yet taken by a slow consumer."""
+    log: list = []
+
+    async def consume():
+        taken = 0
+        ahead = 0
+        async for page in iterate_pages(make_fetcher(pages, page_size, log), prefetch=prefetch,
+                                        page_size=page_size, max_buffered_items=max_buffered_items):
+            taken += 1
+            for _ in range(5):  # Slow consumer: give the producer every chance to run ahead
+                await asyncio.sleep(0)
+            fetched = sum(1 for event in log if event[0] == "fetch")
+            ahead = max(ahead, fetched - taken)
+        assert taken == pages
+        return ahead
+
+    return asyncio.run(consume())
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 3])
+def test_at_most_prefetch_pages_ahead_of_consumer(prefetch):
+    assert max_ahead(prefetch) == prefetch
+
+
+def test_memory_budget_caps_prefetch():
+    assert max_ahead(prefetch=4, max_buffered_items=25, page_size=10) == 2
+
+
+def test_budget_smaller_than_a_page_is_rejected():
+    async def consume():
+        async for _ in iterate_pages(make_fetcher(2, 10, []), page_size=10, max_buffered_items=5):
+            pass
+    with pytest.raises(ValueError):
+        asyncio.run(consume())
+
+
+def test_iterate_items_stops_at_max_items():
+    async def collect():
+        return [item async for item in iterate_items(make_fetcher(5, 10, []), page_size=10, max_items=23)]
+    assert asyncio.run(collect()) == list(range(23))
@@ -0,0 +1,48 @@
+# =============================
+# 📁 tests/test_probe.py
+# =============================
+# Fleet health probes (sdk/probe.py) against the stub: one bad agent record must not fail the rest.
+import asyncio
+
+from sdk import ProbeEngine
+
+OK_PATH = "/api/forgeiq/system/overall-summary"
+SLOW_PATH = "/api/forgeiq/deployments/recent-summary"
+
+
+def agent(agent_id, address):
+    return {"agent_id": agent_id, "endpoints": [{"type": "http", "address": address}] if address else []}
+
+
+def probe_fleet(agents, **engine_kwargs):
+    async def _main():
+        engine = ProbeEngine(health_path="", **engine_kwargs)
+        try:
+            return engine, await engine.probe_fleet(agents)
+        finally:
+            await engine.aclose()
+    return asyncio.run(_main())
+
+
+def test_fleet_probe_reports_each_failure_on_its_own_agent(stub_url, faults):
+    faults(path_prefix=SLOW_PATH, latency_ms=1000)
+    engine, fleet = probe_fleet([
+        agent("healthy", stub_url + OK_PATH),
+        agent("missing", f"{stub_url}/_stub/agents/no-such-agent/health"),
+        agent("slow", stub_url + SLOW_PATH),
+        agent("malformed", "http://[::1"),
+        agent("no-endpoint", None),
+    ], timeout=0.3)
+
+    results = fleet.by_agent()
+    assert [r.agent_id for r in fleet.results] == ["healthy", "missing", "slow", "malformed", "no-endpoint"]
+    assert results["healthy"].ok and results["healthy"].status_code == 200 and results["healthy"].rtt_ms > 0
+    assert not results["missing"].ok and results["missing"].error == "HTTP 404"
+    assert results["slow"].timed_out and results["slow"].rtt_ms is None
+    assert not results["malformed"].ok and results["malformed"].error.startswith("InvalidURL")
+    assert results["no-endpoint"].error == "no HTTP endpoint"
+    assert (fleet.ok, fleet.failed) == (1, 4)
+
+    assert engine.histogram("slow")["timeouts"] == 1
+    assert engine.histogram("malformed")["failures"] == 1
+    assert engine.last_result("malformed") is results["malformed"]
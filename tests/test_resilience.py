@@ -0,0 +1,145 @@
+# =============================
+# 📁 tests/test_resilience.py
+# =============================
+# Retries, circuit breaker and stale serving (sdk/resilience.py) against the stub's injected faults.
+import asyncio
+import time
+
+import pytest
+
+from sdk import APIError, BreakerPolicy, CircuitOpenError, EndpointPolicy, ForgeIQClient, ResilienceLayer, RetryPolicy
+
+ENDPOINT = "/api/forgeiq/system/overall-summary"
+GROUP = "/api/forgeiq/system"
+
+
+def make_layer(max_attempts: int = 3, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> ResilienceLayer:
+    return ResilienceLayer(default=EndpointPolicy(
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0.001, max_delay=0.005),
+        breaker=BreakerPolicy(failure_threshold=failure_threshold, recovery_timeout=recovery_timeout)))
+
+
+def run(stub_url, layer, *steps):
+    """Run each step (an async fn of the client) in order on one client; returns their results."""
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, response_cache=False, resilience=layer) as client:
+            results = []
+            for step in steps:
+                results.append(await step(client))
+            return results
+    return asyncio.run(_main())
+
+
+async def get(client):
+    return await client._request("GET", ENDPOINT)
+
+
+async def get_error(client):
+    try:
+        await client._request("GET", ENDPOINT)
+    except (APIError, CircuitOpenError) as e:
+        return e
+    raise AssertionError("expected the request to fail")
+
+
+@pytest.mark.parametrize("status", [500, 503])
+def test_5xx_is_retried_and_counts_against_breaker(stub_url, faults, status):
+    faults(path_prefix=GROUP, error_rate=1.0, error_status=status)
+    layer = make_layer(max_attempts=3)
+    (error,) = run(stub_url, layer, get_error)
+    assert isinstance(error, APIError) and error.status_code == status
+    assert layer.stats.retries == 2
+    assert layer._breakers[GROUP].failures == 3
+
+
+def test_4xx_is_not_retried_and_does_not_trip_breaker(stub_url):
+    layer = make_layer(max_attempts=3, failure_threshold=1)
+
+    async def missing(client):
+        with pytest.raises(APIError) as info:
+            await client._request("GET", f"{GROUP}/does-not-exist")
+        return info.value
+
+    (error,) = run(stub_url, layer, missing)
+    assert error.status_code == 404
+    assert layer.stats.retries == 0
+    assert layer.breaker_states()[GROUP] == "closed"
+
+
+def test_repeated_500s_open_the_breaker(stub_url, faults):
+    faults(path_prefix=GROUP, error_rate=1.0, error_status=500)
+    layer = make_layer(max_attempts=1, failure_threshold=3)
+    errors = run(stub_url, layer, get_error, get_error, get_error, get_error)
+    assert [type(e) for e in errors[:3]] == [APIError] * 3
+    assert layer.stats.breaker_opened == 1
+    assert layer.breaker_states()[GROUP] == "open"
+    # Open with nothing cached: fails fast without touching the network
+    assert isinstance(errors[3], CircuitOpenError)
+    assert layer.stats.short_circuited == 1
+
+
+def test_half_open_probe_closes_breaker_on_success(stub_url, faults):
+    faults(path_prefix=GROUP, error_rate=1.0, error_status=500)
+    layer = make_layer(max_attempts=1, failure_threshold=2, recovery_timeout=0.2)
+    run(stub_url, layer, get_error, get_error)
+    assert layer.breaker_states()[GROUP] == "open"
+
+    faults.clear()
+    time.sleep(0.25)
+    (summary,) = run(stub_url, layer, get)
+    assert "system_health_status" in summary
+    assert layer.breaker_states()[GROUP] == "closed"
+
+
+def test_half_open_probe_failure_reopens_breaker(stub_url, faults):
+    faults(path_prefix=GROUP, error_rate=1.0, error_status=503)
+    layer = make_layer(max_attempts=1, failure_threshold=2, recovery_timeout=0.2)
+    run(stub_url, layer, get_error, get_error)
+    assert layer.stats.breaker_opened == 1
+
+    time.sleep(0.25)
+    (error,) = run(stub_url, layer, get_error)
+    assert isinstance(error, APIError) and error.status_code == 503
+    assert layer.breaker_states()[GROUP] == "open"
+    assert layer.stats.breaker_opened == 2
+
+
+def test_stale_value_served_only_while_breaker_open(stub_url, faults):
+    layer = make_layer(max_attempts=2, failure_threshold=3)
+    (good,) = run(stub_url, layer, get)
+
+    faults(path_prefix=GROUP, error_rate=1.0, error_status=500)
+    # Retries exhausted with the breaker still closed (2 of 3 failures): the error surfaces
+    (error,) = run(stub_url, layer, get_error)
+    assert isinstance(error, APIError) and error.status_code == 500
+    assert layer.breaker_states()[GROUP] == "closed"
+    assert layer.stats.stale_served == 0
+
+    # The next failure opens the breaker: the last-known-good response is served instead
+    (stale,) = run(stub_url, layer, get)
+    assert layer.breaker_states()[GROUP] == "open"
+    assert stale == good
+    assert layer.stats.stale_served == 1
+
+
+def test_last_known_good_store_is_bounded_by_body_bytes(stub_url):
+    layer = make_layer()
+    run(stub_url, layer, get)
+    body_bytes = layer.snapshot()["last_known_good_bytes"]
+    assert body_bytes > 0
+
+    # Room for about two bodies of this size: a third request under another URL evicts the oldest
+    layer = ResilienceLayer(last_known_good_max_bytes=2 * body_bytes + body_bytes // 2)
+
+    def get_with(since):
+        return lambda client: client._request("GET", ENDPOINT, params={"since": since})
+
+    run(stub_url, layer, get_with(1), get_with(2), get_with(3))
+    stats = layer.snapshot()
+    assert stats["last_known_good_entries"] == 2
+    assert stats["last_known_good_bytes"] <= stats["last_known_good_max_bytes"]
+
+    # A body larger than the whole budget is not kept
+    layer = ResilienceLayer(last_known_good_max_bytes=16)
+    run(stub_url, layer, get)
+    assert layer.snapshot()["last_known_good_entries"] == 0
@@ -0,0 +1,92 @@
+# =============================
+# 📁 tests/test_sync.py
+# =============================
+# Delta sync of pipeline executions (sdk/sync.py) against the stub's changes endpoint.
+#
+# The stub runs in this process, so tests change its execution table directly
+# (the way its own request handlers do) to get known deltas between syncs.
+import asyncio
+
+from sdk import ForgeIQClient
+from sdk.sync import ExecutionDelta, ExecutionStore
+from stubs import backend
+
+
+def sync(stub_url, store, page_size=100):
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, response_cache=False) as client:
+            return await client.sync_pipeline_executions(store=store, page_size=page_size)
+    return asyncio.run(_main())
+
+
+def test_second_sync_fetches_only_changes_since_watermark(stub_url):
+    store = ExecutionStore()
+    first = sync(stub_url, store)
+    assert first.full_resync and first.pages > 1
+    assert set(r.dag_id for r in store.list()) == set(backend._executions)
+    watermark = int(store.watermark)
+
+    # One DAG deleted, one finished with a failure, one failed task among its statuses
+    deleted_id, failed_id = sorted(backend._executions)[:2]
+    del backend._executions[deleted_id]
+    backend._tombstones[deleted_id] = backend._bump()
+    failed = backend._executions[failed_id]
+    version = backend._bump()
+    failed.update(status="COMPLETED_FAILURE", _version=version)
+    failed["task_statuses"][0].update(status="FAILED", _version=version)
+
+    second = sync(stub_url, store)
+    changed = {d for d, e in backend._executions.items() if e["_version"] > watermark}
+    assert not second.full_resync
+    assert second.upserted == len(changed) < len(store)
+    assert second.deleted >= 1
+    assert store.watermark == str(backend._exec_version)
+    assert store.stats()["syncs"] == 2 and store.stats()["full_resyncs"] == 1
+
+    assert store.get(deleted_id) is None
+    assert set(r.dag_id for r in store.list()) == set(backend._executions)
+    record = store.get(failed_id)
+    assert record.status == "COMPLETED_FAILURE"
+    assert record.task_statuses[0].status == "FAILED"
+    # Tasks absent from the delta keep their previous state
+    assert [t.task_id for t in record.task_statuses] == [t["task_id"] for t in failed["task_statuses"]]
+
+    failures = store.page(status="COMPLETED_FAILURE")
+    assert failed_id in [r.dag_id for r in failures.items]
+    assert deleted_id not in [r.dag_id for r in store.page(limit=len(store) + 1).items]
+
+
+def test_page_orders_and_walks_all_records(stub_url):
+    store = ExecutionStore()
+    sync(stub_url, store)
+    seen, cursor = [], None
+    while True:
+        page = store.page(sort="-started_at", cursor=cursor, limit=40)
+        seen.extend(page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    assert page.total == len(store) == len(seen)
+    starts = [r.started_at for r in seen]
+    assert starts == sorted(starts, reverse=True)
+
+    by_project = store.page(sort="project_id,-started_at", limit=len(store)).items
+    keys = [(r.project_id, -r.started_at.timestamp()) for r in by_project]
+    assert keys == sorted(keys)
+
+
+def test_watermark_moves_only_on_commit():
+    store = ExecutionStore()
+    store.apply(ExecutionDelta(executions=[{"dag_id": "d1", "status": "RUNNING"}], watermark="5", next_cursor="x"))
+    assert store.watermark is None and len(store) == 1
+
+    # A full resync drops what was there on its first page only
+    store.apply(ExecutionDelta(executions=[{"dag_id": "d2", "status": "RUNNING"}], watermark="9", full_resync=True))
+    store.apply(ExecutionDelta(executions=[{"dag_id": "d3", "status": "RUNNING"}], watermark="9", full_resync=True),
+                first_page=False)
+    store.commit("9", full_resync=True)
+    assert sorted(r.dag_id for r in store.list()) == ["d2", "d3"]
+    assert store.watermark == "9"
+
+    store.replace_all(store.list()[:1])
+    assert len(store) == 1 and store.watermark is None
@@ -0,0 +1,99 @@
+# =============================
+# 📁 tests/test_timeline.py
+# =============================
+# Lane packing, concurrency sweep, gaps and downsampling of DAG timelines (sdk/timeline.py).
+import datetime
+import random
+
+from sdk.models import SDKTaskStatus
+from sdk.timeline import TimelineBar, _downsample, build_timeline, concurrency_curve, find_gaps, pack_lanes
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def t(seconds):
+    return T0 + datetime.timedelta(seconds=seconds)
+
+
+# Sorted by start: A 0-10, B 0-5, C 5-8 (starts as B ends), D 9-12, E 10-20 (starts as A ends)
+INTERVALS = [(t(0), t(10)), (t(0), t(5)), (t(5), t(8)), (t(9), t(12)), (t(10), t(20))]
+
+
+def test_pack_lanes_reuses_a_lane_freed_at_the_same_instant():
+    assert pack_lanes(INTERVALS) == [0, 1, 1, 1, 0]
+
+
+def test_pack_lanes_uses_peak_concurrency_lanes():
+    rng = random.Random(7)
+    for _ in range(50):
+        intervals = sorted((t(s), t(s + rng.randint(1, 20))) for s in (rng.randint(0, 100) for _ in range(40)))
+        lanes = pack_lanes(intervals)
+        peak = max(running for _, running in concurrency_curve(intervals))
+        assert max(lanes) + 1 == peak
+        # No two intervals in one lane overlap
+        for lane in set(lanes):
+            spans = [span for span, l in zip(intervals, lanes) if l == lane]
+            assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+
+
+def test_zero_length_interval_takes_a_lane_but_adds_no_concurrency():
+    intervals = [(t(0), t(10)), (t(5), t(5))]
+    assert pack_lanes(intervals) == [0, 1]
+    assert concurrency_curve(intervals) == [(t(0), 1), (t(5), 1), (t(10), 0)]
+
+
+def test_concurrency_curve_counts_ends_before_starts():
+    assert concurrency_curve(INTERVALS) == [(t(0), 2), (t(5), 2), (t(8), 1), (t(9), 2), (t(10), 2), (t(12), 1),
+                                            (t(20), 0)]
+
+
+def test_find_gaps():
+    curve = concurrency_curve(INTERVALS)
+    gaps = find_gaps(curve, target=2)
+    assert [(g.start, g.end, g.concurrency) for g in gaps] == [(t(8), t(9), 1), (t(12), t(20), 1)]
+    assert [g.seconds for g in find_gaps(curve, target=2, min_seconds=2)] == [8.0]
+    # Adjacent low stretches merge into one gap that keeps the lowest count
+    merged = find_gaps(curve, target=3)
+    assert [(g.start, g.end, g.concurrency) for g in merged] == [(t(0), t(20), 1)]
+
+
+def test_downsample_merges_bars_within_one_bin():
+    bars = [TimelineBar(0, t(0), t(1), "a", "SUCCESS", 1, 1.0), TimelineBar(1, t(0), t(3), "x", "SUCCESS", 1, 3.0),
+            TimelineBar(0, t(1), t(2), "b", "FAILED", 1, 1.0), TimelineBar(0, t(2.5), t(4), "c", "SUCCESS", 1, 1.5),
+            TimelineBar(0, t(5), t(6), "d", "RUNNING", 1, 1.0, True)]
+    merged = sorted(_downsample(bars, rows=2, bin_seconds=2.0), key=lambda b: (b.row, b.start))
+    assert [(b.row, b.start, b.end, b.tasks, b.status, b.label) for b in merged] == [
+        (0, t(0), t(2), 2, "FAILED", "2 tasks"),
+        (0, t(2.5), t(4), 1, "SUCCESS", "c"),
+        (0, t(5), t(6), 1, "RUNNING", "d"),
+        (1, t(0), t(3), 1, "SUCCESS", "x"),
+    ]
+    assert merged[2].running and sum(b.busy_seconds for b in merged) == 7.5
+
+
+def task(task_id, start=None, end=None, status="SUCCESS"):
+    return SDKTaskStatus.from_dict({"task_id": task_id, "status": status,
+                                    "started_at": t(start).isoformat() if start is not None else None,
+                                    "completed_at": t(end).isoformat() if end is not None else None})
+
+
+def test_build_timeline():
+    # INTERVALS again, with E still running at `now` and F never started
+    tasks = [task("A", 0, 10), task("B", 0, 5), task("C", 5, 8), task("D", 9, 12),
+             task("E", 10, status="RUNNING"), task("F", status="PENDING")]
+    timeline = build_timeline(tasks, now=t(20))
+    assert (timeline.tasks, timeline.untimed, timeline.lanes, timeline.peak) == (5, 1, 2, 2)
+    assert timeline.wall_seconds == 20.0 and timeline.busy_seconds == 31.0
+    assert timeline.utilization == 31.0 / 40.0
+    assert timeline.gap_target == 1 and timeline.gaps == []
+    assert [b.label for b in timeline.bars if b.running] == ["E"]
+
+
+def test_build_timeline_downsamples_to_the_bar_budget():
+    tasks = [task(f"t{i}", i, i + 1) for i in range(100)]   # Back to back on one lane
+    timeline = build_timeline(tasks, max_bars=10, max_rows=4)
+    assert timeline.downsampled and timeline.lanes == 1 and timeline.rows == 1
+    assert timeline.bin_seconds == 10.0
+    assert len(timeline.bars) == 10
+    assert sum(b.tasks for b in timeline.bars) == 100
+    assert sum(b.busy_seconds for b in timeline.bars) == timeline.busy_seconds == 100.0
@@ -0,0 +1,100 @@
+# =============================
+# 📁 tests/test_timing.py
+# =============================
+# Queue wait, critical path and regressions of task timing analytics (sdk/timing.py).
+import datetime
+
+import pytest
+
+from sdk.models import SDKDagExecutionStatus
+from sdk.timing import UNKNOWN_TASK_TYPE, TaskTimingAnalytics, execution_rows
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+# (task_id, start s, end s): a, then b and c in parallel, then d
+TASKS = [("a", 0, 10), ("b", 12, 20), ("c", 11, 30), ("d", 35, 40)]
+
+
+def at(seconds):
+    return (T0 + datetime.timedelta(seconds=seconds)).isoformat()
+
+
+def execution(dag_id="dag_1", tasks=TASKS, nodes=None, status="COMPLETED_SUCCESS", offset=0, task_types=None):
+    return SDKDagExecutionStatus.from_dict({
+        "dag_id": dag_id, "project_id": "project_alpha", "status": status,
+        "started_at": at(offset), "completed_at": at(offset + max(end for _, _, end in tasks)),
+        "dag": {"nodes": nodes} if nodes else {},
+        "task_statuses": [{"task_id": task_id, "status": "SUCCESS", "started_at": at(offset + start),
+                           "completed_at": at(offset + end),
+                           **({"task_type": task_types[task_id]} if task_types and task_id in task_types else {})}
+                          for task_id, start, end in tasks],
+    })
+
+
+def test_queue_wait_follows_the_definitions_dependencies():
+    # d depends on b only, so it waited from b's completion (20s) although c finished later
+    nodes = [{"id": "a", "task_type": "lint"}, {"id": "b", "task_type": "test", "dependencies": ["a"]},
+             {"id": "c", "task_type": "build", "dependencies": ["a"]}, {"id": "d", "task_type": "deploy",
+                                                                        "dependencies": ["b"]}]
+    rows = execution_rows(execution(nodes=nodes))
+    assert list(rows["queue_wait"]) == [0.0, 2.0, 1.0, 15.0]
+    assert list(rows["duration"]) == [10.0, 8.0, 19.0, 5.0]
+    # Traced back from d (last to finish) through its dependency b
+    assert list(rows["critical_seconds"]) == [10.0, 8.0, 0.0, 5.0]
+    assert rows["task_type"] == ["lint", "test", "build", "deploy"]
+    assert rows["dag_seconds"][0] == 40.0
+
+
+def test_queue_wait_without_definition_uses_latest_finish_before_start():
+    rows = execution_rows(execution())
+    assert list(rows["queue_wait"]) == [0.0, 2.0, 1.0, 5.0]        # d waited for c, the last task done by 35s
+    assert list(rows["critical_seconds"]) == [10.0, 0.0, 19.0, 5.0]
+
+
+def test_zero_length_task_does_not_wait_for_itself():
+    rows = execution_rows(execution(tasks=[("a", 0, 10), ("b", 10, 10), ("c", 14, 20)]))
+    assert list(rows["queue_wait"]) == [0.0, 0.0, 4.0]
+
+
+def test_task_type_falls_back_to_status_field_then_one_unknown_bucket():
+    rows = execution_rows(execution(task_types={"a": "lint"}))
+    assert rows["task_type"] == ["lint", UNKNOWN_TASK_TYPE, UNKNOWN_TASK_TYPE, UNKNOWN_TASK_TYPE]
+    analytics = TaskTimingAnalytics()
+    analytics.ingest([execution(task_types={"a": "lint"})])
+    summary = analytics.summary()
+    assert summary.loc[UNKNOWN_TASK_TYPE, "runs"] == 3 and summary.loc["lint", "runs"] == 1
+
+
+def test_ingest_skips_unfinished_and_already_seen_executions():
+    analytics = TaskTimingAnalytics()
+    assert analytics.ingest([execution("d1"), execution("d2", status="RUNNING")]) == 1
+    assert analytics.ingest([execution("d1")]) == 0
+    assert analytics.stats() == {"executions": 1, "rows": 4, "version": 1}
+
+
+@pytest.fixture
+def history():
+    """8 runs of a stable lint step; build slows from 100s to 150s in the last 3."""
+    analytics = TaskTimingAnalytics(recent_runs=3, baseline_runs=5, min_samples=3)
+    for run in range(8):
+        build = 150 if run >= 5 else 100
+        analytics.ingest([execution(f"dag_{run}", tasks=[("lint", 0, 30), ("build", 30, 30 + build)],
+                                    task_types={"lint": "lint", "build": "build"}, offset=run * 1000)])
+    return analytics
+
+
+def test_regressions_compare_recent_median_with_baseline(history):
+    regressions = history.regressions()
+    assert regressions.loc["build", "ratio"] == 1.5
+    assert bool(regressions.loc["build", "regressed"])
+    assert not bool(regressions.loc["lint", "regressed"])
+    assert list(regressions[["recent_runs", "baseline_runs"]].loc["build"]) == [3, 5]
+
+
+def test_summary_is_recomputed_only_after_new_ingest(history):
+    first = history.summary()
+    assert history.summary() is first
+    assert first.loc["build", "critical_share"] > first.loc["lint", "critical_share"]
+    history.ingest([execution("dag_new", tasks=[("lint", 0, 30)], task_types={"lint": "lint"}, offset=9000)])
+    assert history.summary() is not first
+    assert history.summary().loc["lint", "runs"] == 9
@@ -0,0 +1,125 @@
+# =============================
+# 📁 tests/test_tracing.py
+# =============================
+# Span nesting, per-trace export and OTLP/JSON encoding of client-side traces (sdk/tracing.py).
+import asyncio
+import json
+
+from sdk import ForgeIQClient
+from sdk.audit_store import AUDIT_LOGS_ENDPOINT
+from sdk.tracing import NOOP_SPAN, SpanExporter, Tracer, current_span, to_otlp_json
+
+
+class MemoryExporter(SpanExporter):
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans, resource):
+        self.batches.append(list(spans))
+
+
+def test_spans_nest_across_awaited_tasks_and_export_when_the_root_ends():
+    exporter = MemoryExporter()
+    tracer = Tracer([exporter])
+
+    async def child(name):
+        with tracer.span(name) as span:
+            await asyncio.sleep(0)
+            with tracer.span(name + ".inner"):
+                await asyncio.sleep(0)
+            return span
+
+    async def _main():
+        with tracer.span("render", kind="server") as root:
+            a, b = await asyncio.gather(asyncio.create_task(child("a")), child("b"))
+            assert exporter.batches == []   # Children ended, but the trace stays buffered until its root ends
+            assert tracer.stats()["open_traces"] == 1
+        assert current_span() is NOOP_SPAN
+        return root, a, b
+
+    root, a, b = asyncio.run(_main())
+    assert len(exporter.batches) == 1
+    batch = exporter.batches[0]
+    assert batch[-1] is root and len(batch) == 5
+    by_name = {s.name: s for s in batch}
+    assert {s.trace_id for s in batch} == {root.trace_id}
+    assert root.parent_id is None
+    assert a.parent_id == b.parent_id == root.span_id   # The task started under root inherits it
+    assert by_name["a.inner"].parent_id == a.span_id
+    assert by_name["b.inner"].parent_id == b.span_id
+    assert tracer.stats() == {"enabled": True, "exporters": ["MemoryExporter"], "spans_exported": 5,
+                              "spans_dropped": 0, "open_traces": 0}
+
+
+def test_span_ending_after_its_root_is_exported_alone():
+    exporter = MemoryExporter()
+    tracer = Tracer([exporter])
+    with tracer.span("root") as root:
+        late = tracer.start_span("late")
+    late.end()
+    late.end()   # Idempotent
+    assert [[s.name for s in batch] for batch in exporter.batches] == [["root"], ["late"]]
+    assert late.parent_id == root.span_id
+
+
+def test_otlp_json_shape():
+    tracer = Tracer([MemoryExporter()], service_name="svc")
+    with tracer.span("root", attributes={"n": 3, "ratio": 0.5, "ok": True, "tags": ["x", 1], "skip": None}) as root:
+        try:
+            with tracer.span("fetch", kind="client"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    child = tracer.exporters[0].batches[0][0]
+    doc = json.loads(json.dumps(to_otlp_json([child, root], tracer.resource)))
+
+    resource_spans = doc["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "svc"}} in resource_spans["resource"]["attributes"]
+    encoded_child, encoded_root = resource_spans["scopeSpans"][0]["spans"]
+
+    for span, encoded in ((child, encoded_child), (root, encoded_root)):
+        assert encoded["traceId"] == span.trace_id and len(encoded["traceId"]) == 32
+        assert encoded["spanId"] == span.span_id and len(encoded["spanId"]) == 16
+        assert encoded["startTimeUnixNano"] == str(span.start_ns)   # int64 fields are strings in OTLP/JSON
+        assert encoded["endTimeUnixNano"] == str(span.end_ns)
+        assert int(encoded["endTimeUnixNano"]) >= int(encoded["startTimeUnixNano"])
+
+    assert encoded_child["parentSpanId"] == root.span_id
+    assert "parentSpanId" not in encoded_root
+    assert (encoded_child["kind"], encoded_root["kind"]) == (3, 1)
+    assert encoded_child["status"] == {"code": 2, "message": "boom"}
+    event = encoded_child["events"][0]
+    assert event["name"] == "exception" and isinstance(event["timeUnixNano"], str)
+    assert encoded_root["status"] == {"code": 0}
+    assert encoded_root["attributes"] == [
+        {"key": "n", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "tags", "value": {"arrayValue": {"values": [{"stringValue": "x"}, {"intValue": "1"}]}}},
+    ]
+
+
+def test_tracer_without_exporters_is_a_no_op():
+    tracer = Tracer()
+    with tracer.span("root") as span:
+        assert span is NOOP_SPAN and current_span() is NOOP_SPAN
+    assert tracer.start_span("x") is NOOP_SPAN
+    assert tracer.stats()["spans_exported"] == 0
+
+
+def test_client_request_span_wraps_one_send_span_per_attempt(stub_url):
+    exporter = MemoryExporter()
+    tracer = Tracer([exporter])
+
+    async def _main():
+        async with ForgeIQClient(base_url=stub_url, tracer=tracer, resilience=False) as client:
+            with tracer.span("page"):
+                await client._request("GET", AUDIT_LOGS_ENDPOINT, params={"limit": 5})
+
+    asyncio.run(_main())
+    [batch] = exporter.batches
+    by_name = {s.name: s for s in batch}
+    request = by_name[f"GET {AUDIT_LOGS_ENDPOINT}"]
+    assert request.parent_id == by_name["page"].span_id and request.kind == "client"
+    assert by_name["http.send"].parent_id == request.span_id
+    assert request.attributes["url.path"] == AUDIT_LOGS_ENDPOINT
@@ -0,0 +1,8 @@
+# =============================
+# 📁 ui/__init__.py
+# =============================
+# Helpers shared by the Streamlit pages in pages/. Kept outside pages/ because
+# Streamlit turns every module in that directory into a page.
+from .runtime import gather_sync, get_shared_client, notify, run_sync
+
+__all__ = ["run_sync", "gather_sync", "get_shared_client", "notify"]
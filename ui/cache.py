@@ -0,0 +1,209 @@
+# =============================
+# 📁 ui/cache.py
+# =============================
+# Process-wide keyed cache for the pages' async fetch functions.
+#
+# Replaces @st.cache_data + st.cache_data.clear(): entries live under a resource
+# namespace such as "pipelines:project_alpha", and a Refresh button invalidates
+# only its own namespace instead of wiping every user's cached data. Concurrent
+# identical fetches (same function + arguments) are coalesced into one in-flight
+# call ("single-flight"), so a refresh does not cause a stampede of duplicate
+# backend requests across sessions.
+#
+# Loads run on the shared runtime loop (ui/runtime.py); invalidation may be
+# called from any page thread. Each call of a cached function is traced as a
+# "fetch <function>" span tagged with the lookup result (hit, miss, coalesced).
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar, Union
+
+from sdk.tracing import current_span
+from ui.runtime import get_tracer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CacheKey = Tuple[str, Hashable]
+# Seconds, or a callable evaluated on every lookup (so e.g. a TTL that depends on
+# the realtime connection shortens entries already stored when it drops)
+TTL = Union[float, Callable[[], float]]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    ttl: TTL
+
+    def fresh(self, now: float) -> bool:
+        return now < self.stored_at + (self.ttl() if callable(self.ttl) else self.ttl)
+
+
+@dataclass
+class NamespaceMetrics:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0     # Callers that joined an in-flight load instead of starting one
+    evictions: int = 0     # Dropped for capacity or TTL expiry
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+def _scope_value(value: Any) -> str:
+    # "All"/None filter selections share one scope, so "pipelines:all" is the unfiltered view.
+    return "all" if value in (None, "", "All") else str(value)
+
+
+def _root(namespace: str) -> str:
+    return namespace.split(":", 1)[0]
+
+
+class PageCache:
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, "asyncio.Future[Any]"] = {}
+        self._generation: Dict[str, int] = {}  # Bumped by invalidate(); stale in-flight loads aren't stored
+        self._metrics: Dict[str, NamespaceMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _m(self, namespace: str) -> NamespaceMetrics:
+        root = _root(namespace)
+        metrics = self._metrics.get(root)
+        if metrics is None:
+            metrics = self._metrics[root] = NamespaceMetrics()
+        return metrics
+
+    def _generation_of(self, namespace: str) -> Tuple[int, ...]:
+        # A namespace is affected by invalidating itself or any of its ancestors.
+        parts = namespace.split(":")
+        return tuple(self._generation.get(":".join(parts[:i]), 0) for i in range(1, len(parts) + 1))
+
+    async def get_or_load(self, namespace: str, key: Hashable,
+                          loader: Callable[[], Awaitable[T]], ttl: TTL) -> T:
+        cache_key = (namespace, key)
+        now = time.monotonic()
+        owner = False
+        span = current_span()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry.fresh(now):
+                    self._entries.move_to_end(cache_key)
+                    self._m(namespace).hits += 1
+                    span.set_attribute("cache.result", "hit")
+                    return entry.value
+                del self._entries[cache_key]
+                self._m(namespace).evictions += 1
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                self._m(namespace).coalesced += 1
+                span.set_attribute("cache.result", "coalesced")
+            else:
+                span.set_attribute("cache.result", "miss" if entry is None else "expired")
+                self._m(namespace).misses += 1
+                inflight = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = inflight
+                generation = self._generation_of(namespace)
+                owner = True
+        if not owner:
+            return await asyncio.shield(inflight)
+
+        try:
+            value = await loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            if not inflight.done():
+                inflight.set_exception(e)
+                inflight.exception()  # Mark retrieved; waiters (if any) still receive it
+            raise
+        with self._lock:
+            self._inflight.pop(cache_key, None)
+            if self._generation_of(namespace) == generation:
+                self._entries[cache_key] = _Entry(value=value, stored_at=time.monotonic(), ttl=ttl)
+                while len(self._entries) > self.max_entries:
+                    (evicted_ns, _), _ = self._entries.popitem(last=False)
+                    self._m(evicted_ns).evictions += 1
+        inflight.set_result(value)
+        return value
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop every entry in `namespace` and its sub-namespaces ("pipelines" covers "pipelines:x").
+
+        The "all" scope holds the unfiltered view, i.e. every scope's rows: invalidating
+        "deployments:proj" drops "deployments:all" too, and invalidating "deployments:all"
+        drops every "deployments:*" scope.
+        """
+        parent, _, scope = namespace.rpartition(":")
+        targets = [namespace]
+        if parent:
+            targets = [parent] if scope == "all" else [namespace, f"{parent}:all"]
+        with self._lock:
+            doomed = [k for k in self._entries if any(k[0] == t or k[0].startswith(t + ":") for t in targets)]
+            for k in doomed:
+                del self._entries[k]
+            for target in targets:
+                self._generation[target] = self._generation.get(target, 0) + 1
+            self._m(namespace).invalidations += 1
+        logger.info(f"UI cache: invalidated '{namespace}' ({len(doomed)} entries)")
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in {k[0] for k in self._entries}:
+                self._generation[namespace] = self._generation.get(namespace, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_namespace = {ns: m.as_dict() for ns, m in self._metrics.items()}
+            entries = len(self._entries)
+        totals = {field: sum(m[field] for m in per_namespace.values()) for field in NamespaceMetrics().as_dict()}
+        lookups = totals["hits"] + totals["misses"] + totals["coalesced"]
+        totals["hit_ratio"] = round((totals["hits"] + totals["coalesced"]) / lookups, 3) if lookups else 0.0
+        return {"entries": entries, "totals": totals, "namespaces": per_namespace}
+
+    def cached(self, namespace: str, ttl: TTL, scope_arg: Optional[str] = None):
+        """Decorator for async fetch functions.
+
+        Results are keyed by the call's bound arguments and stored under
+        ``namespace`` — or ``f"{namespace}:{<value of scope_arg>}"`` when
+        ``scope_arg`` names one of the function's parameters, so callers can
+        invalidate one project's data without touching the others.
+        """
+        def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> T:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                ns = namespace
+                if scope_arg is not None:
+                    ns = f"{namespace}:{_scope_value(bound.arguments.get(scope_arg))}"
+                key = (fn.__module__, fn.__qualname__, tuple(sorted(bound.arguments.items())))
+                with get_tracer().span(f"fetch {fn.__qualname__}", attributes={"cache.namespace": ns}):
+                    return await self.get_or_load(ns, key, lambda: fn(*bound.args, **bound.kwargs), ttl)
+
+            wrapper.namespace = namespace  # type: ignore[attr-defined]
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def scoped(namespace: str, scope: Any) -> str:
+        """The namespace `cached(..., scope_arg=...)` uses for a given argument value."""
+        return f"{namespace}:{_scope_value(scope)}"
+
+
+# Shared by every page in the process.
+page_cache = PageCache()
@@ -0,0 +1,74 @@
+# =============================
+# 📁 ui/dag_view.py
+# =============================
+# Renders a DagView (sdk/dag.py) as an Altair chart.
+#
+# Node positions come from the SDK's cached layered layout, so the browser
+# only draws points and line segments; it does not run Graphviz layout, which
+# stops being usable beyond a few hundred nodes. Nodes are colored by task
+# status, and the critical path is drawn thicker and in red.
+from typing import Any, Dict, List
+
+import altair as alt
+import pandas as pd
+
+from sdk.dag import DagView
+
+# Above this many displayed nodes labels are left to the tooltips
+LABEL_LIMIT = 150
+
+STATUS_COLORS: Dict[str, str] = {
+    "SUCCESS": "#2e7d32", "COMPLETED_SUCCESS": "#2e7d32", "RUNNING": "#1565c0", "STARTED": "#1565c0",
+    "QUEUED": "#9e9e9e", "PENDING": "#bdbdbd", "SKIPPED": "#cfd8dc", "FAILED": "#c62828",
+    "CANCELLED": "#6d4c41", "UNKNOWN": "#eeeeee",
+}
+
+
+def _format_seconds(seconds: Any) -> str:
+    if seconds is None or pd.isna(seconds):
+        return "-"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
+
+
+def dag_chart(view: DagView) -> alt.LayerChart:
+    structure, layout = view.structure, view.layout
+    nodes = pd.DataFrame({
+        "x": layout.x,
+        "y": layout.y,
+        "node": structure.ids,
+        "task_type": structure.task_types,
+        "status": view.statuses,
+        "members": view.member_counts,
+        "duration": [_format_seconds(d) for d in view.durations],
+        "states": [", ".join(f"{s}: {n}" for s, n in sorted(c.items())) for c in view.status_counts],
+        "critical": [i in view.critical_nodes for i in range(len(structure))],
+    })
+    edge_rows: List[Dict[str, Any]] = [
+        {"x": layout.x[s], "y": layout.y[s], "x2": layout.x[t], "y2": layout.y[t], "critical": (s, t) in view.critical_edges}
+        for s, t in structure.edges()
+    ]
+    edges = pd.DataFrame(edge_rows, columns=["x", "y", "x2", "y2", "critical"])
+
+    x_axis = alt.X("x:Q", axis=None, scale=alt.Scale(padding=20))
+    y_axis = alt.Y("y:Q", axis=None, scale=alt.Scale(reverse=True, padding=20))
+    edge_layer = alt.Chart(edges).mark_rule().encode(
+        x=x_axis, y=y_axis, x2="x2:Q", y2="y2:Q",
+        color=alt.condition("datum.critical", alt.value("#d32f2f"), alt.value("#b0bec5")),
+        strokeWidth=alt.condition("datum.critical", alt.value(3), alt.value(0.7)),
+        opacity=alt.condition("datum.critical", alt.value(1.0), alt.value(0.5)),
+    )
+    domain = list(STATUS_COLORS)
+    node_layer = alt.Chart(nodes).mark_circle(stroke="#d32f2f").encode(
+        x=x_axis, y=y_axis,
+        size=alt.Size("members:Q", legend=None, scale=alt.Scale(range=[60, 600])) if view.collapsed else alt.value(90),
+        color=alt.Color("status:N", scale=alt.Scale(domain=domain, range=[STATUS_COLORS[s] for s in domain]),
+                        legend=alt.Legend(title="Status", orient="bottom")),
+        strokeWidth=alt.condition("datum.critical", alt.value(2.5), alt.value(0)),
+        tooltip=["node", "task_type", "status", "duration", "members", "states", "critical"],
+    )
+    layers = [edge_layer, node_layer]
+    if len(structure) <= LABEL_LIMIT:
+        layers.append(alt.Chart(nodes).mark_text(dy=-12, fontSize=10).encode(x=x_axis, y=y_axis, text="node"))
+    height = int(min(1200, max(250, layout.max_layer_size * (40 if len(structure) <= LABEL_LIMIT else 8))))
+    return alt.layer(*layers).properties(height=height).interactive()
@@ -0,0 +1,53 @@
+# =============================
+# 📁 ui/facets.py
+# =============================
+# Filter dropdown options for the pages, from the SDK's facets query
+# (sdk/facets.py) instead of listing a page of records and taking set().
+#
+# Distinct projects/services/environments change rarely, so facets are cached
+# for FACETS_TTL under their own "facets:<resource>" namespace, independent of
+# the list data's short polling TTL. A failed load yields empty facets and the
+# page's hard-coded list is used as the fallback.
+import logging
+from typing import Any, List, Optional, Sequence
+
+from sdk.facets import (DEPLOYMENT_FACET_FIELDS, PIPELINE_FACET_FIELDS, PROJECT_FACET_FIELDS,
+                        SECURITY_FACET_FIELDS, Facets)
+
+from .cache import page_cache
+from .runtime import notify, run_sync
+
+logger = logging.getLogger(__name__)
+
+FACETS_TTL = 600.0
+
+_FIELDS = {
+    "deployments": DEPLOYMENT_FACET_FIELDS,
+    "pipelines/executions": PIPELINE_FACET_FIELDS,
+    "security/scan-results": SECURITY_FACET_FIELDS,
+    "projects": PROJECT_FACET_FIELDS,
+}
+
+
+@page_cache.cached("facets", ttl=FACETS_TTL, scope_arg="resource")
+async def fetch_facets(client: Any, resource: str, project_id: Optional[str] = None) -> Facets:
+    try:
+        filters = {"project_id": project_id} if project_id else {}
+        facets = await client.get_facets(resource, _FIELDS[resource], **filters)
+        logger.info(f"Facets: Loaded {resource} facets ({facets.source}, total={facets.total}).")
+        return facets
+    except Exception as e:
+        logger.error(f"Facets: Error fetching {resource} facets: {e}", exc_info=True)
+        notify.warning(f"Could not load filter options for {resource}; showing defaults.")
+        return Facets()
+
+
+def filter_options(client: Any, resource: str, name: str, fallback: Sequence[str] = (),
+                   include_all: bool = True, project_id: Optional[str] = None) -> List[str]:
+    """Dropdown options for `name` on `resource`: "All" + its distinct values, or `fallback`."""
+    return run_sync(fetch_facets(client, resource, project_id)).options(name, include_all=include_all,
+                                                                          fallback=fallback)
+
+
+def invalidate_facets(resource: Optional[str] = None) -> None:
+    page_cache.invalidate(page_cache.scoped("facets", resource) if resource else "facets")
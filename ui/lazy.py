@@ -0,0 +1,92 @@
+# =============================
+# 📁 ui/lazy.py
+# =============================
+# Sections that fetch their data only when the user opens them.
+#
+# lazy_tabs() and lazy_expander() create tabs/expanders that track their open
+# state: opening one reruns the page, and is_open() tells the page whether to
+# run that section's body. Closed sections render nothing and fetch nothing.
+# On Streamlit versions without open-state tracking every section reports open,
+# which is the old eager behavior.
+#
+# load()/load_many() show a placeholder in the section while its fetches run on
+# the shared runtime loop (several concurrently, with the placeholder counting
+# them off as they land) and clear it when the data is in. Fetch functions are
+# page_cache.cached, so a section's data is loaded at most once per cache key
+# and TTL, however often it is opened, closed, or opened in other sessions.
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+import streamlit as st
+
+from ui.runtime import get_tracer, run_sync, stream_sync
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_TRACKS_OPEN_STATE = "on_change" in inspect.signature(st.expander).parameters
+
+
+def lazy_tabs(labels: Sequence[str], key: str, default: Optional[str] = None) -> Sequence[Any]:
+    """st.tabs() whose selected tab is tracked (and switching tabs reruns the page)."""
+    if not _TRACKS_OPEN_STATE:
+        return st.tabs(list(labels))
+    return st.tabs(list(labels), key=key, default=default, on_change="rerun")
+
+
+def lazy_expander(label: str, key: str, expanded: bool = False) -> Any:
+    """st.expander() whose open state is tracked (and toggling it reruns the page)."""
+    if not _TRACKS_OPEN_STATE:
+        return st.expander(label, expanded=expanded)
+    return st.expander(label, expanded=expanded, key=key, on_change="rerun")
+
+
+def is_open(section: Any) -> bool:
+    """Whether a lazy tab/expander is open; True when Streamlit does not track it."""
+    state = getattr(section, "open", None)
+    return True if state is None else bool(state)
+
+
+def load(label: str, fetch: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+    """Run `fetch()` behind a "Loading <label>…" placeholder; returns its result."""
+    placeholder = st.empty()
+    placeholder.caption(f"⏳ Loading {label}…")
+    try:
+        with get_tracer().span(f"load {label}"):
+            return run_sync(fetch(), timeout=timeout)
+    finally:
+        placeholder.empty()
+
+
+def load_many(label: str, *fetches: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> List[Any]:
+    """Run several fetches concurrently behind one progress placeholder; results keep argument order.
+
+    A fetch that raised is returned as its exception.
+    """
+    placeholder = st.empty()
+    placeholder.caption(f"⏳ Loading {label} (0/{len(fetches)})…")
+    results: List[Any] = [None] * len(fetches)
+    try:
+        with get_tracer().span(f"load {label}", attributes={"fetches": len(fetches)}):
+            for done, (index, result) in enumerate(stream_sync(*(fetch() for fetch in fetches), timeout=timeout), 1):
+                results[index] = result
+                if isinstance(result, Exception):
+                    logger.warning(f"Lazy section '{label}': fetch {index} failed: {result}")
+                if done < len(fetches):
+                    placeholder.caption(f"⏳ Loading {label} ({done}/{len(fetches)})…")
+    finally:
+        placeholder.empty()
+    return results
+
+
+def keep_widget_state(*keys: str) -> None:
+    """Keep these widgets' values while their section is closed.
+
+    Streamlit drops the state of widgets that were not rendered in a run, so
+    filters inside a closed tab would otherwise reset when it is reopened.
+    """
+    for key in keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
@@ -0,0 +1,266 @@
+# =============================
+# 📁 ui/live_state.py
+# =============================
+# In-memory state fed by Soketi/Pusher push events (sdk/realtime.py).
+#
+# The subscriber runs on the shared runtime loop and applies DAG-status,
+# deployment and agent-heartbeat events here. Pages keep fetching through
+# ui/cache.py, but while the push connection is up they use long TTLs (polling
+# is only a reconciliation fallback) and overlay the live records onto the
+# cached snapshot before rendering.
+#
+# A live record only wins over a polled one while it is the newer of the two:
+# when the snapshot's own timestamps (completed_at, last_seen_timestamp, ...)
+# are at or past the push, the poll has caught up and the live record is
+# dropped. Leaving "connected" clears the store, since events may be missed
+# until the next poll, and each section keeps at most
+# FORGEIQ_REALTIME_MAX_RECORDS records (least recently updated dropped first).
+import asyncio
+import atexit
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sdk.models import parse_timestamp
+
+from .runtime import get_loop
+
+logger = logging.getLogger(__name__)
+
+# Pusher event names -> store section. Extend via FORGEIQ_REALTIME_EXTRA_EVENTS="Evt:section,...".
+EVENT_SECTIONS: Dict[str, str] = {
+    "DagExecutionStatusEvent": "dags",
+    "TaskStatusUpdateEvent": "tasks",
+    "DeploymentStatusEvent": "deployments",
+    "AgentHeartbeatEvent": "agents",
+    "AgentStatusEvent": "agents",
+}
+SECTION_ID_FIELD = {"dags": "dag_id", "deployments": "deployment_id", "agents": "agent_id"}
+# Timestamps that say how recent a record is, in polled snapshots and pushed payloads alike
+FRESHNESS_FIELDS: Dict[str, Sequence[str]] = {
+    "dags": ("completed_at", "started_at", "updated_at"),
+    "deployments": ("timestamp", "completed_at", "started_at", "updated_at"),
+    "agents": ("last_seen_timestamp", "timestamp"),
+}
+DEFAULT_MAX_RECORDS = int(os.getenv("FORGEIQ_REALTIME_MAX_RECORDS", "10000"))
+
+
+def _newest(record: Any, fields: Sequence[str]) -> Optional[datetime.datetime]:
+    stamps = [parse_timestamp(record.get(name)) for name in fields]
+    return max((s for s in stamps if s is not None), default=None)
+
+
+class LiveStateStore:
+    def __init__(self, max_records: int = DEFAULT_MAX_RECORDS):
+        self._lock = threading.Lock()
+        self.max_records = max_records  # Per section
+        self._records: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {s: OrderedDict() for s in SECTION_ID_FIELD}
+        self._received_at: Dict[str, Dict[str, datetime.datetime]] = {s: {} for s in SECTION_ID_FIELD}
+        self.state = "disconnected"
+        self.events_applied = 0
+        self.last_event_at: Optional[float] = None
+        self._listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+
+    def subscribe(self, section: str, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Also hand every applied `section` payload to `callback` (on the runtime loop). Idempotent."""
+        with self._lock:
+            listeners = self._listeners.setdefault(section, [])
+            if callback not in listeners:
+                listeners.append(callback)
+
+    @property
+    def connected(self) -> bool:
+        return self.state == "connected"
+
+    def set_state(self, state: str) -> None:
+        with self._lock:
+            was_connected = self.state == "connected"
+            self.state = state
+            if was_connected and state != "connected":
+                # Pushes may be missed from here on; polls are authoritative again
+                dropped = sum(len(records) for records in self._records.values())
+                for section in self._records:
+                    self._records[section].clear()
+                    self._received_at[section].clear()
+                logger.info(f"Live state: connection {state}; dropped {dropped} pushed records.")
+
+    # --- Write side (runtime loop) ---
+    def apply(self, channel: str, event_name: str, payload: Any) -> None:
+        section = EVENT_SECTIONS.get(event_name)
+        if section is None or not isinstance(payload, dict):
+            return
+        with self._lock:
+            if section == "tasks":
+                self._apply_task_status(payload)
+            else:
+                record_id = payload.get(SECTION_ID_FIELD[section])
+                if not record_id:
+                    return
+                current = self._touch(section, record_id)
+                if section == "dags" and "task_statuses" in payload:
+                    payload = dict(payload)
+                    self._merge_task_statuses(current, payload.pop("task_statuses") or [])
+                if section == "agents" and "timestamp" in payload and "last_seen_timestamp" not in payload:
+                    payload = {**payload, "last_seen_timestamp": payload["timestamp"]}
+                current.update(payload)
+            self.events_applied += 1
+            self.last_event_at = time.monotonic()
+            listeners = list(self._listeners.get(section, ()))
+        for callback in listeners:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.warning(f"Live state: {section} listener failed: {e}")
+
+    def _apply_task_status(self, payload: Dict[str, Any]) -> None:
+        dag_id = payload.get("dag_id")
+        if not dag_id or not payload.get("task_id"):
+            return
+        dag = self._touch("dags", dag_id)
+        dag.setdefault("dag_id", dag_id)
+        self._merge_task_statuses(dag, [payload])
+
+    def _touch(self, section: str, record_id: str) -> Dict[str, Any]:
+        """The live record to update (created if new), marked most recently pushed; enforces max_records."""
+        records = self._records[section]
+        record = records.setdefault(record_id, {})
+        records.move_to_end(record_id)
+        self._received_at[section][record_id] = datetime.datetime.now(datetime.timezone.utc)
+        while len(records) > self.max_records:
+            evicted_id, _ = records.popitem(last=False)
+            self._received_at[section].pop(evicted_id, None)
+        return record
+
+    @staticmethod
+    def _merge_task_statuses(dag: Dict[str, Any], updates: List[Dict[str, Any]]) -> None:
+        by_id = {t.get("task_id"): t for t in dag.get("task_statuses", [])}
+        for update in updates:
+            task_id = update.get("task_id")
+            by_id[task_id] = {**by_id.get(task_id, {}), **{k: v for k, v in update.items() if k != "dag_id"}}
+        dag["task_statuses"] = list(by_id.values())
+
+    # --- Read side (page threads) ---
+    def get(self, section: str, record_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._records[section].get(record_id)
+            return dict(record) if record is not None else None
+
+    def _live_for(self, section: str, snapshot: Any) -> Optional[Dict[str, Any]]:
+        """The live record for `snapshot` if it is newer; one the poll has caught up with is dropped."""
+        record_id = snapshot.get(SECTION_ID_FIELD[section], "")
+        polled_at = _newest(snapshot, FRESHNESS_FIELDS[section])
+        with self._lock:
+            record = self._records[section].get(record_id)
+            if record is None:
+                return None
+            if polled_at is not None:
+                pushed_at = _newest(record, FRESHNESS_FIELDS[section]) or self._received_at[section][record_id]
+                if polled_at >= pushed_at:
+                    del self._records[section][record_id]
+                    del self._received_at[section][record_id]
+                    return None
+            return dict(record)
+
+    def overlay(self, section: str, snapshot: Any) -> Any:
+        """Return `snapshot` (a dict or an sdk.models record) with newer pushed fields applied on top."""
+        if not snapshot:
+            return snapshot
+        live = self._live_for(section, snapshot)
+        if not live:
+            return snapshot
+        if not isinstance(snapshot, dict):
+            merged_model = snapshot.copy()
+            merged_model.update(live)  # Models merge task_statuses by task_id themselves
+            return merged_model
+        merged = {**snapshot, **{k: v for k, v in live.items() if k != "task_statuses"}}
+        if live.get("task_statuses"):
+            merged_tasks = {t.get("task_id"): t for t in snapshot.get("task_statuses", [])}
+            for t in live["task_statuses"]:
+                merged_tasks[t.get("task_id")] = {**merged_tasks.get(t.get("task_id"), {}), **t}
+            merged["task_statuses"] = list(merged_tasks.values())
+        return merged
+
+    def overlay_list(self, section: str, snapshot: List[Any]) -> List[Any]:
+        if not self.events_applied:
+            return snapshot
+        return [self.overlay(section, item) or item for item in snapshot]
+
+    def reconcile_ttl(self, polling_ttl: float, fallback_ttl: float = 300.0) -> float:
+        """Cache TTL for a poll: short while disconnected, long while pushes keep the data fresh.
+
+        Pass it as a callable (ttl=lambda: ...): page_cache re-evaluates it on every lookup.
+        """
+        return fallback_ttl if self.connected else polling_ttl
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {section: len(records) for section, records in self._records.items()}
+        return {"state": self.state, "events_applied": self.events_applied, **counts}
+
+
+live_state = LiveStateStore()
+
+_subscriber_future: Optional["asyncio.Future[None]"] = None
+_start_lock = threading.Lock()
+
+
+def _load_extra_events() -> None:
+    for pair in filter(None, os.getenv("FORGEIQ_REALTIME_EXTRA_EVENTS", "").split(",")):
+        event_name, _, section = pair.partition(":")
+        if section in ("dags", "tasks", "deployments", "agents"):
+            EVENT_SECTIONS[event_name.strip()] = section
+
+
+def start_realtime(client: Any) -> bool:
+    """Start the push subscriber on the runtime loop once per process. Returns True if running.
+
+    Configured from the environment (same Soketi app as src/realtime/pusherClient.ts):
+    FORGEIQ_PUSHER_KEY (required), FORGEIQ_PUSHER_HOST, FORGEIQ_PUSHER_PORT,
+    FORGEIQ_PUSHER_TLS, FORGEIQ_PUSHER_CHANNELS.
+    """
+    global _subscriber_future
+    app_key = os.getenv("FORGEIQ_PUSHER_KEY")
+    if not app_key:
+        return False
+    with _start_lock:
+        if _subscriber_future is not None and not _subscriber_future.done():
+            return True
+        _load_extra_events()
+
+        async def _authorize(socket_id: str, channel: str) -> Dict[str, Any]:
+            return await client._request("POST", "/api/broadcasting/auth",
+                                         json_data={"socket_id": socket_id, "channel_name": channel})
+
+        try:
+            from sdk.realtime import PusherSubscriber
+            subscriber = PusherSubscriber(
+                app_key=app_key,
+                ws_host=os.getenv("FORGEIQ_PUSHER_HOST", "soketi-forgeiq-production.up.railway.app"),
+                ws_port=int(os.getenv("FORGEIQ_PUSHER_PORT", "443")),
+                use_tls=os.getenv("FORGEIQ_PUSHER_TLS", "1") != "0",
+                channels=[c.strip() for c in os.getenv("FORGEIQ_PUSHER_CHANNELS", "private-forgeiq").split(",") if c.strip()],
+                on_event=live_state.apply,
+                authorizer=_authorize,
+                on_state_change=live_state.set_state,
+            )
+        except ImportError as e:
+            logger.warning(f"Realtime disabled: {e}")
+            return False
+        _subscriber_future = asyncio.run_coroutine_threadsafe(subscriber.run(), get_loop())
+        logger.info(f"Realtime: subscriber started for {subscriber.ws_host}")
+        return True
+
+
+def stop_realtime() -> None:
+    global _subscriber_future
+    with _start_lock:
+        if _subscriber_future is not None:
+            _subscriber_future.cancel()
+            _subscriber_future = None
+
+
+atexit.register(stop_realtime)  # Registered after ui.runtime's, so it runs before the loop is stopped
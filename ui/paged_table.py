@@ -0,0 +1,132 @@
+# =============================
+# 📁 ui/paged_table.py
+# =============================
+# One table widget for long lists, instead of a row of widgets per record.
+#
+# paged_table() asks its source for a single page (`page_size` items at a
+# cursor, with the filters and sort applied by the source: a list endpoint,
+# or an SDK store behaving like one) and renders it as one st.dataframe. Only
+# that window is held; the page's `to_frame` turns it into a DataFrame column
+# by column. Cursors of the pages visited so far are kept in session state, so
+# Prev/Next work with forward-only cursors; changing the filters, the sort or
+# the page size starts over from the first page. Selecting a row returns its
+# item, so the page can show a details panel for it below the table.
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Sequence
+
+import pandas as pd
+import streamlit as st
+
+from sdk.pagination import CursorPage
+from ui.lazy import load
+from ui.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# fetch(sort, cursor, page_size) -> the page, or None when the load failed (already reported)
+PageSource = Callable[[str, Optional[str], int], Awaitable[Optional[CursorPage[Any]]]]
+
+_SUPPORTS_SELECTION = "on_select" in inspect.signature(st.dataframe).parameters
+
+
+@dataclass
+class PagedTable:
+    items: List[Any]               # The visible window
+    frame: pd.DataFrame
+    selected: Optional[Any] = None
+    page: int = 1
+    total: Optional[int] = None
+    failed: bool = False
+
+
+def paged_table(key: str,
+                fetch: PageSource,
+                to_frame: Callable[[List[Any]], pd.DataFrame],
+                sort_options: Mapping[str, str],
+                filters: Hashable = None,
+                page_sizes: Sequence[int] = (25, 50, 100, 250),
+                transform: Optional[Callable[[List[Any]], List[Any]]] = None,
+                column_config: Optional[Dict[str, Any]] = None,
+                noun: str = "rows") -> PagedTable:
+    """Render one page of a cursor-paginated collection with sort, page-size and Prev/Next controls.
+
+    `sort_options` maps labels to the source's sort specs ("-started_at");
+    `filters` is anything hashable identifying the current filter selection.
+    `transform` is applied to the fetched items first (e.g. a live-state overlay).
+    """
+    controls = st.columns([1.2, 0.6, 1.6, 0.4, 0.4])
+    with controls[0]:
+        sort_label = st.selectbox("Sort by", list(sort_options), key=f"{key}_sort")
+    with controls[1]:
+        page_size = st.selectbox("Per page", list(page_sizes), index=min(1, len(page_sizes) - 1), key=f"{key}_page_size")
+
+    # Cursor stack of the pages visited, reset whenever what is being paged changes
+    view_key = (filters, sort_label, page_size)
+    pager = st.session_state.get(f"{key}_pager")
+    if pager is None or pager["view"] != view_key:
+        pager = st.session_state[f"{key}_pager"] = {"view": view_key, "cursors": [None]}
+    cursors: List[Optional[str]] = pager["cursors"]
+    page_number = len(cursors)
+
+    page = load(noun, lambda: fetch(sort_options[sort_label], cursors[-1], page_size))
+    items = list(page.items) if page is not None else []
+    if transform is not None:
+        items = transform(items)
+
+    first_row = (page_number - 1) * page_size + 1
+    with controls[2]:
+        if page is None:
+            st.caption(f"Could not load {noun}.")
+        elif not items:
+            st.caption(f"No {noun}.")
+        else:
+            of_total = f" of {page.total:,}" if page.total is not None else (" (more available)" if page.has_more else "")
+            st.caption(f"Page {page_number} · {noun} {first_row:,}–{first_row + len(items) - 1:,}{of_total}")
+    with controls[3]:
+        if st.button("◀ Prev", key=f"{key}_prev", disabled=page_number <= 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with controls[4]:
+        if st.button("Next ▶", key=f"{key}_next", disabled=page is None or not page.has_more, use_container_width=True):
+            cursors.append(page.next_cursor)
+            st.rerun()
+
+    with traced(f"to_frame {key}", rows=len(items)):
+        frame = to_frame(items) if items else pd.DataFrame()
+    table = PagedTable(items=items, frame=frame, page=page_number, total=page.total if page is not None else None,
+                       failed=page is None)
+    if frame.empty:
+        return table
+    height = min(35 * len(frame) + 38, 740)
+    if not _SUPPORTS_SELECTION:
+        st.dataframe(frame, use_container_width=True, hide_index=True, height=height, column_config=column_config)
+        return table
+    # Keyed by page, so a selection does not carry over to whichever row takes its place on another page
+    with traced(f"render {key}", rows=len(frame)):
+        event = st.dataframe(frame, use_container_width=True, hide_index=True, height=height,
+                             column_config=column_config, on_select="rerun", selection_mode="single-row",
+                             key=f"{key}_grid_{page_number}_{abs(hash(view_key)) % 10**8}")
+    rows = event.selection.rows if event is not None else []
+    if rows and rows[0] < len(items):
+        table.selected = items[rows[0]]
+    return table
+
+
+def frame_source(frame: pd.DataFrame) -> PageSource:
+    """A PageSource over an in-memory DataFrame, for data computed client-side (e.g. fleet health).
+
+    Sort specs name columns as for the list endpoints ("-health,agent_id");
+    cursors are offsets, and the items are the window's index labels, so the
+    page's `to_frame` formats `frame.loc[items]` column by column.
+    """
+    async def fetch(sort: str, cursor: Optional[str], page_size: int) -> CursorPage[Any]:
+        keys = [k for k in sort.split(",") if k]
+        view = frame.sort_values([k.lstrip("-") for k in keys], ascending=[not k.startswith("-") for k in keys],
+                                 na_position="last", kind="stable") if keys else frame
+        start = int(cursor or 0)
+        end = start + page_size
+        return CursorPage(items=list(view.index[start:end]), next_cursor=str(end) if end < len(view) else None,
+                          cursor=cursor, total=len(view))
+    return fetch
@@ -0,0 +1,304 @@
+# =============================
+# 📁 ui/runtime.py
+# =============================
+# Shared async runtime for the Streamlit pages.
+#
+# Streamlit executes page scripts synchronously, one thread per session rerun.
+# Instead of spinning up (and tearing down) a fresh event loop with asyncio.run()
+# for every fetch, all pages submit their coroutines to ONE long-lived event loop
+# running in a daemon thread. That lets concurrent fetches really overlap and lets
+# every session reuse the same pooled connections (sdk/transport.py).
+#
+# Fetch coroutines run on the loop thread, which has no ScriptRunContext, so they
+# must not call st.* directly. Use `notify.error(...)` / `notify.toast(...)`
+# instead: the messages are collected and replayed on the page thread once
+# run_sync() returns.
+#
+# The span active on the page thread (the page render, a lazy section's load)
+# is carried over to the coroutines, so their fetch and request spans nest
+# under it (see get_tracer() and sdk/tracing.py).
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from sdk.tracing import Tracer, activate, current_span, exporters_from_spec
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("FORGEIQ_UI_FETCH_TIMEOUT", "60"))
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+# Notices raised while a run_sync() call is in flight (inherited by child tasks via contextvars).
+_pending_notices: contextvars.ContextVar[Optional[List[Tuple[str, str, Dict[str, Any]]]]] = \
+    contextvars.ContextVar("forgeiq_pending_notices", default=None)
+
+
+def _run_loop_forever(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background event loop, starting it on first use."""
+    global _loop, _loop_thread
+    if _loop is not None and _loop_thread is not None and _loop_thread.is_alive():
+        return _loop
+    with _loop_lock:
+        if _loop is None or _loop_thread is None or not _loop_thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_run_loop_forever, args=(_loop,),
+                                            name="forgeiq-async-runtime", daemon=True)
+            _loop_thread.start()
+            logger.info("UI runtime: background event loop started.")
+    return _loop
+
+
+def in_runtime_thread() -> bool:
+    return _loop_thread is not None and threading.current_thread() is _loop_thread
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Run `coro` on the shared background loop and block the calling page thread for its result."""
+    if in_runtime_thread():
+        raise RuntimeError("run_sync() called from the runtime loop itself; `await` the coroutine instead.")
+
+    notices: List[Tuple[str, str, Dict[str, Any]]] = []
+    parent_span = current_span()
+
+    async def _runner() -> T:
+        _pending_notices.set(notices)
+        activate(parent_span)
+        return await coro
+
+    future = asyncio.run_coroutine_threadsafe(_runner(), get_loop())
+    try:
+        return future.result(timeout=timeout or DEFAULT_TIMEOUT_SECONDS)
+    except TimeoutError:
+        future.cancel()
+        raise
+    finally:
+        _replay_notices(notices)
+
+
+def gather_sync(*coros: Awaitable[Any], return_exceptions: bool = True,
+                timeout: Optional[float] = None) -> List[Any]:
+    """Run several coroutines concurrently on the shared loop; results keep argument order."""
+    async def _gather() -> List[Any]:
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+    return run_sync(_gather(), timeout=timeout)
+
+
+def stream_sync(*coros: Awaitable[Any], timeout: Optional[float] = None) -> Iterator[Tuple[int, Any]]:
+    """Run several coroutines concurrently on the shared loop, yielding (argument index, result or
+    exception) as each one finishes. Each coroutine's notices are replayed just before its result."""
+    if in_runtime_thread():
+        raise RuntimeError("stream_sync() called from the runtime loop itself; `await` the coroutines instead.")
+
+    parent_span = current_span()
+
+    async def _runner(coro: Awaitable[Any], notices: List[Tuple[str, str, Dict[str, Any]]]) -> Any:
+        _pending_notices.set(notices)
+        activate(parent_span)
+        return await coro
+
+    loop = get_loop()
+    pending: Dict[concurrent.futures.Future, Tuple[int, List[Tuple[str, str, Dict[str, Any]]]]] = {}
+    for index, coro in enumerate(coros):
+        notices: List[Tuple[str, str, Dict[str, Any]]] = []
+        pending[asyncio.run_coroutine_threadsafe(_runner(coro, notices), loop)] = (index, notices)
+    try:
+        for future in concurrent.futures.as_completed(pending, timeout=timeout or DEFAULT_TIMEOUT_SECONDS):
+            index, notices = pending[future]
+            _replay_notices(notices)
+            error = future.exception()
+            yield index, (error if error is not None else future.result())
+    finally:
+        for future in pending:  # Timed out, or the caller stopped iterating early
+            future.cancel()
+
+
+def shutdown(callback: Optional[Callable[[], Awaitable[Any]]] = None) -> None:
+    """Stop the background loop (optionally awaiting `callback()` on it first, e.g. client.aclose)."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop, _loop_thread = None, None
+    if loop is None or thread is None or not thread.is_alive():
+        return
+    if callback is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(callback(), loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"UI runtime: shutdown callback failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+# --- Tracing ---
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer for page renders, fetches and SDK requests.
+
+    FORGEIQ_UI_TRACE picks the exporters, e.g. "console", "file" (traces.jsonl
+    under FORGEIQ_CACHE_DIR), "file:/tmp/traces.jsonl", "otlp" (OTLP/HTTP to
+    OTEL_EXPORTER_OTLP_ENDPOINT) or several comma-separated. Unset, tracing is off.
+    """
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    with _loop_lock:
+        if _tracer is None:
+            _tracer = Tracer(exporters_from_spec(os.getenv("FORGEIQ_UI_TRACE", "")),
+                             service_name=os.getenv("OTEL_SERVICE_NAME", "forgeiq-ui"))
+            if _tracer.enabled:
+                logger.info(f"UI runtime: tracing to {', '.join(_tracer.stats()['exporters'])}.")
+    return _tracer
+
+
+# --- Shared SDK client ---
+_shared_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+
+def get_shared_client(base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """One ForgeIQClient (and therefore one connection pool) per backend per process.
+
+    The Dashboard entry page should store this in st.session_state.forgeiq_sdk_client
+    rather than constructing a client per session.
+    """
+    from sdk.client import DEFAULT_BASE_URL, ForgeIQClient
+    from sdk.resilience import EndpointPolicy, HedgePolicy, ResilienceLayer
+
+    key = ((base_url or DEFAULT_BASE_URL).rstrip("/"), api_key)
+    tracer = get_tracer()  # Takes _loop_lock itself
+    with _loop_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            # Revalidating HTTP cache: unchanged payloads come back as 304s and skip the JSON decode.
+            use_http_cache = os.getenv("FORGEIQ_UI_HTTP_CACHE", "1") != "0"
+            # "msgpack" negotiates the binary wire format; JSON (fastest installed decoder) otherwise.
+            binary_wire = os.getenv("FORGEIQ_UI_WIRE_FORMAT", "json").lower() == "msgpack"
+            # Hedge slow GETs (after the observed p95) when FORGEIQ_UI_HEDGING=1; retries/breakers are always on.
+            resilience = ResilienceLayer(default=EndpointPolicy(
+                hedge=HedgePolicy(enabled=os.getenv("FORGEIQ_UI_HEDGING", "0") == "1")))
+            client = ForgeIQClient(base_url=key[0], api_key=api_key, response_cache=use_http_cache,
+                                   binary_wire=binary_wire, resilience=resilience, tracer=tracer)
+            _shared_clients[key] = client
+    return client
+
+
+# --- Local audit-log store ---
+_audit_stores: Dict[str, Any] = {}
+
+
+def get_audit_store(client: Any):
+    """The on-disk audit-log store (sdk/audit_store.py) for `client`'s backend, one per process.
+
+    FORGEIQ_UI_AUDIT_DB overrides the database path.
+    """
+    from sdk.audit_store import AuditLogStore, default_store_path
+
+    with _loop_lock:
+        store = _audit_stores.get(client.base_url)
+        if store is None:
+            path = os.getenv("FORGEIQ_UI_AUDIT_DB") or default_store_path(client.base_url)
+            store = _audit_stores[client.base_url] = AuditLogStore(path)
+    return store
+
+
+# --- Task timing analytics ---
+_timing_analytics: Dict[str, Any] = {}
+
+
+def get_task_timings(client: Any):
+    """Process-wide timing analytics (sdk/timing.py) for `client`'s backend; history outlives DAG tombstones."""
+    from sdk.timing import TaskTimingAnalytics
+
+    with _loop_lock:
+        analytics = _timing_analytics.get(client.base_url)
+        if analytics is None:
+            analytics = _timing_analytics[client.base_url] = TaskTimingAnalytics()
+    return analytics
+
+
+# --- Agent fleet state ---
+_fleet_states: Dict[str, Any] = {}
+
+
+def get_fleet_state(client: Any):
+    """Process-wide agent heartbeat history (sdk/fleet.py) for `client`'s backend.
+
+    FORGEIQ_UI_AGENT_POLICIES sets per-agent-type thresholds, e.g.
+    "PlanAgent:120,SecurityAgent:600/1800" (stale[/offline] seconds).
+    """
+    from sdk.fleet import FleetState, parse_policies
+
+    with _loop_lock:
+        fleet = _fleet_states.get(client.base_url)
+        if fleet is None:
+            policies = parse_policies(os.getenv("FORGEIQ_UI_AGENT_POLICIES", ""))
+            fleet = _fleet_states[client.base_url] = FleetState(policies=policies)
+    return fleet
+
+
+async def _close_shared_clients() -> None:
+    for client in list(_shared_clients.values()):
+        await client.aclose()
+    _shared_clients.clear()
+
+
+atexit.register(lambda: shutdown(_close_shared_clients))
+atexit.register(lambda: _tracer is not None and _tracer.shutdown())
+
+
+# --- Deferred UI notices ---
+def _replay_notices(notices: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+    if not notices:
+        return
+    import streamlit as st
+    for kind, message, kwargs in notices:
+        getattr(st, kind)(message, **kwargs)
+
+
+class _Notifier:
+    """st.error/st.warning/st.toast that are safe to call from coroutines on the runtime loop."""
+
+    def _emit(self, kind: str, message: str, **kwargs: Any) -> None:
+        if in_runtime_thread():
+            pending = _pending_notices.get()
+            if pending is not None:
+                pending.append((kind, message, kwargs))
+            else:
+                logger.warning(f"UI runtime: dropped {kind} notice outside run_sync(): {message}")
+            return
+        import streamlit as st
+        getattr(st, kind)(message, **kwargs)
+
+    def error(self, message: str) -> None:
+        self._emit("error", message)
+
+    def warning(self, message: str) -> None:
+        self._emit("warning", message)
+
+    def info(self, message: str) -> None:
+        self._emit("info", message)
+
+    def toast(self, message: str, icon: Optional[str] = None) -> None:
+        self._emit("toast", message, icon=icon)
+
+
+notify = _Notifier()
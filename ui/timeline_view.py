@@ -0,0 +1,69 @@
+# =============================
+# 📁 ui/timeline_view.py
+# =============================
+# Renders a Timeline (sdk/timeline.py) as a Gantt chart above its
+# concurrency-over-time curve.
+#
+# Rows are the SDK's packed lanes, not tasks, and beyond the SDK's draw budget
+# lanes and bars arrive already folded and merged (shaded by how busy each
+# block was), so the chart stays a few thousand marks whatever the DAG size.
+# Idle-worker gaps are shaded on both charts, and brushing a range of the
+# concurrency curve zooms the Gantt to it.
+import altair as alt
+import pandas as pd
+
+from sdk.timeline import Timeline, concurrency_series
+from ui.dag_view import STATUS_COLORS, _format_seconds
+
+# Only the longest gaps are shaded; the rest would be sub-pixel slivers
+GAP_LIMIT = 200
+
+
+def timeline_chart(timeline: Timeline) -> alt.VConcatChart:
+    bars = pd.DataFrame({
+        "row": [b.row for b in timeline.bars],
+        "start": [b.start for b in timeline.bars],
+        "end": [b.end for b in timeline.bars],
+        "task": [b.label for b in timeline.bars],
+        "status": [b.status for b in timeline.bars],
+        "tasks": [b.tasks for b in timeline.bars],
+        "duration": [_format_seconds((b.end - b.start).total_seconds()) for b in timeline.bars],
+        "running": [b.running for b in timeline.bars],
+        # Fraction of the block's lane-time that was busy; merged blocks are shaded by it
+        "load": [min(1.0, b.busy_seconds / max((b.end - b.start).total_seconds() * timeline.lanes_per_row, 1e-9))
+                 for b in timeline.bars],
+    })
+    longest = sorted(timeline.gaps, key=lambda g: g.seconds, reverse=True)[:GAP_LIMIT]
+    gaps = pd.DataFrame({
+        "start": [g.start for g in longest],
+        "end": [g.end for g in longest],
+        "running": [g.concurrency for g in longest],
+        "idle": [_format_seconds(g.seconds) for g in longest],
+    }, columns=["start", "end", "running", "idle"])
+    curve = pd.DataFrame(concurrency_series(timeline))
+
+    brush = alt.selection_interval(encodings=["x"])
+    x = alt.X("start:T", title=None, scale=alt.Scale(domain=brush))
+    domain = list(STATUS_COLORS)
+    gap_layer = alt.Chart(gaps).mark_rect(color="#ffb300", opacity=0.2).encode(
+        x=x, x2="end:T", tooltip=["idle", "running"])
+    bar_layer = alt.Chart(bars).mark_bar(height={"band": 0.8}).encode(
+        x=x, x2="end:T",
+        y=alt.Y("row:O", title="Worker lane" if timeline.lanes_per_row == 1 else f"Worker lanes (×{timeline.lanes_per_row})",
+                axis=alt.Axis(labels=timeline.rows <= 60, ticks=False)),
+        color=alt.Color("status:N", scale=alt.Scale(domain=domain, range=[STATUS_COLORS[s] for s in domain]),
+                        legend=alt.Legend(title="Status", orient="bottom")),
+        opacity=(alt.Opacity("load:Q", legend=None, scale=alt.Scale(domain=[0, 1], range=[0.25, 1.0]))
+                 if timeline.downsampled else alt.condition("datum.running", alt.value(0.6), alt.value(1.0))),
+        tooltip=["task", "status", "duration", "tasks", alt.Tooltip("load:Q", format=".0%"), "start:T", "end:T"],
+    )
+    row_height = 18 if timeline.rows <= 60 else 5
+    gantt = alt.layer(gap_layer, bar_layer).properties(height=int(min(900, max(150, timeline.rows * row_height))))
+
+    concurrency = alt.layer(
+        alt.Chart(gaps).mark_rect(color="#ffb300", opacity=0.2).encode(x=alt.X("start:T", title=None), x2="end:T"),
+        alt.Chart(curve).mark_area(interpolate="step-after", line=True, opacity=0.5).encode(
+            x=alt.X("time:T", title=None), y=alt.Y("running:Q", title="Running tasks"),
+            tooltip=[alt.Tooltip("time:T"), "running"]),
+    ).add_params(brush).properties(height=120)
+    return alt.vconcat(gantt, concurrency)
@@ -0,0 +1,52 @@
+# =============================
+# 📁 ui/tracing.py
+# =============================
+# Page-level spans on top of the runtime's tracer (ui/runtime.get_tracer()).
+#
+# A page calls trace_page() once near the top and end_page() as its last
+# statement. The render span is the root of the run's trace: fetch functions
+# (ui/cache.py), lazy sections (ui/lazy.py) and SDK requests started while it
+# is active nest under it, and traced() times page-thread work such as
+# building DataFrames. Runs cut short by st.rerun(), st.stop() or an exception
+# never reach end_page(); their span is ended when the session's next run
+# starts and tagged page.completed=false.
+#
+# With FORGEIQ_UI_TRACE unset all of this is a no-op.
+from typing import Any
+
+import streamlit as st
+
+from sdk.tracing import NOOP_SPAN, activate
+from ui.runtime import get_tracer
+
+_PAGE_SPAN_KEY = "_forgeiq_page_span"
+
+
+def trace_page(name: str) -> Any:
+    """Start the render span for this run of page `name` and make it the current span."""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return NOOP_SPAN
+    previous = st.session_state.get(_PAGE_SPAN_KEY)
+    if previous is not None:
+        previous.set_attribute("page.completed", False)
+        previous.end()
+    span = tracer.start_span(f"page {name}", kind="server", attributes={"page.name": name}, parent=NOOP_SPAN)
+    st.session_state[_PAGE_SPAN_KEY] = span
+    activate(span)
+    return span
+
+
+def end_page() -> None:
+    """End this run's render span; call as the page's last statement."""
+    span = st.session_state.pop(_PAGE_SPAN_KEY, None)
+    if span is None:
+        return
+    span.set_attribute("page.completed", True)
+    span.end()
+    activate(NOOP_SPAN)
+
+
+def traced(name: str, **attributes: Any) -> Any:
+    """Context manager timing a block of page code as a child of the current span."""
+    return get_tracer().span(name, attributes=attributes)